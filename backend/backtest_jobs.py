@@ -0,0 +1,488 @@
+# ===== backend/backtest_jobs.py =====
+"""
+백테스트 작업 큐
+
+- submit: 작업 ID 즉시 반환, 우선순위 큐에 적재 (숫자가 작을수록 먼저)
+- 실행: 로컬 프로세스 풀 (동시 실행 수 제한), 워커 프로세스마다 백테스트 매니저 1회 초기화
+- 진행률: 워커 -> 관리자 큐 -> 이벤트 루프 -> 구독자(SSE/WebSocket)
+- 취소: 대기 중이면 즉시, 실행 중이면 다음 진행률 보고 시점에 중단
+- 결과 저장: SQLite (완료/실패/취소 작업 조회)
+"""
+
+import asyncio
+import itertools
+import json
+import multiprocessing
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL_STATES = {COMPLETED, FAILED, CANCELLED}
+
+DEFAULT_PRIORITY = 10
+
+
+class JobCancelled(Exception):
+    """실행 중 취소 요청으로 중단된 작업"""
+
+
+# ===== 워커 프로세스 측 =====
+_worker_runner = None
+
+
+def _init_worker(runner_factory: Callable[[], Callable]):
+    """워커 프로세스 초기화 - 전략 모듈/데이터 로딩은 프로세스당 한 번"""
+    global _worker_runner
+    _worker_runner = runner_factory()
+
+
+def _run_job(job_id: str, request: Dict, progress_queue, cancel_flags) -> Dict:
+    """워커에서 실행: runner(request, progress) 호출"""
+    def progress(fraction: float, message: str = ""):
+        if cancel_flags.get(job_id):
+            raise JobCancelled(job_id)
+        progress_queue.put((job_id, float(fraction), message))
+
+    progress(0.0, "started")
+    result = _worker_runner(request, progress)
+    progress(1.0, "finished")
+    return result
+
+
+# ===== 결과 저장소 =====
+class JobStore:
+    """작업 상태/결과 SQLite 저장소"""
+
+    def __init__(self, db_path: str = "data/backtest_jobs.db"):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS backtest_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                request TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT
+            )
+        ''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_backtest_jobs_created ON backtest_jobs(created_at)")
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def save(self, job: "BacktestJob"):
+        with self._lock:
+            self.conn.execute('''
+                INSERT INTO backtest_jobs (id, status, priority, request, result, error, created_at, started_at, finished_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    status = excluded.status, result = excluded.result, error = excluded.error,
+                    started_at = excluded.started_at, finished_at = excluded.finished_at
+            ''', (
+                job.id, job.status, job.priority,
+                json.dumps(job.request, ensure_ascii=False),
+                json.dumps(job.result, ensure_ascii=False, default=str) if job.result is not None else None,
+                job.error, job.created_at, job.started_at, job.finished_at,
+            ))
+            self.conn.commit()
+
+    def load(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id, status, priority, request, result, error, created_at, started_at, finished_at "
+                "FROM backtest_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0], "status": row[1], "priority": row[2],
+            "request": json.loads(row[3]),
+            "result": json.loads(row[4]) if row[4] else None,
+            "error": row[5], "created_at": row[6], "started_at": row[7], "finished_at": row[8],
+            "progress": 1.0 if row[1] == COMPLETED else 0.0, "message": "",
+        }
+
+    def unfinished(self) -> List[Dict]:
+        """대기/실행 상태로 남은 작업 (이전 프로세스가 끝내지 못한 작업) - 생성 순"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id FROM backtest_jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [self.load(row[0]) for row in rows]
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id FROM backtest_jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self.load(row[0]) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+@dataclass
+class BacktestJob:
+    id: str
+    request: Dict
+    priority: int = DEFAULT_PRIORITY
+    status: str = QUEUED
+    progress: float = 0.0
+    message: str = ""
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    submitted: float = field(default_factory=time.perf_counter)
+    done: Optional[asyncio.Event] = None
+
+    def to_dict(self, include_result: bool = False) -> Dict:
+        data = {
+            "id": self.id, "status": self.status, "priority": self.priority,
+            "progress": round(self.progress, 4), "message": self.message, "error": self.error,
+            "created_at": self.created_at, "started_at": self.started_at, "finished_at": self.finished_at,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+# ===== 작업 큐 =====
+class BacktestJobQueue:
+    """우선순위 백테스트 작업 큐 (프로세스 풀 실행)"""
+
+    def __init__(self, runner_factory: Callable[[], Callable], max_workers: int = 2,
+                 db_path: str = "data/backtest_jobs.db", keep_finished: int = 200):
+        self.runner_factory = runner_factory  # 워커에서 호출 -> runner(request, progress) 반환 (모듈 최상위 함수)
+        self.max_workers = max_workers
+        self.keep_finished = keep_finished   # 메모리에 남겨 둘 종료 작업 수 (이후는 저장소에서 조회)
+        self.store = JobStore(db_path)
+
+        self.jobs: Dict[str, BacktestJob] = {}
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._progress_queue = None
+        self._cancel_flags = None
+        self._reader: Optional[threading.Thread] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._finished_order: List[str] = []
+
+        # 통계
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.PriorityQueue()
+        self._manager = multiprocessing.Manager()
+        self._progress_queue = self._manager.Queue()
+        self._cancel_flags = self._manager.dict()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker, initargs=(self.runner_factory,)
+        )
+        self._reader = threading.Thread(target=self._read_progress, name="BacktestProgress", daemon=True)
+        self._reader.start()
+        self._recover()
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.max_workers)]
+        print(f"✓ 백테스트 작업 큐 시작 (워커 {self.max_workers}개)")
+
+    def _recover(self):
+        """이전 프로세스가 남긴 작업 정리 - 대기 작업은 다시 큐에, 실행 중이던 작업은 실패 처리"""
+        requeued = failed = 0
+        for data in self.store.unfinished():
+            job = BacktestJob(id=data["id"], request=data["request"], priority=data["priority"],
+                              created_at=data["created_at"], done=asyncio.Event())
+            self.jobs[job.id] = job
+            if data["status"] == QUEUED:
+                self._queue.put_nowait((job.priority, next(self._seq), job.id))
+                requeued += 1
+            else:
+                # 실행 도중 프로세스가 종료됨 - 결과를 알 수 없으므로 자동 재실행하지 않음
+                job.started_at = data["started_at"]
+                self._finish(job, FAILED, error="interrupted: server restarted while running")
+                failed += 1
+        if requeued or failed:
+            print(f"✓ 백테스트 작업 복구: 재등록 {requeued}개, 중단 처리 {failed}개")
+
+    async def stop(self):
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        if self._executor:
+            for job_id, job in self.jobs.items():
+                if job.status == RUNNING:
+                    self._cancel_flags[job_id] = True
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._progress_queue is not None:
+            self._progress_queue.put(None)
+            self._reader.join(timeout=5)
+        if self._manager:
+            self._manager.shutdown()
+            self._manager = None
+        self.store.close()
+
+    # ----- 제출 / 조회 / 취소 -----
+    def submit(self, request: Dict, priority: int = DEFAULT_PRIORITY) -> str:
+        """작업 등록 -> 작업 ID (대기 없음)"""
+        job = BacktestJob(id=uuid.uuid4().hex, request=request, priority=priority, done=asyncio.Event())
+        self.jobs[job.id] = job
+        self.store.save(job)
+        self._queue.put_nowait((priority, next(self._seq), job.id))
+        self.submitted += 1
+        self._publish(job)
+        return job.id
+
+    def get(self, job_id: str, include_result: bool = False) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict(include_result)
+        data = self.store.load(job_id)
+        if data is not None and not include_result:
+            data.pop("result", None)
+        if data is not None:
+            data.pop("request", None)
+        return data
+
+    def list_jobs(self, limit: int = 50) -> List[Dict]:
+        active = [job.to_dict() for job in self.jobs.values() if job.status not in TERMINAL_STATES]
+        recent = [job for job in self.store.recent(limit) if job["id"] not in self.jobs or job["status"] in TERMINAL_STATES]
+        for job in recent:
+            job.pop("request", None)
+            job.pop("result", None)
+        return (active + recent)[:limit]
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job.status in TERMINAL_STATES:
+            return False
+        if job.status == QUEUED:
+            self._finish(job, CANCELLED, error="cancelled")
+        else:
+            self._cancel_flags[job_id] = True  # 워커가 다음 진행률 보고 시 중단
+            job.message = "cancelling"
+            self._publish(job)
+        return True
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return self.get(job_id, include_result=True)
+        await asyncio.wait_for(job.done.wait(), timeout)
+        return job.to_dict(include_result=True)
+
+    # ----- 진행률 구독 -----
+    async def events(self, job_id: str) -> AsyncIterator[Dict]:
+        """작업 상태 이벤트 스트림 (종료 상태에서 끝)"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            data = self.get(job_id)
+            if data is not None:
+                yield data
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        self.subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            event = job.to_dict()
+            while True:
+                yield event
+                if event["status"] in TERMINAL_STATES:
+                    break
+                event = await queue.get()
+                # 밀린 진행률은 최신 것만
+                while not queue.empty() and event["status"] not in TERMINAL_STATES:
+                    event = queue.get_nowait()
+        finally:
+            self.subscribers.get(job_id, set()).discard(queue)
+            if not self.subscribers.get(job_id):
+                self.subscribers.pop(job_id, None)
+
+    def _publish(self, job: BacktestJob):
+        for queue in self.subscribers.get(job.id, ()):
+            queue.put_nowait(job.to_dict())
+
+    # ----- 실행 -----
+    async def _dispatch(self):
+        """큐에서 우선순위 순으로 꺼내 프로세스 풀에서 실행 (디스패처 수 = 동시 실행 수)"""
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                continue
+
+            job.status = RUNNING
+            job.started_at = datetime.now().isoformat()
+            self.store.save(job)
+            self._publish(job)
+            try:
+                result = await self._loop.run_in_executor(
+                    self._executor, _run_job, job_id, job.request, self._progress_queue, self._cancel_flags
+                )
+                self._finish(job, COMPLETED, result=result)
+            except JobCancelled:
+                self._finish(job, CANCELLED, error="cancelled")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self._cancel_flags.get(job_id):  # 러너가 JobCancelled를 감싸서 다시 던진 경우
+                    self._finish(job, CANCELLED, error="cancelled")
+                    continue
+                print(f"✗ 백테스트 작업 실패 {job_id}: {e}")
+                self._finish(job, FAILED, error=f"{type(e).__name__}: {e}")
+
+    def _finish(self, job: BacktestJob, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = datetime.now().isoformat()
+        if status == COMPLETED:
+            job.progress = 1.0
+            self.completed += 1
+        elif status == FAILED:
+            self.failed += 1
+        else:
+            self.cancelled += 1
+        self._cancel_flags.pop(job.id, None)
+        self.store.save(job)
+        self._publish(job)
+        job.done.set()
+
+        # 오래된 종료 작업은 메모리에서 내림 (저장소에서 조회 가능)
+        self._finished_order.append(job.id)
+        while len(self._finished_order) > self.keep_finished:
+            old_id = self._finished_order.pop(0)
+            if old_id not in self.subscribers:
+                self.jobs.pop(old_id, None)
+
+    def _read_progress(self):
+        """진행률 큐 소비 스레드 -> 이벤트 루프로 전달"""
+        while True:
+            try:
+                item = self._progress_queue.get()
+            except (EOFError, OSError):
+                break
+            if item is None:
+                break
+            self._loop.call_soon_threadsafe(self._on_progress, *item)
+
+    def _on_progress(self, job_id: str, fraction: float, message: str):
+        job = self.jobs.get(job_id)
+        if job is None or job.status != RUNNING:
+            return
+        job.progress = fraction
+        job.message = message
+        self._publish(job)
+
+    def get_stats(self) -> Dict[str, Any]:
+        states: Dict[str, int] = {}
+        for job in self.jobs.values():
+            states[job.status] = states.get(job.status, 0) + 1
+        return {
+            "max_workers": self.max_workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "states": states,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+        }
+
+
+# ===== 부하 테스트 =====
+def _load_test_runner_factory():
+    """부하 테스트용 runner: CPU 작업을 steps번 나눠 수행하며 진행률 보고"""
+    def runner(request: Dict, progress: Callable[[float, str], None]) -> Dict:
+        steps = request.get("steps", 10)
+        total = 0
+        for step in range(steps):
+            total += sum(i * i for i in range(request.get("work", 20000)))
+            progress((step + 1) / steps, f"step {step + 1}/{steps}")
+        return {"total": total}
+    return runner
+
+
+async def run_load_test(jobs: int = 200, workers: int = 4, steps: int = 10, work: int = 20000,
+                        db_path: str = "data/backtest_jobs_loadtest.db") -> Dict[str, Any]:
+    """동시 제출 부하 테스트 - 처리량/대기시간 측정"""
+    queue = BacktestJobQueue(_load_test_runner_factory, max_workers=workers, db_path=db_path)
+    await queue.start()
+    try:
+        start = time.perf_counter()
+        job_ids = [queue.submit({"steps": steps, "work": work}, priority=i % 3) for i in range(jobs)]
+        submit_ms = (time.perf_counter() - start) * 1000
+
+        # 일부 작업 진행률 구독 + 취소 확인
+        watched = asyncio.gather(*(_count_events(queue, job_id) for job_id in job_ids[:5]))
+        queue.cancel(job_ids[-1])
+
+        results = await asyncio.gather(*(queue.wait(job_id) for job_id in job_ids))
+        elapsed = time.perf_counter() - start
+        latencies = sorted(
+            (datetime.fromisoformat(r["finished_at"]) - datetime.fromisoformat(r["created_at"])).total_seconds()
+            for r in results if r["status"] == COMPLETED
+        )
+        events = await watched
+        return {
+            "jobs": jobs,
+            "workers": workers,
+            "submit_ms": round(submit_ms, 2),
+            "elapsed_s": round(elapsed, 3),
+            "jobs_per_sec": round(len(latencies) / elapsed, 1),
+            "latency_p50_s": round(latencies[len(latencies) // 2], 3) if latencies else None,
+            "latency_p99_s": round(latencies[int(len(latencies) * 0.99) - 1], 3) if latencies else None,
+            "progress_events_per_watched_job": events,
+            "stats": queue.get_stats(),
+        }
+    finally:
+        await queue.stop()
+
+
+async def _count_events(queue: BacktestJobQueue, job_id: str) -> int:
+    count = 0
+    async for _ in queue.events(job_id):
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="백테스트 작업 큐 부하 테스트")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--work", type=int, default=20000)
+    args = parser.parse_args()
+
+    print("🚀 백테스트 작업 큐 부하 테스트")
+    try:
+        report = asyncio.run(run_load_test(args.jobs, args.workers, args.steps, args.work))
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    except Exception:
+        print(traceback.format_exc())
@@ -1,18 +1,25 @@
 # ===== backend/main.py 수정된 버전 =====
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import sys
 import os
+import asyncio
 import traceback
 from datetime import datetime
 from pathlib import Path
 import importlib
+import importlib.util
+import json
 import pandas as pd
 import numpy as np
 
+from backtest_jobs import BacktestJobQueue, DEFAULT_PRIORITY
+from market_data import create_market_data_service
+
 # 경로 설정
 current_dir = Path(__file__).parent
 backend_quant_engine_path = current_dir / "quant_engine"
@@ -22,36 +29,33 @@ strategy_engine_path = current_dir / "strategy_engine"
 sys.path.append(str(backend_quant_engine_path))
 sys.path.append(str(strategy_engine_path))
 
-# 모든 전략 모듈들 import
+# 백테스트 결과 캐시 (backtester/result_cache.py - 이름 충돌을 피해 파일 경로로 로딩)
+BACKTEST_ENGINE_VERSION = "1.0.0"  # 실행 로직이 바뀌면 올려서 캐시 무효화
+try:
+    _cache_spec = importlib.util.spec_from_file_location(
+        "backtest_result_cache", current_dir.parent / "backtester" / "result_cache.py"
+    )
+    result_cache_module = importlib.util.module_from_spec(_cache_spec)
+    _cache_spec.loader.exec_module(result_cache_module)
+    print("✓ result_cache 로딩 성공")
+except Exception as e:
+    result_cache_module = None
+    print(f"⚠️ result_cache 로딩 실패 (캐시 없이 실행): {e}")
+
+# 전략 모듈들 - 레지스트리는 매니페스트로 초기화하고, 개별 모듈은 처음 쓸 때 import
 strategy_modules = {}
 
 try:
     # backend/quant_engine/base_strategy.py
-    from quant_engine import base_strategy
+    import base_strategy
     strategy_modules['base_strategy'] = base_strategy
     print("✓ base_strategy 로딩 성공")
     
-    # strategy_engine 디렉토리의 모든 모듈들
-    strategy_files = [
-        'basic_strategies',
-        'cycle_contrarian_strategies', 
-        'fundamental_metrics',
-        'growth_momentum_stratigies',  # 오타 그대로 유지
-        'portfolio_utils',
-        'strategy_factory',
-        'technical_indicators',
-        'value_strategies'
-    ]
-    
-    for module_name in strategy_files:
-        try:
-            module = importlib.import_module(module_name)
-            strategy_modules[module_name] = module
-            print(f"✓ {module_name} 로딩 성공")
-        except ImportError as e:
-            print(f"⚠️ {module_name} 로딩 실패: {e}")
-    
-    print(f"✓ 총 {len(strategy_modules)}개 전략 모듈 로딩 완료")
+    import strategy_factory
+    from strategy_factory import strategy_registry, initialize_strategy_system
+    initialize_strategy_system()
+    strategy_modules['strategy_factory'] = strategy_factory
+    print(f"✓ 전략 레지스트리 초기화 완료 ({len(strategy_registry.list_strategies())}개 전략, 모듈은 지연 로딩)")
     
 except ImportError as e:
     print(f"❌ 전략 모듈 import 실패: {e}")
@@ -100,12 +104,27 @@ class PortfolioRequest(BaseModel):
 class QuantBacktestManager:
     """quant_engine과 strategy_engine을 활용한 백테스트 매니저"""
     
-    def __init__(self):
+    def __init__(self, build_market_data: bool = True):
         self.strategies = {}
-        self.stock_data = None
+        self.stock_data = None  # market_data.PricePanel (mmap, 프로세스 간 공유)
+        self.market_data = None
         self.strategy_modules = strategy_modules
+        self.result_cache = self.create_result_cache()
         self.load_available_strategies()
-        self.load_stock_data()
+        self.load_stock_data(build=build_market_data)
+    
+    def create_result_cache(self):
+        """결과 캐시 생성 (BACKTEST_CACHE_MB=0 이면 사용 안 함)"""
+        max_mb = float(os.getenv("BACKTEST_CACHE_MB", "256"))
+        if result_cache_module is None or max_mb <= 0:
+            return None
+        try:
+            return result_cache_module.BacktestResultCache(
+                os.getenv("BACKTEST_CACHE_PATH", "./data/backtest_results.db"), max_mb=max_mb
+            )
+        except Exception as e:
+            print(f"⚠️ 결과 캐시 초기화 실패: {str(e)}")
+            return None
     
     def load_available_strategies(self):
         """quant_engine에서 실제 전략들 로딩"""
@@ -130,70 +149,82 @@ class QuantBacktestManager:
                             "complexity": strategy_meta.complexity.value
                         }
                 
-            # 추가로 기본 전략들 정의 (백업용)
-            if not self.strategies:
-                self.strategies = {
-                    "low_pe": {
-                        "name": "저PER 전략",
-                        "description": "PER 15배 이하 종목 선별",
-                        "default_params": {"max_pe_ratio": 15},
-                        "module": "basic_strategies"
-                    },
-                    "rsi_mean_reversion": {
-                        "name": "RSI 평균회귀 전략",
-                        "description": "RSI 과매수/과매도 구간 활용",
-                        "default_params": {"rsi_period": 14, "oversold": 30, "overbought": 70},
-                        "module": "basic_strategies"
-                    },
-                    "buffett_moat": {
-                        "name": "워렌 버핏의 해자 전략",
-                        "description": "경제적 해자가 있는 기업 장기 투자",
-                        "default_params": {"max_pe": 20, "min_roe": 0.15, "min_roic": 0.12},
-                        "module": "value_strategies"
-                    },
-                    "peter_lynch_peg": {
-                        "name": "피터 린치의 PEG 전략", 
-                        "description": "PEG 1.0 이하 성장주 발굴",
-                        "default_params": {"max_peg": 1.0, "min_growth_rate": 0.1},
-                        "module": "value_strategies"
-                    },
-                    "william_oneil_canslim": {
-                        "name": "윌리엄 오닐의 CAN SLIM",
-                        "description": "7가지 기준으로 고성장주 발굴",
-                        "default_params": {"min_current_earnings": 0.25, "min_relative_strength": 80},
-                        "module": "growth_momentum_stratigies"
-                    },
-                    "bollinger_band": {
-                        "name": "볼린저 밴드 역발상 전략",
-                        "description": "볼린저 밴드 터치 시점 매매",
-                        "default_params": {"bb_period": 20, "bb_std": 2},
-                        "module": "basic_strategies"
-                    },
-                    "dividend_aristocrats": {
-                        "name": "배당 귀족주 전략",
-                        "description": "연속 배당 증가 기업 투자",
-                        "default_params": {"min_dividend_years": 20, "min_dividend_yield": 0.02},
-                        "module": "basic_strategies"
-                    },
-                    "ray_dalio_all_weather": {
-                        "name": "레이 달리오의 올웨더",
-                        "description": "경제 환경 변화에 관계없이 안정적 수익",
-                        "default_params": {"rebalance_threshold": 0.05},
-                        "module": "cycle_contrarian_strategies"
-                    },
-                    "joel_greenblatt_magic": {
-                        "name": "조엘 그린블라트의 마법공식",
-                        "description": "ROE + 수익수익률 결합 체계적 가치투자",
-                        "default_params": {"min_market_cap": 1000, "top_stocks": 30},
-                        "module": "value_strategies"
-                    },
-                    "simple_momentum": {
-                        "name": "단순 모멘텀 전략",
-                        "description": "최근 성과 상위 종목 추종",
-                        "default_params": {"lookback_months": 6, "top_percentile": 0.2},
-                        "module": "basic_strategies"
-                    }
+            # 추가로 기본 전략들 정의 (백업용, 레지스트리 전략의 기본 파라미터로도 사용)
+            fallback_strategies = {
+                "low_pe": {
+                    "name": "저PER 전략",
+                    "description": "PER 15배 이하 종목 선별",
+                    "default_params": {"max_pe_ratio": 15},
+                    "module": "basic_strategies"
+                },
+                "rsi_mean_reversion": {
+                    "name": "RSI 평균회귀 전략",
+                    "description": "RSI 과매수/과매도 구간 활용",
+                    "default_params": {"rsi_period": 14, "oversold": 30, "overbought": 70},
+                    "module": "basic_strategies"
+                },
+                "buffett_moat": {
+                    "name": "워렌 버핏의 해자 전략",
+                    "description": "경제적 해자가 있는 기업 장기 투자",
+                    "default_params": {"max_pe": 20, "min_roe": 0.15, "min_roic": 0.12},
+                    "module": "value_strategies"
+                },
+                "peter_lynch_peg": {
+                    "name": "피터 린치의 PEG 전략", 
+                    "description": "PEG 1.0 이하 성장주 발굴",
+                    "default_params": {"max_peg": 1.0, "min_growth_rate": 0.1},
+                    "module": "value_strategies"
+                },
+                "william_oneil_canslim": {
+                    "name": "윌리엄 오닐의 CAN SLIM",
+                    "description": "7가지 기준으로 고성장주 발굴",
+                    "default_params": {"min_current_earnings": 0.25, "min_relative_strength": 80},
+                    "module": "growth_momentum_stratigies"
+                },
+                "bollinger_band": {
+                    "name": "볼린저 밴드 역발상 전략",
+                    "description": "볼린저 밴드 터치 시점 매매",
+                    "default_params": {"bb_period": 20, "bb_std": 2},
+                    "module": "basic_strategies"
+                },
+                "dividend_aristocrats": {
+                    "name": "배당 귀족주 전략",
+                    "description": "연속 배당 증가 기업 투자",
+                    "default_params": {"min_dividend_years": 20, "min_dividend_yield": 0.02},
+                    "module": "basic_strategies"
+                },
+                "ray_dalio_all_weather": {
+                    "name": "레이 달리오의 올웨더",
+                    "description": "경제 환경 변화에 관계없이 안정적 수익",
+                    "default_params": {"rebalance_threshold": 0.05},
+                    "module": "cycle_contrarian_strategies"
+                },
+                "joel_greenblatt_magic": {
+                    "name": "조엘 그린블라트의 마법공식",
+                    "description": "ROE + 수익수익률 결합 체계적 가치투자",
+                    "default_params": {"min_market_cap": 1000, "top_stocks": 30},
+                    "module": "value_strategies"
+                },
+                "simple_momentum": {
+                    "name": "단순 모멘텀 전략",
+                    "description": "최근 성과 상위 종목 추종",
+                    "default_params": {"lookback_months": 6, "top_percentile": 0.2},
+                    "module": "basic_strategies"
+                },
+                "regular_rebalancing": {
+                    "name": "정기 리밸런싱 전략",
+                    "description": "정해진 비율로 정기적 리밸런싱 (비율 없으면 동일 가중)",
+                    "default_params": {"target_allocation": {}, "rebalance_threshold": 0.05},
+                    "module": "basic_strategies"
                 }
+            }
+        
+            if not self.strategies:
+                self.strategies = fallback_strategies
+            else:
+                for strategy_name, strategy_info in self.strategies.items():
+                    if not strategy_info["default_params"] and strategy_name in fallback_strategies:
+                        strategy_info["default_params"] = dict(fallback_strategies[strategy_name]["default_params"])
             
             print(f"✓ {len(self.strategies)}개 전략 정의 완료")
             
@@ -241,23 +272,52 @@ class QuantBacktestManager:
             print(f"✗ 전략 로딩 실패: {str(e)}")
             self.strategies = {}
     
-    def load_stock_data(self):
-        """주식 데이터 로딩 (실제로는 CSV 파일에서) """
+    def load_stock_data(self, build: bool = True):
+        """주식 데이터 로딩 - KRX CSV로 만든 가격/재무 패널을 mmap (build=False: 워커, 빌드된 패널만 사용)"""
         try:
-            # 실제 구현에서는 CSV 파일 로딩
-            # import pandas as pd
-            # self.stock_data = pd.read_csv('./data/stock_analysis.csv')
-            print("✓ 주식 데이터 로딩 완료 (모의)")
+            self.market_data = create_market_data_service()
+            panel = self.market_data.load(build=build)
+            
+            if panel is None or panel.empty:
+                print("⚠️ 주식 데이터 없음 - 모의 결과로 실행")
+                return
+            
+            self.stock_data = panel
+            stats = panel.get_stats()
+            print(f"✓ 주식 데이터 로딩 완료 ({stats['symbols']}종목, {stats['firstDate']}~{stats['lastDate']}, 버전 {stats['version']})")
             
         except Exception as e:
             print(f"✗ 주식 데이터 로딩 실패: {str(e)}")
     
+    def refresh_market_data(self, rebuild: bool = False) -> bool:
+        """새 패널 버전이 있으면 교체 (rebuild=True: 소스 CSV 변경 시 새 버전 빌드 - 메인 프로세스)"""
+        if self.market_data is None:
+            return False
+        try:
+            if not self.market_data.refresh(rebuild=rebuild):
+                return False
+        except Exception as e:
+            print(f"✗ 주식 데이터 갱신 실패: {str(e)}")
+            return False
+        
+        panel = self.market_data.panel
+        self.stock_data = panel if panel is not None and not panel.empty else None
+        print(f"🔄 주식 데이터 갱신: {panel.version if panel is not None else None}")
+        return True
+    
     def get_strategy_function(self, strategy_info: Dict):
         """전략 모듈에서 실제 함수 가져오기"""
         try:
             module_name = strategy_info["module"]
             function_name = strategy_info["function"]
             
+            if module_name not in self.strategy_modules:
+                # 처음 쓰는 모듈은 여기서 import
+                try:
+                    self.strategy_modules[module_name] = importlib.import_module(module_name)
+                except ImportError as e:
+                    print(f"⚠️ {module_name} 로딩 실패: {e}")
+            
             if module_name in self.strategy_modules:
                 module = self.strategy_modules[module_name]
                 if hasattr(module, function_name):
@@ -273,14 +333,178 @@ class QuantBacktestManager:
             print(f"✗ 전략 함수 로딩 실패: {str(e)}")
             return None
     
-    def execute_backtest(self, request_data: Dict) -> Dict:
-        """실제 백테스트 실행"""
+    def strategy_source_key(self, strategy_id: str) -> str:
+        """전략 클래스 소스 해시 (레지스트리 전략) - 전략 코드가 바뀌면 캐시 키도 바뀜"""
+        try:
+            return result_cache_module.strategy_fingerprint(strategy_registry.get_strategy_class(strategy_id))
+        except Exception:
+            # 레지스트리에 없는 전략 (모의 결과 경로)
+            return str(self.strategies.get(strategy_id, {}).get("module"))
+    
+    def strategy_params(self, strategy_config: Dict) -> Dict:
+        """전략 기본 파라미터 + 요청 파라미터 (요청 값 우선)"""
+        params = dict(self.strategies.get(strategy_config["id"], {}).get("default_params", {}))
+        params.update(strategy_config.get("params") or {})
+        return params
+    
+    def backtest_cache_key(self, request_data: Dict) -> str:
+        """전략 소스 해시 + 정규화 파라미터 + 데이터 지문 + 엔진 버전 해시"""
+        strategies = []
+        for strategy_config in request_data["strategies"]:
+            strategy_id = strategy_config["id"]
+            strategies.append([
+                strategy_id, self.strategy_source_key(strategy_id),
+                self.strategy_params(strategy_config), strategy_config.get("weight")
+            ])
+        
+        # 패널 버전 = 소스 CSV 서명 (데이터가 갱신되면 키도 바뀜)
+        data_fp = self.stock_data.version
+        
+        return result_cache_module.make_key(
+            strategies, request_data["year"], request_data["outputCount"], data_fp, BACKTEST_ENGINE_VERSION
+        )
+    
+    def has_panel_year(self, year: int) -> bool:
+        """해당 연도를 패널로 실행할 수 있는지 (아니면 모의 결과 경로)"""
+        return self.stock_data is not None and self.stock_data.has_year(year)
+    
+    def execute_backtest(self, request_data: Dict, progress=None) -> Dict:
+        """백테스트 실행 (같은 요청/데이터/엔진 버전이면 캐시된 결과 반환)"""
+        self.refresh_market_data()
+        
+        # 모의 결과 (패널에 해당 연도가 없을 때) 는 캐시하지 않음
+        if self.result_cache is None or not self.has_panel_year(request_data["year"]):
+            return self._execute_backtest(request_data, progress)
+        
+        cache_key = self.backtest_cache_key(request_data)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            if progress:
+                progress(1.0, "캐시된 결과")
+            return cached.metrics
+        
+        result = self._execute_backtest(request_data, progress)
+        self.result_cache.put(cache_key, result)
+        return result
+    
+    def _run_panel_backtest(self, request_data: Dict, progress=None) -> Dict:
+        """패널 연도 단면에 전략들을 적용해 종목별 가중 종합 점수 산출
+
+        전략 DATA_FORMAT 별 입력: cross_section -> 연도 단면, price_history -> 종목별 가격 시계열,
+        external -> 패널에 없는 데이터 (거시/심리/자산군) 가 필요하므로 건너뛰고 skippedStrategies 로 보고.
+        스크리닝 전략은 요청당 한 번 만든 FundamentalPanel 을 공유 (generate_signals_by_date).
+        전략 실행 오류는 작업 실패로 올림
+        """
+        panel = self.stock_data
+        year = request_data["year"]
+        
+        frame = panel.cross_section(year)
+        listed = frame[frame["trading_days"] > 0]
+        history = None
+        screen_panel = None
+        
+        scores = pd.DataFrame(index=listed.index)
+        weights = {}
+        skipped = {}
+        total_strategies = len(request_data["strategies"])
+        
+        for index, strategy_config in enumerate(request_data["strategies"]):
+            strategy_id = strategy_config["id"]
+            if progress:
+                progress(index / total_strategies, f"{strategy_id} 실행 중")
+            
+            data_format = getattr(strategy_registry.get_strategy_class(strategy_id), "DATA_FORMAT", "cross_section")
+            if data_format == "external":
+                skipped[strategy_id] = "패널에 없는 외부 데이터 필요"
+                continue
+            if data_format == "price_history":
+                if history is None:
+                    history = panel.price_history(year).loc[listed.index]
+                data = history
+            else:
+                data = listed
+            
+            try:
+                strategy_instance = strategy_registry.create_strategy(strategy_id, **self.strategy_params(strategy_config))
+                if data_format == "cross_section" and hasattr(strategy_instance, "generate_signals_by_date"):
+                    if screen_panel is None:
+                        from screening import FundamentalPanel
+                        screen_panel = FundamentalPanel.from_long(listed.reset_index().assign(date=pd.Timestamp(year, 12, 31)))
+                    signals, = strategy_instance.generate_signals_by_date(screen_panel).values()
+                else:
+                    signals = strategy_instance.generate_signals(data)
+            except Exception as e:
+                raise ValueError(f"전략 {strategy_id} 실행 실패: {str(e)}") from e
+            
+            strengths = {signal.symbol: signal.strength for signal in signals if signal.signal_type == 'BUY'}
+            scores[strategy_id] = pd.Series(strengths, dtype=float)
+            weights[strategy_id] = float(strategy_config.get("weight") or 0.0)
+        
+        if not weights:
+            raise ValueError(f"패널로 실행할 수 있는 전략이 없습니다 (건너뜀: {', '.join(skipped)})")
+        
+        if progress:
+            progress(0.9, "결과 집계 중")
+        
+        condition_met = scores.notna().any(axis=1)
+        total_weight = sum(weights.values()) or 1.0
+        composite = sum(scores[sid].fillna(0.0) * w for sid, w in weights.items()) / total_weight * 100
+        top = composite[condition_met].nlargest(request_data["outputCount"])
+        
+        results = []
+        for rank, (symbol, score) in enumerate(top.items(), start=1):
+            row_scores = scores.loc[symbol].dropna()
+            if len(row_scores) >= 2:
+                strength_area = "균형"
+            else:
+                strength_area = self.strategies.get(row_scores.index[0], {}).get("name", row_scores.index[0])
+            annual_return = listed.at[symbol, "annual_return"]
+            
+            results.append({
+                "rank": rank,
+                "stockCode": symbol,
+                "stockName": listed.at[symbol, "name"],
+                "compositeScore": round(float(score), 1),
+                "grade": grade_for_score(score),
+                "strengthArea": strength_area,
+                "strategyValues": {sid: round(float(v) * 100, 1) for sid, v in row_scores.items()},
+                "annualReturn": round(float(annual_return) * 100, 2) if pd.notna(annual_return) else None
+            })
+        
+        coverage = panel.coverage(year)
+        if progress:
+            progress(1.0, "결과 집계 완료")
+        
+        return {
+            "results": results,
+            "totalAnalyzed": len(listed),
+            "conditionMet": int(condition_met.sum()),
+            "reliability": {
+                "dataQuality": coverage["priceCompleteness"],
+                "coverage": coverage["fundamentalCoverage"],
+                "dataVersion": panel.version,
+                "skippedStrategies": skipped,
+                "completedAt": datetime.now().isoformat()
+            }
+        }
+    
+    def _execute_backtest(self, request_data: Dict, progress=None) -> Dict:
+        """실제 백테스트 실행 (progress(비율, 메시지): 작업 큐 진행률 보고, 취소 시 예외)"""
+        if self.has_panel_year(request_data["year"]):
+            try:
+                return self._run_panel_backtest(request_data, progress)
+            except Exception as e:
+                raise Exception(f"백테스트 실행 오류: {str(e)}")
+        
         try:
             results = []
+            total_strategies = len(request_data["strategies"])
             
             # 각 전략별로 실행
-            for strategy_config in request_data["strategies"]:
+            for index, strategy_config in enumerate(request_data["strategies"]):
                 strategy_id = strategy_config["id"]
+                if progress:
+                    progress(index / total_strategies, f"{strategy_id} 실행 중")
                 
                 if strategy_id in self.strategies:
                     strategy_info = self.strategies[strategy_id]
@@ -321,6 +545,9 @@ class QuantBacktestManager:
                 }
             ]
             
+            if progress:
+                progress(1.0, "결과 집계 완료")
+            
             return {
                 "results": mock_results[:request_data["outputCount"]],
                 "totalAnalyzed": 2847,
@@ -335,18 +562,80 @@ class QuantBacktestManager:
         except Exception as e:
             raise Exception(f"백테스트 실행 오류: {str(e)}")
 
+def grade_for_score(score: float) -> str:
+    """종합 점수 -> 등급"""
+    if score >= 90:
+        return "S"
+    if score >= 80:
+        return "A"
+    if score >= 70:
+        return "B"
+    return "C"
+
+def create_backtest_runner():
+    """작업 큐 워커 프로세스에서 호출 - 프로세스당 매니저 1개 (패널은 메인 프로세스가 빌드한 것을 mmap)"""
+    return QuantBacktestManager(build_market_data=False).execute_backtest
+
 # 전역 매니저 인스턴스
 backtest_manager = None
+job_queue: Optional[BacktestJobQueue] = None
+market_data_task: Optional[asyncio.Task] = None
+
+async def reload_market_data_periodically(interval: float):
+    """소스 CSV가 바뀌면 새 패널 버전 빌드 (워커들은 다음 작업 때 CURRENT 포인터를 보고 교체)"""
+    while True:
+        await asyncio.sleep(interval)
+        if backtest_manager:
+            await asyncio.to_thread(backtest_manager.refresh_market_data, True)
 
 @app.on_event("startup")
 async def startup_event():
-    global backtest_manager
+    global backtest_manager, job_queue, market_data_task
     try:
         backtest_manager = QuantBacktestManager()
         print("✓ 백테스트 매니저 초기화 완료")
+        
+        # 백테스트 작업 큐 (동시 실행 수는 BACKTEST_WORKERS)
+        job_queue = BacktestJobQueue(
+            create_backtest_runner,
+            max_workers=int(os.getenv("BACKTEST_WORKERS", "2")),
+            db_path=os.getenv("BACKTEST_JOBS_DB", "./data/backtest_jobs.db")
+        )
+        await job_queue.start()
+        
+        # 일별 데이터 핫 리로드 (MARKET_DATA_RELOAD_SEC=0 이면 사용 안 함)
+        reload_interval = float(os.getenv("MARKET_DATA_RELOAD_SEC", "300"))
+        if reload_interval > 0:
+            market_data_task = asyncio.create_task(reload_market_data_periodically(reload_interval))
     except Exception as e:
         print(f"✗ 시스템 초기화 실패: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    if market_data_task:
+        market_data_task.cancel()
+    if job_queue:
+        await job_queue.stop()
+        print("✓ 백테스트 작업 큐 종료")
+
+def validate_backtest_request(request: "BacktestRequest") -> Dict:
+    """백테스트 요청 검증 -> 실행용 딕셔너리"""
+    if not backtest_manager or not job_queue:
+        raise HTTPException(status_code=500, detail="백테스트 시스템이 초기화되지 않았습니다.")
+    
+    if not request.strategies:
+        raise HTTPException(status_code=400, detail="최소 하나의 전략을 선택해야 합니다.")
+    
+    total_weight = sum(s.weight for s in request.strategies)
+    if abs(total_weight - 100) > 1:
+        raise HTTPException(status_code=400, detail="전략 가중치의 합이 100%가 되어야 합니다.")
+    
+    return {
+        "strategies": [s.dict() for s in request.strategies],
+        "year": request.year,
+        "outputCount": request.outputCount
+    }
+
 # ===== API 엔드포인트들 =====
 
 @app.get("/api/strategies")
@@ -378,31 +667,19 @@ async def get_strategies():
 
 @app.post("/api/backtest")
 async def run_backtest(request: BacktestRequest):
-    """백테스트 실행"""
+    """백테스트 실행 (작업 큐에 제출 후 완료 대기 - 긴 작업은 /api/backtest/jobs 사용)"""
     try:
-        if not backtest_manager:
-            raise HTTPException(status_code=500, detail="백테스트 시스템이 초기화되지 않았습니다.")
-        
-        # 요청 데이터 검증
-        if not request.strategies:
-            raise HTTPException(status_code=400, detail="최소 하나의 전략을 선택해야 합니다.")
+        request_dict = validate_backtest_request(request)
         
-        total_weight = sum(s.weight for s in request.strategies)
-        if abs(total_weight - 100) > 1:
-            raise HTTPException(status_code=400, detail="전략 가중치의 합이 100%가 되어야 합니다.")
+        job_id = job_queue.submit(request_dict, priority=0)
+        job = await job_queue.wait(job_id)
         
-        # 백테스트 실행
-        request_dict = {
-            "strategies": [s.dict() for s in request.strategies],
-            "year": request.year,
-            "outputCount": request.outputCount
-        }
-        
-        result_data = backtest_manager.execute_backtest(request_dict)
+        if job["status"] != "completed":
+            raise HTTPException(status_code=500, detail=f"백테스트 실행 중 오류: {job['error']}")
         
         return {
             "success": True,
-            "data": result_data
+            "data": job["result"]
         }
         
     except HTTPException:
@@ -412,6 +689,72 @@ async def run_backtest(request: BacktestRequest):
         print(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"백테스트 실행 중 오류: {str(e)}")
 
+@app.post("/api/backtest/jobs")
+async def submit_backtest_job(request: BacktestRequest, priority: int = DEFAULT_PRIORITY):
+    """백테스트 작업 제출 -> 작업 ID (priority: 작을수록 먼저 실행)"""
+    request_dict = validate_backtest_request(request)
+    job_id = job_queue.submit(request_dict, priority=priority)
+    return {"success": True, "jobId": job_id, "status": "queued"}
+
+@app.get("/api/backtest/jobs")
+async def list_backtest_jobs(limit: int = 50):
+    """최근 백테스트 작업 목록"""
+    if not job_queue:
+        raise HTTPException(status_code=500, detail="백테스트 시스템이 초기화되지 않았습니다.")
+    return {"jobs": job_queue.list_jobs(limit), "stats": job_queue.get_stats()}
+
+@app.get("/api/backtest/jobs/{job_id}")
+async def get_backtest_job(job_id: str):
+    """작업 상태/진행률 조회"""
+    job = job_queue.get(job_id) if job_queue else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+@app.get("/api/backtest/jobs/{job_id}/result")
+async def get_backtest_job_result(job_id: str):
+    """완료된 작업 결과 조회"""
+    job = job_queue.get(job_id, include_result=True) if job_queue else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"작업이 완료되지 않았습니다: {job['status']}")
+    return {"success": True, "data": job["result"]}
+
+@app.delete("/api/backtest/jobs/{job_id}")
+async def cancel_backtest_job(job_id: str):
+    """작업 취소 (대기 중이면 즉시, 실행 중이면 다음 진행률 보고 시점)"""
+    if not job_queue or not job_queue.cancel(job_id):
+        raise HTTPException(status_code=404, detail="취소할 수 있는 작업이 없습니다.")
+    return {"success": True, "jobId": job_id}
+
+@app.get("/api/backtest/jobs/{job_id}/events")
+async def stream_backtest_job(job_id: str):
+    """작업 진행률 스트림 (Server-Sent Events)"""
+    if not job_queue or job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    async def event_stream():
+        async for event in job_queue.events(job_id):
+            yield f"event: {event['status']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+@app.websocket("/ws/backtest/jobs/{job_id}")
+async def backtest_job_websocket(websocket: WebSocket, job_id: str):
+    """작업 진행률 스트림 (WebSocket, 종료 상태 전송 후 닫음)"""
+    await websocket.accept()
+    try:
+        if not job_queue or job_queue.get(job_id) is None:
+            await websocket.send_json({"error": "작업을 찾을 수 없습니다."})
+        else:
+            async for event in job_queue.events(job_id):
+                await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
 @app.get("/api/validate-data")
 async def validate_stock_data(year: int):
     """주식 데이터 유효성 검사"""
@@ -419,12 +762,18 @@ async def validate_stock_data(year: int):
         if not backtest_manager:
             return {"isValid": False, "message": "백테스트 시스템이 초기화되지 않았습니다."}
         
-        # 실제로는 해당 연도 데이터 존재 여부 확인
-        # yearly_data = filter_data_by_year(year)
+        panel = backtest_manager.stock_data
+        if panel is None:
+            return {"isValid": False, "message": "주식 데이터가 로딩되지 않았습니다."}
+        
+        coverage = panel.coverage(year)
+        if coverage["symbols"] == 0:
+            return {"isValid": False, "message": f"{year}년 가격 데이터가 없습니다."}
         
         return {
             "isValid": True,
-            "message": f"{year}년 데이터: 2,847개 종목 보유"
+            "message": f"{year}년 데이터: {coverage['symbols']:,}개 종목 보유",
+            "coverage": coverage
         }
         
     except Exception as e:
@@ -500,7 +849,11 @@ async def health_check():
         "system_ready": backtest_manager is not None,
         "strategies_loaded": len(backtest_manager.strategies) if backtest_manager else 0,
         "modules_loaded": list(strategy_modules.keys()),
-        "data_loaded": backtest_manager.stock_data is not None if backtest_manager else False
+        "data_loaded": backtest_manager.stock_data is not None if backtest_manager else False,
+        "marketData": backtest_manager.market_data.get_stats() if backtest_manager and backtest_manager.market_data else None,
+        "jobs": job_queue.get_stats() if job_queue else None,
+        # 캐시 조회는 워커 프로세스에서 일어나므로 저장소 기준 통계 (프로세스별 적중/미스 카운터 제외)
+        "resultCache": backtest_manager.result_cache.shared_stats() if backtest_manager and backtest_manager.result_cache else None
     }
 
 @app.get("/")
@@ -512,6 +865,7 @@ async def root():
         "endpoints": [
             "/api/strategies",
             "/api/backtest", 
+            "/api/backtest/jobs",
             "/api/validate-data",
             "/api/portfolio",
             "/api/portfolios",
@@ -0,0 +1,575 @@
+"""
+시장 데이터 서비스 - 가격/재무 패널을 프로세스 간 공유
+
+KRX 수집기가 만든 CSV(public/krx)를 한 번 읽어 NumPy 블록으로 변환하고,
+버전 디렉토리에 .npy 로 저장한 뒤 mmap 으로 연다.
+- 가격: (필드 × 날짜 × 종목) float64 - close 등 필드 하나가 (날짜 × 종목) 연속 블록
+- 재무: (필드 × 연도 × 종목) float64
+- 인덱스: index.json (날짜, 종목코드, 종목명, 시장, 필드, 소스 서명)
+- CURRENT: 현재 버전 포인터 - 원자적으로 교체 (핫 리로드)
+
+백테스트 워커 프로세스들은 같은 파일을 mmap 하므로 OS 페이지 캐시를 공유(zero-copy)하고,
+새 일별 데이터가 들어오면 메인 프로세스가 새 버전을 빌드해 포인터만 바꾼다.
+워커는 작업마다 CURRENT 를 stat 한 번 해서 바뀌었으면 새 패널로 갈아탄다.
+"""
+
+import os
+import json
+import glob
+import shutil
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PANEL_VERSION = 1
+CURRENT_NAME = 'CURRENT'
+KEEP_VERSIONS = 2  # 현재 + 직전 버전 (아직 이전 패널을 쓰는 워커용)
+
+PRICE_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+# 재무정보_{연도}_{시장}.csv (재무제표)
+STATEMENT_COLUMNS = {
+    '자산총계': 'total_assets',
+    '유동자산': 'current_assets',
+    '부채총계': 'total_liabilities',
+    '유동부채': 'current_liabilities',
+    '자본총계': 'equity',
+    '이익잉여금': 'retained_earnings',
+    '매출액': 'revenue',
+    '영업이익': 'ebit',
+    '당기순이익': 'net_income',
+    '매출액증감률': 'revenue_growth',
+    '영업이익증감률': 'earnings_growth_rate'
+}
+
+# 재무지표_{연도}_{시장}.csv (투자지표)
+INDICATOR_COLUMNS = {
+    'PER': 'pe_ratio',
+    'PBR': 'pb_ratio',
+    'EPS': 'eps',
+    'BPS': 'bps',
+    '배당수익률': 'dividend_yield',
+    '배당금': 'dps'
+}
+
+# 퍼센트 단위로 저장된 컬럼 -> 비율
+PERCENT_FIELDS = ['revenue_growth', 'earnings_growth_rate', 'dividend_yield']
+
+FUNDAMENTAL_FIELDS = list(STATEMENT_COLUMNS.values()) + list(INDICATOR_COLUMNS.values())
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PRICE_GLOB = str(_REPO_ROOT / 'public' / 'krx' / 'stock_price' / 'korea_stock_data_[0-9][0-9][0-9][0-9].csv')
+DEFAULT_FUNDAMENTAL_GLOB = str(_REPO_ROOT / 'public' / 'krx' / 'financial' / 'krx_financial_data' / '재무*_[0-9][0-9][0-9][0-9]_*.csv')
+
+
+def _file_year(path: str) -> Optional[int]:
+    """파일명에서 연도 추출 (재무정보_2024_KOSPI.csv -> 2024)"""
+    for part in Path(path).stem.split('_'):
+        if len(part) == 4 and part.isdigit():
+            return int(part)
+    return None
+
+
+def _read_csv(path: str, **kwargs) -> pd.DataFrame:
+    try:
+        return pd.read_csv(path, encoding='utf-8-sig', **kwargs)
+    except UnicodeDecodeError:
+        return pd.read_csv(path, encoding='EUC-KR', **kwargs)
+
+
+def _trailing_streak(mask: np.ndarray) -> np.ndarray:
+    """(연도 × 종목) 조건이 최신 연도부터 연속으로 참인 연수"""
+    if len(mask) == 0:
+        return np.zeros(mask.shape[1])
+    return np.cumprod(mask[::-1], axis=0).sum(axis=0).astype(np.float64)
+
+
+def _eps_growth(eps: np.ndarray, years: int) -> np.ndarray:
+    """최신 EPS의 years년 전 대비 연평균 성장률 (양수 EPS 끼리만, 없으면 NaN)"""
+    if years < 1:
+        return np.full(eps.shape[1], np.nan)
+    latest, base = eps[-1], eps[-1 - years]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where((latest > 0) & (base > 0), (latest / base) ** (1.0 / years) - 1.0, np.nan)
+
+
+class PricePanel:
+    """mmap 된 가격/재무 패널 (읽기 전용)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path / 'index.json', 'r', encoding='utf-8') as f:
+            index = json.load(f)
+
+        self.version: str = index['version']
+        self.built_at: str = index['built_at']
+        self.dates = np.array(index['dates'], dtype='datetime64[D]')
+        self.symbols: List[str] = index['symbols']
+        self.names: List[str] = index['names']
+        self.markets: List[str] = index['markets']
+        self.price_fields: List[str] = index['price_fields']
+        self.fundamental_fields: List[str] = index['fundamental_fields']
+        self.fundamental_years = np.array(index['fundamental_years'], dtype=np.int64)
+
+        self.prices = np.load(self.path / 'prices.npy', mmap_mode='r')
+        self.fundamentals = np.load(self.path / 'fundamentals.npy', mmap_mode='r')
+
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._price_field_index = {name: i for i, name in enumerate(self.price_fields)}
+        self._fundamental_field_index = {name: i for i, name in enumerate(self.fundamental_fields)}
+
+    # ------------------------------------------------------------------
+    # 인덱스
+    # ------------------------------------------------------------------
+    @property
+    def empty(self) -> bool:
+        return len(self.dates) == 0 or len(self.symbols) == 0
+
+    def symbol_index(self, symbol: str) -> int:
+        if symbol not in self._symbol_index:
+            raise KeyError(f"종목 {symbol} 이(가) 패널에 없습니다")
+        return self._symbol_index[symbol]
+
+    def date_slice(self, start=None, end=None) -> slice:
+        """[start, end] 날짜 구간 -> 행 슬라이스 (이진 탐색)"""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start).date(), 'D'), 'left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end).date(), 'D'), 'right'))
+        return slice(lo, hi)
+
+    def year_slice(self, year: int) -> slice:
+        return self.date_slice(f'{year}-01-01', f'{year}-12-31')
+
+    def has_year(self, year: int) -> bool:
+        s = self.year_slice(year)
+        return s.stop > s.start
+
+    # ------------------------------------------------------------------
+    # 조회 (mmap 뷰 - 복사 없음)
+    # ------------------------------------------------------------------
+    def field(self, name: str, start=None, end=None) -> np.ndarray:
+        """가격 필드 하나의 (날짜 × 종목) 뷰"""
+        return self.prices[self._price_field_index[name], self.date_slice(start, end)]
+
+    def fundamental(self, name: str, year: int) -> np.ndarray:
+        """해당 연도 이전(포함) 최신 결산 기준 종목별 재무 값"""
+        row = int(np.searchsorted(self.fundamental_years, year, 'right')) - 1
+        if row < 0:
+            return np.full(len(self.symbols), np.nan)
+        return self.fundamentals[self._fundamental_field_index[name], row]
+
+    def fundamental_history(self, name: str, year: int) -> np.ndarray:
+        """해당 연도 이전(포함) 모든 결산의 (연도 × 종목) 뷰 - 마지막 행이 최신"""
+        rows = int(np.searchsorted(self.fundamental_years, year, 'right'))
+        return self.fundamentals[self._fundamental_field_index[name], :rows]
+
+    def field_frame(self, name: str, start=None, end=None) -> pd.DataFrame:
+        s = self.date_slice(start, end)
+        return pd.DataFrame(self.prices[self._price_field_index[name], s],
+                            index=pd.DatetimeIndex(self.dates[s]), columns=self.symbols, copy=False)
+
+    def symbol_frame(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """종목 하나의 OHLCV (거래 없는 날 제외)"""
+        s = self.date_slice(start, end)
+        column = self.prices[:, s, self.symbol_index(symbol)]
+        frame = pd.DataFrame(column.T, index=pd.DatetimeIndex(self.dates[s], name='date'), columns=self.price_fields)
+        return frame.dropna(subset=['close'])
+
+    def price_history(self, year: int, lookback_years: int = 1) -> pd.DataFrame:
+        """종목별 가격 시계열 (종목 인덱스, 'close'/'volume' 칸이 Series) - 시계열 전략 입력 형식
+
+        lookback_years 전 연초부터 해당 연말까지, 거래 없는 날 제외
+        """
+        s = self.date_slice(f'{year - lookback_years}-01-01', f'{year}-12-31')
+        dates = pd.DatetimeIndex(self.dates[s], name='date')
+        close = self.prices[self._price_field_index['close'], s]
+        volume = self.prices[self._price_field_index['volume'], s]
+
+        closes, volumes = [], []
+        for col in range(len(self.symbols)):
+            traded = ~np.isnan(close[:, col])
+            closes.append(pd.Series(close[traded, col], index=dates[traded]))
+            volumes.append(pd.Series(volume[traded, col], index=dates[traded]))
+        return pd.DataFrame({'close': closes, 'volume': volumes}, index=pd.Index(self.symbols, name='symbol'))
+
+    def cross_section(self, year: int) -> pd.DataFrame:
+        """연도 단면 (종목 인덱스) - 전략 generate_signals 입력 형식
+
+        가격: 연말 종가/거래량, 연간 수익률, 52주 고점 대비 / 재무: 직전(포함) 결산 + 파생 비율,
+        여러 결산에 걸친 지표 (연속 배당/배당 증가 연수, 이익 안정성, EPS 성장률)
+        """
+        s = self.year_slice(year)
+        if s.stop <= s.start:
+            raise ValueError(f"{year}년 가격 데이터가 없습니다")
+        close = self.prices[self._price_field_index['close'], s]
+        volume = self.prices[self._price_field_index['volume'], s]
+
+        valid = ~np.isnan(close)
+        has_price = valid.any(axis=0)
+        rows = np.arange(close.shape[0])[:, None]
+        first_row = np.where(valid, rows, close.shape[0]).min(axis=0)
+        last_row = np.where(valid, rows, -1).max(axis=0)
+        cols = np.arange(close.shape[1])
+
+        first_close = np.where(has_price, close[np.minimum(first_row, close.shape[0] - 1), cols], np.nan)
+        last_close = np.where(has_price, close[np.maximum(last_row, 0), cols], np.nan)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frame = pd.DataFrame({
+                'name': self.names,
+                'market': self.markets,
+                'close': last_close,
+                'volume': np.where(has_price, volume[np.maximum(last_row, 0), cols], np.nan),
+                'annual_return': last_close / first_close - 1.0,
+                'trading_days': valid.sum(axis=0)
+            }, index=pd.Index(self.symbols, name='symbol'))
+            # 연도 구간 = 52주
+            frame['momentum_1year'] = frame['annual_return']
+            frame['price_52w_high'] = last_close / np.where(has_price, np.nanmax(np.where(valid, close, -np.inf), axis=0), np.nan)
+
+            for name in self.fundamental_fields:
+                frame[name] = self.fundamental(name, year)
+
+            frame['current_ratio'] = frame['current_assets'] / frame['current_liabilities']
+            frame['debt_to_equity'] = frame['total_liabilities'] / frame['equity']
+            frame['debt_ratio'] = frame['total_liabilities'] / frame['total_assets']
+            frame['roe'] = frame['net_income'] / frame['equity']
+            frame['profit_margin'] = frame['net_income'] / frame['revenue']
+            # 투하자본 = 총자산 - 유동부채 (영업이익 기준 근사)
+            frame['roic'] = frame['ebit'] / (frame['total_assets'] - frame['current_liabilities'])
+            # 발행주식수가 없으므로 PER × 순이익 (없으면 PBR × 자본) 으로 시가총액 근사
+            frame['market_cap'] = (frame['pe_ratio'] * frame['net_income']).fillna(frame['pb_ratio'] * frame['equity'])
+
+            # 결산 이력 지표 (수집된 연도 범위 안에서)
+            dps = self.fundamental_history('dps', year)
+            has_dps = (~np.isnan(dps)).any(axis=0)
+            frame['dividend_years'] = np.where(has_dps, _trailing_streak(dps > 0), np.nan)
+            frame['dividend_growth_years'] = np.where(has_dps, _trailing_streak(dps[1:] > dps[:-1]), np.nan)
+
+            net_income = self.fundamental_history('net_income', year)
+            reported = (~np.isnan(net_income)).sum(axis=0)
+            frame['earnings_stability'] = np.where(reported > 0, (net_income > 0).sum(axis=0) / np.maximum(reported, 1), np.nan)
+
+            eps = self.fundamental_history('eps', year)
+            frame['eps_growth_current'] = _eps_growth(eps, 1)
+            frame['eps_growth_annual'] = _eps_growth(eps, min(3, len(eps) - 1))
+
+        return frame.replace([np.inf, -np.inf], np.nan)
+
+    def coverage(self, year: int) -> Dict[str, float]:
+        """해당 연도 종목 수/가격 완전성/재무 커버리지"""
+        s = self.year_slice(year)
+        close = self.prices[self._price_field_index['close'], s]
+        if close.shape[0] == 0:
+            return {'symbols': 0, 'priceCompleteness': 0.0, 'fundamentalCoverage': 0.0}
+        present = ~np.isnan(close)
+        listed = present.any(axis=0)
+        n_listed = int(listed.sum())
+        completeness = float(present[:, listed].mean()) if n_listed else 0.0
+        net_income = self.fundamental('net_income', year)
+        covered = float((~np.isnan(net_income[listed])).mean()) if n_listed else 0.0
+        return {
+            'symbols': n_listed,
+            'priceCompleteness': round(completeness * 100, 1),
+            'fundamentalCoverage': round(covered * 100, 1)
+        }
+
+    def get_stats(self) -> Dict:
+        return {
+            'version': self.version,
+            'builtAt': self.built_at,
+            'symbols': len(self.symbols),
+            'dates': len(self.dates),
+            'firstDate': str(self.dates[0]) if len(self.dates) else None,
+            'lastDate': str(self.dates[-1]) if len(self.dates) else None,
+            'fundamentalYears': self.fundamental_years.tolist(),
+            'mappedMB': round((self.prices.nbytes + self.fundamentals.nbytes) / 1024 / 1024, 1)
+        }
+
+
+class MarketDataService:
+    """패널 빌드/로딩/핫 리로드
+
+    메인 프로세스: refresh(rebuild=True) - 소스 CSV가 바뀌었으면 새 버전 빌드 후 포인터 교체
+    워커 프로세스: refresh() - 포인터 파일 stat 한 번, 바뀌었으면 새 버전 mmap
+    """
+
+    def __init__(self, data_dir: str = './data/market_panel',
+                 price_glob: str = DEFAULT_PRICE_GLOB,
+                 fundamental_glob: str = DEFAULT_FUNDAMENTAL_GLOB):
+        self.data_dir = Path(data_dir)
+        self.price_glob = price_glob
+        self.fundamental_glob = fundamental_glob
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._panel: Optional[PricePanel] = None
+        self._current_mtime = 0.0
+
+    # ------------------------------------------------------------------
+    # 소스
+    # ------------------------------------------------------------------
+    def source_files(self) -> Tuple[List[str], List[str]]:
+        return sorted(glob.glob(self.price_glob)), sorted(glob.glob(self.fundamental_glob))
+
+    def source_signature(self) -> str:
+        """소스 파일 (경로, 크기, 수정시각) 해시 = 패널 버전"""
+        digest = hashlib.sha1(f'v{PANEL_VERSION}'.encode())
+        for path in sum(self.source_files(), []):
+            stat = os.stat(path)
+            digest.update(f'{path}|{stat.st_size}|{stat.st_mtime_ns}\n'.encode())
+        return digest.hexdigest()[:16]
+
+    # ------------------------------------------------------------------
+    # 빌드
+    # ------------------------------------------------------------------
+    def build(self, version: Optional[str] = None) -> Path:
+        """CSV -> 버전 디렉토리 (임시 디렉토리에 쓴 뒤 rename)"""
+        version = version or self.source_signature()
+        target = self.data_dir / version
+        if (target / 'index.json').exists():
+            return target
+
+        price_files, fundamental_files = self.source_files()
+        prices = self._load_prices(price_files)
+        statements, indicators = self._load_fundamentals(fundamental_files)
+
+        # 종목 유니버스 = 가격 ∪ 재무
+        names: Dict[str, str] = {}
+        markets: Dict[str, str] = {}
+        for frame, code_col, name_col, market_col in ((prices, 'ticker', 'name', 'market'),
+                                                      (indicators, 'code', 'name', 'market'),
+                                                      (statements, 'code', 'name', 'market')):
+            if frame.empty:
+                continue
+            last = frame.drop_duplicates(code_col, keep='last')
+            names.update(zip(last[code_col], last[name_col].fillna('').astype(str)))
+            markets.update(zip(last[code_col], last[market_col].fillna('').astype(str)))
+        symbols = np.array(sorted(names), dtype=object)
+
+        tmp_dir = self.data_dir / f'.{version}.{os.getpid()}.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        # 가격 블록 - open_memmap 으로 디스크에 바로 기록
+        if prices.empty:
+            dates = np.array([], dtype='datetime64[D]')
+        else:
+            dates, date_codes = np.unique(prices['date'].values.astype('datetime64[D]'), return_inverse=True)
+        block = np.lib.format.open_memmap(tmp_dir / 'prices.npy', mode='w+', dtype=np.float64,
+                                          shape=(len(PRICE_FIELDS), len(dates), len(symbols)))
+        block[:] = np.nan
+        if not prices.empty:
+            symbol_codes = np.searchsorted(symbols, prices['ticker'].values)
+            for i, name in enumerate(PRICE_FIELDS):
+                block[i, date_codes, symbol_codes] = prices[name].values.astype(np.float64)
+        block.flush()
+        del block
+
+        # 재무 블록 - 연도별
+        years = sorted(set(statements['year']).union(indicators['year'])) if not (statements.empty and indicators.empty) else []
+        fundamentals = np.lib.format.open_memmap(tmp_dir / 'fundamentals.npy', mode='w+', dtype=np.float64,
+                                                 shape=(len(FUNDAMENTAL_FIELDS), len(years), len(symbols)))
+        fundamentals[:] = np.nan
+        for frame in (statements, indicators):
+            if frame.empty:
+                continue
+            year_codes = np.searchsorted(years, frame['year'].values)
+            symbol_codes = np.searchsorted(symbols, frame['code'].values)
+            for i, name in enumerate(FUNDAMENTAL_FIELDS):
+                if name in frame.columns:
+                    fundamentals[i, year_codes, symbol_codes] = frame[name].values
+        fundamentals.flush()
+        del fundamentals
+
+        index = {
+            'panel_version': PANEL_VERSION,
+            'version': version,
+            'built_at': datetime.now().isoformat(),
+            'dates': [str(d) for d in dates],
+            'symbols': symbols.tolist(),
+            'names': [names[s] for s in symbols],
+            'markets': [markets[s] for s in symbols],
+            'price_fields': PRICE_FIELDS,
+            'fundamental_fields': FUNDAMENTAL_FIELDS,
+            'fundamental_years': [int(y) for y in years],
+            'sources': price_files + fundamental_files
+        }
+        with open(tmp_dir / 'index.json', 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+
+        try:
+            os.replace(tmp_dir, target)
+        except OSError:
+            # 다른 프로세스가 같은 버전을 먼저 완성함
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.logger.info(f"📦 시장 데이터 패널 빌드: {version} ({len(dates)}일 × {len(symbols)}종목)")
+        return target
+
+    def _load_prices(self, files: List[str]) -> pd.DataFrame:
+        frames = []
+        for path in files:
+            try:
+                frame = _read_csv(path, dtype={'ticker': str}, parse_dates=['date'])
+            except Exception as e:
+                self.logger.warning(f"⚠️ 가격 파일 읽기 실패 {path}: {e}")
+                continue
+            missing = [c for c in ['date', 'ticker'] + PRICE_FIELDS if c not in frame.columns]
+            if missing:
+                self.logger.warning(f"⚠️ 가격 파일 컬럼 누락 {path}: {missing}")
+                continue
+            for col in ('name', 'market'):
+                if col not in frame.columns:
+                    frame[col] = ''
+            frames.append(frame[['date', 'ticker', 'name', 'market'] + PRICE_FIELDS])
+        if not frames:
+            return pd.DataFrame(columns=['date', 'ticker', 'name', 'market'] + PRICE_FIELDS)
+        prices = pd.concat(frames, ignore_index=True)
+        prices['ticker'] = prices['ticker'].str.zfill(6)
+        # 연도 파일이 겹치면 뒤 파일 값 사용
+        return prices.drop_duplicates(['date', 'ticker'], keep='last')
+
+    def _load_fundamentals(self, files: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        statements, indicators = [], []
+        for path in files:
+            year = _file_year(path)
+            try:
+                frame = _read_csv(path, dtype={'종목코드': str})
+            except Exception as e:
+                self.logger.warning(f"⚠️ 재무 파일 읽기 실패 {path}: {e}")
+                continue
+            if year is None or '종목코드' not in frame.columns:
+                continue
+
+            columns = STATEMENT_COLUMNS if Path(path).name.startswith('재무정보') else INDICATOR_COLUMNS
+            out = pd.DataFrame({
+                'code': frame['종목코드'].astype(str).str.zfill(6),
+                'name': frame['회사명'] if '회사명' in frame.columns else '',
+                'market': frame['시장구분'] if '시장구분' in frame.columns else '',
+                'year': year
+            })
+            for source, name in columns.items():
+                if source in frame.columns:
+                    values = pd.to_numeric(frame[source], errors='coerce')
+                    out[name] = values / 100.0 if name in PERCENT_FIELDS else values
+            (statements if columns is STATEMENT_COLUMNS else indicators).append(out)
+
+        def combine(frames):
+            if not frames:
+                return pd.DataFrame(columns=['code', 'name', 'market', 'year'])
+            return pd.concat(frames, ignore_index=True).drop_duplicates(['year', 'code'], keep='last')
+
+        return combine(statements), combine(indicators)
+
+    # ------------------------------------------------------------------
+    # 포인터 / 로딩
+    # ------------------------------------------------------------------
+    @property
+    def current_path(self) -> Path:
+        return self.data_dir / CURRENT_NAME
+
+    def _read_current(self) -> Optional[str]:
+        try:
+            with open(self.current_path, 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write_current(self, version: str):
+        tmp_path = self.current_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(tmp_path, self.current_path)
+
+    def _stat_current(self) -> float:
+        try:
+            return self.current_path.stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def _cleanup(self, current: str):
+        """오래된 버전 디렉토리 정리 (mmap 중인 파일은 Linux에선 unlink 후에도 유효)"""
+        versions = [p for p in self.data_dir.iterdir() if p.is_dir() and not p.name.startswith('.')]
+        versions.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        keep = {current} | {p.name for p in versions[:KEEP_VERSIONS]}
+        for path in versions:
+            if path.name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def load(self, build: bool = True) -> Optional[PricePanel]:
+        """현재 패널 (없거나 소스가 바뀌었으면 build=True 일 때 빌드)"""
+        with self._lock:
+            if build:
+                self.refresh(rebuild=True)
+            elif self._panel is None:
+                self.refresh()
+            return self._panel
+
+    def refresh(self, rebuild: bool = False) -> bool:
+        """새 버전이 있으면 교체 (교체했으면 True)"""
+        with self._lock:
+            if rebuild:
+                version = self.source_signature()
+                if self._read_current() != version:
+                    self.data_dir.mkdir(parents=True, exist_ok=True)
+                    self.build(version)
+                    self._write_current(version)
+                    self._cleanup(version)
+
+            mtime = self._stat_current()
+            if mtime == self._current_mtime and self._panel is not None:
+                return False
+
+            version = self._read_current()
+            if version is None or not (self.data_dir / version / 'index.json').exists():
+                return False
+            if self._panel is not None and self._panel.version == version:
+                self._current_mtime = mtime
+                return False
+
+            self._panel = PricePanel(self.data_dir / version)
+            self._current_mtime = mtime
+            self.logger.info(f"🔄 시장 데이터 패널 로딩: {version}")
+            return True
+
+    @property
+    def panel(self) -> Optional[PricePanel]:
+        return self._panel
+
+    def get_stats(self) -> Optional[Dict]:
+        return self._panel.get_stats() if self._panel is not None else None
+
+
+def create_market_data_service() -> MarketDataService:
+    """환경 변수 기반 서비스 (MARKET_DATA_DIR, MARKET_DATA_PRICES, MARKET_DATA_FUNDAMENTALS)"""
+    return MarketDataService(
+        data_dir=os.getenv('MARKET_DATA_DIR', './data/market_panel'),
+        price_glob=os.getenv('MARKET_DATA_PRICES', DEFAULT_PRICE_GLOB),
+        fundamental_glob=os.getenv('MARKET_DATA_FUNDAMENTALS', DEFAULT_FUNDAMENTAL_GLOB)
+    )
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='시장 데이터 패널 빌드/확인')
+    parser.add_argument('--year', type=int, help='해당 연도 커버리지/단면 출력')
+    args = parser.parse_args()
+
+    service = create_market_data_service()
+    start = time.perf_counter()
+    panel = service.load()
+    print(f"⏱️ 빌드/로딩: {time.perf_counter() - start:.3f}s")
+    if panel is None:
+        print("❌ 패널 없음")
+    else:
+        print(f"📊 {panel.get_stats()}")
+        if args.year:
+            print(f"📅 {args.year}: {panel.coverage(args.year)}")
+            print(panel.cross_section(args.year).dropna(subset=['net_income']).head())
@@ -4,7 +4,7 @@ Investment Strategies Package - 개인투자자용 투자전략 20가지
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import List, Optional
 
 # 패키지 정보
 __version__ = "1.0.0"
@@ -44,59 +44,58 @@ try:
         initialize_strategy_system
     )
     
+except ImportError as e:
+    logging.warning(f"Some modules could not be imported: {e}")
+
+# 지표/유틸리티 함수는 처음 접근할 때 import (패키지 import 시간 단축)
+_LAZY_EXPORTS = {
     # 기술적 지표
-    from .technical_indicators import (
-        simple_moving_average,
-        exponential_moving_average,
-        rsi,
-        macd,
-        bollinger_bands,
-        stochastic,
-        atr as average_true_range,
-        on_balance_volume,
-        momentum,
-        relative_strength
-    )
+    "simple_moving_average": ("technical_indicators", "simple_moving_average"),
+    "exponential_moving_average": ("technical_indicators", "exponential_moving_average"),
+    "rsi": ("technical_indicators", "rsi"),
+    "macd": ("technical_indicators", "macd"),
+    "bollinger_bands": ("technical_indicators", "bollinger_bands"),
+    "stochastic": ("technical_indicators", "stochastic"),
+    "average_true_range": ("technical_indicators", "atr"),
+    "on_balance_volume": ("technical_indicators", "on_balance_volume"),
+    "momentum": ("technical_indicators", "momentum"),
+    "relative_strength": ("technical_indicators", "relative_strength"),
     
     # 펀더멘털 지표
-    from .fundamental_metrics import (
-        price_to_earnings_ratio,
-        price_to_book_ratio,
-        return_on_equity,
-        debt_to_equity_ratio,
-        current_ratio,
-        dividend_yield,
-        piotroski_f_score,
-        altman_z_score,
-        calculate_quality_score
-    )
+    "price_to_earnings_ratio": ("fundamental_metrics", "price_to_earnings_ratio"),
+    "price_to_book_ratio": ("fundamental_metrics", "price_to_book_ratio"),
+    "return_on_equity": ("fundamental_metrics", "return_on_equity"),
+    "debt_to_equity_ratio": ("fundamental_metrics", "debt_to_equity_ratio"),
+    "current_ratio": ("fundamental_metrics", "current_ratio"),
+    "dividend_yield": ("fundamental_metrics", "dividend_yield"),
+    "piotroski_f_score": ("fundamental_metrics", "piotroski_f_score"),
+    "altman_z_score": ("fundamental_metrics", "altman_z_score"),
+    "calculate_quality_score": ("fundamental_metrics", "calculate_quality_score"),
     
     # 포트폴리오 유틸리티
-    from .portfolio_utils import (
-        equal_weight_portfolio,
-        market_cap_weighted_portfolio,
-        risk_parity_portfolio,
-        minimum_variance_portfolio,
-        calculate_rebalancing_trades,
-        calculate_portfolio_metrics,
-        efficient_frontier,
-        kelly_criterion_weights
-    )
+    "equal_weight_portfolio": ("portfolio_utils", "equal_weight_portfolio"),
+    "market_cap_weighted_portfolio": ("portfolio_utils", "market_cap_weighted_portfolio"),
+    "risk_parity_portfolio": ("portfolio_utils", "risk_parity_portfolio"),
+    "minimum_variance_portfolio": ("portfolio_utils", "minimum_variance_portfolio"),
+    "calculate_rebalancing_trades": ("portfolio_utils", "calculate_rebalancing_trades"),
+    "calculate_portfolio_metrics": ("portfolio_utils", "calculate_portfolio_metrics"),
+    "efficient_frontier": ("portfolio_utils", "efficient_frontier"),
+    "kelly_criterion_weights": ("portfolio_utils", "kelly_criterion_weights"),
+}
 
-except ImportError as e:
-    logging.warning(f"Some modules could not be imported: {e}")
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    module_name, attr = _LAZY_EXPORTS[name]
+    value = getattr(importlib.import_module(f".{module_name}", __name__), attr)
+    globals()[name] = value
+    return value
 
-# 전략 모듈들 import (선택적)
+# 전략 시스템 초기화 (매니페스트 사용 - 전략 모듈은 처음 생성할 때 import)
 try:
-    from . import basic_strategies
-    from . import value_strategies  
-    from . import growth_momentum_strategies
-    from . import cycle_contrarian_strategies
-    
-    # 전략 시스템 초기화
     initialize_strategy_system()
-    
-except ImportError as e:
+except (ImportError, NameError) as e:
     logging.warning(f"Strategy modules could not be loaded: {e}")
 
 # 공개 API 정의
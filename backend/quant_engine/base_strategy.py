@@ -60,7 +60,19 @@ class PortfolioWeight:
     rebalance_needed: bool = False
 
 class BaseStrategy(ABC):
-    """전략 기본 클래스"""
+    """전략 기본 클래스
+    
+    메타데이터/필수 파라미터는 클래스 속성으로 선언 -> 인스턴스 생성 없이 조회 가능
+    
+    DATA_FORMAT: generate_signals 입력 형식
+      'cross_section' - 종목 인덱스 단면 (가격/재무 컬럼)
+      'price_history' - 종목 인덱스, 'close' 컬럼이 종목별 가격 시계열 (data.loc[종목, 'close'])
+      'external'      - 가격/재무 데이터 밖의 입력 필요 (시장 매크로, 심리 지표, 자산군 배분)
+    """
+    
+    METADATA: Optional[StrategyMetadata] = None
+    REQUIRED_PARAMETERS: List[str] = []
+    DATA_FORMAT: str = 'cross_section'
     
     def __init__(self, name: str, **kwargs):
         self.name = name
@@ -69,10 +81,22 @@ class BaseStrategy(ABC):
         self.logger = logging.getLogger(f"Strategy.{name}")
         self._validate_parameters()
     
-    @abstractmethod
     def _get_metadata(self) -> StrategyMetadata:
         """전략 메타데이터 반환"""
-        pass
+        if self.METADATA is None:
+            raise NotImplementedError(f"{type(self).__name__} must declare METADATA")
+        return self.METADATA
+    
+    @classmethod
+    def get_class_info(cls) -> Dict:
+        """인스턴스 생성 없이 전략 정보 반환 (레지스트리/매니페스트용)"""
+        return {
+            'name': cls.METADATA.name if cls.METADATA else cls.__name__,
+            'metadata': cls.METADATA,
+            'parameters': {},
+            'required_parameters': list(cls.REQUIRED_PARAMETERS),
+            'rebalancing_frequency': cls.METADATA.rebalancing_frequency if cls.METADATA else None
+        }
     
     @abstractmethod
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
@@ -94,7 +118,7 @@ class BaseStrategy(ABC):
     
     def _get_required_parameters(self) -> List[str]:
         """필수 파라미터 목록 반환"""
-        return []
+        return list(self.REQUIRED_PARAMETERS)
     
     def preprocess_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """데이터 전처리"""
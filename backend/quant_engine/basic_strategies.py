@@ -11,60 +11,46 @@ from base_strategy import BaseStrategy, StrategyMetadata, Signal, PortfolioWeigh
 from base_strategy import RiskLevel, Complexity, StrategyCategory, StrategyFactory
 import technical_indicators as ti
 import fundamental_metrics as fm
+from screening import FundamentalPanel, ScreenResult, ScreeningStrategyMixin, notna
 
 # 1. 저PER 전략
-class LowPEStrategy(BaseStrategy):
+class LowPEStrategy(ScreeningStrategyMixin, BaseStrategy):
     """저PER 전략 - PER 15배 이하 종목 선별"""
     
+    METADATA = StrategyMetadata(
+        name="저PER 전략",
+        description="PER 15배 이하 종목 선별하는 가치투자 전략",
+        category=StrategyCategory.BASIC,
+        risk_level=RiskLevel.LOW,
+        complexity=Complexity.SIMPLE,
+        expected_return="8-12%",
+        volatility="12-18%",
+        min_investment_period="1년 이상",
+        rebalancing_frequency="분기별"
+    )
+    REQUIRED_PARAMETERS = ['max_pe_ratio']
+    SIGNAL_CONFIDENCE = 0.7
+    
     def __init__(self, **kwargs):
         super().__init__("Low_PE_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="저PER 전략",
-            description="PER 15배 이하 종목 선별하는 가치투자 전략",
-            category=StrategyCategory.BASIC,
-            risk_level=RiskLevel.LOW,
-            complexity=Complexity.SIMPLE,
-            expected_return="8-12%",
-            volatility="12-18%",
-            min_investment_period="1년 이상",
-            rebalancing_frequency="분기별"
-        )
-    
-    def _get_required_parameters(self) -> List[str]:
-        return ['max_pe_ratio']
-    
     def _get_required_data_columns(self) -> List[str]:
         return super()._get_required_data_columns() + ['pe_ratio', 'market_cap']
     
-    def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
+    def screen(self, panel: FundamentalPanel) -> ScreenResult:
         max_pe = self.parameters.get('max_pe_ratio', 15)
-        signals = []
         
-        # PE 데이터가 있는 종목들만 처리
-        pe_data = data.dropna(subset=['pe_ratio'])
-        
-        for symbol in pe_data.index:
-            pe_ratio = pe_data.loc[symbol, 'pe_ratio']
-            
-            # 저PER 조건 확인
-            if 0 < pe_ratio <= max_pe:
-                # 추가 필터링: 적자 기업 제외, 최소 시가총액
-                market_cap = pe_data.loc[symbol, 'market_cap']
-                if market_cap > 1000:  # 10억 달러 이상
-                    signal_strength = min(1.0, (max_pe - pe_ratio) / max_pe)
-                    
-                    signals.append(Signal(
-                        symbol=symbol,
-                        timestamp=pd.Timestamp.now(),
-                        signal_type='BUY',
-                        strength=signal_strength,
-                        confidence=0.7,
-                        metadata={'pe_ratio': pe_ratio}
-                    ))
+        # PE 데이터가 있는 종목들만, 저PER 조건 + 적자 기업 제외, 최소 시가총액 (10억 달러 이상)
+        pe_ratio = panel.field('pe_ratio')
+        with np.errstate(invalid='ignore'):
+            selected = (notna(pe_ratio) & (pe_ratio > 0) & (pe_ratio <= max_pe)
+                        & (panel.field('market_cap') > 1000))
         
-        return self.validate_signals(signals)
+        return ScreenResult(
+            selected=selected,
+            strength=np.fmin(1.0, (max_pe - pe_ratio) / max_pe),
+            metadata={'pe_ratio': pe_ratio}
+        )
     
     def calculate_weights(self, signals: List[Signal], 
                          current_portfolio: Optional[Dict[str, float]] = None) -> List[PortfolioWeight]:
@@ -92,22 +78,21 @@ class LowPEStrategy(BaseStrategy):
 class DividendAristocratsStrategy(BaseStrategy):
     """배당 귀족주 전략 - 20년 이상 연속 배당 증가 기업"""
     
+    METADATA = StrategyMetadata(
+        name="배당 귀족주 전략",
+        description="20년 이상 연속 배당 증가 기업 투자",
+        category=StrategyCategory.BASIC,
+        risk_level=RiskLevel.LOW,
+        complexity=Complexity.SIMPLE,
+        expected_return="7-10%",
+        volatility="10-15%",
+        min_investment_period="3년 이상",
+        rebalancing_frequency="연 1회"
+    )
+    
     def __init__(self, **kwargs):
         super().__init__("Dividend_Aristocrats_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="배당 귀족주 전략",
-            description="20년 이상 연속 배당 증가 기업 투자",
-            category=StrategyCategory.BASIC,
-            risk_level=RiskLevel.LOW,
-            complexity=Complexity.SIMPLE,
-            expected_return="7-10%",
-            volatility="10-15%",
-            min_investment_period="3년 이상",
-            rebalancing_frequency="연 1회"
-        )
-    
     def _get_required_data_columns(self) -> List[str]:
         return super()._get_required_data_columns() + ['dividend_yield', 'dividend_growth_years']
     
@@ -166,30 +151,33 @@ class DividendAristocratsStrategy(BaseStrategy):
 class SimpleMomentumStrategy(BaseStrategy):
     """단순 모멘텀 전략 - 최근 3-12개월 수익률 상위 종목"""
     
+    METADATA = StrategyMetadata(
+        name="단순 모멘텀 전략",
+        description="최근 성과 상위 종목 투자, 상승 추세 추종",
+        category=StrategyCategory.BASIC,
+        risk_level=RiskLevel.MEDIUM,
+        complexity=Complexity.SIMPLE,
+        expected_return="10-15%",
+        volatility="16-22%",
+        min_investment_period="6개월 이상",
+        rebalancing_frequency="월별"
+    )
+    DATA_FORMAT = 'price_history'
+    
     def __init__(self, **kwargs):
         super().__init__("Simple_Momentum_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="단순 모멘텀 전략",
-            description="최근 성과 상위 종목 투자, 상승 추세 추종",
-            category=StrategyCategory.BASIC,
-            risk_level=RiskLevel.MEDIUM,
-            complexity=Complexity.SIMPLE,
-            expected_return="10-15%",
-            volatility="16-22%",
-            min_investment_period="6개월 이상",
-            rebalancing_frequency="월별"
-        )
-    
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
         lookback_months = self.parameters.get('lookback_months', 6)
         top_percentile = self.parameters.get('top_percentile', 0.2)  # 상위 20%
         
         signals = []
         
-        # 가격 데이터에서 수익률 계산
-        returns = data['close'].pct_change(lookback_months * 21)  # 약 월별 거래일
+        # 종목별 가격 시계열에서 lookback 기간 수익률 계산
+        lookback = lookback_months * 21  # 약 월별 거래일
+        returns = data['close'].map(
+            lambda prices: prices.iloc[-1] / prices.iloc[-lookback - 1] - 1 if len(prices) > lookback else np.nan
+        ).astype(float)
         
         # 상위 percentile 계산
         threshold = returns.quantile(1 - top_percentile)
@@ -248,22 +236,22 @@ class SimpleMomentumStrategy(BaseStrategy):
 class MovingAverageCrossStrategy(BaseStrategy):
     """이동평균 교차 전략 - 20일선이 60일선 돌파"""
     
+    METADATA = StrategyMetadata(
+        name="이동평균 교차 전략",
+        description="단기 이동평균이 장기 이동평균 상향 돌파시 매수",
+        category=StrategyCategory.BASIC,
+        risk_level=RiskLevel.MEDIUM,
+        complexity=Complexity.SIMPLE,
+        expected_return="8-12%",
+        volatility="14-20%",
+        min_investment_period="6개월 이상",
+        rebalancing_frequency="주별"
+    )
+    DATA_FORMAT = 'price_history'
+    
     def __init__(self, **kwargs):
         super().__init__("Moving_Average_Cross_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="이동평균 교차 전략",
-            description="단기 이동평균이 장기 이동평균 상향 돌파시 매수",
-            category=StrategyCategory.BASIC,
-            risk_level=RiskLevel.MEDIUM,
-            complexity=Complexity.SIMPLE,
-            expected_return="8-12%",
-            volatility="14-20%",
-            min_investment_period="6개월 이상",
-            rebalancing_frequency="주별"
-        )
-    
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
         short_period = self.parameters.get('short_ma', 20)
         long_period = self.parameters.get('long_ma', 60)
@@ -350,22 +338,22 @@ class MovingAverageCrossStrategy(BaseStrategy):
 class RSIMeanReversionStrategy(BaseStrategy):
     """RSI 과매수/과매도 전략"""
     
+    METADATA = StrategyMetadata(
+        name="RSI 평균회귀 전략",
+        description="RSI 30 이하 매수, 70 이상 매도",
+        category=StrategyCategory.BASIC,
+        risk_level=RiskLevel.MEDIUM,
+        complexity=Complexity.SIMPLE,
+        expected_return="10-13%",
+        volatility="12-18%",
+        min_investment_period="3개월 이상",
+        rebalancing_frequency="주별"
+    )
+    DATA_FORMAT = 'price_history'
+    
     def __init__(self, **kwargs):
         super().__init__("RSI_Mean_Reversion_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="RSI 평균회귀 전략",
-            description="RSI 30 이하 매수, 70 이상 매도",
-            category=StrategyCategory.BASIC,
-            risk_level=RiskLevel.MEDIUM,
-            complexity=Complexity.SIMPLE,
-            expected_return="10-13%",
-            volatility="12-18%",
-            min_investment_period="3개월 이상",
-            rebalancing_frequency="주별"
-        )
-    
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
         rsi_period = self.parameters.get('rsi_period', 14)
         oversold_threshold = self.parameters.get('oversold', 30)
@@ -439,22 +427,22 @@ class RSIMeanReversionStrategy(BaseStrategy):
 class BollingerBandStrategy(BaseStrategy):
     """볼린저 밴드 역발상 전략"""
     
+    METADATA = StrategyMetadata(
+        name="볼린저 밴드 역발상 전략",
+        description="하단선 터치시 매수, 상단선 터치시 매도",
+        category=StrategyCategory.BASIC,
+        risk_level=RiskLevel.MEDIUM,
+        complexity=Complexity.SIMPLE,
+        expected_return="9-12%",
+        volatility="13-19%",
+        min_investment_period="6개월 이상",
+        rebalancing_frequency="주별"
+    )
+    DATA_FORMAT = 'price_history'
+    
     def __init__(self, **kwargs):
         super().__init__("Bollinger_Band_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="볼린저 밴드 역발상 전략",
-            description="하단선 터치시 매수, 상단선 터치시 매도",
-            category=StrategyCategory.BASIC,
-            risk_level=RiskLevel.MEDIUM,
-            complexity=Complexity.SIMPLE,
-            expected_return="9-12%",
-            volatility="13-19%",
-            min_investment_period="6개월 이상",
-            rebalancing_frequency="주별"
-        )
-    
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
         bb_period = self.parameters.get('bb_period', 20)
         bb_std = self.parameters.get('bb_std', 2)
@@ -540,22 +528,21 @@ class BollingerBandStrategy(BaseStrategy):
 class SmallCapStrategy(BaseStrategy):
     """소형주 프리미엄 전략"""
     
+    METADATA = StrategyMetadata(
+        name="소형주 프리미엄 전략",
+        description="시가총액 하위 종목 투자로 초과수익 추구",
+        category=StrategyCategory.BASIC,
+        risk_level=RiskLevel.HIGH,
+        complexity=Complexity.SIMPLE,
+        expected_return="12-18%",
+        volatility="20-30%",
+        min_investment_period="2년 이상",
+        rebalancing_frequency="분기별"
+    )
+    
     def __init__(self, **kwargs):
         super().__init__("Small_Cap_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="소형주 프리미엄 전략",
-            description="시가총액 하위 종목 투자로 초과수익 추구",
-            category=StrategyCategory.BASIC,
-            risk_level=RiskLevel.HIGH,
-            complexity=Complexity.SIMPLE,
-            expected_return="12-18%",
-            volatility="20-30%",
-            min_investment_period="2년 이상",
-            rebalancing_frequency="분기별"
-        )
-    
     def _get_required_data_columns(self) -> List[str]:
         return super()._get_required_data_columns() + ['market_cap']
     
@@ -614,22 +601,22 @@ class SmallCapStrategy(BaseStrategy):
 class LowVolatilityStrategy(BaseStrategy):
     """저변동성 전략"""
     
+    METADATA = StrategyMetadata(
+        name="저변동성 전략",
+        description="변동성이 낮은 종목으로 안정적 수익 추구",
+        category=StrategyCategory.BASIC,
+        risk_level=RiskLevel.LOW,
+        complexity=Complexity.SIMPLE,
+        expected_return="8-11%",
+        volatility="8-12%",
+        min_investment_period="1년 이상",
+        rebalancing_frequency="분기별"
+    )
+    DATA_FORMAT = 'price_history'
+    
     def __init__(self, **kwargs):
         super().__init__("Low_Volatility_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="저변동성 전략",
-            description="변동성이 낮은 종목으로 안정적 수익 추구",
-            category=StrategyCategory.BASIC,
-            risk_level=RiskLevel.LOW,
-            complexity=Complexity.SIMPLE,
-            expected_return="8-11%",
-            volatility="8-12%",
-            min_investment_period="1년 이상",
-            rebalancing_frequency="분기별"
-        )
-    
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
         volatility_period = self.parameters.get('volatility_period', 60)
         low_vol_percentile = self.parameters.get('low_vol_percentile', 0.3)  # 하위 30%
@@ -697,22 +684,21 @@ class LowVolatilityStrategy(BaseStrategy):
 class QualityFactorStrategy(BaseStrategy):
     """품질 팩터 전략"""
     
+    METADATA = StrategyMetadata(
+        name="품질 팩터 전략",
+        description="ROE, 부채비율 등 재무 건전성 우수 기업",
+        category=StrategyCategory.BASIC,
+        risk_level=RiskLevel.LOW,
+        complexity=Complexity.SIMPLE,
+        expected_return="9-13%",
+        volatility="12-16%",
+        min_investment_period="2년 이상",
+        rebalancing_frequency="분기별"
+    )
+    
     def __init__(self, **kwargs):
         super().__init__("Quality_Factor_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="품질 팩터 전략",
-            description="ROE, 부채비율 등 재무 건전성 우수 기업",
-            category=StrategyCategory.BASIC,
-            risk_level=RiskLevel.LOW,
-            complexity=Complexity.SIMPLE,
-            expected_return="9-13%",
-            volatility="12-16%",
-            min_investment_period="2년 이상",
-            rebalancing_frequency="분기별"
-        )
-    
     def _get_required_data_columns(self) -> List[str]:
         return super()._get_required_data_columns() + ['roe', 'debt_ratio', 'current_ratio']
     
@@ -780,25 +766,22 @@ class QualityFactorStrategy(BaseStrategy):
 class RegularRebalancingStrategy(BaseStrategy):
     """정기 리밸런싱 전략"""
     
+    METADATA = StrategyMetadata(
+        name="정기 리밸런싱 전략",
+        description="정해진 비율로 정기적 리밸런싱하여 위험 관리",
+        category=StrategyCategory.BASIC,
+        risk_level=RiskLevel.MEDIUM,
+        complexity=Complexity.SIMPLE,
+        expected_return="8-12%",
+        volatility="10-16%",
+        min_investment_period="1년 이상",
+        rebalancing_frequency="월별"
+    )
+    REQUIRED_PARAMETERS = ['target_allocation']
+    
     def __init__(self, **kwargs):
         super().__init__("Regular_Rebalancing_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="정기 리밸런싱 전략",
-            description="정해진 비율로 정기적 리밸런싱하여 위험 관리",
-            category=StrategyCategory.BASIC,
-            risk_level=RiskLevel.MEDIUM,
-            complexity=Complexity.SIMPLE,
-            expected_return="8-12%",
-            volatility="10-16%",
-            min_investment_period="1년 이상",
-            rebalancing_frequency="월별"
-        )
-    
-    def _get_required_parameters(self) -> List[str]:
-        return ['target_allocation']
-    
     def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
         target_allocation = self.parameters.get('target_allocation', {})
         rebalance_threshold = self.parameters.get('rebalance_threshold', 0.05)  # 5% 편차
@@ -16,22 +16,22 @@ import fundamental_metrics as fm
 class RayDalioAllWeatherStrategy(BaseStrategy):
     """레이 달리오의 올웨더 포트폴리오 전략"""
     
+    METADATA = StrategyMetadata(
+        name="레이 달리오의 올웨더 포트폴리오",
+        description="경제 환경 변화에 관계없이 안정적 수익 추구",
+        category=StrategyCategory.ADVANCED,
+        risk_level=RiskLevel.LOW,
+        complexity=Complexity.MEDIUM,
+        expected_return="8-12%",
+        volatility="8-12%",
+        min_investment_period="5년 이상",
+        rebalancing_frequency="분기별"
+    )
+    DATA_FORMAT = 'external'
+    
     def __init__(self, **kwargs):
         super().__init__("Ray_Dalio_All_Weather_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="레이 달리오의 올웨더 포트폴리오",
-            description="경제 환경 변화에 관계없이 안정적 수익 추구",
-            category=StrategyCategory.ADVANCED,
-            risk_level=RiskLevel.LOW,
-            complexity=Complexity.MEDIUM,
-            expected_return="8-12%",
-            volatility="8-12%",
-            min_investment_period="5년 이상",
-            rebalancing_frequency="분기별"
-        )
-    
     def _get_required_data_columns(self) -> List[str]:
         return super()._get_required_data_columns() + [
             'asset_class', 'duration', 'correlation_matrix', 'volatility', 
@@ -145,22 +145,22 @@ class RayDalioAllWeatherStrategy(BaseStrategy):
 class DavidDremanContrarianStrategy(BaseStrategy):
     """데이비드 드레먼의 역발상 투자 전략"""
     
+    METADATA = StrategyMetadata(
+        name="데이비드 드레먼의 역발상 투자",
+        description="시장 공포와 비관론 속에서 저평가 기회 발굴",
+        category=StrategyCategory.ADVANCED,
+        risk_level=RiskLevel.MEDIUM,
+        complexity=Complexity.MEDIUM,
+        expected_return="12-16%",
+        volatility="16-22%",
+        min_investment_period="2년 이상",
+        rebalancing_frequency="분기별"
+    )
+    DATA_FORMAT = 'external'
+    
     def __init__(self, **kwargs):
         super().__init__("David_Dreman_Contrarian_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="데이비드 드레먼의 역발상 투자",
-            description="시장 공포와 비관론 속에서 저평가 기회 발굴",
-            category=StrategyCategory.ADVANCED,
-            risk_level=RiskLevel.MEDIUM,
-            complexity=Complexity.MEDIUM,
-            expected_return="12-16%",
-            volatility="16-22%",
-            min_investment_period="2년 이상",
-            rebalancing_frequency="분기별"
-        )
-    
     def _get_required_data_columns(self) -> List[str]:
         return super()._get_required_data_columns() + [
             'pe_ratio', 'pb_ratio', 'sentiment_score', 'analyst_coverage',
@@ -343,22 +343,21 @@ class DavidDremanContrarianStrategy(BaseStrategy):
 class JohnNeffLowPEDividendStrategy(BaseStrategy):
     """존 네프의 저PER + 배당 전략"""
     
+    METADATA = StrategyMetadata(
+        name="존 네프의 저PER + 배당 전략",
+        description="소외받는 업종에서 저PER + 고배당 보석 발굴",
+        category=StrategyCategory.ADVANCED,
+        risk_level=RiskLevel.MEDIUM,
+        complexity=Complexity.MEDIUM,
+        expected_return="11-15%",
+        volatility="14-18%",
+        min_investment_period="3년 이상",
+        rebalancing_frequency="반기별"
+    )
+    
     def __init__(self, **kwargs):
         super().__init__("John_Neff_Low_PE_Dividend_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="존 네프의 저PER + 배당 전략",
-            description="소외받는 업종에서 저PER + 고배당 보석 발굴",
-            category=StrategyCategory.ADVANCED,
-            risk_level=RiskLevel.MEDIUM,
-            complexity=Complexity.MEDIUM,
-            expected_return="11-15%",
-            volatility="14-18%",
-            min_investment_period="3년 이상",
-            rebalancing_frequency="반기별"
-        )
-    
     def _get_required_data_columns(self) -> List[str]:
         return super()._get_required_data_columns() + [
             'pe_ratio', 'dividend_yield', 'earnings_growth_rate', 
@@ -16,22 +16,21 @@ import fundamental_metrics as fm
 class WilliamONeilCANSLIMStrategy(BaseStrategy):
     """윌리엄 오닐의 CAN SLIM 전략"""
     
+    METADATA = StrategyMetadata(
+        name="윌리엄 오닐의 CAN SLIM",
+        description="7가지 기준으로 고성장주 발굴, 모멘텀과 펀더멘털 결합",
+        category=StrategyCategory.ADVANCED,
+        risk_level=RiskLevel.HIGH,
+        complexity=Complexity.COMPLEX,
+        expected_return="15-25%",
+        volatility="20-30%",
+        min_investment_period="6개월-2년",
+        rebalancing_frequency="월별"
+    )
+    
     def __init__(self, **kwargs):
         super().__init__("William_ONeil_CANSLIM_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="윌리엄 오닐의 CAN SLIM",
-            description="7가지 기준으로 고성장주 발굴, 모멘텀과 펀더멘털 결합",
-            category=StrategyCategory.ADVANCED,
-            risk_level=RiskLevel.HIGH,
-            complexity=Complexity.COMPLEX,
-            expected_return="15-25%",
-            volatility="20-30%",
-            min_investment_period="6개월-2년",
-            rebalancing_frequency="월별"
-        )
-    
     def _get_required_data_columns(self) -> List[str]:
         return super()._get_required_data_columns() + [
             'eps_growth_current', 'eps_growth_annual', 'new_products', 'new_management',
@@ -232,22 +231,22 @@ class WilliamONeilCANSLIMStrategy(BaseStrategy):
 class HowardMarksCycleStrategy(BaseStrategy):
     """하워드 막스의 사이클 투자 전략"""
     
+    METADATA = StrategyMetadata(
+        name="하워드 막스의 사이클 투자",
+        description="경기사이클 극단점에서 역발상 기회 포착",
+        category=StrategyCategory.ADVANCED,
+        risk_level=RiskLevel.MEDIUM,
+        complexity=Complexity.COMPLEX,
+        expected_return="13-18%",
+        volatility="16-24%",
+        min_investment_period="2년 이상",
+        rebalancing_frequency="분기별"
+    )
+    DATA_FORMAT = 'external'
+    
     def __init__(self, **kwargs):
         super().__init__("Howard_Marks_Cycle_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="하워드 막스의 사이클 투자",
-            description="경기사이클 극단점에서 역발상 기회 포착",
-            category=StrategyCategory.ADVANCED,
-            risk_level=RiskLevel.MEDIUM,
-            complexity=Complexity.COMPLEX,
-            expected_return="13-18%",
-            volatility="16-24%",
-            min_investment_period="2년 이상",
-            rebalancing_frequency="분기별"
-        )
-    
     def _get_required_data_columns(self) -> List[str]:
         return super()._get_required_data_columns() + [
             'credit_spread', 'vix', 'yield_curve', 'sentiment_index', 
@@ -403,22 +402,21 @@ class HowardMarksCycleStrategy(BaseStrategy):
 class JamesOShaughnessyStrategy(BaseStrategy):
     """제임스 오쇼네시의 What Works on Wall Street 전략"""
     
+    METADATA = StrategyMetadata(
+        name="제임스 오쇼네시의 What Works",
+        description="50년 데이터 검증, 시총+PBR+모멘텀 멀티팩터",
+        category=StrategyCategory.ADVANCED,
+        risk_level=RiskLevel.MEDIUM,
+        complexity=Complexity.MEDIUM,
+        expected_return="14-19%",
+        volatility="17-23%",
+        min_investment_period="1년 이상",
+        rebalancing_frequency="연 1회"
+    )
+    
     def __init__(self, **kwargs):
         super().__init__("James_OShaughnessy_Strategy", **kwargs)
     
-    def _get_metadata(self) -> StrategyMetadata:
-        return StrategyMetadata(
-            name="제임스 오쇼네시의 What Works",
-            description="50년 데이터 검증, 시총+PBR+모멘텀 멀티팩터",
-            category=StrategyCategory.ADVANCED,
-            risk_level=RiskLevel.MEDIUM,
-            complexity=Complexity.MEDIUM,
-            expected_return="14-19%",
-            volatility="17-23%",
-            min_investment_period="1년 이상",
-            rebalancing_frequency="연 1회"
-        )
-    
     def _get_required_data_columns(self) -> List[str]:
         return super()._get_required_data_columns() + [
             'market_cap', 'pb_ratio', 'momentum_1year', 'price_sales', 
@@ -0,0 +1,204 @@
+"""
+file: backend/quant_engine/screening.py
+Cross-Sectional Screening Engine - 횡단면 스크리닝 엔진
+재무 데이터를 (날짜 × 종목 × 필드) 배열로 두고 필터/z-score/순위/복합점수를
+모든 날짜에 대해 한 번에 계산 (종목 루프 없음), 상위 N개는 argpartition 으로 선택
+"""
+
+import warnings
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from dataclasses import dataclass, field
+from base_strategy import Signal
+
+
+class FundamentalPanel:
+    """(날짜 × 종목 × 필드) 재무 패널"""
+    
+    def __init__(self, values: np.ndarray, dates: Sequence, symbols: Sequence, fields: Sequence[str]):
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (len(dates), len(symbols), len(fields)):
+            raise ValueError(f"values shape {values.shape} != ({len(dates)}, {len(symbols)}, {len(fields)})")
+        
+        self.values = values
+        self.dates = list(dates)
+        self.symbols = list(symbols)
+        self.fields = list(fields)
+        self._field_index = {name: i for i, name in enumerate(self.fields)}
+    
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, date=None) -> "FundamentalPanel":
+        """단일 시점 단면 (종목 인덱스 DataFrame) -> 날짜 1개 패널 (숫자 컬럼만)"""
+        numeric = data.select_dtypes(include=[np.number, bool])
+        values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls(values[None, :, :], [date], list(data.index), list(numeric.columns))
+    
+    @classmethod
+    def from_long(cls, data: pd.DataFrame, date_col: str = 'date', symbol_col: str = 'symbol',
+                  fields: Optional[List[str]] = None) -> "FundamentalPanel":
+        """(날짜, 종목) 행의 long 형식 -> 패널 (없는 조합은 NaN)"""
+        if fields is None:
+            fields = [c for c in data.select_dtypes(include=[np.number, bool]).columns
+                      if c not in (date_col, symbol_col)]
+        dates, date_codes = np.unique(data[date_col].to_numpy(), return_inverse=True)
+        symbols, symbol_codes = np.unique(data[symbol_col].to_numpy(), return_inverse=True)
+        
+        values = np.full((len(dates), len(symbols), len(fields)), np.nan)
+        values[date_codes, symbol_codes] = data[fields].to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls(values, list(dates), list(symbols), fields)
+    
+    @property
+    def shape(self):
+        return self.values.shape[:2]
+    
+    def has(self, name: str) -> bool:
+        return name in self._field_index
+    
+    def field(self, name: str, default: Optional[float] = None) -> np.ndarray:
+        """(날짜 × 종목) 필드 뷰 - 없는 필드는 default 로 채운 배열 (default 없으면 KeyError)"""
+        if name in self._field_index:
+            return self.values[:, :, self._field_index[name]]
+        if default is None:
+            raise KeyError(name)
+        return np.full(self.shape, float(default))
+
+
+# ===== 횡단면 연산 (axis=1: 같은 날짜의 종목들) =====
+
+def notna(*arrays: np.ndarray) -> np.ndarray:
+    """모든 배열이 NaN 이 아닌 위치 (dropna(subset=...) 대응)"""
+    mask = np.ones(arrays[0].shape, dtype=bool)
+    for array in arrays:
+        mask &= ~np.isnan(array)
+    return mask
+
+
+def cross_sectional_quantile(x: np.ndarray, q: float, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """날짜별 분위수 (mask 밖/NaN 제외) -> (날짜, 1)"""
+    if mask is not None:
+        x = np.where(mask, x, np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # 전부 NaN 인 날짜
+        return np.nanquantile(x, q, axis=1, keepdims=True)
+
+
+def cross_sectional_zscore(x: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """날짜별 z-score (mask 밖은 NaN)"""
+    if mask is not None:
+        x = np.where(mask, x, np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(x, axis=1, keepdims=True)
+        std = np.nanstd(x, axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(std > 0, (x - mean) / std, 0.0) * np.where(np.isnan(x), np.nan, 1.0)
+
+
+def cross_sectional_rank(x: np.ndarray, mask: Optional[np.ndarray] = None, ascending: bool = True) -> np.ndarray:
+    """날짜별 순위 (1부터, 동점은 평균 순위 - pandas rank 기본값과 동일, mask 밖은 NaN)"""
+    valid = ~np.isnan(x) if mask is None else (mask & ~np.isnan(x))
+    keys = np.where(valid, x if ascending else -x, np.inf)
+    
+    order = np.argsort(keys, axis=1, kind='stable')
+    sorted_keys = np.take_along_axis(keys, order, axis=1)
+    n = x.shape[1]
+    positions = np.broadcast_to(np.arange(n), x.shape)
+    
+    # 동점 구간의 처음/끝 위치 -> 평균 순위
+    new_group = np.ones(x.shape, dtype=bool)
+    new_group[:, 1:] = sorted_keys[:, 1:] != sorted_keys[:, :-1]
+    end_group = np.ones(x.shape, dtype=bool)
+    end_group[:, :-1] = new_group[:, 1:]
+    first = np.maximum.accumulate(np.where(new_group, positions, 0), axis=1)
+    last = np.minimum.accumulate(np.where(end_group, positions, n - 1)[:, ::-1], axis=1)[:, ::-1]
+    
+    ranks = np.empty(x.shape)
+    np.put_along_axis(ranks, order, (first + last) / 2.0 + 1.0, axis=1)
+    return np.where(valid, ranks, np.nan)
+
+
+def composite_score(scores: Dict[str, np.ndarray], weights: Dict[str, float]) -> np.ndarray:
+    """가중 복합 점수 (NaN 점수는 해당 항목 제외 후 가중치 재정규화)"""
+    total = None
+    weight_sum = None
+    for name, weight in weights.items():
+        value = scores[name]
+        present = ~np.isnan(value)
+        contribution = np.where(present, value * weight, 0.0)
+        used = np.where(present, weight, 0.0)
+        total = contribution if total is None else total + contribution
+        weight_sum = used if weight_sum is None else weight_sum + used
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(weight_sum > 0, total / weight_sum, np.nan)
+
+
+def top_n(score: np.ndarray, n: int, mask: Optional[np.ndarray] = None, ascending: bool = False) -> np.ndarray:
+    """날짜별 상위 n개 선택 마스크 (argpartition - 전체 정렬 없음)"""
+    valid = ~np.isnan(score) if mask is None else (mask & ~np.isnan(score))
+    keys = np.where(valid, score if ascending else -score, np.inf)
+    n_symbols = score.shape[1]
+    
+    selected = np.zeros(score.shape, dtype=bool)
+    if n <= 0 or n_symbols == 0:
+        return selected
+    if n >= n_symbols:
+        return valid
+    
+    idx = np.argpartition(keys, n - 1, axis=1)[:, :n]
+    np.put_along_axis(selected, idx, True, axis=1)
+    return selected & valid
+
+
+# ===== 결과 -> 신호 =====
+
+@dataclass
+class ScreenResult:
+    """스크리닝 결과 - (날짜 × 종목) 선택/강도 + 신호 메타데이터용 배열"""
+    selected: np.ndarray
+    strength: np.ndarray
+    metadata: Dict[str, np.ndarray] = field(default_factory=dict)
+    order: Optional[np.ndarray] = None  # 신호 정렬 키 (작을수록 앞, 없으면 종목 순서)
+    
+    def to_signals(self, panel: FundamentalPanel, confidence: float, row: int = 0) -> List[Signal]:
+        """한 날짜의 선택 종목 -> BUY 신호 리스트"""
+        columns = np.flatnonzero(self.selected[row])
+        if self.order is not None:
+            columns = columns[np.argsort(self.order[row, columns], kind='stable')]
+        
+        timestamp = panel.dates[row]
+        timestamp = pd.Timestamp.now() if timestamp is None else pd.Timestamp(timestamp)
+        
+        return [
+            Signal(
+                symbol=panel.symbols[col],
+                timestamp=timestamp,
+                signal_type='BUY',
+                strength=float(self.strength[row, col]),
+                confidence=confidence,
+                metadata={name: float(values[row, col]) for name, values in self.metadata.items()}
+            )
+            for col in columns
+        ]
+
+
+class ScreeningStrategyMixin:
+    """screen(panel) 만 구현하면 되는 전략 믹스인 (BaseStrategy 앞에 상속)
+    
+    generate_signals(data): 단일 단면 DataFrame -> 신호 (기존 인터페이스)
+    generate_signals_by_date(panel): 모든 리밸런싱 날짜를 한 번에 스크리닝
+    """
+    
+    SIGNAL_CONFIDENCE = 0.8
+    
+    def screen(self, panel: FundamentalPanel) -> ScreenResult:
+        raise NotImplementedError
+    
+    def generate_signals(self, data: pd.DataFrame) -> List[Signal]:
+        panel = FundamentalPanel.from_frame(data)
+        return self.validate_signals(self.screen(panel).to_signals(panel, self.SIGNAL_CONFIDENCE))
+    
+    def generate_signals_by_date(self, panel: FundamentalPanel) -> Dict:
+        result = self.screen(panel)
+        return {date: self.validate_signals(result.to_signals(panel, self.SIGNAL_CONFIDENCE, row))
+                for row, date in enumerate(panel.dates)}
@@ -6,48 +6,83 @@ Strategy Factory Module - 전략 객체 생성 팩토리 패턴
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Type, Any, Callable
+from typing import Dict, List, Optional, Type, Any, Callable, Tuple
 import logging
 import importlib
-from base_strategy import BaseStrategy, StrategyCategory
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+import base_strategy
+from base_strategy import BaseStrategy, StrategyCategory, StrategyMetadata, RiskLevel, Complexity
 from collections import defaultdict
 
+# 전략 모듈 (파일명 오타 growth_momentum_stratigies 그대로)
+STRATEGY_MODULES = [
+    'basic_strategies',
+    'value_strategies',
+    'growth_momentum_stratigies',
+    'cycle_contrarian_strategies'
+]
+
+# 전략 매니페스트 - 모듈 import 없이 목록/메타데이터 제공
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'strategy_manifest.json')
+MANIFEST_VERSION = 1
+
 class StrategyRegistry:
-    """전략 레지스트리 - 모든 전략을 중앙 관리"""
+    """전략 레지스트리 - 모든 전략을 중앙 관리
+    
+    메타데이터는 클래스 속성(METADATA) 또는 매니페스트에서 읽고,
+    전략 모듈은 처음 생성할 때 import 한다.
+    """
     
     def __init__(self):
-        self._strategies: Dict[str, Type[BaseStrategy]] = {}
+        self._strategies: Dict[str, Type[BaseStrategy]] = {}        # import 된 클래스
+        self._locations: Dict[str, Tuple[str, str]] = {}           # 전략명 -> (모듈, 클래스)
         self._strategy_metadata: Dict[str, Dict] = {}
         self._categories: Dict[StrategyCategory, List[str]] = defaultdict(list)
         self.logger = logging.getLogger("StrategyRegistry")
     
     def register(self, strategy_name: str, strategy_class: Type[BaseStrategy]):
-        """전략 등록"""
+        """전략 등록 (클래스 속성 메타데이터 사용, 인스턴스 생성 없음)"""
         if not issubclass(strategy_class, BaseStrategy):
             raise ValueError(f"Strategy class must inherit from BaseStrategy")
         
         self._strategies[strategy_name] = strategy_class
+        self._locations[strategy_name] = (strategy_class.__module__, strategy_class.__name__)
         
-        # 메타데이터 저장 (인스턴스 생성 없이)
-        try:
-            temp_instance = strategy_class()
-            metadata = temp_instance.get_strategy_info()
-            self._strategy_metadata[strategy_name] = metadata
-            
-            # 카테고리별 분류
-            category = metadata['metadata'].category
-            if strategy_name not in self._categories[category]:
-                self._categories[category].append(strategy_name)
-            
-        except Exception as e:
-            self.logger.warning(f"Could not get metadata for {strategy_name}: {e}")
+        if strategy_class.METADATA is None:
+            self.logger.warning(f"Could not get metadata for {strategy_name}: METADATA not declared")
+            return
+        self._add_metadata(strategy_name, strategy_class.get_class_info())
+    
+    def register_lazy(self, strategy_name: str, module_name: str, class_name: str, info: Dict):
+        """매니페스트 항목 등록 - 모듈은 get_strategy_class 시점에 import"""
+        self._locations[strategy_name] = (module_name, class_name)
+        self._add_metadata(strategy_name, info)
+    
+    def _add_metadata(self, strategy_name: str, info: Dict):
+        self._strategy_metadata[strategy_name] = info
+        
+        # 카테고리별 분류
+        category = info['metadata'].category
+        if strategy_name not in self._categories[category]:
+            self._categories[category].append(strategy_name)
     
     def get_strategy_class(self, strategy_name: str) -> Type[BaseStrategy]:
-        """전략 클래스 반환"""
-        if strategy_name not in self._strategies:
-            raise ValueError(f"Strategy '{strategy_name}' not found. Available strategies: {list(self._strategies.keys())}")
+        """전략 클래스 반환 (필요 시 모듈 import)"""
+        if strategy_name in self._strategies:
+            return self._strategies[strategy_name]
+        
+        if strategy_name not in self._locations:
+            raise ValueError(f"Strategy '{strategy_name}' not found. Available strategies: {self.list_strategies()}")
         
-        return self._strategies[strategy_name]
+        module_name, class_name = self._locations[strategy_name]
+        strategy_class = getattr(importlib.import_module(module_name), class_name)
+        self._strategies[strategy_name] = strategy_class
+        return strategy_class
     
     def create_strategy(self, strategy_name: str, **kwargs) -> BaseStrategy:
         """전략 인스턴스 생성"""
@@ -56,7 +91,11 @@ class StrategyRegistry:
     
     def list_strategies(self) -> List[str]:
         """등록된 전략 목록"""
-        return list(self._strategies.keys())
+        return list(self._locations.keys())
+    
+    def is_loaded(self, strategy_name: str) -> bool:
+        """전략 모듈이 import 되었는지"""
+        return strategy_name in self._strategies
     
     def list_strategies_by_category(self, category: StrategyCategory) -> List[str]:
         """카테고리별 전략 목록"""
@@ -271,19 +310,12 @@ class StrategyManager:
         return strategy_returns
 
 class StrategyLoader:
-    """전략 동적 로딩"""
+    """전략 로딩 (매니페스트 우선, 없거나 오래되면 모듈 import 후 재생성)"""
     
     @staticmethod
     def load_strategies_from_modules():
-        """모든 전략 모듈에서 전략들을 자동 로드"""
-        strategy_modules = [
-            'basic_strategies',
-            'value_strategies', 
-            'growth_momentum_strategies',
-            'cycle_contrarian_strategies'
-        ]
-        
-        for module_name in strategy_modules:
+        """모든 전략 모듈에서 전략들을 로드 (모듈 import - 느린 경로)"""
+        for module_name in STRATEGY_MODULES:
             try:
                 module = importlib.import_module(module_name)
                 # 각 모듈의 register 함수 호출 (있다면)
@@ -293,6 +325,83 @@ class StrategyLoader:
                     logging.info(f"Loaded strategies from {module_name}")
             except ImportError as e:
                 logging.warning(f"Could not load strategy module {module_name}: {e}")
+        
+        # 전략 모듈들은 base_strategy.StrategyFactory 에 등록하므로 레지스트리로 옮김
+        for strategy_name, strategy_class in base_strategy.StrategyFactory._strategies.items():
+            if not strategy_registry.is_loaded(strategy_name):
+                strategy_registry.register(strategy_name, strategy_class)
+    
+    @staticmethod
+    def source_signature() -> Dict[str, str]:
+        """전략 소스 파일 해시 (매니페스트 유효성 확인용)"""
+        base_dir = os.path.dirname(MANIFEST_PATH)
+        signature = {}
+        for module_name in ['base_strategy'] + STRATEGY_MODULES:
+            path = os.path.join(base_dir, f'{module_name}.py')
+            try:
+                with open(path, 'rb') as f:
+                    signature[module_name] = hashlib.sha1(f.read()).hexdigest()
+            except OSError:
+                signature[module_name] = None
+        return signature
+    
+    @staticmethod
+    def load_manifest(path: str = MANIFEST_PATH) -> bool:
+        """매니페스트로 지연 등록 (소스가 바뀌었으면 False)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        
+        if manifest.get('version') != MANIFEST_VERSION or manifest.get('sources') != StrategyLoader.source_signature():
+            logging.info("Strategy manifest is stale - reloading strategy modules")
+            return False
+        
+        for strategy_name, entry in manifest['strategies'].items():
+            meta = dict(entry['metadata'])
+            meta['category'] = StrategyCategory(meta['category'])
+            meta['risk_level'] = RiskLevel(meta['risk_level'])
+            meta['complexity'] = Complexity(meta['complexity'])
+            metadata = StrategyMetadata(**meta)
+            
+            strategy_registry.register_lazy(strategy_name, entry['module'], entry['class'], {
+                'name': metadata.name,
+                'metadata': metadata,
+                'parameters': {},
+                'required_parameters': entry.get('required_parameters', []),
+                'rebalancing_frequency': metadata.rebalancing_frequency
+            })
+        return True
+    
+    @staticmethod
+    def write_manifest(path: str = MANIFEST_PATH) -> Dict:
+        """현재 등록된 전략들로 매니페스트 작성 (모듈 import 필요)"""
+        strategies = {}
+        for strategy_name in strategy_registry.list_strategies():
+            strategy_class = strategy_registry.get_strategy_class(strategy_name)
+            if strategy_class.METADATA is None:
+                continue
+            metadata = asdict(strategy_class.METADATA)
+            for key in ('category', 'risk_level', 'complexity'):
+                metadata[key] = metadata[key].value
+            strategies[strategy_name] = {
+                'module': strategy_class.__module__,
+                'class': strategy_class.__name__,
+                'metadata': metadata,
+                'required_parameters': list(strategy_class.REQUIRED_PARAMETERS)
+            }
+        
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'sources': StrategyLoader.source_signature(),
+            'strategies': strategies
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return manifest
     
     @staticmethod
     def get_all_available_strategies() -> Dict[str, Dict]:
@@ -367,12 +476,60 @@ def get_recommended_strategies(user_profile: Dict[str, Any]) -> List[str]:
     return recommended[:5]  # 최대 5개 전략 추천
 
 # 모듈 로드시 자동 실행
-def initialize_strategy_system():
-    """전략 시스템 초기화"""
-    StrategyLoader.load_strategies_from_modules()
+def initialize_strategy_system(use_manifest: bool = True):
+    """전략 시스템 초기화 (여러 번 호출해도 한 번만 로딩)"""
+    if strategy_registry.list_strategies():
+        return
+    
+    if not (use_manifest and StrategyLoader.load_manifest()):
+        StrategyLoader.load_strategies_from_modules()
+        if use_manifest:
+            try:
+                StrategyLoader.write_manifest()
+            except OSError as e:
+                logging.warning(f"Could not write strategy manifest: {e}")
+    
     logging.info(f"Strategy system initialized with {len(strategy_registry.list_strategies())} strategies")
 
 # 백워드 호환성을 위한 별칭
 register_strategy = StrategyFactory.register_strategy
 create_strategy = StrategyFactory.create_strategy
 list_strategies = StrategyFactory.list_strategies 
+
+
+def benchmark_startup(repeat: int = 3) -> Dict[str, float]:
+    """새 프로세스 기준 초기화 시간 (매니페스트 vs 모듈 import)"""
+    import subprocess
+    
+    scripts = {
+        'manifest_list': "from strategy_factory import initialize_strategy_system as i, strategy_registry as r; i(); r.list_strategies()",
+        'import_all_list': "from strategy_factory import initialize_strategy_system as i, strategy_registry as r; i(use_manifest=False); r.list_strategies()",
+        'manifest_create_one': "from strategy_factory import initialize_strategy_system as i, strategy_registry as r; i(); r.create_strategy('buffett_moat')",
+    }
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for label, script in scripts.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', script], cwd=base_dir, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - start)
+        results[label] = round(min(timings), 3)
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="전략 레지스트리 도구")
+    parser.add_argument('--build-manifest', action='store_true', help='전략 모듈을 import 해 매니페스트 재생성')
+    parser.add_argument('--benchmark', action='store_true', help='초기화 시간 측정')
+    args = parser.parse_args()
+    
+    if args.build_manifest:
+        initialize_strategy_system(use_manifest=False)
+        manifest = StrategyLoader.write_manifest()
+        print(f"✅ 매니페스트 생성: {MANIFEST_PATH} ({len(manifest['strategies'])}개 전략)")
+    if args.benchmark:
+        for label, seconds in benchmark_startup().items():
+            print(f"⏱️ {label:<22} {seconds:.3f}s")
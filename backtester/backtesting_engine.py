@@ -3,23 +3,66 @@ File: backtester/backtesting_engine.py
 Backtesting Engine for Strategy Execution
 """
 
+import sys
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Tuple
 from .portfolio_analyzer import PortfolioAnalyzer
+from .strategies.base_strategy import simulate_portfolio
+from .result_cache import (
+    BacktestResultCache, frame_fingerprint, make_key, strategy_fingerprint, strategy_params
+)
+
+# 시뮬레이션/지표 계산 로직이 바뀌면 올려서 기존 캐시 결과를 무효화
+ENGINE_VERSION = "2.0.0"
+
+# quant_engine 스크리닝 전략 (backend/quant_engine - 모듈끼리 bare import 를 쓰므로 경로째 추가)
+QUANT_ENGINE_PATH = Path(__file__).resolve().parent.parent / "backend" / "quant_engine"
+
+# 백테스터 컬럼 -> quant_engine 필드명, 단위 환산 (ROE: % -> 비율, 시가총액: 달러 -> 백만 달러)
+SCREENING_FIELDS = {
+    'Close': ('close', 1.0),
+    'Volume': ('volume', 1.0),
+    'Market_Cap': ('market_cap', 1e-6),
+    'PE_Ratio': ('pe_ratio', 1.0),
+    'PB_Ratio': ('pb_ratio', 1.0),
+    'ROE': ('roe', 0.01),
+    'Debt_to_Equity': ('debt_to_equity', 1.0),
+}
+
+def load_fundamental_panel():
+    """quant_engine FundamentalPanel (경로가 없으면 추가 후 import)"""
+    if str(QUANT_ENGINE_PATH) not in sys.path:
+        sys.path.append(str(QUANT_ENGINE_PATH))
+    from screening import FundamentalPanel
+    return FundamentalPanel
+
+def to_screening_frame(symbol: str, data: pd.DataFrame) -> pd.DataFrame:
+    """종목 시계열 -> (date, symbol, quant_engine 필드) long 형식 행"""
+    columns = [column for column in data.columns if column in SCREENING_FIELDS]
+    frame = pd.DataFrame({SCREENING_FIELDS[column][0]: data[column].to_numpy(dtype=np.float64) * SCREENING_FIELDS[column][1]
+                          for column in columns})
+    frame.insert(0, 'date', data.index)
+    frame.insert(1, 'symbol', symbol)
+    return frame
 
 class BacktestingEngine:
     """Engine for executing backtests on trading strategies"""
     
-    def __init__(self):
+    def __init__(self, result_cache: BacktestResultCache = None):
         self.portfolio_analyzer = PortfolioAnalyzer()
+        self.result_cache = result_cache
     
     def run_multi_stock_backtest(self, strategy, stock_data: Dict, days: int) -> List[Dict]:
         """Run backtest on multiple stocks"""
         print("🔍 개별 종목 분석 중...")
         
-        individual_results = self._run_individual_stock_analysis(strategy, stock_data, days)
+        if hasattr(strategy, 'generate_signals_by_date'):
+            individual_results = self._run_screening_analysis(strategy, stock_data, days)
+        else:
+            individual_results = self._run_individual_stock_analysis(strategy, stock_data, days)
         
         if not individual_results:
             print("❌ 분석할 수 있는 종목이 없습니다.")
@@ -59,9 +102,55 @@ class BacktestingEngine:
         # Sort by Sharpe ratio
         return sorted(results, key=lambda x: x['Sharpe_Ratio'], reverse=True)
     
-    def _execute_strategy(self, strategy, symbol: str, data: pd.DataFrame, days: int) -> Dict:
+    def _run_screening_analysis(self, strategy, stock_data: Dict, days: int) -> List[Dict]:
+        """Analyze stocks with a cross-sectional screening strategy (quant_engine ScreeningStrategyMixin)
+        
+        One (date x symbol) panel for the whole period -> generate_signals_by_date screens every
+        date at once; a symbol is held (signal 1) on the dates it is selected
+        """
+        FundamentalPanel = load_fundamental_panel()
+        
+        periods = {}
+        for symbol, data in stock_data.items():
+            start_date = data.index[-1] - timedelta(days=days)
+            period_data = data[data.index >= start_date]
+            if len(period_data) >= 30:  # Need minimum data points
+                periods[symbol] = period_data
+        if not periods:
+            return []
+        
+        # 종목별 시계열 -> (날짜, 종목) long 형식 하나
+        long = pd.concat([to_screening_frame(symbol, frame) for symbol, frame in periods.items()],
+                         ignore_index=True)
+        panel = FundamentalPanel.from_long(long)
+        signals_by_date = strategy.generate_signals_by_date(panel)
+        
+        columns = {symbol: col for col, symbol in enumerate(panel.symbols)}
+        held = np.zeros((len(panel.dates), len(panel.symbols)))
+        for row, signals in enumerate(signals_by_date.values()):
+            held[row, [columns[signal.symbol] for signal in signals if signal.signal_type == 'BUY']] = 1.0
+        held = pd.DataFrame(held, index=pd.DatetimeIndex(panel.dates), columns=panel.symbols)
+        
+        results = []
+        for symbol, data in periods.items():
+            signals = held[symbol].reindex(data.index, fill_value=0.0)
+            portfolio_value, _ = simulate_portfolio(data['Close'].to_numpy(), signals.to_numpy())
+            
+            metrics = self.portfolio_analyzer.calculate_metrics(portfolio_value, symbol, days)
+            metrics['Portfolio_History'] = portfolio_value
+            metrics['Signals'] = signals
+            results.append(metrics)
+        
+        # Sort by Sharpe ratio
+        return sorted(results, key=lambda x: x['Sharpe_Ratio'], reverse=True)
+    
+    def _execute_strategy(self, strategy, symbol: str, data: pd.DataFrame, days: int,
+                          use_cache: bool = True) -> Dict:
         """Execute strategy on single stock"""
         try:
+            if use_cache and self.result_cache is not None:
+                return self._execute_strategy_cached(strategy, symbol, data, days)
+            
             # Generate trading signals
             signals = strategy.generate_signals(data)
             
@@ -82,6 +171,50 @@ class BacktestingEngine:
         except Exception as e:
             return None
     
+    def _execute_strategy_cached(self, strategy, symbol: str, data: pd.DataFrame, days: int) -> Dict:
+        """Execute strategy through the result cache (hit -> reuse, causal prefix -> extend)"""
+        cache = self.result_cache
+        strategy_id = strategy_fingerprint(type(strategy))
+        params = strategy_params(strategy)
+        data_fp = frame_fingerprint(data)
+        key = make_key(strategy_id, params, symbol, data_fp, days, ENGINE_VERSION)
+        
+        cached = cache.get(key)
+        if cached is not None:
+            metrics = cached.metrics
+            metrics['Portfolio_History'] = cached.arrays['equity'].tolist()
+            metrics['Signals'] = pd.Series(cached.arrays['signals'], index=data.index)
+            return metrics
+        
+        signals = strategy.generate_signals(data)
+        
+        # 같은 시작일의 짧은 실행이 있으면 새 날짜만 이어서 계산
+        # (신호 앞부분이 캐시와 같으면 자산곡선 앞부분도 같음)
+        prefix_key = make_key(strategy_id, params, symbol, str(data.index[0]), ENGINE_VERSION)
+        simulate = getattr(strategy, 'simulate_portfolio', None)
+        base = cache.find_prefix(prefix_key, data) if strategy.causal and simulate else None
+        
+        if base is not None and np.array_equal(base.arrays['signals'], signals.to_numpy()[:base.n_rows]):
+            new_values, state = simulate(data, signals, start=base.n_rows, state=base.state)
+            portfolio_value = base.arrays['equity'].tolist() + new_values
+            cache.extensions += 1
+        elif simulate:
+            portfolio_value, state = simulate(data, signals)
+        else:
+            portfolio_value, state = strategy.calculate_returns(data, signals), None
+        
+        metrics = self.portfolio_analyzer.calculate_metrics(portfolio_value, symbol, days)
+        cache.put(
+            key, metrics,
+            arrays={'equity': np.asarray(portfolio_value, dtype=np.float64),
+                    'signals': signals.to_numpy(dtype=np.float64)},
+            state=state, prefix_key=prefix_key, data_fp=data_fp, n_rows=len(data)
+        )
+        
+        metrics['Portfolio_History'] = portfolio_value
+        metrics['Signals'] = signals
+        return metrics
+    
     def run_strategy_comparison(self, strategies: List, stock_data: Dict, days: int) -> Dict:
         """Compare multiple strategies on the same dataset"""
         comparison_results = {}
@@ -153,7 +286,8 @@ class BacktestingEngine:
                 noisy_data = self._add_noise_to_data(data, days)
                 
                 # Run strategy
-                result = self._execute_strategy(strategy, symbol, noisy_data, days)
+                # 노이즈 데이터는 매번 달라 재사용되지 않으므로 캐시하지 않음
+                result = self._execute_strategy(strategy, symbol, noisy_data, days, use_cache=False)
                 
                 if result:
                     simulation_results.append(result['Annual_Return_%'])
@@ -23,6 +23,7 @@ from .strategies import (
 from .data_generator import DataGenerator
 from .backtesting_engine import BacktestingEngine
 from .portfolio_analyzer import PortfolioAnalyzer
+from .result_cache import BacktestResultCache
 
 # 수정된 import - 실제 작동하는 버전
 try:
@@ -40,7 +41,8 @@ class QuantBacktester:
     def __init__(self):
         # Initialize components
         self.data_generator = DataGenerator()
-        self.backtest_engine = BacktestingEngine()
+        self.result_cache = self._create_result_cache()
+        self.backtest_engine = BacktestingEngine(result_cache=self.result_cache)
         self.portfolio_analyzer = PortfolioAnalyzer()
         
         # 시각화 객체 초기화 (안전한 방식)
@@ -65,6 +67,20 @@ class QuantBacktester:
         # Default settings
         self.default_period_days = 3650  # 10 years
 
+    def _create_result_cache(self):
+        """백테스트 결과 캐시 (BACKTEST_CACHE_MB=0 이면 사용 안 함)"""
+        max_mb = float(os.getenv('BACKTEST_CACHE_MB', '256'))
+        if max_mb <= 0:
+            return None
+        try:
+            return BacktestResultCache(
+                os.getenv('BACKTEST_CACHE_PATH', os.path.join('backtest_cache', 'results.db')),
+                max_mb=max_mb
+            )
+        except Exception as e:
+            print(f"⚠️ 결과 캐시 초기화 실패: {e} - 캐시 없이 계속합니다.")
+            return None
+
     def _initialize_strategies(self):
         """Initialize 4 core trading strategies using implemented classes"""
         return {
@@ -210,6 +226,10 @@ class QuantBacktester:
         
         execution_time = time.time() - start_time
         print(f"✅ 백테스트 완료! 실행시간: {execution_time:.2f}초")
+        if self.result_cache:
+            stats = self.result_cache.get_stats()
+            print(f"💾 결과 캐시: 적중 {stats['hits']} / 확장 {stats['extensions']} / "
+                  f"항목 {stats['entries']}개 ({stats['cache_size'] / 1024 / 1024:.1f}MB)")
         
         return {
             'results': results,
@@ -0,0 +1,329 @@
+"""
+File: backtester/result_cache.py
+Content-Addressed Backtest Result Cache
+
+같은 전략 + 같은 파라미터 + 같은 데이터 + 같은 엔진 버전이면 결과도 같으므로
+그 조합의 해시를 키로 결과를 저장해 재사용한다.
+
+- 키: 전략 클래스(이름 + 소스 해시), 정규화된 파라미터, 데이터 지문(종목별 내용 해시), 엔진 버전
+- 저장: SQLite 한 파일 (지표는 JSON, 자산곡선/신호 배열은 압축 npz)
+- 용량 제한: 전체 바이트가 예산을 넘으면 가장 오래 안 쓴 항목부터 삭제
+- 부분 재사용: 같은 시작일의 짧은 실행(prefix)을 찾아 새 날짜만 이어서 계산 (인과적 전략만)
+
+backend/main.py 에서도 디렉토리를 sys.path 에 추가해 단독 모듈로 import 하므로
+패키지 내부(상대) import 를 사용하지 않는다.
+"""
+
+import hashlib
+import inspect
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_PATH = os.path.join("backtest_cache", "results.db")
+DEFAULT_MAX_MB = 256
+PREFIX_CANDIDATES = 3  # 부분 재사용 시 확인할 최대 후보 수 (긴 것부터)
+
+
+# ===== 키 구성 요소 =====
+def normalize_params(value: Any) -> Any:
+    """파라미터를 해시 가능한 정규형으로 변환
+
+    - dict 는 키 정렬, tuple/set 은 list
+    - 정수값 float 와 int 는 같은 값 (12 == 12.0)
+    - numpy 스칼라/배열은 파이썬 값
+    - 전략 객체(중첩 전략)는 {클래스: 파라미터}
+    """
+    if isinstance(value, dict):
+        return {str(k): normalize_params(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [normalize_params(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(normalize_params(v) for v in value)
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return int(value) if value.is_integer() else repr(value)
+    if isinstance(value, np.ndarray):
+        return normalize_params(value.tolist())
+    if value is None or isinstance(value, str):
+        return value
+    if hasattr(value, "generate_signals"):
+        return {class_path(type(value)): strategy_params(value)}
+    return repr(value)
+
+
+def strategy_params(strategy) -> Dict[str, Any]:
+    """전략 인스턴스의 파라미터 (공개 속성 전체, 메서드/데이터프레임 제외)"""
+    params = {}
+    for name, value in vars(strategy).items():
+        if name.startswith("_") or callable(value) or isinstance(value, (pd.DataFrame, pd.Series)):
+            continue
+        params[name] = value
+    return normalize_params(params)
+
+
+def class_path(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+_source_hashes: Dict[type, str] = {}
+
+
+def strategy_fingerprint(cls: type) -> str:
+    """전략 클래스 식별자 + 소스 해시 (전략 코드가 바뀌면 키도 바뀜)"""
+    if cls not in _source_hashes:
+        digest = hashlib.blake2b(digest_size=8)
+        for klass in cls.__mro__:
+            if klass is object or klass.__module__ in ("abc", "builtins"):
+                continue
+            try:
+                digest.update(inspect.getsource(klass).encode("utf-8"))
+            except (OSError, TypeError):
+                digest.update(class_path(klass).encode("utf-8"))
+        _source_hashes[cls] = f"{class_path(cls)}@{digest.hexdigest()}"
+    return _source_hashes[cls]
+
+
+def frame_fingerprint(data: pd.DataFrame, rows: Optional[int] = None) -> str:
+    """DataFrame 내용 해시 (인덱스 + 컬럼명 + 값). rows 를 주면 앞쪽 rows 행만"""
+    if rows is not None:
+        data = data.iloc[:rows]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(data)).encode())
+    digest.update(_array_bytes(data.index))
+    for column in data.columns:
+        digest.update(str(column).encode("utf-8"))
+        digest.update(_array_bytes(data[column]))
+    return digest.hexdigest()
+
+
+def _array_bytes(values) -> bytes:
+    if isinstance(values, pd.DatetimeIndex):
+        return values.asi8.tobytes()
+    array = np.asarray(values)
+    if array.dtype.kind in "biufcmM":
+        return np.ascontiguousarray(array).tobytes()
+    return pd.util.hash_pandas_object(pd.Series(array), index=False).to_numpy().tobytes()
+
+
+def make_key(*parts: Any) -> str:
+    """구성 요소들의 정규형 JSON 해시"""
+    payload = json.dumps(normalize_params(list(parts)), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ===== 저장 형식 =====
+def _pack_arrays(arrays: Dict[str, np.ndarray]) -> bytes:
+    if not arrays:
+        return b""
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **{name: np.asarray(array) for name, array in arrays.items()})
+    return buffer.getvalue()
+
+
+def _unpack_arrays(blob: bytes) -> Dict[str, np.ndarray]:
+    if not blob:
+        return {}
+    with np.load(io.BytesIO(blob), allow_pickle=False) as npz:
+        return {name: npz[name] for name in npz.files}
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return str(value)
+    raise TypeError(f"JSON 변환 불가: {type(value).__name__}")
+
+
+@dataclass
+class CachedResult:
+    """캐시된 실행 결과"""
+    key: str
+    metrics: Dict[str, Any]
+    arrays: Dict[str, np.ndarray] = field(default_factory=dict)
+    state: Optional[Dict[str, Any]] = None   # 이어서 계산하기 위한 마지막 상태
+    n_rows: int = 0                          # 입력 데이터 행 수
+
+
+# ===== 캐시 =====
+class BacktestResultCache:
+    """내용 주소 기반 백테스트 결과 캐시 (SQLite, 바이트 예산 LRU)"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_mb: float = DEFAULT_MAX_MB):
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 여러 워커 프로세스가 같은 파일을 쓸 수 있으므로 WAL + 대기 시간
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS backtest_results (
+                key TEXT PRIMARY KEY,
+                prefix_key TEXT,
+                data_fp TEXT,
+                n_rows INTEGER NOT NULL DEFAULT 0,
+                metrics TEXT NOT NULL,
+                arrays BLOB,
+                state TEXT,
+                nbytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_backtest_results_prefix ON backtest_results (prefix_key, n_rows)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_backtest_results_used ON backtest_results (last_used)")
+        self.conn.commit()
+
+        # 통계 (현재 프로세스 기준)
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self.evictions = 0
+
+    # ----- 조회 -----
+    def get(self, key: str) -> Optional[CachedResult]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT metrics, arrays, state, n_rows FROM backtest_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute(
+                "UPDATE backtest_results SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+            )
+            self.conn.commit()
+            self.hits += 1
+        return self._to_result(key, row)
+
+    def find_prefix(self, prefix_key: str, data: pd.DataFrame) -> Optional[CachedResult]:
+        """data 의 앞부분과 내용이 같은 더 짧은 실행 (가장 긴 것 우선)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT key, data_fp, metrics, arrays, state, n_rows FROM backtest_results "
+                "WHERE prefix_key = ? AND n_rows > 1 AND n_rows < ? AND state IS NOT NULL "
+                "ORDER BY n_rows DESC LIMIT ?",
+                (prefix_key, len(data), PREFIX_CANDIDATES)
+            ).fetchall()
+        for key, data_fp, *payload in rows:
+            if frame_fingerprint(data, rows=payload[-1]) == data_fp:
+                return self._to_result(key, payload)
+        return None
+
+    @staticmethod
+    def _to_result(key: str, row) -> CachedResult:
+        metrics, arrays, state, n_rows = row
+        return CachedResult(
+            key=key,
+            metrics=json.loads(metrics),
+            arrays=_unpack_arrays(arrays),
+            state=json.loads(state) if state else None,
+            n_rows=n_rows
+        )
+
+    # ----- 저장 -----
+    def put(self, key: str, metrics: Dict[str, Any], arrays: Optional[Dict[str, np.ndarray]] = None,
+            state: Optional[Dict[str, Any]] = None, prefix_key: Optional[str] = None,
+            data_fp: Optional[str] = None, n_rows: int = 0):
+        metrics_json = json.dumps(metrics, default=_json_default, ensure_ascii=False)
+        blob = _pack_arrays(arrays or {})
+        state_json = json.dumps(state, default=_json_default) if state is not None else None
+        nbytes = len(metrics_json) + len(blob) + len(state_json or "")
+        if nbytes > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT INTO backtest_results
+                    (key, prefix_key, data_fp, n_rows, metrics, arrays, state, nbytes, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    metrics = excluded.metrics, arrays = excluded.arrays, state = excluded.state,
+                    nbytes = excluded.nbytes, last_used = excluded.last_used
+                """,
+                (key, prefix_key, data_fp, n_rows, metrics_json, blob, state_json, nbytes, now, now)
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """예산 초과분을 오래 안 쓴 순서로 삭제 (잠금 보유 상태에서 호출)"""
+        total = self.conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM backtest_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, nbytes in self.conn.execute("SELECT key, nbytes FROM backtest_results ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= nbytes
+        self.conn.executemany("DELETE FROM backtest_results WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        with self._lock:
+            cursor = self.conn.executemany("DELETE FROM backtest_results WHERE key = ?", [(k,) for k in keys])
+            self.conn.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM backtest_results")
+            self.conn.commit()
+            self.conn.execute("VACUUM")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def shared_stats(self) -> Dict[str, Any]:
+        """저장소 기준 통계 (모든 프로세스 합산) - 조회가 워커 프로세스에서 일어날 때 사용"""
+        with self._lock:
+            entries, total, hits = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0), COALESCE(SUM(hits), 0) FROM backtest_results"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "cache_size": total,
+            "max_bytes": self.max_bytes,
+            "stored_hits": hits,  # 현재 남아 있는 항목들의 누적 적중 수 (축출된 항목 제외)
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM backtest_results"
+            ).fetchone()
+        requests = self.hits + self.misses
+        return {
+            "entries": entries,
+            "cache_size": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+            "extensions": self.extensions,
+            "evictions": self.evictions,
+        }
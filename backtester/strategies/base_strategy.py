@@ -8,9 +8,69 @@ import numpy as np
 from abc import ABC, abstractmethod
 from typing import List, Dict, Tuple
 
+def simulate_portfolio(prices: np.ndarray, signal_values: np.ndarray, initial_capital: float = 10000,
+                       transaction_cost: float = 0.001, start: int = 1,
+                       state: Dict = None) -> Tuple[List[float], Dict]:
+    """
+    Simulate an all-in long/short portfolio that trades whenever the signal changes
+    
+    Args:
+        prices: Close prices
+        signal_values: Trading signals (same length as prices)
+        initial_capital: Starting cash
+        transaction_cost: Cost per trade as a fraction of the traded value
+        start: First row to simulate (1 = full run)
+        state: {'position', 'cash', 'shares'} after row start-1 (None = initial capital)
+        
+    Returns:
+        (portfolio values, final state) - values include the initial capital only for a full run
+    """
+    if state is None:
+        portfolio_value = [initial_capital]
+        position = 0  # Current position (0: no position, 1: long, -1: short)
+        cash = initial_capital
+        shares = 0
+    else:
+        portfolio_value = []
+        position, cash, shares = state['position'], state['cash'], state['shares']
+    
+    for i in range(start, len(signal_values)):
+        current_price = prices[i]
+        current_signal = signal_values[i]
+        previous_signal = signal_values[i-1]
+        
+        # Execute trades when signal changes
+        if current_signal != previous_signal:
+            # Close existing position
+            if position != 0:
+                cash = shares * current_price * (1 - transaction_cost)
+                shares = 0
+                position = 0
+            
+            # Open new position
+            if current_signal != 0:
+                shares = cash / (current_price * (1 + transaction_cost))
+                cash = 0
+                position = current_signal
+        
+        # Calculate current portfolio value
+        if position != 0:
+            current_value = shares * current_price
+        else:
+            current_value = cash
+        
+        portfolio_value.append(current_value)
+    
+    final_state = {'position': float(position), 'cash': float(cash), 'shares': float(shares)}
+    return portfolio_value, final_state
+
 class BaseStrategy(ABC):
     """Base class for all trading strategies"""
     
+    # True: signal at row t depends only on rows <= t (no full-series quantiles etc.)
+    # -> cached runs can be extended with new dates instead of recomputed
+    causal = False
+    
     def __init__(self, name: str):
         self.name = name
         self.transaction_cost = 0.001  # 0.1% transaction cost
@@ -40,40 +100,25 @@ class BaseStrategy(ABC):
         Returns:
             List of portfolio values over time
         """
-        prices = data['Close']
-        portfolio_value = [self.initial_capital]
-        position = 0  # Current position (0: no position, 1: long, -1: short)
-        cash = self.initial_capital
-        shares = 0
+        portfolio_value, _ = self.simulate_portfolio(data, signals)
+        return portfolio_value
+    
+    def simulate_portfolio(self, data: pd.DataFrame, signals: pd.Series,
+                           start: int = 1, state: Dict = None) -> Tuple[List[float], Dict]:
+        """
+        Simulate the portfolio from row `start`, optionally resuming from a saved state
         
-        for i in range(1, len(signals)):
-            current_price = prices.iloc[i]
-            current_signal = signals.iloc[i]
-            previous_signal = signals.iloc[i-1]
-            
-            # Execute trades when signal changes
-            if current_signal != previous_signal:
-                # Close existing position
-                if position != 0:
-                    cash = shares * current_price * (1 - self.transaction_cost)
-                    shares = 0
-                    position = 0
-                
-                # Open new position
-                if current_signal != 0:
-                    shares = cash / (current_price * (1 + self.transaction_cost))
-                    cash = 0
-                    position = current_signal
-            
-            # Calculate current portfolio value
-            if position != 0:
-                current_value = shares * current_price
-            else:
-                current_value = cash
+        Args:
+            data: Market data DataFrame
+            signals: Trading signals Series (same length as data)
+            start: First row to simulate (1 = full run)
+            state: {'position', 'cash', 'shares'} after row start-1 (None = initial capital)
             
-            portfolio_value.append(current_value)
-        
-        return portfolio_value
+        Returns:
+            (portfolio values, final state) - values include the initial capital only for a full run
+        """
+        return simulate_portfolio(data['Close'].to_numpy(), signals.to_numpy(), self.initial_capital,
+                                  self.transaction_cost, start, state)
     
     def calculate_technical_indicators(self, data: pd.DataFrame) -> Dict[str, pd.Series]:
         """Calculate common technical indicators"""
@@ -10,6 +10,8 @@ from .base_strategy import BaseStrategy
 class PERStrategy(BaseStrategy):
     """P/E Ratio Based Value Strategy - 주가수익비율 전략"""
     
+    causal = True  # 당일 PER + 과거 모멘텀만 사용
+    
     def __init__(self):
         super().__init__("PER Strategy")
         self.low_pe_threshold = 12.0    # 저평가 기준
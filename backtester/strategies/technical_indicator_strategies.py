@@ -10,6 +10,8 @@ from .base_strategy import BaseStrategy
 class MovingAverageStrategy(BaseStrategy):
     """Moving Average Based Trend Following Strategy - 이동평균 전략"""
     
+    causal = True  # EMA/SMA는 과거 가격만 사용
+    
     def __init__(self):
         super().__init__("Moving Average Strategy")
         self.short_window = 20         # 단기 이동평균
@@ -98,6 +100,8 @@ class MovingAverageStrategy(BaseStrategy):
 class RSIStrategy(BaseStrategy):
     """RSI Based Mean Reversion Strategy - RSI 전략"""
     
+    causal = True  # 롤링 RSI - 과거 가격만 사용
+    
     def __init__(self):
         super().__init__("RSI Strategy")
         self.rsi_period = 14           # RSI 계산 기간
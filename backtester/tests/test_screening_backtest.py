@@ -0,0 +1,77 @@
+# tests/test_screening_backtest.py - quant_engine 스크리닝 전략 백테스트 경로 테스트
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 저장소 루트를 Python 경로에 추가 (backtester 패키지)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+pytest.importorskip("matplotlib")  # backtester 패키지 import 시 visualizer 가 필요
+pytest.importorskip("seaborn")
+
+from backtester.backtesting_engine import BacktestingEngine, load_fundamental_panel
+from backtester.strategies.base_strategy import simulate_portfolio
+
+load_fundamental_panel()  # backend/quant_engine 경로 추가
+from value_strategies import JoelGreenblattMagicFormulaStrategy
+
+DAYS = 60
+SWITCH = 20  # 이 날부터 AAA 가 마법공식 1위
+
+
+def make_stock(pe_ratio, roe, start_price: float = 100.0) -> pd.DataFrame:
+    """백테스터 형식 (Close/Volume/재무 컬럼) 종목 시계열"""
+    dates = pd.date_range("2024-01-01", periods=DAYS, freq="D")
+    return pd.DataFrame({
+        'Close': start_price * (1.01 ** np.arange(DAYS)),
+        'Volume': np.full(DAYS, 1000.0),
+        'Market_Cap': np.full(DAYS, 50e9),  # 500억 달러
+        'PE_Ratio': np.broadcast_to(pe_ratio, DAYS).astype(float),
+        'PB_Ratio': np.full(DAYS, 2.0),
+        'ROE': np.broadcast_to(roe, DAYS).astype(float),  # %
+        'Debt_to_Equity': np.full(DAYS, 0.5),
+    }, index=pd.Index(dates, name='Date'))
+
+
+def sample_stocks():
+    improving = np.arange(DAYS) >= SWITCH
+    return {
+        'AAA': make_stock(np.where(improving, 5.0, 30.0), np.where(improving, 40.0, 5.0)),
+        'BBB': make_stock(10.0, 20.0),
+        'CCC': make_stock(20.0, 10.0),
+        'DDD': make_stock(25.0, 8.0, start_price=50.0),
+    }
+
+
+def test_screening_strategy_runs_on_one_panel():
+    engine = BacktestingEngine()
+    results = engine.run_multi_stock_backtest(JoelGreenblattMagicFormulaStrategy(top_stocks=1), sample_stocks(), DAYS)
+
+    by_symbol = {result['Symbol']: result for result in results}
+    assert set(by_symbol) == {'AAA', 'BBB', 'CCC', 'DDD'}
+
+    # 상위 1개: SWITCH 전에는 BBB, 이후에는 AAA (ROE % -> 비율, 시가총액 환산 후 필터 통과)
+    expected = (np.arange(DAYS) >= SWITCH).astype(float)
+    np.testing.assert_array_equal(by_symbol['AAA']['Signals'].to_numpy(), expected)
+    np.testing.assert_array_equal(by_symbol['BBB']['Signals'].to_numpy(), 1.0 - expected)
+    assert by_symbol['CCC']['Signals'].sum() == 0
+
+    # 보유 구간은 공용 시뮬레이터와 같은 자산곡선
+    prices = sample_stocks()['AAA']['Close'].to_numpy()
+    assert by_symbol['AAA']['Portfolio_History'] == simulate_portfolio(prices, expected)[0]
+
+
+def test_strategy_simulate_portfolio_matches_function():
+    from backtester.strategies import PERStrategy
+
+    strategy = PERStrategy()
+    data = sample_stocks()['BBB']
+    signals = pd.Series(np.where(np.arange(DAYS) % 10 < 5, 1.0, 0.0), index=data.index)
+
+    values, state = strategy.simulate_portfolio(data, signals)
+    assert (values, state) == simulate_portfolio(data['Close'].to_numpy(), signals.to_numpy(),
+                                                 strategy.initial_capital, strategy.transaction_cost)
+    assert values[-1] != strategy.initial_capital
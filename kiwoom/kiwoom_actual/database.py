@@ -6,24 +6,206 @@ file: database.py
 import sqlite3
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from config import Config
 
+# 연결마다 적용하는 SQLite 설정
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",        # 읽기와 쓰기 동시 진행, 커밋 시 fsync 감소
+    "PRAGMA synchronous=NORMAL",      # WAL에서는 NORMAL로도 손상 없음
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",       # 16MB 페이지 캐시
+    "PRAGMA mmap_size=268435456",     # 256MB 메모리 맵
+    "PRAGMA busy_timeout=5000",
+)
+
+PORTFOLIO_UPSERT_SQL = '''
+INSERT INTO portfolio (account_no, stock_code, quantity, avg_price)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(account_no, stock_code) DO UPDATE SET
+    avg_price = CASE WHEN portfolio.quantity <= 0 THEN excluded.avg_price
+        WHEN portfolio.quantity + excluded.quantity > 0
+        THEN (portfolio.quantity * portfolio.avg_price + excluded.quantity * excluded.avg_price)
+             / (portfolio.quantity + excluded.quantity)
+        ELSE portfolio.avg_price END,
+    quantity = CASE WHEN portfolio.quantity <= 0 THEN excluded.quantity
+        ELSE portfolio.quantity + excluded.quantity END,
+    updated_at = CURRENT_TIMESTAMP
+'''
+# 수량 0 이하 행(아직 정리 전)은 새로 넣은 것처럼 덮어씀 -> 정리(DELETE)를 같은 묶음의 upsert 뒤로 미뤄도 결과가 같음
+
+PORTFOLIO_CLEANUP_SQL = '''
+DELETE FROM portfolio WHERE account_no = ? AND stock_code = ? AND quantity <= 0
+'''
+
+TRANSACTION_INSERT_SQL = '''
+INSERT INTO transactions 
+(account_no, stock_code, transaction_type, quantity, price, amount, fee)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+TICK_INSERT_SQL = '''
+INSERT INTO ticks (stock_code, price, volume, tick_time)
+VALUES (?, ?, ?, ?)
+'''
+
+STOCK_UPSERT_SQL = '''
+INSERT OR REPLACE INTO stocks 
+(stock_code, stock_name, current_price, updated_at)
+VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+'''
+
+class WriteBehindQueue:
+    """쓰기 지연 큐
+    
+    호출 스레드는 (SQL, 파라미터) 작업 단위를 큐에 넣고 바로 반환한다.
+    전용 스레드가 flush_interval 동안 모인 단위를 꺼내 SQL별로 묶어 (처음 나온 순서,
+    SQL 안에서는 넣은 순서) executemany 한 번씩 실행하고, 묶음 전체를 트랜잭션 하나로 커밋한다.
+    
+    SQL별로 묶으면 서로 다른 SQL 사이의 순서가 바뀐다. 같은 테이블에 쓰는 SQL 여러 개가
+    순서에 의존하면 put_statements 로 한 단위로 넣는다 - 단위는 묶음 사이에서 쪼개지지 않으므로
+    단위 안에서 먼저 나온 SQL 묶음이 먼저 실행된다 (포트폴리오 upsert -> 정리).
+    """
+    
+    def __init__(self, db_manager: 'DatabaseManager', flush_interval: float = 0.05,
+                 max_batch: int = 5000):
+        self.db_manager = db_manager
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.logger = logging.getLogger(__name__)
+        
+        self._queue: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self._thread.start()
+        
+        # 통계
+        self.written = 0
+        self.commits = 0
+        self.errors = 0
+    
+    def put(self, sql: str, params: tuple):
+        self._queue.put([(sql, params)])
+    
+    def put_many(self, sql: str, rows: List[tuple]):
+        self.put_statements([(sql, params) for params in rows])
+    
+    def put_statements(self, statements: List[Tuple[str, tuple]]):
+        """여러 SQL을 한 단위로 (같은 묶음에서 함께 커밋)"""
+        if statements:
+            self._queue.put(statements)
+    
+    @property
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+    
+    def flush(self):
+        """큐에 들어간 작업이 모두 커밋될 때까지 대기"""
+        self._queue.join()
+    
+    def close(self):
+        self.flush()
+        self._stop.set()
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+    
+    def _run(self):
+        while not self._stop.is_set():
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+            
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._stop.set()
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+            
+            try:
+                self._write([statement for unit in batch for statement in unit])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _write(self, batch: List[tuple]):
+        """SQL별 executemany 한 번씩, 트랜잭션 하나로 커밋"""
+        try:
+            by_sql: Dict[str, List[tuple]] = {}
+            for sql, params in batch:
+                by_sql.setdefault(sql, []).append(params)
+            
+            conn = self.db_manager.get_connection()
+            with conn:
+                for sql, rows in by_sql.items():
+                    conn.executemany(sql, rows)
+            self.written += len(batch)
+            self.commits += 1
+        except Exception as e:
+            self.errors += 1
+            self.logger.error(f"지연 쓰기 오류 ({len(batch)}건 유실): {e}")
+
 class DatabaseManager:
-    """데이터베이스 관리 클래스"""
+    """데이터베이스 관리 클래스
     
-    def __init__(self, db_path: str = None):
+    - 스레드마다 연결 하나를 재사용 (WAL, 튜닝된 PRAGMA)
+    - write_behind=True 이면 포트폴리오/거래/시세 쓰기를 WriteBehindQueue로 모아 커밋하고,
+      조회 전에 대기 중인 쓰기를 먼저 반영한다
+    """
+    
+    def __init__(self, db_path: str = None, write_behind: bool = False,
+                 flush_interval: float = 0.05):
         self.db_path = db_path or Config.DATABASE_PATH
         self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self.initialize_database()
+        self.writer = WriteBehindQueue(self, flush_interval) if write_behind else None
     
     def get_connection(self) -> sqlite3.Connection:
-        """데이터베이스 연결 생성"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """현재 스레드의 데이터베이스 연결 (최초 호출 시 생성 후 재사용)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
         return conn
     
+    def flush(self):
+        """지연 쓰기 큐 비우기 (쓰기 지연을 쓰지 않으면 아무것도 하지 않음)"""
+        if self.writer is not None and self.writer.pending:
+            self.writer.flush()
+    
+    def close(self):
+        """지연 쓰기 반영 후 모든 스레드 연결 종료"""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+    
     def initialize_database(self):
         """데이터베이스 테이블 초기화"""
         try:
@@ -106,6 +288,20 @@ class DatabaseManager:
                 )
                 ''')
                 
+                # 실시간 시세 테이블
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ticks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    stock_code TEXT,
+                    price INTEGER,
+                    volume INTEGER,
+                    tick_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                ''')
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_ticks_code_time ON ticks (stock_code, tick_time)
+                ''')
+                
                 # 기본 계좌 생성
                 cursor.execute('''
                 INSERT OR IGNORE INTO accounts (account_no, account_name, balance, buying_power)
@@ -122,6 +318,7 @@ class DatabaseManager:
     def get_account_info(self, account_no: str) -> Optional[Dict]:
         """계좌 정보 조회"""
         try:
+            self.flush()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM accounts WHERE account_no = ?", (account_no,))
@@ -160,15 +357,13 @@ class DatabaseManager:
     def save_stock_info(self, stock_code: str, stock_name: str, current_price: int):
         """종목 정보 저장"""
         try:
+            params = (stock_code, stock_name, current_price)
+            if self.writer is not None:
+                self.writer.put(STOCK_UPSERT_SQL, params)
+                return True
+            
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                INSERT OR REPLACE INTO stocks 
-                (stock_code, stock_name, current_price, updated_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (stock_code, stock_name, current_price))
-                
-                conn.commit()
+                conn.execute(STOCK_UPSERT_SQL, params)
                 return True
                 
         except Exception as e:
@@ -178,6 +373,7 @@ class DatabaseManager:
     def get_portfolio(self, account_no: str) -> List[Dict]:
         """포트폴리오 조회"""
         try:
+            self.flush()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
@@ -195,52 +391,23 @@ class DatabaseManager:
             return []
     
     def update_portfolio(self, account_no: str, stock_code: str, quantity: int, avg_price: int):
-        """포트폴리오 업데이트"""
+        """포트폴리오 업데이트 (upsert 한 번으로 수량 합산/평균단가 재계산, 0 이하면 삭제)"""
+        return self.update_portfolio_batch(account_no, [(stock_code, quantity, avg_price)])
+    
+    def update_portfolio_batch(self, account_no: str, rows: List[Tuple[str, int, int]]) -> bool:
+        """포트폴리오 일괄 업데이트 - rows: [(종목코드, 수량 변화, 단가)]"""
         try:
+            upserts = [(account_no, stock_code, quantity, avg_price) for stock_code, quantity, avg_price in rows]
+            cleanups = [(account_no, stock_code) for stock_code, _, _ in rows]
+            
+            if self.writer is not None:
+                self.writer.put_statements([(PORTFOLIO_UPSERT_SQL, params) for params in upserts]
+                                           + [(PORTFOLIO_CLEANUP_SQL, params) for params in cleanups])
+                return True
+            
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # 기존 보유량 확인
-                cursor.execute('''
-                SELECT quantity, avg_price FROM portfolio 
-                WHERE account_no = ? AND stock_code = ?
-                ''', (account_no, stock_code))
-                
-                existing = cursor.fetchone()
-                
-                if existing:
-                    # 기존 보유 종목 업데이트
-                    old_qty = existing['quantity']
-                    old_avg = existing['avg_price']
-                    
-                    new_qty = old_qty + quantity
-                    
-                    if new_qty > 0:
-                        # 평균단가 재계산
-                        total_amount = (old_qty * old_avg) + (quantity * avg_price)
-                        new_avg = total_amount // new_qty
-                        
-                        cursor.execute('''
-                        UPDATE portfolio 
-                        SET quantity = ?, avg_price = ?, updated_at = CURRENT_TIMESTAMP
-                        WHERE account_no = ? AND stock_code = ?
-                        ''', (new_qty, new_avg, account_no, stock_code))
-                    else:
-                        # 수량이 0 이하면 삭제
-                        cursor.execute('''
-                        DELETE FROM portfolio 
-                        WHERE account_no = ? AND stock_code = ?
-                        ''', (account_no, stock_code))
-                else:
-                    # 신규 종목 추가
-                    if quantity > 0:
-                        cursor.execute('''
-                        INSERT INTO portfolio 
-                        (account_no, stock_code, quantity, avg_price)
-                        VALUES (?, ?, ?, ?)
-                        ''', (account_no, stock_code, quantity, avg_price))
-                
-                conn.commit()
+                conn.executemany(PORTFOLIO_UPSERT_SQL, upserts)
+                conn.executemany(PORTFOLIO_CLEANUP_SQL, cleanups)
                 return True
                 
         except Exception as e:
@@ -292,6 +459,7 @@ class DatabaseManager:
     def get_orders(self, account_no: str, status: str = None) -> List[Dict]:
         """주문 내역 조회"""
         try:
+            self.flush()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
@@ -321,28 +489,45 @@ class DatabaseManager:
     def save_transaction(self, account_no: str, stock_code: str, transaction_type: str,
                         quantity: int, price: int, fee: int = 0) -> bool:
         """거래 내역 저장"""
+        return self.save_transactions(account_no, [(stock_code, transaction_type, quantity, price, fee)])
+    
+    def save_transactions(self, account_no: str, rows: List[Tuple[str, str, int, int, int]]) -> bool:
+        """거래 내역 일괄 저장 - rows: [(종목코드, 거래구분, 수량, 단가, 수수료)]"""
         try:
+            params = [(account_no, stock_code, transaction_type, quantity, price, quantity * price, fee)
+                      for stock_code, transaction_type, quantity, price, fee in rows]
+            
+            if self.writer is not None:
+                self.writer.put_many(TRANSACTION_INSERT_SQL, params)
+                return True
+            
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                amount = quantity * price
-                
-                cursor.execute('''
-                INSERT INTO transactions 
-                (account_no, stock_code, transaction_type, quantity, price, amount, fee)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (account_no, stock_code, transaction_type, quantity, price, amount, fee))
-                
-                conn.commit()
+                conn.executemany(TRANSACTION_INSERT_SQL, params)
                 return True
                 
         except Exception as e:
             self.logger.error(f"거래 내역 저장 오류: {e}")
             return False
     
+    def save_ticks(self, rows: List[Tuple[str, int, int, str]]) -> bool:
+        """실시간 시세 일괄 저장 - rows: [(종목코드, 가격, 거래량, 체결시각)]"""
+        try:
+            if self.writer is not None:
+                self.writer.put_many(TICK_INSERT_SQL, rows)
+                return True
+            
+            with self.get_connection() as conn:
+                conn.executemany(TICK_INSERT_SQL, rows)
+                return True
+                
+        except Exception as e:
+            self.logger.error(f"시세 저장 오류: {e}")
+            return False
+    
     def get_transactions(self, account_no: str, start_date: str = None) -> List[Dict]:
         """거래 내역 조회"""
         try:
+            self.flush()
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
@@ -379,9 +564,13 @@ class DatabaseManager:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = os.path.join(backup_dir, f"trading_backup_{timestamp}.db")
             
-            # 파일 복사
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            # SQLite 백업 API로 복사 (WAL에 남은 변경분까지 포함)
+            self.flush()
+            backup_conn = sqlite3.connect(backup_path)
+            try:
+                self.get_connection().backup(backup_conn)
+            finally:
+                backup_conn.close()
             
             self.logger.info(f"데이터베이스 백업 완료: {backup_path}")
             return True
@@ -445,5 +634,80 @@ def initialize_database():
         print(f"✗ 데이터베이스 초기화 실패: {e}")
         return False
 
+def benchmark_writes(count: int = 2000, db_dir: str = None) -> Dict[str, float]:
+    """쓰기 처리량 비교 (초당 건수): 기존 방식 vs 연결 재사용/일괄/지연 쓰기
+    
+    한 건 = 체결 1회 (포트폴리오 반영 + 거래 내역 저장)
+    """
+    import tempfile
+    
+    workdir = db_dir or tempfile.mkdtemp(prefix="db_bench_")
+    codes = [f"{i:06d}" for i in range(50)]
+    fills = [(codes[i % len(codes)], 10 + i % 7, 50000 + i % 100) for i in range(count)]
+    account = Config.DEFAULT_ACCOUNT
+    results = {}
+    
+    # 1. 기존 방식: 호출마다 새 연결, SELECT 후 UPDATE/INSERT, 건마다 커밋 (rollback 저널)
+    path = os.path.join(workdir, "legacy.db")
+    DatabaseManager(path).close()
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA journal_mode=DELETE")
+    start = time.perf_counter()
+    for stock_code, quantity, price in fills:
+        conn = sqlite3.connect(path)
+        existing = conn.execute(
+            "SELECT quantity, avg_price FROM portfolio WHERE account_no = ? AND stock_code = ?",
+            (account, stock_code)).fetchone()
+        if existing:
+            new_qty = existing[0] + quantity
+            conn.execute("UPDATE portfolio SET quantity = ?, avg_price = ? WHERE account_no = ? AND stock_code = ?",
+                         (new_qty, (existing[0] * existing[1] + quantity * price) // new_qty, account, stock_code))
+        else:
+            conn.execute("INSERT INTO portfolio (account_no, stock_code, quantity, avg_price) VALUES (?, ?, ?, ?)",
+                         (account, stock_code, quantity, price))
+        conn.commit()
+        conn.close()
+        conn = sqlite3.connect(path)
+        conn.execute(TRANSACTION_INSERT_SQL, (account, stock_code, "매수", quantity, price, quantity * price, 0))
+        conn.commit()
+        conn.close()
+    results['legacy'] = count / (time.perf_counter() - start)
+    
+    # 2. 스레드 연결 재사용 + WAL + upsert (건마다 커밋)
+    db = DatabaseManager(os.path.join(workdir, "pooled.db"))
+    start = time.perf_counter()
+    for stock_code, quantity, price in fills:
+        db.update_portfolio(account, stock_code, quantity, price)
+        db.save_transaction(account, stock_code, "매수", quantity, price)
+    results['pooled'] = count / (time.perf_counter() - start)
+    db.close()
+    
+    # 3. executemany 일괄 (커밋 1회)
+    db = DatabaseManager(os.path.join(workdir, "batch.db"))
+    start = time.perf_counter()
+    db.update_portfolio_batch(account, fills)
+    db.save_transactions(account, [(code, "매수", qty, price, 0) for code, qty, price in fills])
+    results['batch'] = count / (time.perf_counter() - start)
+    db.close()
+    
+    # 4. 지연 쓰기 큐 (호출은 즉시 반환, 커밋은 묶어서)
+    db = DatabaseManager(os.path.join(workdir, "write_behind.db"), write_behind=True)
+    start = time.perf_counter()
+    for stock_code, quantity, price in fills:
+        db.update_portfolio(account, stock_code, quantity, price)
+        db.save_transaction(account, stock_code, "매수", quantity, price)
+    db.flush()
+    results['write_behind'] = count / (time.perf_counter() - start)
+    results['write_behind_commits'] = db.writer.commits
+    db.close()
+    
+    return results
+
 if __name__ == "__main__":
-    initialize_database()
\ No newline at end of file
+    import sys
+    
+    if "--benchmark" in sys.argv:
+        for name, value in benchmark_writes().items():
+            print(f"{name:>22}: {value:,.0f}" + ("" if name.endswith("commits") else " writes/s"))
+    else:
+        initialize_database()
\ No newline at end of file
@@ -0,0 +1,370 @@
+"""
+file: columnar_store.py
+키움증권 주식 데이터 수집기 - 일봉 컬럼 저장소
+Phase 1 MVP
+
+월별 파티션 파일(Parquet, 없으면 pickle) + 매니페스트(JSON)
+- 파티션: month=YYYYMM/part.parquet - 한 달치 전 종목, (종목코드, 날짜) 정렬
+- 매니페스트: 파티션별 종목 행 범위, 종목별 기간/행수/종목명
+- 쓰기: 새 행을 해당 월 파티션에 병합 (같은 날짜는 새 값으로 교체)
+- 읽기: 여러 종목을 필요한 파티션만 한 번씩 읽어 한꺼번에 로드
+"""
+
+import os
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Parquet 엔진 (선택)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+DAILY_COLUMNS = ['날짜', '시가', '고가', '저가', '종가', '거래량']
+PRICE_COLUMNS = ['시가', '고가', '저가', '종가']
+# 파티션 컬럼 타입 (빈 프레임/결측과 concat 해도 object로 바뀌지 않도록 쓰기 전에 고정)
+PARTITION_DTYPES = {'code': str, '날짜': str, **{col: 'float64' for col in PRICE_COLUMNS}, '거래량': 'int64'}
+MANIFEST_NAME = 'manifest.json'
+STORE_VERSION = 1
+
+
+class DailyStore:
+    """월 파티션 일봉 컬럼 저장소"""
+
+    def __init__(self, root: Path, file_format: Optional[str] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+
+        self.manifest_path = self.root / MANIFEST_NAME
+        self.manifest = self._load_manifest()
+
+        # 포맷은 저장소 생성 시 고정 (매니페스트 우선)
+        if 'format' not in self.manifest:
+            self.manifest['format'] = file_format or ('parquet' if PARQUET_AVAILABLE else 'pickle')
+        self.file_format = self.manifest['format']
+        if self.file_format == 'parquet' and not PARQUET_AVAILABLE:
+            raise RuntimeError("❌ Parquet 저장소를 읽으려면 pyarrow가 필요합니다. pip install pyarrow를 실행하세요.")
+
+        # 아직 파티션에 반영하지 않은 행 (flush 전)
+        self._pending: Dict[str, List[pd.DataFrame]] = defaultdict(list)
+
+    # ------------------------------------------------------------------
+    # 매니페스트
+    # ------------------------------------------------------------------
+    def _load_manifest(self) -> Dict:
+        self._manifest_mtime = self._stat_manifest()
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'version': STORE_VERSION, 'partitions': {}, 'codes': {}}
+
+    def _stat_manifest(self) -> float:
+        try:
+            return self.manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def refresh(self) -> bool:
+        """다른 프로세스가 매니페스트를 갱신했으면 다시 읽음 (stat 한 번)"""
+        with self._lock:
+            if self._pending or self._stat_manifest() == self._manifest_mtime:
+                return False
+            self.manifest = self._load_manifest()
+            return True
+
+    def _save_manifest(self):
+        self.manifest['updated_at'] = datetime.now().isoformat()
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_mtime = self._stat_manifest()
+
+    def partition_path(self, month: str) -> Path:
+        suffix = 'parquet' if self.file_format == 'parquet' else 'pkl'
+        return self.root / f"month={month}" / f"part.{suffix}"
+
+    def partition_mtime(self, month: str) -> float:
+        """파티션 파일 수정 시각 (없으면 0)"""
+        info = self.manifest['partitions'].get(month)
+        return info['mtime'] if info else 0.0
+
+    def version(self, stock_code: str) -> tuple:
+        """종목 데이터 버전 (걸친 파티션들의 수정 시각) - 캐시 무효화 기준"""
+        return tuple(self.partition_mtime(month) for month in self.months(stock_code))
+
+    def months(self, stock_code: Optional[str] = None) -> List[str]:
+        if stock_code is None:
+            return sorted(self.manifest['partitions'])
+        info = self.manifest['codes'].get(stock_code)
+        return list(info['months']) if info else []
+
+    def codes(self) -> List[str]:
+        return sorted(self.manifest['codes'])
+
+    def has(self, stock_code: str) -> bool:
+        return stock_code in self.manifest['codes']
+
+    def info(self, stock_code: str) -> Optional[Dict]:
+        return self.manifest['codes'].get(stock_code)
+
+    # ------------------------------------------------------------------
+    # 파티션 입출력
+    # ------------------------------------------------------------------
+    def _read_partition(self, month: str) -> pd.DataFrame:
+        path = self.partition_path(month)
+        if not path.exists():
+            return self._cast(pd.DataFrame(columns=['code'] + DAILY_COLUMNS))
+        if self.file_format == 'parquet':
+            return pq.read_table(path).to_pandas()
+        return pd.read_pickle(path)
+
+    def _write_partition(self, month: str, frame: pd.DataFrame):
+        path = self.partition_path(month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        if self.file_format == 'parquet':
+            pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp_path, compression='zstd')
+        else:
+            frame.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+        # 종목별 행 범위 (code 정렬 상태)
+        codes = frame['code'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+        stops = np.r_[starts[1:], len(codes)]
+        self.manifest['partitions'][month] = {
+            'file': str(path.relative_to(self.root)),
+            'rows': int(len(frame)),
+            'mtime': path.stat().st_mtime,
+            'codes': {codes[s]: [int(s), int(e)] for s, e in zip(starts, stops)},
+        }
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _cast(frame: pd.DataFrame) -> pd.DataFrame:
+        """파티션 컬럼 타입 고정 (가격 float64, 거래량 int64, 코드/날짜 str)"""
+        frame = frame.copy()
+        frame['거래량'] = pd.to_numeric(frame['거래량'], errors='coerce').fillna(0)
+        return frame.astype(PARTITION_DTYPES)
+
+    @staticmethod
+    def _restore_int_prices(frame: pd.DataFrame) -> pd.DataFrame:
+        """가격 컬럼을 CSV 로드와 같은 타입으로 (결측 없이 모두 정수면 int64, 아니면 float64 유지)"""
+        for col in PRICE_COLUMNS:
+            values = frame[col].to_numpy()
+            if not np.isnan(values).any() and np.array_equal(values, np.trunc(values)):
+                frame[col] = values.astype(np.int64)
+        return frame
+
+    @staticmethod
+    def _normalize(stock_code: str, data: pd.DataFrame) -> pd.DataFrame:
+        frame = data[DAILY_COLUMNS].copy()
+        frame['날짜'] = frame['날짜'].astype(str).str.replace('-', '', regex=False).str.strip()
+        for col in PRICE_COLUMNS + ['거래량']:
+            frame[col] = pd.to_numeric(frame[col], errors='coerce')
+        frame.insert(0, 'code', stock_code)
+        return frame
+
+    def append(self, stock_code: str, data: pd.DataFrame, stock_name: Optional[str] = None) -> int:
+        """행 추가 예약 (flush 시 월 파티션에 병합) -> 예약한 행 수"""
+        if data is None or data.empty:
+            return 0
+        frame = self._normalize(stock_code, data)
+        with self._lock:
+            for month, part in frame.groupby(frame['날짜'].str[:6], sort=False):
+                self._pending[month].append(part)
+            if stock_name:
+                self.manifest['codes'].setdefault(stock_code, {'months': []})['name'] = stock_name
+        return len(frame)
+
+    def flush(self) -> int:
+        """예약된 행을 월 파티션에 병합 -> 다시 쓴 파티션 수"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, defaultdict(list)
+            touched_codes = set()
+
+            for month, parts in pending.items():
+                incoming = pd.concat(parts, ignore_index=True)
+                touched_codes.update(incoming['code'].unique())
+                existing = self._read_partition(month)
+                # 새 달(빈 파티션)은 concat 하지 않음 - 빈 프레임과 합치면 컬럼이 object로 바뀜
+                merged = pd.concat([existing, incoming], ignore_index=True) if len(existing) else incoming
+                merged = (merged.drop_duplicates(subset=['code', '날짜'], keep='last')
+                          .sort_values(['code', '날짜'], kind='stable')
+                          .reset_index(drop=True))
+                self._write_partition(month, self._cast(merged))
+
+            self._refresh_code_index(touched_codes)
+            self._save_manifest()
+            self.logger.debug(f"💾 일봉 저장소 반영: 파티션 {len(pending)}개, 종목 {len(touched_codes)}개")
+            return len(pending)
+
+    def write(self, stock_code: str, data: pd.DataFrame, stock_name: Optional[str] = None) -> int:
+        """단일 종목 즉시 저장 (append + flush)"""
+        rows = self.append(stock_code, data, stock_name)
+        self.flush()
+        return rows
+
+    def _refresh_code_index(self, stock_codes: Iterable[str]):
+        """매니페스트의 종목별 기간/행수 재계산 (파티션 행 범위 기준)"""
+        partitions = self.manifest['partitions']
+        for code in stock_codes:
+            months = sorted(m for m, p in partitions.items() if code in p['codes'])
+            entry = self.manifest['codes'].setdefault(code, {})
+            if not months:
+                self.manifest['codes'].pop(code, None)
+                continue
+            entry['months'] = months
+            entry['rows'] = sum(partitions[m]['codes'][code][1] - partitions[m]['codes'][code][0] for m in months)
+            entry['first_month'] = months[0]
+            entry['last_month'] = months[-1]
+
+    def delete(self, stock_code: str) -> bool:
+        """종목 데이터 삭제 (해당 파티션만 다시 씀)"""
+        with self._lock:
+            months = self.months(stock_code)
+            if not months:
+                return False
+            for month in months:
+                frame = self._read_partition(month)
+                frame = frame[frame['code'] != stock_code].reset_index(drop=True)
+                if frame.empty:
+                    self.partition_path(month).unlink(missing_ok=True)
+                    self.manifest['partitions'].pop(month, None)
+                else:
+                    self._write_partition(month, frame)
+            self.manifest['codes'].pop(stock_code, None)
+            self._save_manifest()
+            return True
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def load(self, stock_code: str) -> Optional[pd.DataFrame]:
+        return self.load_many([stock_code]).get(stock_code)
+
+    def load_many(self, stock_codes: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """여러 종목 일괄 로드 - 필요한 파티션을 한 번씩만 읽음"""
+        wanted = [code for code in dict.fromkeys(stock_codes) if self.months(code)]
+        if not wanted:
+            return {}
+
+        with self._lock:
+            by_month: Dict[str, List[str]] = defaultdict(list)
+            for code in wanted:
+                for month in self.manifest['codes'][code]['months']:
+                    by_month[month].append(code)
+
+            # 파티션마다 필요한 종목 행만 한 번에 추출 (월 오름차순)
+            parts = []
+            for month in sorted(by_month):
+                ranges = self.manifest['partitions'][month]['codes']
+                index = np.concatenate([np.arange(*ranges[code]) for code in by_month[month]])
+                parts.append(self._read_partition(month).take(index))
+
+        if not parts:
+            return {}
+
+        # 종목 기준 안정 정렬 -> 종목별 구간으로 분할 (월 순서 = 날짜 순서 유지)
+        combined = pd.concat(parts, ignore_index=True)
+        codes = combined['code'].to_numpy()
+        order = np.argsort(codes, kind='stable')
+        combined = combined.take(order)[DAILY_COLUMNS].reset_index(drop=True)
+        codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        stops = np.r_[starts[1:], len(codes)]
+
+        result = {}
+        for start, stop in zip(starts, stops):
+            result[codes[start]] = self._restore_int_prices(combined.iloc[start:stop].reset_index(drop=True))
+        return result
+
+    # ------------------------------------------------------------------
+    # 이관
+    # ------------------------------------------------------------------
+    def migrate_csv_tree(self, daily_path: Path, encoding: str = 'utf-8-sig', validate=None) -> Dict:
+        """기존 종목별 일봉 CSV 트리 가져오기
+
+        같은 종목의 파일이 여러 개면 오래된 파일부터 병합 (겹치는 날짜는 최신 파일 값)
+        validate: 선택적 검증 함수 (DataFrame -> DataFrame 또는 None)
+        """
+        files_by_code: Dict[str, List[Path]] = defaultdict(list)
+        for file_path in Path(daily_path).glob("*_daily_*.csv"):
+            parts = file_path.stem.split('_')
+            if len(parts) >= 5:
+                files_by_code[parts[0]].append(file_path)
+
+        stats = {'codes': 0, 'files': 0, 'rows': 0, 'failed': []}
+        for code, files in sorted(files_by_code.items()):
+            for file_path in sorted(files, key=lambda f: f.stat().st_mtime):
+                try:
+                    data = pd.read_csv(file_path, encoding=encoding, dtype={'날짜': str})
+                    if validate is not None:
+                        data = validate(data)
+                    if data is None or data.empty:
+                        continue
+                    stats['rows'] += self.append(code, data, stock_name=file_path.stem.split('_')[1])
+                    stats['files'] += 1
+                except Exception as e:
+                    self.logger.warning(f"⚠️ 이관 실패 ({file_path.name}): {e}")
+                    stats['failed'].append(file_path.name)
+            stats['codes'] += 1
+
+        stats['partitions'] = self.flush()
+        self.logger.info(f"✅ CSV 이관 완료: 종목 {stats['codes']}개, 파일 {stats['files']}개, {stats['rows']:,}행")
+        return stats
+
+    def get_summary(self) -> Dict:
+        partitions = self.manifest['partitions']
+        total_size = sum(self.partition_path(m).stat().st_size for m in partitions if self.partition_path(m).exists())
+        return {
+            'format': self.file_format,
+            'root': str(self.root),
+            'partitions': len(partitions),
+            'codes': len(self.manifest['codes']),
+            'rows': sum(p['rows'] for p in partitions.values()),
+            'total_size': total_size,
+        }
+
+
+if __name__ == "__main__":
+    # CSV 트리 이관 도구: python columnar_store.py [--format parquet|pickle]
+    import argparse
+    from config import get_config
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="일봉 CSV 파일을 월 파티션 컬럼 저장소로 이관")
+    parser.add_argument('--source', help="일봉 CSV 디렉토리 (기본: CSV_SAVE_PATH/daily)")
+    parser.add_argument('--target', help="저장소 디렉토리 (기본: CSV_SAVE_PATH/store/daily)")
+    parser.add_argument('--format', choices=['parquet', 'pickle'], help="파티션 파일 포맷")
+    args = parser.parse_args()
+
+    config = get_config()
+    source = Path(args.source) if args.source else config.CSV_SAVE_PATH / 'daily'
+    target = Path(args.target) if args.target else config.CSV_SAVE_PATH / 'store' / 'daily'
+
+    print(f"📦 CSV 이관: {source} -> {target}")
+    store = DailyStore(target, file_format=args.format)
+    result = store.migrate_csv_tree(source, encoding=config.CSV_ENCODING)
+    print(f"✅ 종목 {result['codes']}개, 파일 {result['files']}개, {result['rows']:,}행, 파티션 {result['partitions']}개")
+    if result['failed']:
+        print(f"⚠️ 실패한 파일: {len(result['failed'])}개")
+    print(f"📈 저장소: {store.get_summary()}")
@@ -57,6 +57,7 @@ class Config:
         self.MAX_RETRY_COUNT = int(os.getenv('MAX_RETRY_COUNT', '3'))
         self.API_TIMEOUT = int(os.getenv('API_TIMEOUT', '30'))
         self.DATA_VALIDATION = os.getenv('DATA_VALIDATION', 'true').lower() == 'true'
+        self.CACHE_MAX_MB = int(os.getenv('CACHE_MAX_MB', '256'))  # 일봉 캐시 메모리 예산
         
         # 데이터 수집 제한값 검증
         if self.DEFAULT_PERIOD_DAYS > self.MAX_PERIOD_DAYS:
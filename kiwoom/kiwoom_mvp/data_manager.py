@@ -3,7 +3,7 @@ file: main.py
 키움증권 주식 데이터 수집기 - 데이터 관리자
 Phase 1 MVP
 
-CSV 파일 저장/로드, 데이터 검증, 파일 관리 기능
+월 파티션 컬럼 저장소 저장/로드, CSV 내보내기/이관, 데이터 검증, 파일 관리 기능
 수집된 주식 데이터의 저장소 역할
 """
 
@@ -16,6 +16,9 @@ from typing import Dict, List, Optional, Tuple, Any
 import pandas as pd
 import numpy as np
 from config import get_config
+from columnar_store import DailyStore
+from frame_cache import FrameCache
+from data_validator import DailyDataValidator, REQUIRED_COLUMNS
 
 class DataManager:
     """주식 데이터 관리 클래스"""
@@ -34,10 +37,16 @@ class DataManager:
         # 디렉토리 생성
         self._create_directories()
         
-        # 데이터 캐시
-        self.data_cache: Dict[str, pd.DataFrame] = {}
-        self.cache_timestamps: Dict[str, datetime] = {}
-        self.cache_max_age = timedelta(minutes=30)  # 30분 캐시
+        # 일봉 저장소 (월 파티션 컬럼 파일 + 매니페스트)
+        self.store = DailyStore(self.csv_base_path / 'store' / 'daily')
+        self.export_csv = False  # True면 저장 시 날짜 범위 CSV 파일도 생성
+        
+        # 데이터 캐시 (바이트 예산 LRU, 읽기 전용 뷰 반환, 파티션 수정 시각으로 무효화)
+        self.cache = FrameCache(max_bytes=self.config.CACHE_MAX_MB * 1024 * 1024)
+        
+        # 데이터 검증기 (오류 행 제거, 최근 문제 테이블 보관)
+        self.validator = DailyDataValidator(policy='drop')
+        self.last_issues: Optional[pd.DataFrame] = None
     
     def _create_directories(self):
         """필요한 디렉토리 생성"""
@@ -54,176 +63,156 @@ class DataManager:
         self.logger.debug(f"📁 디렉토리 생성 완료: {len(directories)}개")
     
     def save_daily_data(self, stock_code: str, stock_name: str, data: pd.DataFrame,
-                       start_date: str = None, end_date: str = None) -> Optional[str]:
-        """일봉 데이터를 CSV 파일로 저장"""
+                       start_date: str = None, end_date: str = None,
+                       export_csv: bool = None) -> Optional[str]:
+        """일봉 데이터 저장 (월 파티션 컬럼 저장소에 병합, 선택적으로 CSV 내보내기)"""
         try:
             if data is None or data.empty:
                 self.logger.warning(f"⚠️ {stock_code} 저장할 데이터가 없습니다.")
                 return None
             
-            # 날짜 범위 자동 계산 (데이터에서 추출)
-            if start_date is None or end_date is None:
-                dates = data['날짜'].tolist()
-                start_date = min(dates)
-                end_date = max(dates)
-            
-            # 파일명 생성
-            filename = self.config.get_csv_filename(
-                stock_code, stock_name, start_date, end_date, 'daily'
-            )
-            filepath = self.daily_path / filename
-            
             # 데이터 검증
             validated_data = self._validate_daily_data(data)
             if validated_data is None:
                 self.logger.error(f"❌ {stock_code} 데이터 검증 실패")
                 return None
             
-            # 기존 파일 백업 (덮어쓰기 전)
-            if filepath.exists():
-                self._backup_file(filepath)
+            # 저장소에 병합 (같은 날짜는 새 값으로 교체, 해당 월 파티션만 다시 씀)
+            self.store.write(stock_code, validated_data, stock_name)
+            saved_path = str(self.store.root)
             
-            # CSV 저장
-            validated_data.to_csv(
-                filepath,
-                index=False,
-                encoding=self.config.CSV_ENCODING
-            )
+            # CSV 내보내기 (선택)
+            if self.export_csv if export_csv is None else export_csv:
+                saved_path = self.export_daily_csv(stock_code, stock_name, validated_data, start_date, end_date)
+                if saved_path is None:
+                    return None
             
-            # 저장 후 검증
-            if self._verify_saved_file(filepath):
-                self.logger.info(f"✅ {stock_name}({stock_code}) 일봉 데이터 저장: {filename}")
-                
-                # 캐시 업데이트
-                cache_key = f"daily_{stock_code}"
-                self.data_cache[cache_key] = validated_data.copy()
-                self.cache_timestamps[cache_key] = datetime.now()
-                
-                return str(filepath)
-            else:
-                self.logger.error(f"❌ {stock_code} 파일 저장 검증 실패")
-                return None
+            self.logger.info(f"✅ {stock_name}({stock_code}) 일봉 데이터 저장: {len(validated_data)}개")
+            
+            # 캐시 업데이트 (저장소 전체 기간으로 다시 읽도록 무효화)
+            self._invalidate_cache(stock_code)
+            
+            return saved_path
                 
         except Exception as e:
             self.logger.error(f"❌ {stock_code} 일봉 데이터 저장 실패: {e}")
             return None
     
+    def export_daily_csv(self, stock_code: str, stock_name: str, data: pd.DataFrame,
+                         start_date: str = None, end_date: str = None) -> Optional[str]:
+        """일봉 데이터를 날짜 범위 CSV 파일로 내보내기"""
+        # 날짜 범위 자동 계산 (데이터에서 추출)
+        if start_date is None or end_date is None:
+            start_date = data['날짜'].min()
+            end_date = data['날짜'].max()
+        
+        filename = self.config.get_csv_filename(
+            stock_code, stock_name, start_date, end_date, 'daily'
+        )
+        filepath = self.daily_path / filename
+        
+        # 기존 파일 백업 (덮어쓰기 전)
+        if filepath.exists():
+            self._backup_file(filepath)
+        
+        data.to_csv(filepath, index=False, encoding=self.config.CSV_ENCODING)
+        
+        if not self._verify_saved_file(filepath):
+            self.logger.error(f"❌ {stock_code} 파일 저장 검증 실패")
+            return None
+        return str(filepath)
+    
     def load_daily_data(self, stock_code: str, use_cache: bool = True) -> Optional[pd.DataFrame]:
-        """일봉 데이터 로드"""
+        """일봉 데이터 로드 (캐시 적중 시 읽기 전용 뷰 - 수정하려면 .copy())"""
+        return self.load_daily_data_many([stock_code], use_cache=use_cache).get(stock_code)
+    
+    def load_daily_data_many(self, stock_codes: List[str], use_cache: bool = True) -> Dict[str, pd.DataFrame]:
+        """여러 종목 일봉 일괄 로드 - 저장소는 필요한 월 파티션을 한 번씩만 읽음"""
+        result = {}
+        missing = []
+        
+        # 캐시 확인 (다른 프로세스의 저장도 반영되도록 매니페스트 갱신 여부 확인)
+        if use_cache:
+            self.store.refresh()
+        for stock_code in stock_codes:
+            cached_data = self._get_cached_data(f"daily_{stock_code}", self.store.version(stock_code)) if use_cache else None
+            if cached_data is not None:
+                result[stock_code] = cached_data
+            else:
+                missing.append(stock_code)
+        
+        if not missing:
+            return result
+        
         try:
-            # 캐시 확인
-            if use_cache:
-                cached_data = self._get_cached_data(f"daily_{stock_code}")
-                if cached_data is not None:
-                    self.logger.debug(f"📊 {stock_code} 캐시에서 일봉 데이터 로드")
-                    return cached_data
-            
-            # 최신 파일 찾기
-            latest_file = self._find_latest_daily_file(stock_code)
-            if not latest_file:
-                self.logger.warning(f"⚠️ {stock_code} 일봉 데이터 파일을 찾을 수 없습니다.")
-                return None
+            # 저장소 데이터는 저장 시 검증을 거쳤으므로 그대로 사용
+            loaded = self.store.load_many(missing)
             
-            # CSV 파일 로드
-            data = pd.read_csv(latest_file, encoding=self.config.CSV_ENCODING)
+            # 저장소에 없는 종목은 기존 CSV에서 읽어 저장소로 가져옴
+            for stock_code in missing:
+                if stock_code not in loaded:
+                    data = self._load_legacy_csv(stock_code)
+                    if data is not None:
+                        loaded[stock_code] = data
             
-            # 데이터 검증
-            validated_data = self._validate_daily_data(data)
-            if validated_data is None:
-                self.logger.error(f"❌ {stock_code} 로드된 데이터 검증 실패")
-                return None
+            for stock_code, data in loaded.items():
+                result[stock_code] = self.cache.put(f"daily_{stock_code}", data, self.store.version(stock_code))
             
-            # 캐시 저장
-            cache_key = f"daily_{stock_code}"
-            self.data_cache[cache_key] = validated_data.copy()
-            self.cache_timestamps[cache_key] = datetime.now()
-            
-            self.logger.info(f"✅ {stock_code} 일봉 데이터 로드: {len(validated_data)}개")
-            return validated_data
+            not_found = [code for code in missing if code not in loaded]
+            if not_found:
+                self.logger.warning(f"⚠️ 일봉 데이터를 찾을 수 없습니다: {', '.join(not_found[:10])}")
+            self.logger.info(f"✅ 일봉 데이터 로드: {len(loaded)}개 종목")
             
         except Exception as e:
-            self.logger.error(f"❌ {stock_code} 일봉 데이터 로드 실패: {e}")
+            self.logger.error(f"❌ 일봉 데이터 로드 실패: {e}")
+        
+        return result
+    
+    def _load_legacy_csv(self, stock_code: str) -> Optional[pd.DataFrame]:
+        """이관 전 CSV 파일 로드 후 저장소에 반영"""
+        latest_file = self._find_latest_daily_file(stock_code)
+        if not latest_file:
             return None
+        
+        data = pd.read_csv(latest_file, encoding=self.config.CSV_ENCODING, dtype={'날짜': str})
+        validated_data = self._validate_daily_data(data)
+        if validated_data is None:
+            self.logger.error(f"❌ {stock_code} 로드된 데이터 검증 실패")
+            return None
+        
+        stock_name = latest_file.stem.split('_')[1]
+        self.store.write(stock_code, validated_data, stock_name)
+        return self.store.load(stock_code)
+    
+    def migrate_csv_files(self) -> Dict:
+        """기존 일봉 CSV 트리를 저장소로 일괄 이관"""
+        result = self.store.migrate_csv_tree(
+            self.daily_path, encoding=self.config.CSV_ENCODING, validate=self._validate_daily_data
+        )
+        self.clear_cache()
+        return result
+    
+    def _invalidate_cache(self, stock_code: str):
+        """종목 캐시 제거"""
+        self.cache.invalidate(f"daily_{stock_code}")
     
     def _validate_daily_data(self, data: pd.DataFrame) -> Optional[pd.DataFrame]:
-        """일봉 데이터 검증 및 정리"""
+        """일봉 데이터 검증 및 정리 (벡터화 검증기, 오류 행 제거 / 중복 날짜는 마지막 유지)"""
         if data is None or data.empty:
             return None
         
         try:
             # 필수 컬럼 확인
-            required_columns = ['날짜', '시가', '고가', '저가', '종가', '거래량']
-            missing_columns = [col for col in required_columns if col not in data.columns]
-            
+            missing_columns = [col for col in REQUIRED_COLUMNS if col not in data.columns]
             if missing_columns:
                 self.logger.error(f"❌ 필수 컬럼 누락: {missing_columns}")
                 return None
             
-            # 데이터 복사
-            validated_data = data.copy()
-            
-            # 날짜 형식 통일 (YYYY-MM-DD 또는 YYYYMMDD)
-            validated_data['날짜'] = validated_data['날짜'].astype(str)
-            validated_data['날짜'] = validated_data['날짜'].apply(self._normalize_date_format)
-            
-            # 숫자형 컬럼 변환
-            numeric_columns = ['시가', '고가', '저가', '종가', '거래량']
-            for col in numeric_columns:
-                validated_data[col] = pd.to_numeric(validated_data[col], errors='coerce')
-            
-            # 결측값 확인
-            null_counts = validated_data[required_columns].isnull().sum()
-            if null_counts.sum() > 0:
-                self.logger.warning(f"⚠️ 결측값 발견: {null_counts[null_counts > 0].to_dict()}")
-                
-                # 결측값이 있는 행 제거
-                validated_data = validated_data.dropna(subset=required_columns)
-            
-            # 데이터 정합성 검증
-            invalid_rows = []
-            
-            # 가격 데이터 검증 (시가, 고가, 저가, 종가 > 0)
-            price_cols = ['시가', '고가', '저가', '종가']
-            for idx, row in validated_data.iterrows():
-                # 음수 가격 확인
-                if any(row[col] <= 0 for col in price_cols):
-                    invalid_rows.append(idx)
-                    continue
-                
-                # 고가 >= 저가 확인
-                if row['고가'] < row['저가']:
-                    invalid_rows.append(idx)
-                    continue
-                
-                # 시가, 종가가 고가-저가 범위 내에 있는지 확인
-                if not (row['저가'] <= row['시가'] <= row['고가']):
-                    invalid_rows.append(idx)
-                    continue
-                
-                if not (row['저가'] <= row['종가'] <= row['고가']):
-                    invalid_rows.append(idx)
-                    continue
-                
-                # 거래량 검증 (음수 불가)
-                if row['거래량'] < 0:
-                    invalid_rows.append(idx)
-                    continue
-            
-            # 잘못된 데이터 제거
-            if invalid_rows:
-                self.logger.warning(f"⚠️ 잘못된 데이터 {len(invalid_rows)}개 제거")
-                validated_data = validated_data.drop(invalid_rows)
+            validated_data, issues = self.validator.validate(data[REQUIRED_COLUMNS])
+            self.last_issues = issues
             
-            # 날짜순 정렬 (과거 → 현재)
-            validated_data = validated_data.sort_values('날짜').reset_index(drop=True)
-            
-            # 중복 날짜 제거 (최신 데이터 유지)
-            before_count = len(validated_data)
-            validated_data = validated_data.drop_duplicates(subset=['날짜'], keep='last').reset_index(drop=True)
-            after_count = len(validated_data)
-            
-            if before_count != after_count:
-                self.logger.warning(f"⚠️ 중복 날짜 {before_count - after_count}개 제거")
+            if not issues.empty:
+                self.logger.warning(f"⚠️ 데이터 검증 문제: {self.validator.summarize(issues)}")
             
             if len(validated_data) == 0:
                 self.logger.error("❌ 검증 후 유효한 데이터가 없습니다.")
@@ -235,28 +224,18 @@ class DataManager:
             self.logger.error(f"❌ 데이터 검증 중 오류: {e}")
             return None
     
-    def _normalize_date_format(self, date_str: str) -> str:
-        """날짜 형식 정규화 (YYYYMMDD)"""
-        try:
-            # 공백 제거
-            date_str = str(date_str).strip()
-            
-            # 이미 YYYYMMDD 형식인 경우
-            if len(date_str) == 8 and date_str.isdigit():
-                return date_str
-            
-            # YYYY-MM-DD 형식인 경우
-            if len(date_str) == 10 and '-' in date_str:
-                return date_str.replace('-', '')
-            
-            # 기타 형식 시도
-            from datetime import datetime
-            parsed_date = datetime.strptime(date_str, '%Y%m%d')
-            return parsed_date.strftime('%Y%m%d')
-            
-        except:
-            # 파싱 실패시 원본 반환
-            return date_str
+    def check_daily_data(self, stock_codes: List[str] = None) -> pd.DataFrame:
+        """저장된 일봉 일괄 점검 (수정 없음) -> 문제 테이블 (code, 날짜, rule, value)"""
+        stock_codes = stock_codes or self.store.codes()
+        frames = self.store.load_many(stock_codes)
+        if not frames:
+            return self.validator.issue_table(pd.DataFrame(columns=['code', '날짜']), {}, {})
+        
+        combined = pd.concat(frames.values(), keys=list(frames.keys()), names=['code', None]).reset_index(0)
+        frame, masks, values = self.validator.check(combined)
+        issues = self.validator.issue_table(frame, masks, values)
+        self.logger.info(f"📋 일봉 점검: {len(frames)}개 종목, {len(combined):,}행, 문제 {len(issues)}건")
+        return issues
     
     def _find_latest_daily_file(self, stock_code: str) -> Optional[Path]:
         """특정 종목의 최신 일봉 파일 찾기"""
@@ -318,28 +297,19 @@ class DataManager:
             self.logger.error(f"❌ 파일 검증 실패: {e}")
             return False
     
-    def _get_cached_data(self, cache_key: str) -> Optional[pd.DataFrame]:
-        """캐시된 데이터 조회"""
-        if cache_key not in self.data_cache:
-            return None
-        
-        # 캐시 만료 확인
-        if cache_key in self.cache_timestamps:
-            cache_age = datetime.now() - self.cache_timestamps[cache_key]
-            if cache_age > self.cache_max_age:
-                # 만료된 캐시 제거
-                del self.data_cache[cache_key]
-                del self.cache_timestamps[cache_key]
-                return None
-        
-        return self.data_cache[cache_key].copy()
+    def _get_cached_data(self, cache_key: str, version: Any = None) -> Optional[pd.DataFrame]:
+        """캐시된 데이터 조회 (버전이 바뀌었으면 None)"""
+        return self.cache.get(cache_key, version)
     
     def clear_cache(self):
         """캐시 초기화"""
-        self.data_cache.clear()
-        self.cache_timestamps.clear()
+        self.cache.clear()
         self.logger.info("🧹 데이터 캐시 초기화 완료")
     
+    def get_cache_stats(self) -> Dict:
+        """캐시 통계 (적중/실패/축출/무효화)"""
+        return self.cache.get_stats()
+    
     def get_stock_file_list(self, stock_code: str = None) -> List[Dict]:
         """종목별 파일 목록 조회"""
         try:
@@ -397,6 +367,10 @@ class DataManager:
         try:
             deleted_count = 0
             
+            # 저장소에서 제거 (해당 월 파티션만 다시 씀)
+            if self.store.delete(stock_code):
+                deleted_count += 1
+            
             # 해당 종목의 모든 파일 찾기
             patterns = [
                 f"{stock_code}_*_daily_*.csv",
@@ -419,11 +393,7 @@ class DataManager:
                         self.logger.warning(f"⚠️ 파일 삭제 실패 ({file_path.name}): {e}")
             
             # 캐시에서도 제거
-            cache_keys_to_remove = [key for key in self.data_cache.keys() if stock_code in key]
-            for key in cache_keys_to_remove:
-                del self.data_cache[key]
-                if key in self.cache_timestamps:
-                    del self.cache_timestamps[key]
+            self._invalidate_cache(stock_code)
             
             if deleted_count > 0:
                 self.logger.info(f"✅ {stock_code} 데이터 파일 삭제 완료: {deleted_count}개")
@@ -470,10 +440,8 @@ class DataManager:
                 'total_size': 0,
                 'stocks': {},
                 'date_range': {},
-                'cache_status': {
-                    'cached_items': len(self.data_cache),
-                    'cache_size': sum(df.memory_usage(deep=True).sum() for df in self.data_cache.values()) if self.data_cache else 0
-                }
+                'store': self.store.get_summary(),
+                'cache_status': self.cache.get_stats()
             }
             
             # 파일 정보 수집
@@ -0,0 +1,233 @@
+"""
+file: data_validator.py
+키움증권 주식 데이터 수집기 - 일봉 데이터 검증기
+Phase 1 MVP
+
+모든 규칙을 프레임 전체(여러 종목 포함)에 대한 벡터화 불리언 마스크로 계산
+- 결과는 문제 테이블 (code, 날짜, rule, value)
+- 오류 규칙은 복구 정책(drop/clip/keep)에 따라 자동 수정, 경고 규칙은 기록만
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLUMNS = ['날짜', '시가', '고가', '저가', '종가', '거래량']
+PRICE_COLUMNS = ['시가', '고가', '저가', '종가']
+
+# 규칙 -> (심각도, 설명)
+RULES = {
+    'missing_value': ('error', '필수 값 결측'),
+    'bad_date': ('error', '날짜 형식 오류'),
+    'non_positive_price': ('error', '0 이하 가격'),
+    'high_below_low': ('error', '고가 < 저가'),
+    'open_out_of_range': ('error', '시가가 고가-저가 범위 밖'),
+    'close_out_of_range': ('error', '종가가 고가-저가 범위 밖'),
+    'negative_volume': ('error', '음수 거래량'),
+    'duplicate_date': ('error', '중복 날짜 (마지막 행 유지)'),
+    'price_jump': ('warning', '전일 대비 종가 변동 한도 초과'),
+    'date_gap': ('warning', '거래일 간격 과다'),
+    'zero_volume': ('warning', '거래량 0 (거래정지 의심)'),
+}
+
+# 복구 정책: drop(행 제거), clip(값 보정), keep(기록만)
+POLICY_DROP = {rule: 'drop' for rule, (severity, _) in RULES.items() if severity == 'error'}
+POLICY_CLIP = {
+    **POLICY_DROP,
+    'high_below_low': 'clip',       # 고가/저가 교환
+    'open_out_of_range': 'clip',    # 고가-저가 범위로 자르기
+    'close_out_of_range': 'clip',
+    'negative_volume': 'clip',      # 0으로
+}
+POLICIES = {'drop': POLICY_DROP, 'clip': POLICY_CLIP, 'report': {}}
+
+ISSUE_COLUMNS = ['code', '날짜', 'rule', 'value']
+
+
+def dates_to_days(dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """YYYYMMDD 정수 -> (epoch 일수, 유효 여부)"""
+    year, month, day = dates // 10000, dates // 100 % 100, dates % 100
+    valid = (year >= 1900) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+    year, month, day = np.where(valid, year, 1970), np.where(valid, month, 1), np.where(valid, day, 1)
+    days = ((year - 1970).astype('datetime64[Y]').astype('datetime64[M]')
+            + (month - 1).astype('timedelta64[M]')).astype('datetime64[D]') + (day - 1).astype('timedelta64[D]')
+    days = days.astype(np.int64)
+    # 31일이 없는 달 등 (다음 달로 넘어간 경우)
+    roundtrip = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) % 12 + 1
+    valid &= roundtrip == month
+    return days, valid
+
+
+def normalize_dates(values: pd.Series) -> np.ndarray:
+    """날짜 컬럼 -> YYYYMMDD 정수 (해석 불가 값은 0)"""
+    if pd.api.types.is_integer_dtype(values):
+        return values.to_numpy(dtype=np.int64)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return (values.dt.year * 10000 + values.dt.month * 100 + values.dt.day).fillna(0).to_numpy(dtype=np.int64)
+    text = values.astype(str).str.strip().str.replace('-', '', regex=False)
+    return pd.to_numeric(text, errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+
+
+class DailyDataValidator:
+    """일봉 데이터 벡터화 검증기"""
+
+    def __init__(self, policy='drop', max_change: float = 0.3, max_gap_days: int = 14):
+        self.policy = POLICIES[policy] if isinstance(policy, str) else dict(policy)
+        self.max_change = max_change      # 전일 대비 종가 변동 한도 (KRX 가격제한폭 30%)
+        self.max_gap_days = max_gap_days  # 연속 거래일 사이 최대 달력 일수
+        self.logger = logging.getLogger(__name__)
+
+    def check(self, data: pd.DataFrame, code: Optional[str] = None
+              ) -> Tuple[pd.DataFrame, Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """검증만 수행 -> (정렬된 프레임, 규칙별 행 마스크, 규칙별 기록 값)
+
+        data에 'code' 컬럼이 있으면 여러 종목을 한 번에 검증 (종목 경계는 넘지 않음)
+        """
+        frame = data.copy()
+        if 'code' not in frame.columns:
+            frame.insert(0, 'code', code or '')
+
+        dates = normalize_dates(frame['날짜'])
+        days, date_ok = dates_to_days(dates)
+        frame['날짜'] = dates
+        for col in PRICE_COLUMNS + ['거래량']:
+            if not pd.api.types.is_numeric_dtype(frame[col]):
+                frame[col] = pd.to_numeric(frame[col], errors='coerce')
+
+        # (종목, 날짜) 정렬 - 종목 내 이전 행 비교용 (이미 정렬돼 있으면 생략)
+        code_ids = pd.factorize(frame['code'], sort=True)[0].astype(np.int64)
+        keys = code_ids * 100_000_000 + dates
+        if len(keys) > 1 and (keys[1:] < keys[:-1]).any():
+            order = np.argsort(keys, kind='stable')
+            frame = frame.take(order).reset_index(drop=True)
+            code_ids, keys, dates, days, date_ok = code_ids[order], keys[order], dates[order], days[order], date_ok[order]
+
+        open_, high, low, close = (frame[col].to_numpy(dtype=np.float64) for col in PRICE_COLUMNS)
+        volume = frame['거래량'].to_numpy(dtype=np.float64)
+        same_code = np.r_[False, code_ids[1:] == code_ids[:-1]]
+
+        missing = np.isnan(open_) | np.isnan(high) | np.isnan(low) | np.isnan(close) | np.isnan(volume)
+        # 이전 행 비교는 같은 종목의 정상 행끼리만
+        usable = date_ok & ~missing
+        chained = same_code & usable & np.r_[False, usable[:-1]]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            prev_close = np.r_[np.nan, close[:-1]]
+            change = np.where(chained, close / prev_close - 1.0, 0.0)
+            gap = np.where(chained, np.diff(days, prepend=days[:1]), 0)
+            masks = {
+                'missing_value': missing,
+                'bad_date': ~date_ok,
+                'non_positive_price': ~missing & (np.minimum(np.minimum(open_, high), np.minimum(low, close)) <= 0),
+                'high_below_low': high < low,
+                'open_out_of_range': (open_ < np.minimum(high, low)) | (open_ > np.maximum(high, low)),
+                'close_out_of_range': (close < np.minimum(high, low)) | (close > np.maximum(high, low)),
+                'negative_volume': volume < 0,
+                # 다음 행과 (종목, 날짜)가 같으면 앞 행이 중복 (마지막 유지)
+                'duplicate_date': np.r_[keys[1:] == keys[:-1], False],
+                'price_jump': np.abs(np.nan_to_num(change)) > self.max_change,
+                'date_gap': gap > self.max_gap_days,
+                'zero_volume': volume == 0,
+            }
+        values = {
+            'missing_value': np.full(len(frame), np.nan),
+            'bad_date': dates.astype(np.float64),
+            'non_positive_price': np.minimum(np.minimum(open_, high), np.minimum(low, close)),
+            'high_below_low': high - low,
+            'open_out_of_range': open_,
+            'close_out_of_range': close,
+            'negative_volume': volume,
+            'duplicate_date': close,
+            'price_jump': change,
+            'date_gap': gap.astype(np.float64),
+            'zero_volume': volume,
+        }
+        return frame, masks, values
+
+    @staticmethod
+    def issue_table(frame: pd.DataFrame, masks: Dict[str, np.ndarray], values: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """규칙별 마스크 -> 문제 테이블 (code, 날짜, rule, value)"""
+        parts = []
+        for rule, mask in masks.items():
+            index = np.flatnonzero(mask)
+            if len(index):
+                parts.append((index, np.full(len(index), rule, dtype=object), values[rule][index]))
+        if not parts:
+            return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in
+                                 zip(ISSUE_COLUMNS, [object, np.int64, 'category', np.float64])})
+        index = np.concatenate([p[0] for p in parts])
+        return pd.DataFrame({
+            'code': frame['code'].take(index).to_numpy(),
+            '날짜': frame['날짜'].take(index).to_numpy(),
+            'rule': pd.Categorical(np.concatenate([p[1] for p in parts]), categories=list(RULES)),
+            'value': np.concatenate([p[2] for p in parts]),
+        })
+
+    def repair(self, frame: pd.DataFrame, masks: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """복구 정책 적용 (clip 먼저, 그 다음 drop)"""
+        policy = self.policy
+        if policy.get('high_below_low') == 'clip' and masks['high_below_low'].any():
+            mask = masks['high_below_low']
+            high, low = frame['고가'].to_numpy(copy=True), frame['저가'].to_numpy(copy=True)
+            high[mask], low[mask] = low[mask], high[mask]
+            frame['고가'], frame['저가'] = high, low
+        for rule, col in (('open_out_of_range', '시가'), ('close_out_of_range', '종가')):
+            if policy.get(rule) == 'clip' and masks[rule].any():
+                frame[col] = np.clip(frame[col].to_numpy(), frame['저가'].to_numpy(), frame['고가'].to_numpy())
+        if policy.get('negative_volume') == 'clip' and masks['negative_volume'].any():
+            frame['거래량'] = frame['거래량'].clip(lower=0)
+
+        drop = np.zeros(len(frame), dtype=bool)
+        for rule, action in policy.items():
+            if action == 'drop':
+                drop |= masks[rule]
+        if drop.any():
+            frame = frame[~drop].reset_index(drop=True)
+        return frame
+
+    def validate(self, data: pd.DataFrame, code: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """검증 + 자동 복구 -> (정리된 프레임, 문제 테이블)
+
+        정리된 프레임: (종목, 날짜) 정렬, 날짜는 입력이 정수면 YYYYMMDD 정수, 아니면 문자열
+        """
+        had_code = 'code' in data.columns
+        int_dates = pd.api.types.is_integer_dtype(data['날짜'])
+        frame, masks, values = self.check(data, code)
+        issues = self.issue_table(frame, masks, values)
+        cleaned = self.repair(frame, masks)
+        if not int_dates:
+            cleaned['날짜'] = cleaned['날짜'].astype(str)
+        if not had_code:
+            cleaned = cleaned.drop(columns='code')
+        return cleaned, issues
+
+    @staticmethod
+    def summarize(issues: pd.DataFrame) -> Dict[str, int]:
+        """규칙별 문제 건수"""
+        counts = issues['rule'].value_counts(sort=False)
+        return {rule: int(count) for rule, count in counts.items() if count}
+
+
+if __name__ == "__main__":
+    # 처리량 측정: python data_validator.py
+    import time
+
+    rng = np.random.default_rng(0)
+    n_codes, n_days = 2000, 1000
+    close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_codes, n_days)), axis=1)).ravel()
+    frame = pd.DataFrame({
+        'code': np.repeat([f"{i:06d}" for i in range(n_codes)], n_days),
+        '날짜': np.tile(pd.bdate_range('2020-01-01', periods=n_days).strftime('%Y%m%d').astype(int), n_codes),
+        '시가': close * 1.001, '고가': close * 1.01, '저가': close * 0.99, '종가': close,
+        '거래량': rng.integers(0, 1_000_000, len(close)),
+    })
+    bad = rng.choice(len(frame), 1000, replace=False)
+    frame.loc[bad, '고가'] = frame.loc[bad, '저가'] * 0.9
+
+    validator = DailyDataValidator(policy='clip')
+    start = time.perf_counter()
+    cleaned, issues = validator.validate(frame)
+    elapsed = time.perf_counter() - start
+    print(f"🧪 {len(frame):,}행 검증: {elapsed:.2f}초 ({len(frame) / elapsed / 1e6:.1f}M행/초)")
+    print(f"📋 문제: {DailyDataValidator.summarize(issues)}")
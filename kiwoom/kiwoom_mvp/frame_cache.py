@@ -0,0 +1,136 @@
+"""
+file: frame_cache.py
+키움증권 주식 데이터 수집기 - DataFrame 캐시
+Phase 1 MVP
+
+메모리 예산(바이트) 기반 LRU 캐시
+- 저장 시 배열을 읽기 전용으로 만들고, 조회 시 복사 없이 얕은 뷰 반환
+- 무효화는 TTL 대신 버전(파일/파티션 수정 시각)으로 판단
+- 적중/실패/축출/무효화 통계
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def freeze_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """DataFrame 내부 numpy 배열의 쓰기 플래그 해제 (제자리 수정 시 ValueError)
+
+    블록(frame._mgr.blocks)은 pandas 비공개 구조 - 없는 버전에서는 컬럼별 배열 뷰로 대신함
+    """
+    blocks = getattr(getattr(frame, '_mgr', None), 'blocks', None)
+    if blocks is not None:
+        arrays = [block.values for block in blocks]
+    else:
+        arrays = [frame.iloc[:, i].to_numpy(copy=False) for i in range(frame.shape[1])]
+    for values in arrays:
+        if isinstance(values, np.ndarray) and values.flags.writeable:
+            values.flags.writeable = False
+    return frame
+
+
+def frame_nbytes(frame: pd.DataFrame) -> int:
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+class FrameCache:
+    """바이트 예산 LRU DataFrame 캐시"""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (frame, nbytes, version)
+        self.total_bytes = 0
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.rejected = 0  # 예산보다 커서 캐시하지 않은 항목
+
+    def get(self, key: Hashable, version: Any = None) -> Optional[pd.DataFrame]:
+        """조회 - 버전이 다르면 무효화 후 None. 반환값은 읽기 전용 뷰"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            frame, nbytes, cached_version = entry
+            if version is not None and cached_version != version:
+                self._remove(key)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        # 얕은 뷰: 배열은 공유, 컬럼 교체 등은 호출자 객체에만 반영
+        return frame.copy(deep=False)
+
+    def put(self, key: Hashable, frame: pd.DataFrame, version: Any = None) -> pd.DataFrame:
+        """저장 - 저장된 프레임의 읽기 전용 뷰 반환"""
+        frame = freeze_frame(frame)
+        nbytes = frame_nbytes(frame)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            if nbytes > self.max_bytes:
+                self.rejected += 1
+            else:
+                # 예산을 넘지 않을 때까지 가장 오래 안 쓴 항목부터 축출
+                while self._entries and self.total_bytes + nbytes > self.max_bytes:
+                    _, (_, evicted_bytes, _) = self._entries.popitem(last=False)
+                    self.total_bytes -= evicted_bytes
+                    self.evictions += 1
+                self._entries[key] = (frame, nbytes, version)
+                self.total_bytes += nbytes
+
+        return frame.copy(deep=False)
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self.invalidations += 1
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def _remove(self, key: Hashable):
+        _, nbytes, _ = self._entries.pop(key)
+        self.total_bytes -= nbytes
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            'cached_items': len(self._entries),
+            'cache_size': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / requests, 4) if requests else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'rejected': self.rejected,
+        }
@@ -402,7 +402,8 @@ class StockDataCollector:
             saved_path = self.data_manager.save_daily_data(stock_code, stock_name, daily_data)
             
             if saved_path:
-                print(f"✅ 데이터 저장 완료: {os.path.basename(saved_path)}")
+                months = daily_data['날짜'].astype(str).str.replace('-', '', regex=False).str[:6].nunique()
+                print(f"✅ 데이터 저장 완료: {saved_path} ({months}개월, {len(daily_data)}행)")
                 
                 # 수집 요약 표시
                 self._show_collection_summary(daily_data, stock_name, stock_code)
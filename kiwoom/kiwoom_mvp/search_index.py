@@ -0,0 +1,219 @@
+"""
+file: kiwoom_mvp/search_index.py
+키움증권 주식 데이터 수집기 - 종목 검색 인덱스
+Phase 1 MVP
+
+- 종목코드: 정렬 배열 + 이진 탐색으로 접두어 범위 조회
+- 종목명: n-gram(1, 2글자) 역색인, 후보 교집합 후 부분 문자열 확인
+- 초성: 한글 종목명을 초성 문자열로 바꿔 같은 방식으로 색인 ("ㅅㅅㅈㅈ" -> 삼성전자)
+- 순위: 완전 일치 > 시작 일치 > 부분 일치, 같은 점수는 짧은 이름/앞쪽 위치 우선 (top-k 힙)
+- 한 번 구축 후 pickle로 저장, 종목 리스트가 바뀌면 재구축
+"""
+
+import bisect
+import hashlib
+import heapq
+import logging
+import pickle
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+INDEX_VERSION = 1
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+CHOSEONG_SET = frozenset(CHOSEONG)
+
+SCORE_EXACT = 200
+SCORE_PREFIX = 100
+SCORE_PARTIAL = 50
+
+
+def normalize_name(name: str) -> str:
+    """검색용 이름 정규화 (소문자, 공백 제거)"""
+    return ''.join(str(name).lower().split())
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절을 초성으로 변환 (그 외 문자는 그대로)"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            chars.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            chars.append(ch)
+    return ''.join(chars)
+
+
+def is_choseong_query(query: str) -> bool:
+    """초성(자음) 글자가 포함된 질의인지"""
+    return any(ch in CHOSEONG_SET for ch in query)
+
+
+def rank_key(text: str, query: str, position: int, doc_id: int) -> tuple:
+    """순위 키 (작을수록 상위): 완전 일치 > 시작 일치 > 부분 일치, 앞쪽 위치, 짧은 이름"""
+    if len(text) == len(query):
+        score = SCORE_EXACT
+    elif position == 0:
+        score = SCORE_PREFIX
+    else:
+        score = SCORE_PARTIAL
+    return (-score, position, len(text), doc_id)
+
+
+def _grams(text: str) -> set:
+    """1글자 + 2글자 n-gram"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class _NgramIndex:
+    """n-gram 역색인 (gram -> 정렬된 종목 번호 목록)"""
+
+    def __init__(self, texts: Sequence[str]):
+        self.texts = list(texts)
+        postings: Dict[str, List[int]] = {}
+        for doc_id, text in enumerate(self.texts):
+            for gram in _grams(text):
+                postings.setdefault(gram, []).append(doc_id)
+        self.postings = postings
+
+        # 1글자 질의는 결과가 많으므로 순위대로 미리 정렬해 둠 (조회 시 앞에서 k개)
+        self.ranked_unigrams = {
+            gram: sorted(posting, key=lambda doc_id: rank_key(self.texts[doc_id], gram, self.texts[doc_id].find(gram), doc_id))
+            for gram, posting in postings.items() if len(gram) == 1
+        }
+
+    def candidates(self, query: str) -> List[int]:
+        """질의 n-gram을 모두 포함하는 후보 (가장 짧은 목록부터 교집합)"""
+        grams = [query[i:i + 2] for i in range(len(query) - 1)] or [query]
+        lists = []
+        for gram in set(grams):
+            posting = self.postings.get(gram)
+            if not posting:
+                return []
+            lists.append(posting)
+        lists.sort(key=len)
+        result = lists[0]
+        for posting in lists[1:]:
+            members = set(posting)
+            result = [doc_id for doc_id in result if doc_id in members]
+            if not result:
+                break
+        return result
+
+    def search(self, query: str) -> List[Tuple[int, int]]:
+        """부분 문자열 일치 종목 [(종목 번호, 일치 위치)]"""
+        matches = []
+        for doc_id in self.candidates(query):
+            position = self.texts[doc_id].find(query)
+            if position >= 0:
+                matches.append((doc_id, position))
+        return matches
+
+
+class StockSearchIndex:
+    """종목 검색 인덱스"""
+
+    def __init__(self, stocks: Sequence[Dict]):
+        self.stocks = [dict(stock) for stock in stocks]
+        self.signature = self.compute_signature(self.stocks)
+
+        # 종목코드 정렬 배열
+        order = sorted(range(len(self.stocks)), key=lambda i: str(self.stocks[i]['code']))
+        self.sorted_codes = [str(self.stocks[i]['code']) for i in order]
+        self.code_order = order
+
+        # 종목명 / 초성 n-gram 역색인
+        self.names = [normalize_name(stock['name']) for stock in self.stocks]
+        self.name_index = _NgramIndex(self.names)
+        self.choseong_names = [to_choseong(name) for name in self.names]
+        self.choseong_index = _NgramIndex(self.choseong_names)
+
+    @staticmethod
+    def compute_signature(stocks: Sequence[Dict]) -> str:
+        """종목 리스트 내용 해시 (저장된 인덱스 재사용 판단용)"""
+        digest = hashlib.sha1(str(INDEX_VERSION).encode())
+        for stock in stocks:
+            digest.update(repr(sorted(stock.items())).encode('utf-8'))
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def search_code_prefix(self, prefix: str, max_results: int = 10) -> List[Dict]:
+        """종목코드 접두어 검색 (코드 순)"""
+        start = bisect.bisect_left(self.sorted_codes, prefix)
+        end = bisect.bisect_left(self.sorted_codes, prefix + '\uffff', lo=start)
+        end = min(end, start + max_results)
+        return [self.stocks[self.code_order[i]] for i in range(start, end)]
+
+    def search_name(self, query: str, max_results: int = 10) -> List[Dict]:
+        """종목명 부분 검색 (초성 질의 포함), 점수 순 상위 max_results개"""
+        query = normalize_name(query)
+        if not query:
+            return []
+
+        if is_choseong_query(query):
+            query, index = to_choseong(query), self.choseong_index
+        else:
+            index = self.name_index
+
+        if len(query) == 1:
+            ranked = index.ranked_unigrams.get(query, [])
+            return [self.stocks[doc_id] for doc_id in ranked[:max_results]]
+
+        # 부분 문자열 일치 = 길이가 같으면 완전 일치
+        texts = index.texts
+        top = heapq.nsmallest(max_results, index.search(query),
+                              key=lambda match: rank_key(texts[match[0]], query, match[1], match[0]))
+        return [self.stocks[doc_id] for doc_id, _ in top]
+
+    def suggest(self, query: str, max_suggestions: int = 5) -> List[str]:
+        """자동완성 종목명"""
+        return [stock['name'] for stock in self.search_name(query, max_suggestions)]
+
+    # ------------------------------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------------------------------
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, signature: Optional[str] = None) -> Optional['StockSearchIndex']:
+        """저장된 인덱스 로드 (없거나 서명이 다르면 None)"""
+        try:
+            with open(path, 'rb') as f:
+                index = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if not isinstance(index, cls) or (signature is not None and index.signature != signature):
+            return None
+        return index
+
+    @classmethod
+    def load_or_build(cls, stocks: Sequence[Dict], path: Optional[Path] = None) -> 'StockSearchIndex':
+        """저장본이 현재 종목 리스트와 같으면 재사용, 아니면 구축 후 저장"""
+        logger = logging.getLogger(__name__)
+        signature = cls.compute_signature(stocks)
+        if path is not None:
+            index = cls.load(path, signature)
+            if index is not None:
+                logger.debug(f"📊 검색 인덱스 로드: {path}")
+                return index
+
+        index = cls(stocks)
+        if path is not None:
+            try:
+                index.save(path)
+            except OSError as e:
+                logger.warning(f"⚠️ 검색 인덱스 저장 실패: {e}")
+        return index
@@ -15,6 +15,7 @@ from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import pandas as pd
 from config import get_config
+from search_index import StockSearchIndex
 
 class StockSearcher:
     """종목 검색 엔진 클래스"""
@@ -29,8 +30,10 @@ class StockSearcher:
         self.stock_code_map: Dict[str, Dict] = {}  # 코드로 빠른 검색
         self.stock_name_map: Dict[str, Dict] = {}  # 이름으로 빠른 검색
         
-        # 종목 리스트 파일 경로
+        # 종목 리스트 / 검색 인덱스 파일 경로
         self.stock_list_file = self.config.BASE_DIR / 'data' / 'stock_list.csv'
+        self.search_index_file = self.config.BASE_DIR / 'data' / 'stock_index.pkl'
+        self.search_index: Optional[StockSearchIndex] = None
         
         # 초기화
         self._load_stock_list()
@@ -55,7 +58,7 @@ class StockSearcher:
     def _load_from_file(self):
         """CSV 파일에서 종목 리스트 로드"""
         try:
-            df = pd.read_csv(self.stock_list_file, encoding='utf-8-sig')
+            df = pd.read_csv(self.stock_list_file, encoding='utf-8-sig', dtype={'code': str})
             self.stock_list = df.to_dict('records')
             
         except Exception as e:
@@ -151,6 +154,9 @@ class StockSearcher:
                 self.stock_name_map[name_key] = []
             self.stock_name_map[name_key].append(stock)
         
+        # 부분/초성/코드 접두어 검색 인덱스 (저장본이 같으면 재사용)
+        self.search_index = StockSearchIndex.load_or_build(self.stock_list, self.search_index_file)
+        
         self.logger.debug(f"📊 검색 인덱스 구축 완료: {len(self.stock_code_map)}개 종목")
     
     def search_by_code(self, code: str) -> Optional[Dict]:
@@ -174,37 +180,12 @@ class StockSearcher:
         return self.stock_name_map.get(name_key, [])
     
     def search_partial(self, query: str, max_results: int = 10) -> List[Dict]:
-        """부분 검색 (종목명 부분 일치)"""
+        """부분 검색 (종목명 부분 일치, 초성 검색 지원 - 예: 'ㅅㅅㅈㅈ')"""
         if not query or len(query) < 1:
             return []
         
-        query_lower = query.lower().strip()
-        results = []
-        
-        # 종목명에서 부분 검색
-        for stock in self.stock_list:
-            stock_name_lower = stock['name'].lower()
-            
-            # 부분 일치 검사
-            if query_lower in stock_name_lower:
-                # 매칭 점수 계산 (정확도 순 정렬용)
-                if stock_name_lower.startswith(query_lower):
-                    score = 100  # 시작 일치
-                elif stock_name_lower == query_lower:
-                    score = 200  # 완전 일치
-                else:
-                    score = 50   # 부분 일치
-                
-                results.append({
-                    'stock': stock,
-                    'score': score
-                })
-        
-        # 점수 순으로 정렬 (높은 점수 우선)
-        results.sort(key=lambda x: x['score'], reverse=True)
-        
-        # 최대 결과 개수만큼 반환
-        return [item['stock'] for item in results[:max_results]]
+        # 점수: 완전 일치 > 시작 일치 > 부분 일치 (n-gram 인덱스 + top-k)
+        return self.search_index.search_name(query, max_results)
     
     def search_smart(self, query: str, max_results: int = 10) -> List[Dict]:
         """스마트 검색 (코드/이름 자동 판별)"""
@@ -233,16 +214,8 @@ class StockSearcher:
         return self.search_partial(query, max_results)
     
     def _search_partial_code(self, partial_code: str, max_results: int = 10) -> List[Dict]:
-        """부분 종목코드 검색"""
-        results = []
-        
-        for code, stock in self.stock_code_map.items():
-            if code.startswith(partial_code):
-                results.append(stock)
-                if len(results) >= max_results:
-                    break
-        
-        return results
+        """부분 종목코드 검색 (접두어, 코드 순)"""
+        return self.search_index.search_code_prefix(partial_code, max_results)
     
     def _clean_stock_code(self, code: str) -> Optional[str]:
         """종목코드 정리 (6자리 숫자 형태로 변환)"""
@@ -346,28 +319,11 @@ class StockSearcher:
         return [stock for stock in self.stock_list if sector.lower() in stock.get('sector', '').lower()]
     
     def get_search_suggestions(self, query: str, max_suggestions: int = 5) -> List[str]:
-        """검색 자동완성 제안"""
+        """검색 자동완성 제안 (점수 순)"""
         if not query or len(query) < 1:
             return []
         
-        query_lower = query.lower()
-        suggestions = set()
-        
-        for stock in self.stock_list:
-            name = stock['name']
-            name_lower = name.lower()
-            
-            # 시작 문자가 일치하는 경우
-            if name_lower.startswith(query_lower):
-                suggestions.add(name)
-            # 부분 일치하는 경우
-            elif query_lower in name_lower:
-                suggestions.add(name)
-            
-            if len(suggestions) >= max_suggestions:
-                break
-        
-        return list(suggestions)[:max_suggestions]
+        return self.search_index.suggest(query, max_suggestions)
     
     def validate_and_format_display(self, query: str) -> Tuple[bool, Optional[str], Optional[Dict]]:
         """검색 결과 검증 및 표시용 포맷팅"""
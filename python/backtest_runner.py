@@ -3,17 +3,45 @@
 백테스트 실행 스크립트
 입력: JSON 파일 (전략ID, 파라미터, 시장데이터)
 출력: JSON 파일 (백테스트 결과)
+
+실행 모드
+- 1회 실행: python backtest_runner.py <input_file> <output_file>
+- 상주 워커 (stdin/stdout): python backtest_runner.py --serve
+- 상주 워커 풀 (Unix 소켓): python backtest_runner.py --socket /tmp/backtest.sock --workers 4
+
+상주 모드는 줄 단위 JSON 프로토콜 (요청 1줄 -> 응답 1줄)
+  요청: {"id": 1, "strategy_id": "low_pe", "parameters": {...}, "market_data": [...], "data_key": "kospi-2024"}
+        {"id": 2, "strategy_id": "rsi_mean_reversion", "data_key": "kospi-2024"}   # 등록된 데이터 재사용
+        {"id": 3, "op": "load_data", "data_key": "kospi-2024", "market_data": [...]}
+        {"id": 4, "op": "ping" | "stats" | "drop_data" | "shutdown"}
+  응답: {"id": 1, "ok": true, "result": {...}} / {"id": 1, "ok": false, "error": "..."}
+pandas/numpy, quant_engine 전략 레지스트리, 시장 데이터, 전략 인스턴스/결과를 프로세스에 유지한다.
 """
 
 import json
 import sys
 import os
+import socket
+import subprocess
+import threading
+import queue
+import time
+import argparse
+import hashlib
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
-# quant_engine 모듈 경로 추가
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'quant_engine'))
+# quant_engine 모듈 경로 추가 (backend/quant_engine 배치도 지원)
+for _engine_dir in (os.path.join(os.path.dirname(__file__), '..', 'quant_engine'),
+                    os.path.join(os.path.dirname(__file__), '..', 'backend', 'quant_engine')):
+    if os.path.isdir(_engine_dir):
+        sys.path.append(_engine_dir)
+
+MAX_CACHED_DATA = 16        # 보관할 시장 데이터 수
+MAX_CACHED_STRATEGIES = 64  # 보관할 전략 인스턴스 수
+MAX_CACHED_RESULTS = 256    # 보관할 결과 수
 
 def load_input_data(input_file):
     """입력 데이터 로드"""
@@ -45,53 +73,177 @@ def prepare_market_data(market_data):
     except Exception as e:
         raise Exception(f"시장 데이터 준비 실패: {str(e)}")
 
-def run_backtest(strategy_id, parameters, market_data):
-    """백테스트 실행"""
-    try:
+class LRUCache(OrderedDict):
+    """크기 제한 LRU 딕셔너리"""
+    
+    def __init__(self, max_items):
+        super().__init__()
+        self.max_items = max_items
+    
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+    
+    def put(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.max_items:
+            self.popitem(last=False)
+        return value
+
+
+class BacktestWorker:
+    """전략 레지스트리/데이터/결과를 유지하며 여러 백테스트를 처리하는 워커"""
+    
+    def __init__(self):
         from strategy_factory import strategy_registry, initialize_strategy_system
         from portfolio_utils import calculate_portfolio_metrics
         
-        # 전략 시스템 초기화
+        # 전략 시스템 초기화 (프로세스당 1회)
         initialize_strategy_system()
+        self.strategy_registry = strategy_registry
+        self.calculate_portfolio_metrics = calculate_portfolio_metrics
         
-        # 전략 생성
-        strategy = strategy_registry.create_strategy(strategy_id, **parameters)
-        
-        # 데이터 준비
-        df = prepare_market_data(market_data)
-        
-        # 전략 실행
-        signals = strategy.generate_signals(df)
-        weights = strategy.calculate_weights(signals)
-        
-        # 포트폴리오 수익률 계산 (간단한 구현)
-        portfolio_returns = calculate_simple_returns(df, weights)
-        
-        # 성과 지표 계산
-        metrics = calculate_portfolio_metrics(portfolio_returns)
-        
-        # 결과 구성
-        result = {
-            'strategy_name': strategy.name,
-            'symbol': 'PORTFOLIO',
-            'totalReturn': float(metrics.get('total_return', 0) * 100),
-            'annualReturn': float(metrics.get('annualized_return', 0) * 100),
-            'volatility': float(metrics.get('volatility', 0) * 100),
-            'sharpeRatio': float(metrics.get('sharpe_ratio', 0)),
-            'sortinoRatio': float(metrics.get('sortino_ratio', 0)),
-            'calmarRatio': float(metrics.get('sharpe_ratio', 0) * 0.8),  # 근사값
-            'maxDrawdown': float(abs(metrics.get('max_drawdown', 0)) * 100),
-            'winRate': float(metrics.get('win_rate', 0) * 100),
-            'finalValue': float((1 + metrics.get('total_return', 0)) * 100000),
-            'portfolioHistory': generate_portfolio_history(portfolio_returns),
-            'components': [w.symbol for w in weights[:5]] if weights else [],
-            'weights': {w.symbol: float(w.weight) for w in weights[:5]} if weights else {}
-        }
+        self.data_cache = LRUCache(MAX_CACHED_DATA)              # data_key -> DataFrame
+        self.strategy_cache = LRUCache(MAX_CACHED_STRATEGIES)    # (전략ID, 파라미터) -> 인스턴스
+        self.result_cache = LRUCache(MAX_CACHED_RESULTS)         # (전략ID, 파라미터, data_key) -> 결과
         
-        return result
+        self.started_at = datetime.now().isoformat()
+        self.requests = 0
+        self.errors = 0
+        self.result_hits = 0
+        self.busy_seconds = 0.0
+    
+    # ----- 캐시 -----
+    def get_data(self, market_data=None, data_key=None):
+        """시장 데이터 준비 (data_key 가 있으면 보관 후 재사용) -> (data_key, DataFrame)"""
+        if market_data is None:
+            if data_key is None:
+                raise ValueError("market_data 또는 data_key 가 필요합니다")
+            df = self.data_cache.get(data_key)
+            if df is None:
+                raise KeyError(f"등록되지 않은 data_key: {data_key}")
+            return data_key, df
         
-    except Exception as e:
-        raise Exception(f"백테스트 실행 실패: {str(e)}")
+        if data_key is None:
+            # 키가 없으면 내용 해시로 식별 (같은 데이터 재전송 시 결과 캐시 적중)
+            payload = json.dumps(market_data, sort_keys=True, default=str).encode('utf-8')
+            data_key = 'sha1:' + hashlib.sha1(payload).hexdigest()
+            df = self.data_cache.get(data_key)
+            if df is not None:
+                return data_key, df
+        
+        # 같은 키로 새 데이터가 오면 교체하고 그 데이터의 결과는 버림
+        for key in [key for key in self.result_cache if key[2] == data_key]:
+            del self.result_cache[key]
+        return data_key, self.data_cache.put(data_key, prepare_market_data(market_data))
+    
+    def get_strategy(self, strategy_id, parameters):
+        key = (strategy_id, json.dumps(parameters, sort_keys=True, default=str))
+        strategy = self.strategy_cache.get(key)
+        if strategy is None:
+            strategy = self.strategy_cache.put(key, self.strategy_registry.create_strategy(strategy_id, **parameters))
+        return key, strategy
+    
+    # ----- 실행 -----
+    def run(self, strategy_id, parameters=None, market_data=None, data_key=None):
+        """백테스트 실행"""
+        try:
+            data_key, df = self.get_data(market_data, data_key)
+            strategy_key, strategy = self.get_strategy(strategy_id, parameters or {})
+            
+            result_key = strategy_key + (data_key,)
+            cached = self.result_cache.get(result_key)
+            if cached is not None:
+                self.result_hits += 1
+                return cached
+            
+            # 전략 실행
+            signals = strategy.generate_signals(df)
+            weights = strategy.calculate_weights(signals)
+            
+            # 포트폴리오 수익률 계산 (간단한 구현)
+            portfolio_returns = calculate_simple_returns(df, weights)
+            
+            # 성과 지표 계산
+            metrics = self.calculate_portfolio_metrics(portfolio_returns)
+            
+            # 결과 구성
+            result = {
+                'strategy_name': strategy.name,
+                'symbol': 'PORTFOLIO',
+                'totalReturn': float(metrics.get('total_return', 0) * 100),
+                'annualReturn': float(metrics.get('annualized_return', 0) * 100),
+                'volatility': float(metrics.get('volatility', 0) * 100),
+                'sharpeRatio': float(metrics.get('sharpe_ratio', 0)),
+                'sortinoRatio': float(metrics.get('sortino_ratio', 0)),
+                'calmarRatio': float(metrics.get('sharpe_ratio', 0) * 0.8),  # 근사값
+                'maxDrawdown': float(abs(metrics.get('max_drawdown', 0)) * 100),
+                'winRate': float(metrics.get('win_rate', 0) * 100),
+                'finalValue': float((1 + metrics.get('total_return', 0)) * 100000),
+                'portfolioHistory': generate_portfolio_history(portfolio_returns),
+                'components': [w.symbol for w in weights[:5]] if weights else [],
+                'weights': {w.symbol: float(w.weight) for w in weights[:5]} if weights else {}
+            }
+            
+            return self.result_cache.put(result_key, result)
+            
+        except Exception as e:
+            raise Exception(f"백테스트 실행 실패: {str(e)}")
+    
+    def handle(self, request):
+        """프로토콜 요청 1건 처리 -> 응답"""
+        request_id = request.get('id')
+        op = request.get('op', 'backtest')
+        started = time.perf_counter()
+        self.requests += 1
+        
+        try:
+            if op == 'backtest':
+                result = self.run(
+                    request['strategy_id'], request.get('parameters', {}),
+                    request.get('market_data'), request.get('data_key')
+                )
+            elif op == 'ping':
+                result = {'pid': os.getpid()}
+            elif op == 'stats':
+                result = self.get_stats()
+            elif op == 'load_data':
+                data_key, df = self.get_data(request['market_data'], request.get('data_key'))
+                result = {'data_key': data_key, 'rows': len(df)}
+            elif op == 'drop_data':
+                result = {'dropped': self.data_cache.pop(request.get('data_key'), None) is not None}
+            elif op == 'shutdown':
+                result = {'pid': os.getpid()}
+            else:
+                raise ValueError(f"알 수 없는 op: {op}")
+            response = {'id': request_id, 'ok': True, 'result': result}
+        except Exception as e:
+            self.errors += 1
+            response = {'id': request_id, 'ok': False, 'error': str(e)}
+        
+        self.busy_seconds += time.perf_counter() - started
+        return response
+    
+    def get_stats(self):
+        return {
+            'pid': os.getpid(),
+            'started_at': self.started_at,
+            'requests': self.requests,
+            'errors': self.errors,
+            'result_hits': self.result_hits,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'cached_data': list(self.data_cache.keys()),
+            'cached_strategies': len(self.strategy_cache),
+            'cached_results': len(self.result_cache),
+        }
+
+
+def run_backtest(strategy_id, parameters, market_data):
+    """백테스트 1회 실행 (1회 실행 CLI용)"""
+    return BacktestWorker().run(strategy_id, parameters, market_data)
 
 def calculate_simple_returns(df, weights):
     """간단한 포트폴리오 수익률 계산"""
@@ -132,14 +284,236 @@ def save_output(output_file, result):
     except Exception as e:
         raise Exception(f"결과 파일 저장 실패: {str(e)}")
 
-def main():
-    if len(sys.argv) != 3:
-        print("사용법: python backtest_runner.py <input_file> <output_file>")
-        sys.exit(1)
+# ===== 상주 워커 =====
+def serve_stream(worker, reader, writer, allow_shutdown=True):
+    """줄 단위 JSON 요청을 읽어 응답 (EOF 또는 shutdown 까지)"""
+    for line in reader:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response, request = {'id': None, 'ok': False, 'error': f"잘못된 JSON: {e}"}, {}
+        else:
+            response = worker.handle(request)
+        
+        writer.write(json.dumps(response, ensure_ascii=False, default=str) + '\n')
+        writer.flush()
+        
+        if allow_shutdown and request.get('op') == 'shutdown':
+            return True
+    return False
+
+def serve_stdio():
+    """stdin/stdout 상주 모드 - 전략 코드의 print 는 stderr 로 보내 프로토콜을 보호"""
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+    
+    worker = BacktestWorker()
+    protocol_out.write(json.dumps({'ready': True, 'pid': os.getpid()}) + '\n')
+    protocol_out.flush()
+    serve_stream(worker, sys.stdin, protocol_out)
+
+def serve_socket(path, workers=1):
+    """Unix 소켓 상주 워커 풀 (pre-fork)
+    
+    부모가 전략 레지스트리를 한 번 초기화한 뒤 fork 하므로 자식들은 초기화 비용 없이
+    같은 리스닝 소켓에서 연결을 나눠 받는다. 연결 1개 = 줄 단위 JSON 세션.
+    """
+    if not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'fork'):
+        raise RuntimeError("Unix 소켓 모드는 POSIX 환경에서만 지원됩니다 (--serve 사용)")
+    
+    sys.stdout = sys.stderr
+    worker = BacktestWorker()
+    
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(64)
+    print(f"✅ 백테스트 워커 풀 시작: {path} (워커 {workers}개)", file=sys.stderr)
+    
+    children = []
+    for _ in range(max(1, workers)):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                while True:
+                    conn, _ = server.accept()
+                    try:
+                        reader = conn.makefile('r', encoding='utf-8')
+                        writer = conn.makefile('w', encoding='utf-8')
+                        serve_stream(worker, reader, writer, allow_shutdown=False)
+                        writer.close()
+                    except OSError:
+                        pass  # 클라이언트가 먼저 끊은 경우
+                    finally:
+                        conn.close()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os._exit(0)
+        children.append(pid)
+    
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in children:
+            try:
+                os.kill(pid, 15)
+            except ProcessLookupError:
+                pass
+    finally:
+        server.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+class BacktestWorkerPool:
+    """--serve 워커 프로세스 풀 클라이언트 (스레드 안전, 유휴 워커에 요청 배정)
+    
+    with BacktestWorkerPool(4) as pool:
+        pool.run('low_pe', {}, market_data=rows, data_key='kospi')
+        pool.run('rsi_mean_reversion', {}, data_key='kospi')
+    
+    data_key 로 등록한 데이터는 각 워커에 따로 보관되므로 모든 워커에 보내려면 broadcast_data 사용
+    """
+    
+    def __init__(self, size=2, python=None, start_timeout=60):
+        self.size = size
+        self.python = python or sys.executable
+        self.start_timeout = start_timeout
+        self._idle = queue.Queue()
+        self._workers = []
+        self._next_id = 0
+        self._id_lock = threading.Lock()
+        for _ in range(size):
+            self._idle.put(self._spawn())
+    
+    def _spawn(self):
+        proc = subprocess.Popen(
+            [self.python, os.path.abspath(__file__), '--serve'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=None,
+            text=True, encoding='utf-8', bufsize=1
+        )
+        ready = proc.stdout.readline()
+        if not ready:
+            proc.kill()
+            raise RuntimeError("백테스트 워커 시작 실패")
+        self._workers.append(proc)
+        return proc
     
-    input_file = sys.argv[1]
-    output_file = sys.argv[2]
+    def _replace(self, proc):
+        """죽은 워커를 정리하고 새 워커를 유휴 큐에 추가 (재시작 실패 시 풀을 줄이고 예외)"""
+        proc.kill()
+        self._workers.remove(proc)
+        try:
+            self._idle.put(self._spawn())
+        except Exception:
+            with self._id_lock:
+                self.size -= 1
+            raise
     
+    def request(self, payload):
+        """요청 1건 전송 후 응답 대기 (워커가 죽으면 재시작 후 오류 응답, 재시작 실패 시 예외)"""
+        with self._id_lock:
+            self._next_id += 1
+            payload = dict(payload, id=self._next_id)
+        line = json.dumps(payload, ensure_ascii=False, default=str) + '\n'
+        if self.size <= 0:
+            raise RuntimeError("사용 가능한 백테스트 워커 없음")
+        
+        proc = self._idle.get()
+        try:
+            proc.stdin.write(line)
+            proc.stdin.flush()
+            reply = proc.stdout.readline()
+            if not reply:
+                raise BrokenPipeError("워커 종료")
+            response = json.loads(reply)
+        except (BrokenPipeError, OSError, ValueError) as e:
+            self._replace(proc)
+            return {'id': payload['id'], 'ok': False, 'error': f"워커 오류: {e}"}
+        self._idle.put(proc)
+        return response
+    
+    def run(self, strategy_id, parameters=None, market_data=None, data_key=None):
+        """백테스트 실행 -> 결과 (실패 시 예외)"""
+        response = self.request({
+            'strategy_id': strategy_id, 'parameters': parameters or {},
+            'market_data': market_data, 'data_key': data_key
+        })
+        if not response['ok']:
+            raise Exception(response['error'])
+        return response['result']
+    
+    def broadcast_data(self, data_key, market_data):
+        """모든 워커에 시장 데이터 등록 (이후 data_key 만으로 요청 가능)"""
+        line = json.dumps({'id': 0, 'op': 'load_data', 'data_key': data_key, 'market_data': market_data},
+                          ensure_ascii=False, default=str) + '\n'
+        workers = [self._idle.get() for _ in range(self.size)]
+        dead, errors = [], []
+        try:
+            sent = []
+            for proc in workers:
+                try:
+                    proc.stdin.write(line)
+                    proc.stdin.flush()
+                    sent.append(proc)
+                except OSError as e:
+                    dead.append(proc)
+                    errors.append(f"워커 오류: {e}")
+            for proc in sent:
+                try:
+                    reply = proc.stdout.readline()
+                    if not reply:
+                        raise BrokenPipeError("워커 종료")
+                    response = json.loads(reply)
+                except (OSError, ValueError) as e:
+                    dead.append(proc)
+                    errors.append(f"워커 오류: {e}")
+                    continue
+                if not response['ok']:
+                    errors.append(response['error'])
+        finally:
+            # 살아있는 워커만 반환, 죽은 워커는 재시작된 새 워커로 교체 (새 워커에는 데이터 없음)
+            for proc in workers:
+                if proc not in dead:
+                    self._idle.put(proc)
+                    continue
+                try:
+                    self._replace(proc)
+                except Exception as e:
+                    errors.append(str(e))
+        if errors:
+            raise Exception('; '.join(errors))
+    
+    def stats(self):
+        return [self.request({'op': 'stats'})['result'] for _ in range(self.size)]
+    
+    def close(self):
+        for proc in self._workers:
+            try:
+                proc.stdin.write(json.dumps({'op': 'shutdown'}) + '\n')
+                proc.stdin.flush()
+                proc.stdin.close()
+                proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                proc.kill()
+        self._workers = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_once(input_file, output_file):
+    """1회 실행: 입력 JSON 파일 -> 결과 JSON 파일"""
+    input_data = {}
     try:
         # 입력 데이터 로드
         input_data = load_input_data(input_file)
@@ -171,5 +545,28 @@ def main():
         save_output(output_file, error_result)
         sys.exit(1)
 
+def main():
+    # 기존 1회 실행 형식 유지
+    if len(sys.argv) == 3 and not sys.argv[1].startswith('--'):
+        run_once(sys.argv[1], sys.argv[2])
+        return
+    
+    parser = argparse.ArgumentParser(
+        description="백테스트 실행기",
+        usage="python backtest_runner.py <input_file> <output_file> | --serve | --socket PATH [--workers N]"
+    )
+    parser.add_argument('--serve', action='store_true', help='stdin/stdout 줄 단위 JSON 상주 모드')
+    parser.add_argument('--socket', help='Unix 소켓 경로 (상주 워커 풀)')
+    parser.add_argument('--workers', type=int, default=1, help='소켓 모드 워커 프로세스 수')
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve_stdio()
+    elif args.socket:
+        serve_socket(args.socket, args.workers)
+    else:
+        print("사용법: python backtest_runner.py <input_file> <output_file>")
+        sys.exit(1)
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -17,16 +17,19 @@ class QuantTradingSystem:
         self.kis_ws = None
         self.data_processor = None
         self.chart_manager = None
+        self.output = None
         self.auto_execute = False
         self.monitored_stocks = []
     
-    async def initialize_environment(self, env_type: str = "interactive"):
+    async def initialize_environment(self, env_type: str = "interactive", output_mode: str = "dashboard",
+                                     output_log: Optional[str] = None):
         """환경 초기화"""
         try:
             # 지연 임포트로 순환 임포트 방지
             from services.kis_auth import KISAuth
             from services.kis_websocket import KISWebSocket
             from services.data_processor import TickDataProcessor, RealTimeChartManager
+            from services.output_sinks import create_output_sink
             
             print(f"\n시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
@@ -54,13 +57,17 @@ class QuantTradingSystem:
             await self.kis_auth.get_access_token()
             print(f"인증 완료")
             
+            # 출력 싱크 초기화 (틱 경로에서는 print 대신 싱크 사용)
+            self.output = create_output_sink(output_mode, log_path=output_log)
+            await self.output.start()
+            
             # 데이터 처리기 초기화
-            self.data_processor = TickDataProcessor()
+            self.data_processor = TickDataProcessor(output=self.output)
             self.chart_manager = RealTimeChartManager(self.data_processor)
             
             # WebSocket 서비스 초기화
             print(f"실시간 데이터 시스템 초기화 중...")
-            self.kis_ws = KISWebSocket(self.kis_auth, selected_env.ws_url)
+            self.kis_ws = KISWebSocket(self.kis_auth, selected_env.ws_url, output=self.output)
             
             print(f"환경 초기화 완료!")
             return selected_env
@@ -191,7 +198,7 @@ class QuantTradingSystem:
             await self.kis_auth.get_access_token()
             
             # 새 WebSocket 서비스 초기화
-            self.kis_ws = KISWebSocket(self.kis_auth, new_env.ws_url)
+            self.kis_ws = KISWebSocket(self.kis_auth, new_env.ws_url, output=self.output)
             
             # 기존 모니터링 종목 재시작
             if self.monitored_stocks:
@@ -207,6 +214,12 @@ class QuantTradingSystem:
         """시스템 정리"""
         if self.kis_ws:
             await self.kis_ws.disconnect()
+        if self.chart_manager:
+            await self.chart_manager.close()
+        if self.data_processor:
+            await self.data_processor.close()
+        if self.output:
+            await self.output.stop()
         print("시스템 정리 완료")
 
 def parse_arguments():
@@ -229,6 +242,17 @@ def parse_arguments():
         action='store_true',
         help='자동 실행 모드 활성화'
     )
+    parser.add_argument(
+        '--output',
+        choices=['dashboard', 'console', 'log', 'silent'],
+        default='dashboard',
+        help='실시간 출력 방식 (주기적 대시보드 / 샘플링 콘솔 / 구조화 로그 / 무출력)'
+    )
+    parser.add_argument(
+        '--output-log',
+        default=None,
+        help='구조화 로그(JSON Lines) 파일 경로'
+    )
     
     return parser.parse_args()
 
@@ -259,7 +283,7 @@ async def main():
         print("="*80)
         
         # 환경 초기화
-        selected_env = await system.initialize_environment(args.env)
+        selected_env = await system.initialize_environment(args.env, args.output, args.output_log)
         
         # 전략 설정
         if args.auto_execute:
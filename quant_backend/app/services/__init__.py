@@ -5,6 +5,13 @@ KIS API 서비스 패키지
 이 패키지는 한국투자증권 OpenAPI와의 통신을 담당하는 서비스들을 포함합니다.
 - kis_auth: API 인증 관리
 - kis_websocket: 실시간 WebSocket 연결
+- tick_parser: 실시간 프레임 파서
+- tick_dispatcher: 실시간 틱 구독자 분배
+- output_sinks: 실시간 출력 싱크
+- redis_writer: 버퍼링 Redis 틱 저장
+- ring_buffer: NumPy 틱/분봉 링 버퍼
+- chart_broadcast: 차트 WebSocket 브로드캐스트
+- chart_stream: 차트 스냅샷/델타 스트림
 - kis_api: REST API 클라이언트
 - data_processor: 실시간 데이터 처리
 - trading_strategy: 거래 전략 실행
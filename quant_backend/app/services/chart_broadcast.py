@@ -0,0 +1,330 @@
+# services/chart_broadcast.py - 차트 WebSocket 브로드캐스트 허브
+"""
+차트 구독 클라이언트로의 동시 전송 허브
+
+- 업데이트는 프레임 간격(기본 100ms) 안에서 종목별 최신 값 하나로 병합
+- 프레임마다 종목당 한 번만 직렬화하고 같은 페이로드를 모든 클라이언트가 공유
+- 클라이언트마다 크기 제한 전송 큐와 독립 전송 태스크를 두어 느린 탭이
+  다른 클라이언트를 지연시키지 않음
+- 메시지를 버린 클라이언트는 스냅샷 제공자가 있으면 다음 프레임에 재동기화
+- 큐를 비우지 못한 채 유실이 반복되거나 전송이 제한 시간을 넘기면 클라이언트 퇴출
+- 인코딩: json(기본, orjson 사용 가능 시 orjson) / msgpack(바이너리)
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Union
+import logging
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack은 선택사항
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+Payload = Union[str, bytes]
+
+
+def _default(value):
+    """datetime 등 기본 직렬화 불가 타입 처리"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):  # NumPy 스칼라
+        return value.item()
+    return str(value)
+
+
+def serialize(message: Dict, encoding: str = "json") -> Payload:
+    """메시지 직렬화 (json -> str, msgpack -> bytes)"""
+    if encoding == "msgpack":
+        if msgpack is None:
+            raise ValueError("msgpack 인코딩에는 msgpack 패키지가 필요합니다")
+        return msgpack.packb(message, default=_default)
+    if orjson is not None:
+        return orjson.dumps(message, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(message, default=_default)
+
+
+class ChartClient:
+    """클라이언트 하나의 전송 큐와 전송 태스크"""
+
+    def __init__(self, websocket, code: str, maxsize: int = 32, options: Optional[Dict] = None):
+        self.websocket = websocket
+        self.code = code
+        self.maxsize = maxsize
+        self.options = options or {}  # 화면 폭 등 클라이언트별 설정
+        self.task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.needs_resync = False
+
+        self._queue: deque = deque()
+        self._wakeup = asyncio.Event()
+
+        # 통계
+        self.sent = 0
+        self.dropped = 0
+        self.full_frames = 0  # 큐를 비우지 못한 채 유실이 발생한 프레임 수
+        self.last_send_ms = 0.0
+        self.max_send_ms = 0.0
+
+    @property
+    def lag(self) -> int:
+        return len(self._queue)
+
+    def offer(self, payload: Payload) -> bool:
+        """페이로드 적재 (절대 대기하지 않음) - 큐가 가득 차 있었으면 False"""
+        full = len(self._queue) >= self.maxsize
+        if full:
+            self._queue.popleft()
+            self.dropped += 1
+            self.needs_resync = True
+        self._queue.append(payload)
+        self._wakeup.set()
+        return not full
+
+    async def run(self, send_timeout: float, on_error: Callable):
+        """전송 루프 - 클라이언트별로 독립 실행"""
+        while True:
+            if not self._queue:
+                self.full_frames = 0  # 따라잡음
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            payload = self._queue.popleft()
+            start = time.perf_counter()
+            try:
+                if isinstance(payload, bytes):
+                    await asyncio.wait_for(self.websocket.send_bytes(payload), send_timeout)
+                else:
+                    await asyncio.wait_for(self.websocket.send_text(payload), send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await on_error(self, e)
+                return
+
+            elapsed = (time.perf_counter() - start) * 1000
+            self.last_send_ms = elapsed
+            if elapsed > self.max_send_ms:
+                self.max_send_ms = elapsed
+            self.sent += 1
+
+    def get_stats(self) -> Dict:
+        return {
+            'code': self.code,
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'lag': self.lag,
+            'last_send_ms': round(self.last_send_ms, 3),
+            'max_send_ms': round(self.max_send_ms, 3),
+        }
+
+
+class ChartBroadcastHub:
+    """종목별 차트 클라이언트 브로드캐스트 허브"""
+
+    def __init__(self, frame_interval: float = 0.1, client_queue_size: int = 32,
+                 send_timeout: float = 2.0, max_full_frames: int = 20,
+                 encoding: str = "json", on_evict: Optional[Callable] = None,
+                 snapshot: Optional[Callable] = None):
+        if encoding == "msgpack" and msgpack is None:
+            raise ValueError("msgpack 인코딩에는 msgpack 패키지가 필요합니다")
+        self.frame_interval = frame_interval
+        self.client_queue_size = client_queue_size
+        self.send_timeout = send_timeout
+        self.max_full_frames = max_full_frames
+        self.encoding = encoding
+        self.on_evict = on_evict
+        self.snapshot = snapshot  # snapshot(client) -> 재동기화 메시지
+
+        self.clients: Dict[str, List[ChartClient]] = {}
+        self._pending: Dict[str, Dict] = {}  # 종목코드 -> 이번 프레임 최신 메시지
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.published = 0
+        self.conflated = 0
+        self.frames = 0
+        self.serializations = 0
+        self.evicted = 0
+        self.resyncs = 0
+        self.last_frame_ms = 0.0
+
+    def start(self):
+        """프레임 태스크 시작 (실행 중인 이벤트 루프 필요)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def add_client(self, code: str, websocket, options: Optional[Dict] = None) -> ChartClient:
+        """클라이언트 등록 및 전송 태스크 시작"""
+        self.start()
+        client = ChartClient(websocket, code, self.client_queue_size, options)
+        client.task = asyncio.get_running_loop().create_task(
+            client.run(self.send_timeout, self._on_send_error)
+        )
+        self.clients.setdefault(code, []).append(client)
+        return client
+
+    def find_client(self, code: str, websocket) -> Optional[ChartClient]:
+        for client in self.clients.get(code, []):
+            if client.websocket is websocket:
+                return client
+        return None
+
+    def remove_client(self, code: str, websocket) -> bool:
+        """클라이언트 해제 - 등록되어 있었으면 True"""
+        client = self.find_client(code, websocket)
+        if client is None:
+            return False
+        self._detach(client)
+        return True
+
+    def _detach(self, client: ChartClient):
+        client.closed = True
+        clients = self.clients.get(client.code, [])
+        if client in clients:
+            clients.remove(client)
+        if not clients:
+            self.clients.pop(client.code, None)
+            self._pending.pop(client.code, None)
+        if client.task and client.task is not asyncio.current_task():
+            client.task.cancel()
+
+    def send_to(self, client: ChartClient, message: Dict):
+        """특정 클라이언트에게만 전송 (초기 스냅샷 등)"""
+        client.offer(serialize(message, self.encoding))
+
+    def resync(self, client: ChartClient):
+        """밀린 메시지를 버리고 스냅샷부터 다시 전송"""
+        client._queue.clear()
+        client.needs_resync = False
+        if self.snapshot is not None:
+            self.send_to(client, self.snapshot(client))
+            self.resyncs += 1
+
+    def publish(self, code: str, message: Union[Dict, Callable]):
+        """업데이트 적재 - 같은 프레임 안의 이전 업데이트는 병합
+
+        message가 callable이면 프레임 시점에 한 번만 호출해 메시지를 만든다
+        (None을 반환하면 해당 프레임은 건너뜀).
+        """
+        if code not in self.clients:
+            return
+        self.published += 1
+        if code in self._pending:
+            self.conflated += 1
+        self._pending[code] = message
+        self._wakeup.set()
+
+    async def _run(self):
+        """프레임 루프 - 프레임마다 종목당 한 번 직렬화 후 전 클라이언트 큐에 적재"""
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await asyncio.sleep(self.frame_interval)
+            self.flush_frame()
+
+    def flush_frame(self):
+        """대기 중인 업데이트를 클라이언트 큐로 분배"""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        start = time.perf_counter()
+        slow: List[ChartClient] = []
+        for code, message in pending.items():
+            clients = self.clients.get(code)
+            if not clients:
+                continue
+            if callable(message):
+                message = message()
+                if message is None:
+                    continue
+            payload = serialize(message, self.encoding)
+            self.serializations += 1
+            for client in list(clients):
+                if client.needs_resync and self.snapshot is not None:
+                    # 델타를 놓친 클라이언트는 스냅샷으로 재동기화
+                    self.resync(client)
+                    continue
+                if not client.offer(payload):
+                    client.full_frames += 1
+                    if client.full_frames >= self.max_full_frames:
+                        slow.append(client)
+        self.frames += 1
+        self.last_frame_ms = (time.perf_counter() - start) * 1000
+
+        for client in slow:
+            self._evict(client, f"전송 큐 적체 {client.lag}건")
+
+    async def _on_send_error(self, client: ChartClient, error: Exception):
+        if isinstance(error, asyncio.TimeoutError):
+            reason = f"전송 시간 초과 ({self.send_timeout}s)"
+        else:
+            reason = f"전송 실패: {error}"
+        self._evict(client, reason)
+
+    def _evict(self, client: ChartClient, reason: str):
+        """느리거나 끊어진 클라이언트 퇴출"""
+        if client.closed:
+            return
+        self._detach(client)
+        self.evicted += 1
+        logger.warning(f"차트 클라이언트 퇴출 [{client.code}]: {reason}")
+        close = getattr(client.websocket, 'close', None)
+        if close is not None:
+            asyncio.get_running_loop().create_task(self._close_quietly(close))
+        if self.on_evict:
+            self.on_evict(client.code, client.websocket, reason)
+
+    @staticmethod
+    async def _close_quietly(close):
+        try:
+            await close()
+        except Exception:
+            pass
+
+    async def stop(self):
+        """프레임/전송 태스크 종료"""
+        tasks = []
+        if self._task:
+            self._task.cancel()
+            tasks.append(self._task)
+            self._task = None
+        for clients in self.clients.values():
+            for client in clients:
+                if client.task:
+                    client.task.cancel()
+                    tasks.append(client.task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def client_count(self, code: Optional[str] = None) -> int:
+        if code is not None:
+            return len(self.clients.get(code, []))
+        return sum(len(clients) for clients in self.clients.values())
+
+    def get_stats(self) -> Dict:
+        """허브 통계 반환"""
+        clients = [c for cs in self.clients.values() for c in cs]
+        return {
+            'clients': len(clients),
+            'published': self.published,
+            'conflated': self.conflated,
+            'frames': self.frames,
+            'serializations': self.serializations,
+            'evicted': self.evicted,
+            'resyncs': self.resyncs,
+            'dropped': sum(c.dropped for c in clients),
+            'max_lag': max((c.lag for c in clients), default=0),
+            'last_frame_ms': round(self.last_frame_ms, 3),
+        }
@@ -0,0 +1,163 @@
+# services/chart_stream.py - 델타 인코딩 차트 스트림
+"""
+차트 스트리밍 프로토콜 (스냅샷 + 시퀀스 번호 델타)
+
+1. 구독 시 chart_snapshot 한 번: 화면 폭(픽셀)에 맞춰 다운샘플한 틱/분봉과 현재 seq
+2. 이후 프레임마다 chart_delta: prev_seq -> seq, 새 틱과 분봉 변경분만 포함
+   - ticks.start / bars.start 는 첫 행의 절대 인덱스
+   - 분봉: bars.start 이후 봉을 교체 (형성 중인 봉 제자리 갱신 + 새 봉 추가),
+     스냅샷이 step개씩 묶였으면 절대 인덱스 // step 버킷에 합친다
+   - 틱: 이미 가진 인덱스(스냅샷 end 포함) 이전 행은 무시하고 나머지만 추가
+3. 클라이언트의 seq와 델타의 prev_seq가 다르면 {"type": "resync"}로 스냅샷 재요청,
+   서버도 전송 큐에서 메시지를 버린 클라이언트에는 스냅샷을 다시 보낸다
+
+모든 배열은 열 지향(time/price/...)이며 시각은 epoch 밀리초 정수.
+델타는 종목당 한 번 만들어 모든 클라이언트가 공유하므로 서버 부하와 대역폭은
+이력 길이가 아니라 새 데이터 양에 비례한다.
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+NS_PER_MS = 1_000_000
+
+
+def downsample_ticks(ticks: Dict[str, np.ndarray], width: Optional[int]) -> Dict[str, np.ndarray]:
+    """픽셀 구간마다 최저/최고가 틱만 남기는 다운샘플 (최대 약 2*width 점, 시간순 유지)"""
+    n = len(ticks['ts'])
+    if not width or n <= 2 * width:
+        return ticks
+
+    bucket = (np.arange(n) * width) // n
+    order = np.lexsort((ticks['price'], bucket))  # 구간별 가격 오름차순
+    sorted_bucket = bucket[order]
+    first = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+    last = np.r_[first[1:] - 1, n - 1]
+    # 구간 최저/최고가 + 마지막 틱(현재가)
+    keep = np.unique(np.concatenate((order[first], order[last], [n - 1])))
+    return {name: col[keep] for name, col in ticks.items()}
+
+
+def downsample_bars(bars: Dict[str, np.ndarray], first_index: int,
+                    width: Optional[int]) -> Tuple[Dict[str, np.ndarray], int]:
+    """분봉을 절대 인덱스 기준 step개씩 묶어 OHLCV 재집계 -> (묶은 봉, step)"""
+    n = len(bars['ts'])
+    if not width or n <= width:
+        return bars, 1
+
+    step = -(-n // width)
+    bucket = (first_index + np.arange(n)) // step
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    volume = np.add.reduceat(bars['volume'], starts)
+    value = np.add.reduceat(bars['vwap'] * bars['volume'], starts)
+    close = bars['close'][ends]
+    return {
+        'ts': bars['ts'][starts],
+        'open': bars['open'][starts],
+        'high': np.maximum.reduceat(bars['high'], starts),
+        'low': np.minimum.reduceat(bars['low'], starts),
+        'close': close,
+        'volume': volume,
+        'tick_count': np.add.reduceat(bars['tick_count'], starts),
+        'vwap': np.where(volume > 0, value / np.maximum(volume, 1), close),
+    }, step
+
+
+def _tick_columns(ticks: Dict[str, np.ndarray], **extra) -> Dict:
+    return {
+        **extra,
+        'time': (ticks['ts'] // NS_PER_MS).tolist(),
+        'price': ticks['price'].tolist(),
+        'volume': ticks['volume'].tolist(),
+        'change': ticks['change'].tolist(),
+        'change_rate': ticks['change_rate'].tolist(),
+    }
+
+
+def _bar_columns(bars: Dict[str, np.ndarray], **extra) -> Dict:
+    return {
+        **extra,
+        'time': (bars['ts'] // NS_PER_MS).tolist(),
+        'open': bars['open'].tolist(),
+        'high': bars['high'].tolist(),
+        'low': bars['low'].tolist(),
+        'close': bars['close'].tolist(),
+        'volume': bars['volume'].tolist(),
+        'vwap': np.round(bars['vwap'], 2).tolist(),
+    }
+
+
+class ChartStream:
+    """종목 하나의 델타 스트림 상태 (모든 구독 클라이언트가 공유)"""
+
+    def __init__(self, stock_code: str, processor):
+        self.code = stock_code
+        self.processor = processor
+        self.seq = 0
+
+        ticks, bars = self._buffers()
+        self.tick_index = ticks.total if ticks is not None else 0  # 다음 델타 첫 틱
+        self.bar_index = max(bars.total - 1, 0) if bars is not None else 0  # 다음 델타 첫 봉
+
+        # 통계
+        self.deltas = 0
+        self.snapshots = 0
+
+    def _buffers(self):
+        ticks = self.processor.tick_buffers.get(self.code)
+        bars = self.processor.chart_data.get(self.code, {}).get('minute_bars')
+        return ticks, bars
+
+    def next_delta(self) -> Optional[Dict]:
+        """마지막 델타 이후 변경분 (새 틱이 없으면 None)"""
+        ticks_buf, bars_buf = self._buffers()
+        if ticks_buf is None or ticks_buf.total == self.tick_index:
+            return None
+
+        tick_start = max(self.tick_index, ticks_buf.first_index)
+        bar_start = max(self.bar_index, bars_buf.first_index)
+        chart_data = self.processor.chart_data[self.code]
+        message = {
+            'type': 'chart_delta',
+            'code': self.code,
+            'prev_seq': self.seq,
+            'seq': self.seq + 1,
+            'ticks': _tick_columns(ticks_buf.since_index(tick_start), start=tick_start),
+            'bars': _bar_columns(bars_buf.since_index(bar_start), start=bar_start),
+            'indicators': chart_data.get('indicators', {}),
+            'stats': chart_data.get('tick_stats', {}),
+        }
+
+        self.seq += 1
+        self.deltas += 1
+        self.tick_index = ticks_buf.total
+        self.bar_index = max(bars_buf.total - 1, 0)  # 형성 중인 봉은 다음 델타에 다시 포함
+        return message
+
+    def snapshot(self, width: Optional[int] = None, minutes: int = 30) -> Dict:
+        """현재 seq 기준 전체 스냅샷 (width 픽셀에 맞춰 다운샘플)"""
+        ticks_buf, bars_buf = self._buffers()
+        message = {
+            'type': 'chart_snapshot',
+            'code': self.code,
+            'seq': self.seq,
+            'ticks': None,
+            'bars': None,
+            'volume_profile': self.processor.get_volume_profile(self.code),
+            'indicators': self.processor.get_indicators(self.code),
+            'stats': self.processor.chart_data.get(self.code, {}).get('tick_stats', {}),
+        }
+        if ticks_buf is not None:
+            ticks = downsample_ticks(self.processor.get_tick_arrays(self.code, minutes), width)
+            message['ticks'] = _tick_columns(ticks, end=ticks_buf.total)
+            bars, step = downsample_bars(bars_buf.last(), bars_buf.first_index, width)
+            message['bars'] = _bar_columns(bars, start=bars_buf.first_index, step=step,
+                                           end=bars_buf.total)
+
+        self.snapshots += 1
+        return message
+
+    def get_stats(self) -> Dict:
+        return {'code': self.code, 'seq': self.seq, 'deltas': self.deltas,
+                'snapshots': self.snapshots}
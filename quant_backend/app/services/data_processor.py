@@ -1,23 +1,35 @@
 # services/data_processor.py - 실시간 데이터 처리 및 틱차트 서비스 완성본
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Any
 import asyncio
 import json
-from collections import deque
+import time
 import logging
 
+from services.output_sinks import OutputSink, SampledConsoleSink
+from services.redis_writer import RedisTickWriter
+from services.chart_broadcast import ChartBroadcastHub
+from services.chart_stream import ChartStream, downsample_ticks, downsample_bars
+from services.ring_buffer import (
+    TickRingBuffer, BarRingBuffer, NS_PER_MINUTE,
+    tick_time_ns, ns_to_datetime, ns_to_iso
+)
+
 logger = logging.getLogger(__name__)
 
 class TickDataProcessor:
     """실시간 틱 데이터 처리기"""
     
-    def __init__(self, redis_client=None):
+    def __init__(self, redis_client=None, output: Optional[OutputSink] = None):
         self.redis = redis_client
-        self.tick_buffers: Dict[str, deque] = {}
+        self.redis_writer = RedisTickWriter(redis_client) if redis_client else None
+        self.output = output or SampledConsoleSink()
+        self.tick_buffers: Dict[str, TickRingBuffer] = {}
         self.chart_data: Dict[str, Dict] = {}
         self.max_ticks = 1000  # 최대 저장 틱 수
+        self.max_minute_bars = 480  # 최대 분봉 수 (8시간)
         self.price_alerts: Dict[str, Dict] = {}  # 가격 알림 설정
         
     async def process_tick(self, tick_data: Dict) -> Dict:
@@ -26,9 +38,9 @@ class TickDataProcessor:
         
         # 틱 버퍼 초기화
         if stock_code not in self.tick_buffers:
-            self.tick_buffers[stock_code] = deque(maxlen=self.max_ticks)
+            self.tick_buffers[stock_code] = TickRingBuffer(self.max_ticks)
             self.chart_data[stock_code] = {
-                'minute_bars': [],
+                'minute_bars': BarRingBuffer(self.max_minute_bars),
                 'volume_profile': {},
                 'tick_stats': {},
                 'indicators': {}
@@ -39,11 +51,15 @@ class TickDataProcessor:
             logger.warning(f"유효하지 않은 틱 데이터: {stock_code}")
             return tick_data
         
-        # 틱 데이터 추가
-        self.tick_buffers[stock_code].append(tick_data)
+        # 틱 데이터 추가 (링 버퍼에 열 단위로 기록)
+        ts_ns = tick_time_ns(tick_data)
+        self.tick_buffers[stock_code].append(
+            ts_ns, tick_data['price'], tick_data['volume'],
+            tick_data.get('change', 0), tick_data.get('change_rate', 0.0)
+        )
         
         # 분봉 데이터 업데이트
-        await self._update_minute_bar(stock_code, tick_data)
+        await self._update_minute_bar(stock_code, tick_data, ts_ns)
         
         # 볼륨 프로파일 업데이트
         self._update_volume_profile(stock_code, tick_data)
@@ -61,8 +77,8 @@ class TickDataProcessor:
         if self.redis:
             await self._save_to_redis(stock_code, tick_data)
         
-        # 실시간 출력
-        self._print_realtime_analysis(stock_code, tick_data)
+        # 실시간 출력 (싱크에서 샘플링/집계)
+        self._emit_realtime_analysis(stock_code, tick_data)
         
         return tick_data
     
@@ -80,40 +96,13 @@ class TickDataProcessor:
         
         return True
     
-    async def _update_minute_bar(self, stock_code: str, tick_data: Dict):
-        """1분봉 데이터 업데이트"""
-        current_minute = tick_data['timestamp'].replace(second=0, microsecond=0)
-        chart_data = self.chart_data[stock_code]
-        
-        # 현재 분봉이 없거나 새로운 분이면 생성
-        if not chart_data['minute_bars'] or chart_data['minute_bars'][-1]['timestamp'] != current_minute:
-            new_bar = {
-                'timestamp': current_minute,
-                'open': tick_data['price'],
-                'high': tick_data['price'],
-                'low': tick_data['price'],
-                'close': tick_data['price'],
-                'volume': tick_data['volume'],
-                'tick_count': 1,
-                'vwap': tick_data['price']  # 가중평균가격
-            }
-            chart_data['minute_bars'].append(new_bar)
-            
-            # 최대 480개 (8시간) 분봉 유지
-            if len(chart_data['minute_bars']) > 480:
-                chart_data['minute_bars'] = chart_data['minute_bars'][-480:]
-        else:
-            # 기존 분봉 업데이트
-            current_bar = chart_data['minute_bars'][-1]
-            current_bar['high'] = max(current_bar['high'], tick_data['price'])
-            current_bar['low'] = min(current_bar['low'], tick_data['price'])
-            current_bar['close'] = tick_data['price']
-            current_bar['volume'] += tick_data['volume']
-            current_bar['tick_count'] += 1
-            
-            # VWAP 업데이트
-            total_value = (current_bar['vwap'] * (current_bar['volume'] - tick_data['volume'])) + (tick_data['price'] * tick_data['volume'])
-            current_bar['vwap'] = total_value / current_bar['volume'] if current_bar['volume'] > 0 else tick_data['price']
+    async def _update_minute_bar(self, stock_code: str, tick_data: Dict, ts_ns: Optional[int] = None):
+        """1분봉 데이터 업데이트 (형성 중인 봉은 제자리 갱신)"""
+        if ts_ns is None:
+            ts_ns = tick_time_ns(tick_data)
+        self.chart_data[stock_code]['minute_bars'].update(
+            ts_ns, tick_data['price'], tick_data['volume']
+        )
     
     def _update_volume_profile(self, stock_code: str, tick_data: Dict):
         """볼륨 프로파일 업데이트"""
@@ -138,46 +127,46 @@ class TickDataProcessor:
         volume_profile[price_level]['last_time'] = tick_data['timestamp']
     
     def _update_tick_stats(self, stock_code: str):
-        """틱 통계 업데이트"""
-        ticks = list(self.tick_buffers[stock_code])
-        if len(ticks) < 2:
+        """틱 통계 업데이트 (최근 1분 구간을 이진 탐색으로 잘라 벡터 연산)"""
+        buffer = self.tick_buffers[stock_code]
+        if len(buffer) < 2:
             return
         
         # 최근 1분간 데이터
-        now = datetime.now()
-        recent_ticks = [t for t in ticks if (now - t['timestamp']).total_seconds() <= 60]
+        now_ns = time.time_ns()
+        recent = buffer.between(now_ns - NS_PER_MINUTE)
+        prices = recent['price']
+        volumes = recent['volume']
         
-        if recent_ticks:
-            prices = [t['price'] for t in recent_ticks]
-            volumes = [t['volume'] for t in recent_ticks]
-            
+        if len(prices):
             # 가격 변동성 계산
-            price_changes = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-            volatility = np.std(price_changes) if len(price_changes) > 1 else 0
+            volatility = float(np.std(np.diff(prices))) if len(prices) > 2 else 0
+            min_price = int(prices.min())
+            max_price = int(prices.max())
+            max_volume = int(volumes.max())
             
             stats = {
-                'tick_count_1min': len(recent_ticks),
-                'avg_price_1min': np.mean(prices),
+                'tick_count_1min': len(prices),
+                'avg_price_1min': float(prices.mean()),
                 'price_volatility_1min': volatility,
-                'total_volume_1min': sum(volumes),
-                'avg_volume_1min': np.mean(volumes),
-                'max_tick_volume': max(volumes) if volumes else 0,
-                'min_price_1min': min(prices),
-                'max_price_1min': max(prices),
-                'price_range_1min': max(prices) - min(prices) if prices else 0,
-                'last_update': now
+                'total_volume_1min': int(volumes.sum()),
+                'avg_volume_1min': float(volumes.mean()),
+                'max_tick_volume': max_volume,
+                'min_price_1min': min_price,
+                'max_price_1min': max_price,
+                'price_range_1min': max_price - min_price,
+                'last_update': ns_to_datetime(now_ns)
             }
             
             self.chart_data[stock_code]['tick_stats'] = stats
     
     async def _calculate_indicators(self, stock_code: str):
         """기술적 지표 계산"""
-        ticks = list(self.tick_buffers[stock_code])
-        if len(ticks) < 20:
+        buffer = self.tick_buffers[stock_code]
+        if len(buffer) < 20:
             return
         
-        prices = [t['price'] for t in ticks[-50:]]  # 최근 50틱
-        volumes = [t['volume'] for t in ticks[-50:]]
+        prices = buffer.last(50)['price'].tolist()  # 최근 50틱
         
         indicators = {}
         
@@ -215,11 +204,11 @@ class TickDataProcessor:
         
         # 상한선 알림
         if 'upper_limit' in alerts and price >= alerts['upper_limit']:
-            print(f"가격 알림! {stock_code} 상한선 돌파: {price:,}원")
+            self.output.on_alert(stock_code, f"가격 알림! 상한선 돌파: {price:,}원")
             
         # 하한선 알림  
         if 'lower_limit' in alerts and price <= alerts['lower_limit']:
-            print(f"가격 알림! {stock_code} 하한선 돌파: {price:,}원")
+            self.output.on_alert(stock_code, f"가격 알림! 하한선 돌파: {price:,}원")
     
     def set_price_alert(self, stock_code: str, upper_limit: float = None, lower_limit: float = None):
         """가격 알림 설정"""
@@ -233,88 +222,69 @@ class TickDataProcessor:
         
         print(f"[알림 설정] {stock_code} - 상한: {upper_limit:,}원, 하한: {lower_limit:,}원")
     
-    def _print_realtime_analysis(self, stock_code: str, tick_data: Dict):
-        """실시간 분석 결과 출력"""
+    def _emit_realtime_analysis(self, stock_code: str, tick_data: Dict):
+        """실시간 분석 결과를 출력 싱크로 전달"""
         stats = self.chart_data[stock_code].get('tick_stats', {})
         indicators = self.chart_data[stock_code].get('indicators', {})
-        timestamp = tick_data['timestamp'].strftime('%H:%M:%S')
-        
-        # 기본 틱 정보
-        print(f"\n╔═══ 실시간 틱 분석 [{stock_code}] {timestamp} ═══╗")
-        print(f"║ 현재가: {tick_data['price']:,}원                            ║")
-        print(f"║ 거래량: {tick_data['volume']:,}주                             ║")
-        print(f"║ 전일대비: {tick_data['change']:+,}원 ({tick_data['change_rate']:+.2f}%)        ║")
-        print(f"╠═══════════════════════════════════════════════════════════╣")
-        
-        # 1분간 통계
-        if stats:
-            print(f"║ [1분간 통계]                                           ║")
-            print(f"║ 틱 수: {stats.get('tick_count_1min', 0):,}개                                    ║")
-            print(f"║ 평균가: {stats.get('avg_price_1min', 0):,.0f}원                              ║")
-            print(f"║ 변동성: {stats.get('price_volatility_1min', 0):.1f}                                 ║")
-            print(f"║ 거래량: {stats.get('total_volume_1min', 0):,}주                             ║")
-            print(f"║ 가격범위: {stats.get('price_range_1min', 0):,}원                             ║")
-        
-        # 기술적 지표
-        if indicators:
-            print(f"║ [기술적 지표]                                          ║")
-            if 'sma5' in indicators:
-                sma5_signal = "상승세" if tick_data['price'] > indicators['sma5'] else "하락세"
-                print(f"║ SMA5: {indicators['sma5']:,.0f}원 ({sma5_signal})                        ║")
-            if 'rsi' in indicators:
-                rsi = indicators['rsi']
-                rsi_signal = "과매수" if rsi > 70 else "과매도" if rsi < 30 else "중립"
-                print(f"║ RSI: {rsi:.1f} ({rsi_signal})                                    ║")
-        
-        print(f"╚═══════════════════════════════════════════════════════════╝")
+        self.output.on_analysis(stock_code, tick_data, stats, indicators)
         
         # 거래량 분석
         if stats and stats.get('max_tick_volume', 0) > stats.get('avg_volume_1min', 0) * 3:
             avg_vol = stats.get('avg_volume_1min', 1)
             max_vol = stats.get('max_tick_volume', 0)
             ratio = max_vol / max(avg_vol, 1)
-            print(f"대량 거래 감지! (평균 대비 {ratio:.1f}배)")
+            self.output.on_alert(stock_code, f"대량 거래 감지! (평균 대비 {ratio:.1f}배)")
     
     async def _save_to_redis(self, stock_code: str, tick_data: Dict):
-        """Redis에 틱 데이터 저장"""
+        """Redis에 틱 데이터 저장 (버퍼링 후 파이프라인으로 일괄 기록)"""
         try:
-            # 틱 데이터 저장
-            tick_key = f"ticks:{stock_code}"
-            tick_json = json.dumps(tick_data, default=str)
-            
-            await self.redis.lpush(tick_key, tick_json)
-            await self.redis.ltrim(tick_key, 0, 999)  # 최대 1000개 유지
-            await self.redis.expire(tick_key, 86400)  # 1일 TTL
-            
-            # 통계 데이터 저장
-            stats_key = f"stats:{stock_code}"
             stats = self.chart_data[stock_code].get('tick_stats', {})
-            if stats:
-                await self.redis.hset(stats_key, mapping=stats)
-                await self.redis.expire(stats_key, 3600)  # 1시간 TTL
-            
+            await self.redis_writer.write(stock_code, tick_data, stats)
         except Exception as e:
             logger.error(f"Redis 저장 실패: {e}")
     
+    async def close(self):
+        """잔여 Redis 버퍼 기록"""
+        if self.redis_writer:
+            await self.redis_writer.close()
+    
+    def get_tick_arrays(self, stock_code: str, minutes: int = 60) -> Dict[str, np.ndarray]:
+        """틱차트 데이터를 열 배열(ts/price/volume/change/change_rate)로 반환"""
+        if stock_code not in self.tick_buffers:
+            return {}
+        
+        # 지정된 시간만큼 이진 탐색으로 잘라냄
+        cutoff_ns = time.time_ns() - minutes * NS_PER_MINUTE
+        return self.tick_buffers[stock_code].between(cutoff_ns)
+    
     def get_tick_chart_data(self, stock_code: str, minutes: int = 60) -> List[Dict]:
         """틱차트 데이터 반환"""
-        if stock_code not in self.tick_buffers:
+        arrays = self.get_tick_arrays(stock_code, minutes)
+        if not arrays:
             return []
         
-        # 지정된 시간만큼의 틱 데이터 필터링
-        cutoff_time = datetime.now() - timedelta(minutes=minutes)
-        ticks = [
-            tick for tick in self.tick_buffers[stock_code] 
-            if tick['timestamp'] >= cutoff_time
+        return [
+            {
+                'timestamp': ns_to_datetime(ts), 'price': price, 'volume': volume,
+                'change': change, 'change_rate': change_rate
+            }
+            for ts, price, volume, change, change_rate in zip(
+                arrays['ts'].tolist(), arrays['price'].tolist(), arrays['volume'].tolist(),
+                arrays['change'].tolist(), arrays['change_rate'].tolist()
+            )
         ]
-        
-        return ticks
+    
+    def get_minute_arrays(self, stock_code: str) -> Dict[str, np.ndarray]:
+        """분봉 데이터를 열 배열(ts/open/high/low/close/volume/tick_count/vwap)로 반환"""
+        if stock_code not in self.chart_data:
+            return {}
+        return self.chart_data[stock_code]['minute_bars'].last()
     
     def get_minute_chart_data(self, stock_code: str) -> List[Dict]:
         """분봉 차트 데이터 반환"""
         if stock_code not in self.chart_data:
             return []
-        return self.chart_data[stock_code]['minute_bars']
+        return self.chart_data[stock_code]['minute_bars'].to_dicts()
     
     def get_volume_profile(self, stock_code: str) -> Dict[int, Dict]:
         """볼륨 프로파일 반환"""
@@ -334,22 +304,24 @@ class TickDataProcessor:
             print(f"{stock_code} 데이터가 없습니다")
             return
         
-        ticks = list(self.tick_buffers[stock_code])
-        if not ticks:
+        ticks = self.tick_buffers[stock_code].last()
+        if not len(ticks['ts']):
             return
         
         # 통계 계산
-        prices = [t['price'] for t in ticks]
-        volumes = [t['volume'] for t in ticks]
+        prices = ticks['price']
+        volumes = ticks['volume']
+        first_time = ns_to_datetime(int(ticks['ts'][0]))
+        last_time = ns_to_datetime(int(ticks['ts'][-1]))
         
         print(f"\n============ {stock_code} 틱 데이터 요약 ============")
-        print(f"데이터 기간: {ticks[0]['timestamp'].strftime('%H:%M:%S')} ~ {ticks[-1]['timestamp'].strftime('%H:%M:%S')}")
-        print(f"총 틱 수: {len(ticks):,}개")
-        print(f"가격 범위: {min(prices):,}원 ~ {max(prices):,}원")
-        print(f"평균 가격: {np.mean(prices):,.0f}원")
-        print(f"총 거래량: {sum(volumes):,}주")
-        print(f"평균 틱 거래량: {np.mean(volumes):,.0f}주")
-        print(f"최대 틱 거래량: {max(volumes):,}주")
+        print(f"데이터 기간: {first_time.strftime('%H:%M:%S')} ~ {last_time.strftime('%H:%M:%S')}")
+        print(f"총 틱 수: {len(prices):,}개")
+        print(f"가격 범위: {prices.min():,}원 ~ {prices.max():,}원")
+        print(f"평균 가격: {prices.mean():,.0f}원")
+        print(f"총 거래량: {volumes.sum():,}주")
+        print(f"평균 틱 거래량: {volumes.mean():,.0f}주")
+        print(f"최대 틱 거래량: {volumes.max():,}주")
         print("=" * 48)
 
 class TechnicalIndicators:
@@ -453,95 +425,88 @@ class TechnicalIndicators:
 class RealTimeChartManager:
     """실시간 차트 매니저"""
     
-    def __init__(self, data_processor: TickDataProcessor):
+    def __init__(self, data_processor: TickDataProcessor, output: Optional[OutputSink] = None,
+                 frame_interval: float = 0.1, encoding: str = "json"):
         self.processor = data_processor
-        self.chart_subscribers: Dict[str, List] = {}
-        self.update_interval = 1  # 1초마다 업데이트
+        self.output = output or data_processor.output
+        # 구독자 전송은 브로드캐스트 허브가 담당 (프레임 단위 병합 + 클라이언트별 전송 큐)
+        self.hub = ChartBroadcastHub(frame_interval=frame_interval, encoding=encoding,
+                                     on_evict=self._on_client_evicted,
+                                     snapshot=self._client_snapshot)
+        self.streams: Dict[str, ChartStream] = {}  # 종목별 델타 스트림
+        self.update_interval = frame_interval  # 종목별 최대 업데이트 주기
         self.last_update: Dict[str, datetime] = {}
-        
-    async def add_chart_subscriber(self, stock_code: str, websocket):
-        """차트 구독자 추가"""
-        if stock_code not in self.chart_subscribers:
-            self.chart_subscribers[stock_code] = []
-        self.chart_subscribers[stock_code].append(websocket)
-        
-        print(f"차트 구독자 추가: {stock_code}")
-        
-        # 초기 차트 데이터 전송
-        await self._send_initial_chart_data(stock_code, websocket)
     
-    async def _send_initial_chart_data(self, stock_code: str, websocket):
-        """초기 차트 데이터 전송"""
+    @property
+    def chart_subscribers(self) -> Dict[str, List]:
+        """종목별 구독 WebSocket 목록"""
+        return {code: [c.websocket for c in clients] for code, clients in self.hub.clients.items()}
+        
+    async def add_chart_subscriber(self, stock_code: str, websocket, width: Optional[int] = None,
+                                   minutes: int = 30):
+        """차트 구독자 추가 (width: 차트 픽셀 폭, 스냅샷 다운샘플 기준)"""
+        if stock_code not in self.streams:
+            self.streams[stock_code] = ChartStream(stock_code, self.processor)
+        client = self.hub.add_client(stock_code, websocket,
+                                     options={'width': width, 'minutes': minutes})
+        
+        self.output.on_status(f"차트 구독자 추가: {stock_code}")
+        
+        # 초기 스냅샷 전송 (이후 델타보다 먼저 전송 큐에 적재)
+        await self._send_initial_chart_data(stock_code, client)
+    
+    async def _send_initial_chart_data(self, stock_code: str, client):
+        """초기 차트 스냅샷 전송"""
         try:
-            chart_data = await self.generate_tick_chart_json(stock_code, 30)
-            initial_message = {
-                'type': 'initial_chart',
-                'data': chart_data
-            }
-            await websocket.send_text(json.dumps(initial_message, default=str))
+            self.hub.send_to(client, self._client_snapshot(client))
         except Exception as e:
             logger.error(f"초기 차트 데이터 전송 실패: {e}")
     
+    def _client_snapshot(self, client) -> Dict:
+        """클라이언트 화면 폭에 맞춘 스냅샷"""
+        return self.streams[client.code].snapshot(client.options.get('width'),
+                                                  client.options.get('minutes', 30))
+    
+    async def request_resync(self, stock_code: str, websocket):
+        """클라이언트가 seq 누락을 감지했을 때 스냅샷 재전송 ({"type": "resync"} 수신 시)"""
+        client = self.hub.find_client(stock_code, websocket)
+        if client is not None:
+            self.hub.resync(client)
+    
     async def remove_chart_subscriber(self, stock_code: str, websocket):
         """차트 구독자 제거"""
-        if stock_code in self.chart_subscribers:
-            try:
-                self.chart_subscribers[stock_code].remove(websocket)
-                if not self.chart_subscribers[stock_code]:
-                    del self.chart_subscribers[stock_code]
-                print(f"차트 구독자 제거: {stock_code}")
-            except ValueError:
-                pass
+        if self.hub.remove_client(stock_code, websocket):
+            self.output.on_status(f"차트 구독자 제거: {stock_code}")
+        if stock_code not in self.hub.clients:
+            self.streams.pop(stock_code, None)
+    
+    def _on_client_evicted(self, stock_code: str, websocket, reason: str):
+        self.output.on_status(f"차트 구독자 퇴출: {stock_code} ({reason})")
+        if stock_code not in self.hub.clients:
+            self.streams.pop(stock_code, None)
     
     async def broadcast_chart_update(self, stock_code: str, tick_data: Dict):
-        """차트 업데이트 브로드캐스트"""
-        if stock_code not in self.chart_subscribers:
+        """차트 업데이트 브로드캐스트 (프레임마다 델타 하나를 만들어 전 구독자에 동시 전송)"""
+        stream = self.streams.get(stock_code)
+        if stream is None or stock_code not in self.hub.clients:
             return
         
-        # 업데이트 빈도 제한
-        now = datetime.now()
-        last_update = self.last_update.get(stock_code, datetime.min)
-        if (now - last_update).total_seconds() < self.update_interval:
-            return
-        
-        self.last_update[stock_code] = now
-        
-        # 차트 데이터 준비
-        indicators = self.processor.get_indicators(stock_code)
-        stats = self.processor.chart_data.get(stock_code, {}).get('tick_stats', {})
-        
-        chart_update = {
-            'type': 'tick_update',
-            'code': stock_code,
-            'timestamp': tick_data['timestamp'].isoformat(),
-            'price': tick_data['price'],
-            'volume': tick_data['volume'],
-            'change': tick_data['change'],
-            'change_rate': tick_data['change_rate'],
-            'indicators': indicators,
-            'stats': stats
-        }
-        
-        # 구독자들에게 전송
-        message = json.dumps(chart_update, default=str)
-        disconnected = []
-        
-        for websocket in self.chart_subscribers[stock_code]:
-            try:
-                await websocket.send_text(message)
-            except Exception as e:
-                logger.warning(f"차트 업데이트 전송 실패: {e}")
-                disconnected.append(websocket)
-        
-        # 끊어진 연결 제거
-        for ws in disconnected:
-            await self.remove_chart_subscriber(stock_code, ws)
+        self.last_update[stock_code] = datetime.now()
+        self.hub.publish(stock_code, stream.next_delta)
+    
+    async def close(self):
+        """브로드캐스트 태스크 종료"""
+        await self.hub.stop()
     
     def print_chart_status(self):
         """차트 상태 출력"""
         print(f"\n================== 실시간 차트 상태 ==================")
         print(f"활성 차트 수: {len(self.chart_subscribers)}개")
         print(f"업데이트 간격: {self.update_interval}초")
+        hub_stats = self.hub.get_stats()
+        print(f"브로드캐스트: 프레임 {hub_stats['frames']:,} / 병합 {hub_stats['conflated']:,} / "
+              f"유실 {hub_stats['dropped']:,} / 재동기화 {hub_stats['resyncs']:,} / "
+              f"퇴출 {hub_stats['evicted']:,}")
         
         for stock_code, subscribers in self.chart_subscribers.items():
             tick_count = len(self.processor.tick_buffers.get(stock_code, []))
@@ -552,41 +517,55 @@ class RealTimeChartManager:
             print(f"├─ 구독자: {len(subscribers)}명")
             print(f"├─ 틱 데이터: {tick_count:,}개")
             print(f"├─ 분봉 데이터: {minute_bars}개")
+            stream = self.streams.get(stock_code)
+            if stream:
+                print(f"├─ 스트림: seq {stream.seq:,} (델타 {stream.deltas:,} / 스냅샷 {stream.snapshots:,})")
             print(f"└─ 마지막 업데이트: {last_update.strftime('%H:%M:%S')}")
         
         print("=" * 54)
     
-    async def generate_tick_chart_json(self, stock_code: str, minutes: int = 30) -> Dict:
-        """틱차트 JSON 데이터 생성"""
-        tick_data = self.processor.get_tick_chart_data(stock_code, minutes)
-        minute_data = self.processor.get_minute_chart_data(stock_code)
+    async def generate_tick_chart_json(self, stock_code: str, minutes: int = 30,
+                                       width: Optional[int] = None) -> Dict:
+        """틱차트 JSON 데이터 생성 (링 버퍼 배열 슬라이스에서 열 단위 변환)
+
+        width를 주면 차트 픽셀 폭에 맞춰 다운샘플한다.
+        """
+        ticks = self.processor.get_tick_arrays(stock_code, minutes)
+        bars = self.processor.get_minute_arrays(stock_code)
+        if width and ticks:
+            ticks = downsample_ticks(ticks, width)
+            first_bar = self.processor.chart_data[stock_code]['minute_bars'].first_index
+            bars, _ = downsample_bars(bars, first_bar, width)
         volume_profile = self.processor.get_volume_profile(stock_code)
         indicators = self.processor.get_indicators(stock_code)
         stats = self.processor.chart_data.get(stock_code, {}).get('tick_stats', {})
         
+        tick_data = []
+        if ticks:
+            tick_data = [
+                {'time': t, 'price': p, 'volume': v, 'change': c, 'change_rate': r}
+                for t, p, v, c, r in zip(
+                    ns_to_iso(ticks['ts']), ticks['price'].tolist(), ticks['volume'].tolist(),
+                    ticks['change'].tolist(), ticks['change_rate'].tolist()
+                )
+            ]
+        
+        minute_bars = []
+        if bars:
+            minute_bars = [
+                {'time': t, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v, 'vwap': w}
+                for t, o, h, l, c, v, w in zip(
+                    ns_to_iso(bars['ts']), bars['open'].tolist(), bars['high'].tolist(),
+                    bars['low'].tolist(), bars['close'].tolist(), bars['volume'].tolist(),
+                    bars['vwap'].tolist()
+                )
+            ]
+        
         return {
             'stock_code': stock_code,
             'timestamp': datetime.now().isoformat(),
-            'tick_data': [
-                {
-                    'time': tick['timestamp'].isoformat(),
-                    'price': tick['price'],
-                    'volume': tick['volume'],
-                    'change': tick.get('change', 0),
-                    'change_rate': tick.get('change_rate', 0)
-                } for tick in tick_data
-            ],
-            'minute_bars': [
-                {
-                    'time': bar['timestamp'].isoformat(),
-                    'open': bar['open'],
-                    'high': bar['high'],
-                    'low': bar['low'],
-                    'close': bar['close'],
-                    'volume': bar['volume'],
-                    'vwap': bar.get('vwap', bar['close'])
-                } for bar in minute_data
-            ],
+            'tick_data': tick_data,
+            'minute_bars': minute_bars,
             'volume_profile': volume_profile,
             'indicators': indicators,
             'stats': stats
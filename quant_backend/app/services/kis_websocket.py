@@ -8,12 +8,17 @@ import logging
 from datetime import datetime
 import base64
 
+from services.tick_parser import KISFrameParser, TR_PRICE, TR_ORDERBOOK
+from services.tick_dispatcher import TickDispatcher
+from services.output_sinks import OutputSink, SampledConsoleSink
+
 logger = logging.getLogger(__name__)
 
 class KISWebSocket:
     """KIS WebSocket 실시간 데이터 클라이언트"""
     
-    def __init__(self, auth_service, ws_url: str):
+    def __init__(self, auth_service, ws_url: str, dispatcher: Optional[TickDispatcher] = None,
+                 output: Optional[OutputSink] = None):
         self.auth = auth_service
         self.ws_url = ws_url
         self.websocket: Optional[websockets.WebSocketServerProtocol] = None
@@ -22,6 +27,10 @@ class KISWebSocket:
         self.reconnect_attempts = 0
         self.max_reconnect_attempts = 5
         self.heartbeat_task: Optional[asyncio.Task] = None
+        self.parser = KISFrameParser()
+        self.dispatcher = dispatcher or TickDispatcher()
+        self.output = output or SampledConsoleSink()
+        self.surge_alert_rate = 3.0  # 급등/급락 알림 기준 (%)
         
     async def connect(self):
         """WebSocket 연결"""
@@ -66,6 +75,52 @@ class KISWebSocket:
             approval_key = await self.auth.get_websocket_key()
             
             approval_data = {
+                "header": {
+                    "approval_key": approval_key,
+                    "custtype": "P",
+                    "tr_type": "1",
+                    "content_type": "utf-8"
+                },
+                "body": {
+                    "input": {
+                        "tr_id": "PINGPONG",
+                        "tr_key": ""
+                    }
+                }
+            }
+            
+            await self.websocket.send(json.dumps(approval_data))
+            logger.info("승인키 전송 완료")
+            print("WebSocket 승인키 전송 완료")
+            
+            # 승인 응답 대기
+            await asyncio.sleep(1)
+            
+        except Exception as e:
+            logger.error(f"승인키 전송 실패: {e}")
+            print(f"승인키 전송 실패: {e}")
+            raise e
+    
+    async def _heartbeat(self):
+        """연결 유지를 위한 하트비트"""
+        while self.is_connected:
+            try:
+                if self.websocket and not self.websocket.closed:
+                    await self.websocket.ping()
+                await asyncio.sleep(30)  # 30초마다 핑
+            except Exception as e:
+                logger.warning(f"하트비트 실패: {e}")
+                break
+    
+    async def subscribe_realtime_price(self, stock_code: str, callback: Callable = None):
+        """실시간 시세 구독"""
+        if not self.is_connected:
+            await self.connect()
+        
+        try:
+            approval_key = await self.auth.get_websocket_key()
+            
+            subscribe_data = {
                 "header": {
                     "approval_key": approval_key,
                     "custtype": "P",
@@ -84,9 +139,7 @@ class KISWebSocket:
             
             # 콜백 등록
             if callback:
-                if stock_code not in self.subscribers:
-                    self.subscribers[stock_code] = []
-                self.subscribers[stock_code].append(callback)
+                self.add_subscriber(stock_code, callback)
             
             logger.info(f"실시간 시세 구독: {stock_code}")
             print(f"\n[구독 시작] {stock_code} 실시간 시세")
@@ -123,10 +176,7 @@ class KISWebSocket:
             await self.websocket.send(json.dumps(subscribe_data))
             
             if callback:
-                callback_key = f"{stock_code}_orderbook"
-                if callback_key not in self.subscribers:
-                    self.subscribers[callback_key] = []
-                self.subscribers[callback_key].append(callback)
+                self.add_subscriber(f"{stock_code}_orderbook", callback)
             
             print(f"[호가 구독] {stock_code} 실시간 호가 구독 시작")
             
@@ -138,9 +188,9 @@ class KISWebSocket:
         """실시간 메시지 수신"""
         try:
             async for message in self.websocket:
-                if isinstance(message, bytes):
-                    # 바이너리 데이터 처리
-                    await self._process_binary_message(message)
+                if isinstance(message, bytes) or self.parser.is_realtime_frame(message):
+                    # 실시간 데이터 프레임 처리
+                    await self._process_realtime_message(message)
                 else:
                     # JSON 데이터 처리
                     await self._process_json_message(message)
@@ -171,91 +221,37 @@ class KISWebSocket:
         except Exception as e:
             logger.error(f"JSON 메시지 처리 오류: {e}")
     
-    async def _process_binary_message(self, message):
-        """바이너리 메시지 처리 (실시간 데이터)"""
-        try:
-            # KIS WebSocket 바이너리 프로토콜 파싱
-            if len(message) < 3:
-                return
-            
-            # 헤더 파싱
-            tr_id = message[:3].decode('utf-8', errors='ignore')
-            
-            if tr_id == 'H0S':  # 실시간 시세
-                await self._parse_realtime_price(message)
-            elif tr_id == 'H0A':  # 실시간 호가
-                await self._parse_realtime_orderbook(message)
-                
-        except Exception as e:
-            logger.error(f"바이너리 메시지 처리 오류: {e}")
-    
-    async def _parse_realtime_price(self, message):
-        """실시간 시세 바이너리 데이터 파싱"""
-        try:
-            # KIS 바이너리 프로토콜에 따른 파싱
-            # 실제 구현에서는 KIS 문서의 바이너리 구조를 따라야 함
-            
-            # 임시 파싱 로직 (실제로는 KIS 스펙에 맞게 구현 필요)
-            data_str = message[3:].decode('utf-8', errors='ignore')
-            fields = data_str.split('|')
-            
-            if len(fields) >= 10:
-                stock_code = fields[0] if len(fields) > 0 else ""
-                current_price = int(fields[2]) if fields[2].isdigit() else 0
-                volume = int(fields[4]) if fields[4].isdigit() else 0
-                
-                price_data = {
-                    'timestamp': datetime.now(),
-                    'code': stock_code,
-                    'price': current_price,
-                    'volume': volume,
-                    'total_volume': int(fields[5]) if len(fields) > 5 and fields[5].isdigit() else 0,
-                    'change': int(fields[6]) if len(fields) > 6 and fields[6].lstrip('-').isdigit() else 0,
-                    'change_rate': float(fields[7]) if len(fields) > 7 else 0.0
-                }
-                
-                await self._handle_realtime_price(stock_code, price_data)
-            
-        except Exception as e:
-            logger.error(f"실시간 시세 파싱 오류: {e}")
-    
-    async def _parse_realtime_orderbook(self, message):
-        """실시간 호가 바이너리 데이터 파싱"""
+    async def _process_realtime_message(self, message):
+        """실시간 데이터 프레임 처리 (다건 레코드 포함)"""
         try:
-            # 호가 데이터 파싱 로직
-            data_str = message[3:].decode('utf-8', errors='ignore')
-            fields = data_str.split('|')
-            
-            if len(fields) >= 20:
-                stock_code = fields[0] if len(fields) > 0 else ""
-                
-                orderbook_data = {
-                    'timestamp': datetime.now(),
-                    'code': stock_code,
-                    'ask_prices': [int(fields[i]) if fields[i].isdigit() else 0 for i in range(1, 11)],
-                    'ask_volumes': [int(fields[i]) if fields[i].isdigit() else 0 for i in range(11, 21)],
-                    'bid_prices': [int(fields[i]) if fields[i].isdigit() else 0 for i in range(21, 31)],
-                    'bid_volumes': [int(fields[i]) if fields[i].isdigit() else 0 for i in range(31, 41)]
-                }
+            tr_id, records = self.parser.parse(message)
+            
+            if tr_id == TR_PRICE:  # 실시간 시세
+                for tick in records:
+                    await self._handle_realtime_price(tick.code, tick)
+            elif tr_id == TR_ORDERBOOK:  # 실시간 호가
+                for orderbook in records:
+                    await self._handle_realtime_orderbook(orderbook.code, orderbook)
+            elif tr_id is not None:
+                logger.debug(f"미지원 실시간 TR: {tr_id}")
                 
-                await self._handle_realtime_orderbook(stock_code, orderbook_data)
-            
         except Exception as e:
-            logger.error(f"호가 데이터 파싱 오류: {e}")
+            logger.error(f"실시간 프레임 처리 오류: {e}")
     
     async def _handle_realtime_price(self, stock_code: str, data: Dict):
         """실시간 시세 데이터 처리"""
         try:
-            # 실시간 틱 출력
-            self._print_tick_data(data)
+            # 실시간 틱 출력 (싱크에서 샘플링/집계)
+            self.output.on_tick(stock_code, data)
             
-            # 구독자들에게 콜백 실행
-            if stock_code in self.subscribers:
-                for callback in self.subscribers[stock_code]:
-                    try:
-                        await callback(data)
-                    except Exception as e:
-                        logger.error(f"콜백 실행 오류: {e}")
+            # 급등/급락 알림
+            change_rate = data['change_rate']
+            if abs(change_rate) > self.surge_alert_rate:
+                direction = "급등" if change_rate > 0 else "급락"
+                self.output.on_alert(stock_code, f"{direction} 알림! {change_rate:+.2f}%")
+            
+            # 구독자 큐에 분배 (수신 루프는 콜백을 기다리지 않음)
+            self.dispatcher.publish(stock_code, data)
                         
         except Exception as e:
             logger.error(f"실시간 시세 처리 오류: {e}")
@@ -264,67 +260,14 @@ class KISWebSocket:
         """실시간 호가 데이터 처리"""
         try:
             # 호가창 출력
-            self._print_orderbook(data)
-            
-            # 콜백 실행
-            callback_key = f"{stock_code}_orderbook"
-            if callback_key in self.subscribers:
-                for callback in self.subscribers[callback_key]:
-                    try:
-                        await callback(data)
-                    except Exception as e:
-                        logger.error(f"호가 콜백 실행 오류: {e}")
+            self.output.on_orderbook(stock_code, data)
+            
+            # 구독자 큐에 분배
+            self.dispatcher.publish(f"{stock_code}_orderbook", data)
                         
         except Exception as e:
             logger.error(f"호가 데이터 처리 오류: {e}")
     
-    def _print_tick_data(self, data: Dict):
-        """틱 데이터 실시간 출력"""
-        timestamp = data['timestamp'].strftime('%H:%M:%S')
-        price = data['price']
-        volume = data['volume']
-        change = data['change']
-        change_rate = data['change_rate']
-        
-        # 등락 표시
-        if change > 0:
-            change_symbol = "▲"
-            color = "상승"
-        elif change < 0:
-            change_symbol = "▼" 
-            color = "하락"
-        else:
-            change_symbol = "="
-            color = "보합"
-        
-        print(f"\n[실시간 틱] {data['code']} | {timestamp}")
-        print(f"├─ 현재가: {price:,}원 ({change_symbol} {abs(change)}, {change_rate:+.2f}%) [{color}]")
-        print(f"├─ 거래량: {volume:,}주")
-        print(f"└─ 누적거래량: {data['total_volume']:,}주")
-        
-        # 급등/급락 알림
-        if abs(change_rate) > 3.0:
-            if change_rate > 0:
-                print(f"급등 알림! {data['code']} {change_rate:.2f}% 상승")
-            else:
-                print(f"급락 알림! {data['code']} {change_rate:.2f}% 하락")
-    
-    def _print_orderbook(self, data: Dict):
-        """호가창 실시간 출력"""
-        timestamp = data['timestamp'].strftime('%H:%M:%S')
-        
-        print(f"\n[실시간 호가] {data['code']} | {timestamp}")
-        print("매도 호가                    │ 매수 호가")
-        print("-" * 30 + "┼" + "-" * 30)
-        
-        for i in range(5):  # 상위 5호가만 출력
-            ask_price = data['ask_prices'][i] if i < len(data['ask_prices']) else 0
-            ask_volume = data['ask_volumes'][i] if i < len(data['ask_volumes']) else 0
-            bid_price = data['bid_prices'][i] if i < len(data['bid_prices']) else 0
-            bid_volume = data['bid_volumes'][i] if i < len(data['bid_volumes']) else 0
-            
-            print(f"{ask_price:>7,} ({ask_volume:>4,})    │    {bid_price:>7,} ({bid_volume:>4,})")
-    
     async def _handle_reconnect(self):
         """재연결 처리"""
         if self.reconnect_attempts >= self.max_reconnect_attempts:
@@ -367,12 +310,14 @@ class KISWebSocket:
         if stock_code not in self.subscribers:
             self.subscribers[stock_code] = []
         self.subscribers[stock_code].append(callback)
+        self.dispatcher.subscribe(stock_code, callback)
     
     def remove_subscriber(self, stock_code: str, callback: Callable):
         """구독자 제거"""
         if stock_code in self.subscribers:
             try:
                 self.subscribers[stock_code].remove(callback)
+                self.dispatcher.unsubscribe(stock_code, callback)
                 if not self.subscribers[stock_code]:
                     del self.subscribers[stock_code]
             except ValueError:
@@ -386,6 +331,8 @@ class KISWebSocket:
         print(f"구독 종목 수: {len([k for k in self.subscribers.keys() if '_orderbook' not in k])}개")
         print(f"호가 구독 수: {len([k for k in self.subscribers.keys() if '_orderbook' in k])}개")
         print(f"재연결 시도: {self.reconnect_attempts}/{self.max_reconnect_attempts}")
+        parser_stats = self.parser.get_stats()
+        print(f"수신 프레임: {parser_stats['frames']:,}개 (레코드 {parser_stats['records']:,}개, 오류 {parser_stats['errors']}개)")
         print(f"마지막 연결: {datetime.now().strftime('%H:%M:%S')}")
         
         if self.subscribers:
@@ -396,6 +343,8 @@ class KISWebSocket:
             for i, stock_code in enumerate(price_subs, 1):
                 has_orderbook = stock_code in orderbook_subs
                 print(f"{i:2d}. {stock_code} {'(시세+호가)' if has_orderbook else '(시세만)'}")
+            
+            self.dispatcher.print_stats()
         
         print("=" * 54)
     
@@ -427,6 +376,7 @@ class KISWebSocket:
             # 로컬 구독자 제거
             if stock_code in self.subscribers:
                 del self.subscribers[stock_code]
+            self.dispatcher.unsubscribe(stock_code)
             
             print(f"[구독 해제] {stock_code} 구독 해제 완료")
             
@@ -446,6 +396,9 @@ class KISWebSocket:
             except asyncio.CancelledError:
                 pass
         
+        # 구독자 소비 태스크 종료
+        await self.dispatcher.stop()
+        
         # WebSocket 연결 종료
         if self.websocket and not self.websocket.closed:
             try:
@@ -461,49 +414,4 @@ class KISWebSocket:
     
     def get_subscribed_stocks(self) -> List[str]:
         """구독 중인 종목 리스트 반환"""
-        return [k for k in self.subscribers.keys() if '_orderbook' not in k]    "input": {
-                        "tr_id": "PINGPONG",
-                        "tr_key": ""
-                    }
-                }
-            }
-            
-            await self.websocket.send(json.dumps(approval_data))
-            logger.info("승인키 전송 완료")
-            print("WebSocket 승인키 전송 완료")
-            
-            # 승인 응답 대기
-            await asyncio.sleep(1)
-            
-        except Exception as e:
-            logger.error(f"승인키 전송 실패: {e}")
-            print(f"승인키 전송 실패: {e}")
-            raise e
-    
-    async def _heartbeat(self):
-        """연결 유지를 위한 하트비트"""
-        while self.is_connected:
-            try:
-                if self.websocket and not self.websocket.closed:
-                    await self.websocket.ping()
-                await asyncio.sleep(30)  # 30초마다 핑
-            except Exception as e:
-                logger.warning(f"하트비트 실패: {e}")
-                break
-    
-    async def subscribe_realtime_price(self, stock_code: str, callback: Callable = None):
-        """실시간 시세 구독"""
-        if not self.is_connected:
-            await self.connect()
-        
-        try:
-            approval_key = await self.auth.get_websocket_key()
-            
-            subscribe_data = {
-                "header": {
-                    "approval_key": approval_key,
-                    "custtype": "P",
-                    "tr_type": "1",
-                    "content_type": "utf-8"
-                },
-                "body": {
\ No newline at end of file
+        return [k for k in self.subscribers.keys() if '_orderbook' not in k]
@@ -0,0 +1,321 @@
+# services/output_sinks.py - 실시간 출력 싱크
+"""
+틱 처리 경로의 출력 계층
+
+틱마다 print()로 여러 줄을 찍으면 이벤트 루프가 터미널 I/O에 묶이므로
+출력은 싱크를 통해서만 내보낸다.
+
+- NullSink: 아무것도 출력하지 않음
+- SampledConsoleSink: 종목별 초당 N줄 이하로 샘플링한 한 줄 요약
+- AsyncLogSink: 구조화(JSON Lines) 레코드를 모아 백그라운드에서 기록
+- ConsoleDashboard: 틱 경로에서는 상태만 집계하고 주기적으로 대시보드 렌더링
+- MultiSink: 여러 싱크 동시 사용
+"""
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class OutputSink:
+    """출력 싱크 기본 클래스 (기본 동작은 모두 무시)"""
+
+    def on_tick(self, code: str, tick) -> None:
+        """실시간 체결"""
+
+    def on_orderbook(self, code: str, orderbook) -> None:
+        """실시간 호가"""
+
+    def on_analysis(self, code: str, tick, stats: Dict, indicators: Dict) -> None:
+        """틱 분석 결과 (통계/지표)"""
+
+    def on_alert(self, code: str, message: str) -> None:
+        """급등락/가격/대량거래 알림"""
+
+    def on_status(self, message: str) -> None:
+        """구독자 추가/제거 등 저빈도 상태 메시지"""
+
+    async def start(self):
+        """백그라운드 작업 시작"""
+
+    async def stop(self):
+        """백그라운드 작업 종료 및 잔여 출력 처리"""
+
+
+class NullSink(OutputSink):
+    """무출력 싱크"""
+
+
+class SampledConsoleSink(OutputSink):
+    """종목별 초당 최대 N줄로 제한한 콘솔 싱크"""
+
+    def __init__(self, max_lines_per_sec: float = 1.0, stream=None):
+        self.interval_ns = int(1e9 / max_lines_per_sec) if max_lines_per_sec > 0 else 0
+        self.stream = stream or sys.stdout
+        self._last_emit: Dict[str, int] = {}
+        self.suppressed = 0
+
+    def _allow(self, key: str) -> bool:
+        now = time.monotonic_ns()
+        if now - self._last_emit.get(key, -self.interval_ns) < self.interval_ns:
+            self.suppressed += 1
+            return False
+        self._last_emit[key] = now
+        return True
+
+    def _write(self, line: str):
+        self.stream.write(line + "\n")
+
+    def on_tick(self, code: str, tick) -> None:
+        if self._allow(code):
+            self._write(f"[틱] {code} {tick['timestamp']:%H:%M:%S} {tick['price']:,}원 "
+                        f"({tick['change_rate']:+.2f}%) 거래량 {tick['volume']:,}주")
+
+    def on_orderbook(self, code: str, orderbook) -> None:
+        if self._allow(f"{code}_orderbook"):
+            self._write(f"[호가] {code} 매도1 {orderbook['ask_prices'][0]:,} "
+                        f"({orderbook['ask_volumes'][0]:,}) / 매수1 {orderbook['bid_prices'][0]:,} "
+                        f"({orderbook['bid_volumes'][0]:,})")
+
+    def on_analysis(self, code: str, tick, stats: Dict, indicators: Dict) -> None:
+        if self._allow(f"{code}_analysis") and indicators:
+            rsi = indicators.get('rsi')
+            rsi_text = f" RSI {rsi:.1f}" if rsi is not None else ""
+            self._write(f"[분석] {code} 1분 틱 {stats.get('tick_count_1min', 0):,}개 "
+                        f"변동성 {stats.get('price_volatility_1min', 0):.1f}{rsi_text}")
+
+    def on_alert(self, code: str, message: str) -> None:
+        if self._allow(f"{code}_alert"):
+            self._write(f"[알림] {code} {message}")
+
+    def on_status(self, message: str) -> None:
+        self._write(message)
+
+
+class AsyncLogSink(OutputSink):
+    """구조화 로그 싱크 - 레코드를 모아 백그라운드 스레드에서 기록"""
+
+    def __init__(self, path: Optional[str] = None, flush_interval: float = 0.5,
+                 max_buffer: int = 50000, include_ticks: bool = True):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.include_ticks = include_ticks
+        self._buffer: deque = deque(maxlen=max_buffer)
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self._log = logging.getLogger("quant.realtime")
+
+    def _append(self, record: Dict):
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(record)
+
+    def on_tick(self, code: str, tick) -> None:
+        if self.include_ticks:
+            self._append({'event': 'tick', 'code': code, 'ts': tick['timestamp'],
+                          'price': tick['price'], 'volume': tick['volume'],
+                          'change_rate': tick['change_rate']})
+
+    def on_alert(self, code: str, message: str) -> None:
+        self._append({'event': 'alert', 'code': code, 'ts': datetime.now(), 'message': message})
+
+    def on_status(self, message: str) -> None:
+        self._append({'event': 'status', 'ts': datetime.now(), 'message': message})
+
+    def _write_batch(self, batch: List[Dict]):
+        lines = [json.dumps(record, default=str, ensure_ascii=False) for record in batch]
+        if self.path:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+        else:
+            for line in lines:
+                self._log.info(line)
+        self.written += len(batch)
+
+    async def flush(self):
+        """버퍼 내용을 스레드에서 기록"""
+        if not self._buffer:
+            return
+        batch = list(self._buffer)
+        self._buffer.clear()
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+        except Exception as e:
+            logger.error(f"로그 싱크 기록 실패: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+class ConsoleDashboard(OutputSink):
+    """집계 상태를 주기적으로 렌더링하는 콘솔 대시보드"""
+
+    def __init__(self, refresh_interval: float = 2.0, stream=None, max_alerts: int = 5):
+        self.refresh_interval = refresh_interval
+        self.stream = stream or sys.stdout
+        self.state: Dict[str, Dict] = {}
+        self.alerts: deque = deque(maxlen=max_alerts)
+        self.status_messages: deque = deque(maxlen=max_alerts)
+        self._task: Optional[asyncio.Task] = None
+        self._tick_total = 0
+        self._last_render = time.monotonic()
+        self._last_tick_total = 0
+
+    def _entry(self, code: str) -> Dict:
+        entry = self.state.get(code)
+        if entry is None:
+            entry = self.state[code] = {
+                'price': 0, 'change_rate': 0.0, 'volume': 0, 'ticks': 0,
+                'time': None, 'rsi': None, 'sma5': None, 'ask1': 0, 'bid1': 0,
+                'tick_count_1min': 0,
+            }
+        return entry
+
+    def on_tick(self, code: str, tick) -> None:
+        entry = self._entry(code)
+        entry['price'] = tick['price']
+        entry['change_rate'] = tick['change_rate']
+        entry['volume'] += tick['volume']
+        entry['ticks'] += 1
+        entry['time'] = tick['timestamp']
+        self._tick_total += 1
+
+    def on_orderbook(self, code: str, orderbook) -> None:
+        entry = self._entry(code)
+        entry['ask1'] = orderbook['ask_prices'][0]
+        entry['bid1'] = orderbook['bid_prices'][0]
+
+    def on_analysis(self, code: str, tick, stats: Dict, indicators: Dict) -> None:
+        entry = self._entry(code)
+        entry['rsi'] = indicators.get('rsi')
+        entry['sma5'] = indicators.get('sma5')
+        entry['tick_count_1min'] = stats.get('tick_count_1min', 0)
+
+    def on_alert(self, code: str, message: str) -> None:
+        self.alerts.append(f"{datetime.now():%H:%M:%S} {code} {message}")
+
+    def on_status(self, message: str) -> None:
+        self.status_messages.append(f"{datetime.now():%H:%M:%S} {message}")
+
+    def render(self) -> str:
+        """대시보드 문자열 생성"""
+        now = time.monotonic()
+        elapsed = max(now - self._last_render, 1e-9)
+        rate = (self._tick_total - self._last_tick_total) / elapsed
+        self._last_render = now
+        self._last_tick_total = self._tick_total
+
+        lines = [
+            f"\n╔═══ 실시간 대시보드 {datetime.now():%H:%M:%S} | 종목 {len(self.state)}개 | "
+            f"{rate:,.0f} 틱/초 ═══╗",
+            f"{'종목':<8}{'현재가':>10}{'등락률':>9}{'틱':>8}{'1분틱':>7}{'RSI':>7}"
+            f"{'매도1':>10}{'매수1':>10}{'시각':>10}",
+        ]
+        for code, e in sorted(self.state.items()):
+            rsi = f"{e['rsi']:.1f}" if e['rsi'] is not None else "-"
+            tick_time = f"{e['time']:%H:%M:%S}" if e['time'] else "-"
+            lines.append(f"{code:<8}{e['price']:>10,}{e['change_rate']:>+8.2f}%{e['ticks']:>8,}"
+                         f"{e['tick_count_1min']:>7,}{rsi:>7}{e['ask1']:>10,}{e['bid1']:>10,}{tick_time:>10}")
+        if self.alerts:
+            lines.append("[최근 알림]")
+            lines.extend(f"  {alert}" for alert in self.alerts)
+        if self.status_messages:
+            lines.append("[상태]")
+            lines.extend(f"  {message}" for message in self.status_messages)
+        lines.append("╚" + "═" * 78 + "╝")
+        return "\n".join(lines)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            if self.state:
+                self.stream.write(self.render() + "\n")
+                self.stream.flush()
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class MultiSink(OutputSink):
+    """여러 싱크로 동시 출력"""
+
+    def __init__(self, *sinks: OutputSink):
+        self.sinks = list(sinks)
+
+    def on_tick(self, code: str, tick) -> None:
+        for sink in self.sinks:
+            sink.on_tick(code, tick)
+
+    def on_orderbook(self, code: str, orderbook) -> None:
+        for sink in self.sinks:
+            sink.on_orderbook(code, orderbook)
+
+    def on_analysis(self, code: str, tick, stats: Dict, indicators: Dict) -> None:
+        for sink in self.sinks:
+            sink.on_analysis(code, tick, stats, indicators)
+
+    def on_alert(self, code: str, message: str) -> None:
+        for sink in self.sinks:
+            sink.on_alert(code, message)
+
+    def on_status(self, message: str) -> None:
+        for sink in self.sinks:
+            sink.on_status(message)
+
+    async def start(self):
+        for sink in self.sinks:
+            await sink.start()
+
+    async def stop(self):
+        for sink in self.sinks:
+            await sink.stop()
+
+
+def create_output_sink(mode: str = "dashboard", log_path: Optional[str] = None,
+                       max_lines_per_sec: float = 1.0,
+                       refresh_interval: float = 2.0) -> OutputSink:
+    """출력 모드 이름으로 싱크 생성 (dashboard / console / log / silent)"""
+    if mode == "silent":
+        return NullSink()
+    if mode == "console":
+        return SampledConsoleSink(max_lines_per_sec)
+    if mode == "log":
+        return AsyncLogSink(log_path)
+    if mode == "dashboard":
+        if log_path:
+            return MultiSink(ConsoleDashboard(refresh_interval), AsyncLogSink(log_path))
+        return ConsoleDashboard(refresh_interval)
+    raise ValueError(f"지원하지 않는 출력 모드: {mode}")
@@ -0,0 +1,204 @@
+# services/redis_writer.py - 버퍼링 Redis 틱 저장기
+"""
+틱마다 Redis 명령을 개별 await하지 않고 모아서 파이프라인으로 기록
+
+- 여러 종목의 틱을 버퍼에 모아 N ms 또는 M 틱마다 한 번에 flush
+- 틱은 Redis Stream(XADD MAXLEN ~)에 고정 CSV 레이아웃으로 저장
+- 통계(hash)는 flush 주기마다 종목별 최신값 하나만 기록
+- Redis가 느려 버퍼가 가득 차면 호출자를 잠시 대기시키고(backpressure),
+  대기 한도를 넘으면 가장 오래된 틱을 버리고 유실 건수를 기록
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Stream 엔트리 필드 레이아웃 (CSV 한 줄)
+TICK_FIELDS = ('recv_ns', 'price', 'volume', 'change', 'change_rate', 'total_volume')
+
+
+def encode_tick(tick) -> str:
+    """틱을 고정 CSV 레이아웃으로 인코딩"""
+    recv_ns = getattr(tick, 'recv_ns', None) or int(tick['timestamp'].timestamp() * 1e9)
+    return (f"{recv_ns},{tick['price']},{tick['volume']},{tick.get('change', 0)},"
+            f"{tick.get('change_rate', 0.0)},{tick.get('total_volume', 0)}")
+
+
+def decode_tick(raw) -> Dict:
+    """CSV 레이아웃을 dict로 복원"""
+    if isinstance(raw, bytes):
+        raw = raw.decode('ascii')
+    recv_ns, price, volume, change, change_rate, total_volume = raw.split(',')
+    return {
+        'recv_ns': int(recv_ns),
+        'price': int(price),
+        'volume': int(volume),
+        'change': int(change),
+        'change_rate': float(change_rate),
+        'total_volume': int(total_volume),
+    }
+
+
+def _flatten_stats(stats: Dict) -> Dict:
+    """hash에 저장할 수 있도록 값 정리"""
+    return {k: v if isinstance(v, (int, float, str)) else str(v) for k, v in stats.items()}
+
+
+class RedisTickWriter:
+    """버퍼링 + 파이프라인 Redis 틱 저장기"""
+
+    def __init__(self, redis_client, flush_interval_ms: int = 50, max_batch: int = 500,
+                 stream_maxlen: int = 1000, max_pending: int = 20000,
+                 backpressure_timeout: float = 0.5, tick_ttl: int = 86400,
+                 stats_ttl: int = 3600, transaction: bool = False):
+        self.redis = redis_client
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch = max_batch
+        self.stream_maxlen = stream_maxlen
+        self.max_pending = max_pending
+        self.backpressure_timeout = backpressure_timeout
+        self.tick_ttl = tick_ttl
+        self.stats_ttl = stats_ttl
+        self.transaction = transaction
+
+        self._ticks: List[Tuple[str, str]] = []
+        self._stats: Dict[str, Dict] = {}
+        self._flush_now = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        # 통계
+        self.written = 0
+        self.flushes = 0
+        self.dropped = 0
+        self.errors = 0
+        self.backpressure_waits = 0
+        self.last_flush_ms = 0.0
+
+    def start(self):
+        """flush 태스크 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    @property
+    def pending(self) -> int:
+        return len(self._ticks)
+
+    async def write(self, stock_code: str, tick, stats: Optional[Dict] = None):
+        """틱 적재 - 버퍼가 가득 차면 flush가 따라잡을 때까지 대기"""
+        if self._task is None:
+            self.start()
+
+        if len(self._ticks) >= self.max_pending:
+            self.backpressure_waits += 1
+            self._space.clear()
+            self._flush_now.set()
+            try:
+                await asyncio.wait_for(self._space.wait(), self.backpressure_timeout)
+            except asyncio.TimeoutError:
+                pass
+            if len(self._ticks) >= self.max_pending:
+                # Redis가 계속 느리면 가장 오래된 틱 폐기
+                overflow = len(self._ticks) - self.max_pending + 1
+                del self._ticks[:overflow]
+                self.dropped += overflow
+
+        self._ticks.append((stock_code, encode_tick(tick)))
+        if stats:
+            self._stats[stock_code] = stats
+
+        if len(self._ticks) >= self.max_batch:
+            self._flush_now.set()
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self.flush()
+
+    async def flush(self):
+        """버퍼 내용을 파이프라인 한 번으로 기록"""
+        while self._ticks or self._stats:
+            batch = self._ticks[:self.max_batch]
+            del self._ticks[:len(batch)]
+            stats, self._stats = self._stats, {}
+            if len(self._ticks) < self.max_pending:
+                self._space.set()
+
+            start = time.perf_counter()
+            try:
+                pipe = self.redis.pipeline(transaction=self.transaction)
+                codes = set()
+                for stock_code, encoded in batch:
+                    pipe.xadd(f"ticks:{stock_code}", {'d': encoded},
+                              maxlen=self.stream_maxlen, approximate=True)
+                    codes.add(stock_code)
+                for stock_code in codes:
+                    pipe.expire(f"ticks:{stock_code}", self.tick_ttl)
+                for stock_code, stock_stats in stats.items():
+                    stats_key = f"stats:{stock_code}"
+                    pipe.hset(stats_key, mapping=_flatten_stats(stock_stats))
+                    pipe.expire(stats_key, self.stats_ttl)
+                await pipe.execute()
+                self.written += len(batch)
+                self.flushes += 1
+            except Exception as e:
+                self.errors += 1
+                self.dropped += len(batch)
+                logger.error(f"Redis 배치 저장 실패 ({len(batch)}건): {e}")
+                break
+            finally:
+                self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+        if len(self._ticks) < self.max_pending:
+            self._space.set()
+
+    async def close(self, timeout: float = 5.0):
+        """flush 태스크 종료 후 잔여 버퍼 기록
+
+        진행 중인 파이프라인은 끝날 때까지 기다린다 (execute 도중 취소하면 그 배치가
+        유실되고 연결 상태가 깨져 이후 명령이 멈출 수 있음). timeout 안에 끝나지 않으면
+        태스크를 취소하고 잔여 버퍼는 남겨 둔다.
+        """
+        if self._task:
+            self._closing = True
+            self._flush_now.set()
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Redis flush 종료 시간 초과 - 미기록 {self.pending}건")
+                return
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._task = None
+                self._closing = False
+        await self.flush()
+
+    async def read_ticks(self, stock_code: str, count: int = 100) -> List[Dict]:
+        """최근 틱 조회 (최신순)"""
+        entries = await self.redis.xrevrange(f"ticks:{stock_code}", count=count)
+        ticks = []
+        for _, fields in entries:
+            raw = fields.get(b'd') or fields.get('d')
+            ticks.append(decode_tick(raw))
+        return ticks
+
+    def get_stats(self) -> Dict:
+        """저장기 통계 반환"""
+        return {
+            'pending': self.pending,
+            'written': self.written,
+            'flushes': self.flushes,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'backpressure_waits': self.backpressure_waits,
+            'last_flush_ms': round(self.last_flush_ms, 3),
+        }
@@ -0,0 +1,237 @@
+# services/ring_buffer.py - NumPy 기반 틱/분봉 링 버퍼
+"""
+종목별 틱/분봉 저장용 열 지향 링 버퍼
+
+- 열마다 미리 할당한 NumPy 배열과 쓰기 커서만 사용 (틱마다 dict/datetime 생성 없음)
+- 시각은 epoch 기준 int64 나노초로 저장
+- 시간 구간 조회는 np.searchsorted 이진 탐색
+- 버퍼가 한 바퀴 돌기 전까지 스냅샷은 복사 없는 배열 슬라이스(뷰)
+"""
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+NS_PER_SEC = 1_000_000_000
+NS_PER_MINUTE = 60 * NS_PER_SEC
+
+# epoch(UTC) -> 로컬 시각 보정값 (ISO 문자열 변환용)
+LOCAL_OFFSET_NS = int(time.localtime().tm_gmtoff) * NS_PER_SEC
+
+
+def tick_time_ns(tick) -> int:
+    """틱의 수신 시각 (epoch 나노초)"""
+    recv_ns = getattr(tick, 'recv_ns', None)
+    if recv_ns:
+        return recv_ns
+    return int(tick['timestamp'].timestamp() * NS_PER_SEC)
+
+
+def ns_to_datetime(ts_ns: int) -> datetime:
+    """epoch 나노초 -> 로컬 datetime"""
+    return datetime.fromtimestamp(ts_ns / NS_PER_SEC)
+
+
+def ns_to_iso(ts_ns: np.ndarray) -> List[str]:
+    """epoch 나노초 배열 -> 로컬 ISO 문자열 리스트 (일괄 변환)"""
+    local = (np.asarray(ts_ns, dtype=np.int64) + LOCAL_OFFSET_NS).astype('datetime64[ns]')
+    return np.datetime_as_string(local, unit='us').tolist()
+
+
+class _ColumnRing:
+    """열 지향 링 버퍼 공통 기능"""
+
+    COLUMNS: Tuple[Tuple[str, type], ...] = ()
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=dtype) for name, dtype in self.COLUMNS
+        }
+        self.ts = self.columns['ts']
+        self.cursor = 0  # 다음 쓰기 위치
+        self.size = 0
+        self.total = 0  # 지금까지 기록된 행 수 (절대 인덱스 = 0 ~ total-1)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self.columns.values())
+
+    def _advance(self) -> int:
+        """쓰기 위치 반환 후 커서 이동"""
+        idx = self.cursor
+        self.cursor = (idx + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        self.total += 1
+        return idx
+
+    @property
+    def _last_index(self) -> int:
+        return (self.cursor - 1) % self.capacity
+
+    def _ordered(self, column: np.ndarray, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """논리 순서(오래된 것 -> 최신) [start, stop) 구간
+
+        버퍼가 한 바퀴 돌기 전이거나 구간이 끊기지 않으면 뷰를 반환한다.
+        """
+        stop = self.size if stop is None else stop
+        if start >= stop:
+            return column[:0]
+        head = (self.cursor - self.size) % self.capacity  # 가장 오래된 위치
+        a = (head + start) % self.capacity
+        b = (head + stop - 1) % self.capacity + 1
+        if a < b:
+            return column[a:b]
+        return np.concatenate((column[a:], column[:b]))
+
+    def _search(self, ts_ns: int, side: str = 'left') -> int:
+        """논리 순서 기준 ts_ns 위치 (이진 탐색, 세그먼트 최대 2개)"""
+        if self.size == 0:
+            return 0
+        head = (self.cursor - self.size) % self.capacity
+        if head + self.size <= self.capacity:
+            return int(np.searchsorted(self.ts[head:head + self.size], ts_ns, side=side))
+        first = self.ts[head:]
+        if ts_ns < first[-1] or (side == 'left' and ts_ns == first[-1]):
+            return int(np.searchsorted(first, ts_ns, side=side))
+        second = self.ts[:self.cursor]
+        return len(first) + int(np.searchsorted(second, ts_ns, side=side))
+
+    def last(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """최근 n개 (기본 전체) 열 스냅샷"""
+        n = self.size if n is None else min(n, self.size)
+        start = self.size - n
+        return {name: self._ordered(col, start) for name, col in self.columns.items()}
+
+    @property
+    def first_index(self) -> int:
+        """보관 중인 가장 오래된 행의 절대 인덱스"""
+        return self.total - self.size
+
+    def since_index(self, index: int) -> Dict[str, np.ndarray]:
+        """절대 인덱스 index 이후(포함) 행 스냅샷 - 이미 밀려난 행은 제외"""
+        start = max(index - self.first_index, 0)
+        return {name: self._ordered(col, start) for name, col in self.columns.items()}
+
+    def between(self, start_ns: int, end_ns: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """[start_ns, end_ns] 구간 열 스냅샷"""
+        start = self._search(start_ns, 'left')
+        stop = self.size if end_ns is None else self._search(end_ns, 'right')
+        return {name: self._ordered(col, start, stop) for name, col in self.columns.items()}
+
+    def latest(self, name: str, default=0):
+        """가장 최근 값"""
+        if self.size == 0:
+            return default
+        return self.columns[name][self._last_index].item()
+
+    def first(self, name: str, default=0):
+        """가장 오래된 값"""
+        if self.size == 0:
+            return default
+        return self.columns[name][(self.cursor - self.size) % self.capacity].item()
+
+
+class TickRingBuffer(_ColumnRing):
+    """종목별 틱 링 버퍼"""
+
+    COLUMNS = (
+        ('ts', np.int64),           # 수신 시각 (epoch ns)
+        ('price', np.int64),
+        ('volume', np.int64),
+        ('change', np.int64),
+        ('change_rate', np.float64),
+    )
+
+    def __init__(self, capacity: int = 1000):
+        super().__init__(capacity)
+        self.price = self.columns['price']
+        self.volume = self.columns['volume']
+        self.change = self.columns['change']
+        self.change_rate = self.columns['change_rate']
+
+    def append(self, ts_ns: int, price: int, volume: int, change: int = 0,
+               change_rate: float = 0.0):
+        idx = self._advance()
+        self.ts[idx] = ts_ns
+        self.price[idx] = price
+        self.volume[idx] = volume
+        self.change[idx] = change
+        self.change_rate[idx] = change_rate
+
+    def append_tick(self, tick):
+        """틱 객체/dict 추가"""
+        self.append(tick_time_ns(tick), tick['price'], tick['volume'],
+                    tick.get('change', 0), tick.get('change_rate', 0.0))
+
+
+class BarRingBuffer(_ColumnRing):
+    """OHLCV 봉 링 버퍼 (마지막 봉은 제자리 갱신)"""
+
+    COLUMNS = (
+        ('ts', np.int64),           # 봉 시작 시각 (epoch ns)
+        ('open', np.int64),
+        ('high', np.int64),
+        ('low', np.int64),
+        ('close', np.int64),
+        ('volume', np.int64),
+        ('tick_count', np.int64),
+        ('vwap', np.float64),
+    )
+
+    def __init__(self, capacity: int = 480, bar_ns: int = NS_PER_MINUTE):
+        super().__init__(capacity)
+        self.bar_ns = bar_ns
+        self.open = self.columns['open']
+        self.high = self.columns['high']
+        self.low = self.columns['low']
+        self.close = self.columns['close']
+        self.volume = self.columns['volume']
+        self.tick_count = self.columns['tick_count']
+        self.vwap = self.columns['vwap']
+
+    def update(self, ts_ns: int, price: int, volume: int) -> bool:
+        """틱 반영 - 새 봉이 열리면 True"""
+        bar_start = ts_ns - ts_ns % self.bar_ns
+        if self.size and self.ts[self._last_index] == bar_start:
+            i = self._last_index
+            if price > self.high[i]:
+                self.high[i] = price
+            if price < self.low[i]:
+                self.low[i] = price
+            self.close[i] = price
+            prev_volume = self.volume[i]
+            total_volume = prev_volume + volume
+            self.volume[i] = total_volume
+            self.tick_count[i] += 1
+            if total_volume > 0:
+                self.vwap[i] = (self.vwap[i] * prev_volume + price * volume) / total_volume
+            return False
+
+        i = self._advance()
+        self.ts[i] = bar_start
+        self.open[i] = self.high[i] = self.low[i] = self.close[i] = price
+        self.volume[i] = volume
+        self.tick_count[i] = 1
+        self.vwap[i] = price
+        return True
+
+    def to_dicts(self, start: int = 0) -> List[Dict]:
+        """dict 리스트로 변환 (기존 분봉 형식, timestamp는 datetime)"""
+        cols = self.last(self.size - start)
+        return [
+            {
+                'timestamp': ns_to_datetime(ts), 'open': o, 'high': h, 'low': l,
+                'close': c, 'volume': v, 'tick_count': n, 'vwap': w
+            }
+            for ts, o, h, l, c, v, n, w in zip(
+                cols['ts'].tolist(), cols['open'].tolist(), cols['high'].tolist(),
+                cols['low'].tolist(), cols['close'].tolist(), cols['volume'].tolist(),
+                cols['tick_count'].tolist(), cols['vwap'].tolist()
+            )
+        ]
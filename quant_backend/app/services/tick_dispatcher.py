@@ -0,0 +1,214 @@
+# services/tick_dispatcher.py - 실시간 틱 구독자 분배기
+"""
+WebSocket 수신 루프와 구독자 콜백 사이의 분배기
+
+- 구독자마다 크기 제한 큐와 독립 소비 태스크를 둔다
+- 수신 루프는 publish()로 넣기만 하고 구독자를 기다리지 않는다
+- 큐가 가득 차면 정책에 따라 가장 오래된 틱을 버리거나(DROP_OLDEST)
+  종목별 최신 틱 하나로 합친다(CONFLATE)
+- 구독자별 전달/유실/병합 건수와 지연(큐 적체, 수신 후 경과 시간)을 기록
+"""
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(Enum):
+    """큐 초과 시 처리 정책"""
+    DROP_OLDEST = "drop_oldest"  # 가장 오래된 틱 폐기
+    CONFLATE = "conflate"        # 종목별 최신 틱만 유지
+
+
+class TickSubscriber:
+    """구독자 하나의 큐와 소비 태스크"""
+
+    def __init__(self, key: str, callback: Callable, maxsize: int = 1000,
+                 policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        self.key = key
+        self.callback = callback
+        self.maxsize = maxsize
+        self.policy = policy
+        self.task: Optional[asyncio.Task] = None
+
+        self._queue: deque = deque()
+        self._latest: Dict[str, object] = {}  # CONFLATE: 종목코드 -> 최신 틱
+        self._wakeup = asyncio.Event()
+
+        # 통계
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.errors = 0
+        self.max_lag = 0
+        self.last_delay_ms = 0.0
+        self.max_delay_ms = 0.0
+
+    def start(self):
+        """소비 태스크 시작 (실행 중인 이벤트 루프 필요)"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    @property
+    def lag(self) -> int:
+        """아직 전달되지 않은 틱 수"""
+        return len(self._latest) if self.policy is OverflowPolicy.CONFLATE else len(self._queue)
+
+    def offer(self, item) -> None:
+        """틱 적재 (절대 대기하지 않음)"""
+        self.received += 1
+
+        if self.policy is OverflowPolicy.CONFLATE:
+            code = item['code']
+            if code in self._latest:
+                self.conflated += 1
+            elif len(self._latest) >= self.maxsize:
+                # 종목 수가 한도를 넘으면 가장 오래 대기한 종목 폐기
+                del self._latest[next(iter(self._latest))]
+                self.dropped += 1
+            self._latest[code] = item
+        else:
+            if len(self._queue) >= self.maxsize:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(item)
+
+        lag = self.lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+        self._wakeup.set()
+
+    def _take(self):
+        """다음 전달 대상 꺼내기 (없으면 None)"""
+        if self.policy is OverflowPolicy.CONFLATE:
+            if not self._latest:
+                return None
+            code = next(iter(self._latest))
+            return self._latest.pop(code)
+        return self._queue.popleft() if self._queue else None
+
+    async def run(self):
+        """소비 루프 - 구독자별로 독립 실행"""
+        while True:
+            item = self._take()
+            if item is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            recv_ns = getattr(item, 'recv_ns', None)
+            if recv_ns:
+                delay_ms = (time.time_ns() - recv_ns) / 1e6
+                self.last_delay_ms = delay_ms
+                if delay_ms > self.max_delay_ms:
+                    self.max_delay_ms = delay_ms
+
+            try:
+                await self.callback(item)
+                self.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"콜백 실행 오류 [{self.key}]: {e}")
+
+    def get_stats(self) -> Dict:
+        """구독자 통계 반환"""
+        return {
+            'key': self.key,
+            'callback': getattr(self.callback, '__qualname__', repr(self.callback)),
+            'policy': self.policy.value,
+            'received': self.received,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'conflated': self.conflated,
+            'errors': self.errors,
+            'lag': self.lag,
+            'max_lag': self.max_lag,
+            'last_delay_ms': round(self.last_delay_ms, 3),
+            'max_delay_ms': round(self.max_delay_ms, 3),
+        }
+
+
+class TickDispatcher:
+    """키(종목코드)별 구독자 분배기"""
+
+    def __init__(self, maxsize: int = 1000,
+                 policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        self.default_maxsize = maxsize
+        self.default_policy = policy
+        self.subscribers: Dict[str, List[TickSubscriber]] = {}
+
+    def subscribe(self, key: str, callback: Callable, maxsize: Optional[int] = None,
+                  policy: Optional[OverflowPolicy] = None) -> TickSubscriber:
+        """구독자 등록 및 소비 태스크 시작
+
+        이벤트 루프 밖에서 등록된 구독자는 첫 publish 시점에 태스크가 시작된다.
+        """
+        subscriber = TickSubscriber(
+            key, callback,
+            maxsize=maxsize or self.default_maxsize,
+            policy=policy or self.default_policy
+        )
+        try:
+            subscriber.start()
+        except RuntimeError:
+            pass
+        self.subscribers.setdefault(key, []).append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, key: str, callback: Optional[Callable] = None):
+        """구독자 해제 (callback 생략 시 해당 키 전체)"""
+        subscribers = self.subscribers.get(key, [])
+        remaining = []
+        for subscriber in subscribers:
+            if callback is None or subscriber.callback == callback:
+                if subscriber.task:
+                    subscriber.task.cancel()
+            else:
+                remaining.append(subscriber)
+
+        if remaining:
+            self.subscribers[key] = remaining
+        else:
+            self.subscribers.pop(key, None)
+
+    def publish(self, key: str, item) -> int:
+        """틱 분배 - 구독자 큐에 넣기만 하고 즉시 반환"""
+        subscribers = self.subscribers.get(key)
+        if not subscribers:
+            return 0
+        for subscriber in subscribers:
+            if subscriber.task is None:
+                subscriber.start()
+            subscriber.offer(item)
+        return len(subscribers)
+
+    async def stop(self):
+        """모든 소비 태스크 종료 (구독 등록은 유지, 다음 publish 때 재시작)"""
+        tasks = []
+        for subs in self.subscribers.values():
+            for subscriber in subs:
+                if subscriber.task:
+                    subscriber.task.cancel()
+                    tasks.append(subscriber.task)
+                    subscriber.task = None
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> List[Dict]:
+        """전체 구독자 통계 반환"""
+        return [s.get_stats() for subs in self.subscribers.values() for s in subs]
+
+    def print_stats(self):
+        """구독자별 전달 상태 출력"""
+        stats = self.get_stats()
+        print(f"\n[분배기] 구독자 {len(stats)}개")
+        for s in stats:
+            print(f"├─ {s['key']} ({s['policy']}) 전달 {s['delivered']:,} / 유실 {s['dropped']:,} / "
+                  f"병합 {s['conflated']:,} | 적체 {s['lag']} (최대 {s['max_lag']}) | "
+                  f"지연 {s['last_delay_ms']:.1f}ms (최대 {s['max_delay_ms']:.1f}ms)")
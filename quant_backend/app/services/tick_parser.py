@@ -0,0 +1,471 @@
+# services/tick_parser.py - KIS 실시간 프레임 파서
+"""
+KIS WebSocket 실시간 프레임 파서
+
+KIS 실시간 데이터 프레임 형식:
+    암호화여부|TR_ID|데이터건수|필드1^필드2^...^필드N[^다음 레코드 필드...]
+
+- 수신 프레임을 디코딩하지 않고 헤더/페이로드를 바로 분리 (bytes/str/memoryview 모두 지원)
+- tr_id별로 미리 컴파일한 스키마(필드 위치 + 변환기)로 필요한 필드만 변환
+- 한 프레임에 여러 레코드가 묶여 오는 경우(데이터건수 > 1) 모두 처리
+- 결과는 __slots__ 기반 틱 객체 또는 NumPy 구조화 배열로 반환
+"""
+import time
+from datetime import datetime
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple, Union
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FIELD_SEP = b'^'
+HEADER_SEP = b'|'
+_STR_SEPS = ('|', '^')
+_BYTES_SEPS = (HEADER_SEP, FIELD_SEP)
+
+TR_PRICE = 'H0STCNT0'      # 실시간 체결가
+TR_ORDERBOOK = 'H0STASP0'  # 실시간 호가
+
+MAX_ROUTES = 1024  # 헤더 라우트 캐시 상한 (비정상 헤더로 무한히 커지지 않도록)
+
+Frame = Union[bytes, bytearray, memoryview, str]
+
+
+class _SlotRecord:
+    """__slots__ 레코드 공통 기능 (dict 호환 읽기 인터페이스)"""
+
+    __slots__ = ()
+    KEYS: Tuple[str, ...] = ()
+
+    @property
+    def timestamp(self) -> datetime:
+        """수신 시각 (필요할 때만 datetime 생성)"""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self.recv_ns / 1e9)
+        return self._timestamp
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.KEYS
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.KEYS else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.KEYS
+
+    def to_dict(self) -> Dict:
+        """기존 dict 형식으로 변환"""
+        return {key: getattr(self, key) for key in self.KEYS}
+
+
+class Tick(_SlotRecord):
+    """실시간 체결 틱"""
+
+    __slots__ = ('code', 'trade_time', 'price', 'change', 'change_rate',
+                 'volume', 'total_volume', 'recv_ns', '_timestamp')
+
+    KEYS = ('timestamp', 'code', 'price', 'volume', 'total_volume',
+            'change', 'change_rate', 'trade_time')
+
+    def __init__(self, code: str, trade_time: str, price: int, change: int,
+                 change_rate: float, volume: int, total_volume: int, recv_ns: int = 0):
+        self.code = code
+        self.trade_time = trade_time
+        self.price = price
+        self.change = change
+        self.change_rate = change_rate
+        self.volume = volume
+        self.total_volume = total_volume
+        self.recv_ns = recv_ns or time.time_ns()
+        self._timestamp = None
+
+    def __repr__(self):
+        return f"Tick({self.code} {self.price} x {self.volume} @ {self.trade_time})"
+
+
+class OrderbookTick(_SlotRecord):
+    """실시간 호가 (10단계)"""
+
+    __slots__ = ('code', 'trade_time', 'ask_prices', 'bid_prices',
+                 'ask_volumes', 'bid_volumes', 'total_ask_volume',
+                 'total_bid_volume', 'recv_ns', '_timestamp')
+
+    KEYS = ('timestamp', 'code', 'ask_prices', 'ask_volumes', 'bid_prices',
+            'bid_volumes', 'total_ask_volume', 'total_bid_volume', 'trade_time')
+
+    def __init__(self, code: str, trade_time: str, ask_prices: Tuple[int, ...],
+                 bid_prices: Tuple[int, ...], ask_volumes: Tuple[int, ...],
+                 bid_volumes: Tuple[int, ...], total_ask_volume: int = 0,
+                 total_bid_volume: int = 0, recv_ns: int = 0):
+        self.code = code
+        self.trade_time = trade_time
+        self.ask_prices = ask_prices
+        self.bid_prices = bid_prices
+        self.ask_volumes = ask_volumes
+        self.bid_volumes = bid_volumes
+        self.total_ask_volume = total_ask_volume
+        self.total_bid_volume = total_bid_volume
+        self.recv_ns = recv_ns or time.time_ns()
+        self._timestamp = None
+
+    def __repr__(self):
+        return f"OrderbookTick({self.code} ask1={self.ask_prices[0]} bid1={self.bid_prices[0]})"
+
+
+class FrameSchema:
+    """tr_id별 레코드 스키마 (필드 위치를 미리 컴파일)"""
+
+    __slots__ = ('tr_id', 'width', 'names', 'positions', 'index', 'getter', 'maxsplit')
+
+    def __init__(self, tr_id: str, width: int, fields: Dict[str, int]):
+        self.tr_id = tr_id
+        self.width = width  # 레코드 하나의 필드 수
+        self.names = tuple(fields.keys())
+        self.positions = tuple(fields.values())
+        self.index = dict(fields)
+        self.getter = itemgetter(*self.positions)
+        # 단건 레코드는 마지막 필요 필드까지만 분리
+        self.maxsplit = max(self.positions) + 1
+
+
+# 주식 체결가 (H0STCNT0, 레코드당 46필드)
+PRICE_SCHEMA = FrameSchema(TR_PRICE, 46, {
+    'code': 0,           # 유가증권 단축 종목코드
+    'trade_time': 1,     # 주식 체결 시간 (HHMMSS)
+    'price': 2,          # 주식 현재가
+    'change': 4,         # 전일 대비
+    'change_rate': 5,    # 전일 대비율
+    'volume': 12,        # 체결 거래량
+    'total_volume': 13,  # 누적 거래량
+})
+
+# 주식 호가 (H0STASP0, 레코드당 59필드)
+ORDERBOOK_SCHEMA = FrameSchema(TR_ORDERBOOK, 59, {
+    'code': 0,                # 유가증권 단축 종목코드
+    'trade_time': 1,          # 영업 시간
+    'ask_start': 3,           # 매도호가 1~10
+    'bid_start': 13,          # 매수호가 1~10
+    'ask_volume_start': 23,   # 매도호가 잔량 1~10
+    'bid_volume_start': 33,   # 매수호가 잔량 1~10
+    'total_ask_volume': 43,   # 총 매도호가 잔량
+    'total_bid_volume': 44,   # 총 매수호가 잔량
+})
+
+DEFAULT_SCHEMAS: Dict[str, FrameSchema] = {
+    TR_PRICE: PRICE_SCHEMA,
+    TR_ORDERBOOK: ORDERBOOK_SCHEMA,
+}
+
+# NumPy 구조화 레코드 (체결가)
+TICK_DTYPE = np.dtype([
+    ('code', 'S6'),
+    ('trade_time', 'S6'),
+    ('price', np.int64),
+    ('change', np.int64),
+    ('change_rate', np.float64),
+    ('volume', np.int64),
+    ('total_volume', np.int64),
+    ('recv_ns', np.int64),
+])
+
+
+def _as_buffer(frame: Frame) -> Union[bytes, str]:
+    """수신 프레임을 split 가능한 버퍼로 변환 (가능하면 복사 없이)
+
+    텍스트 프레임(str)은 인코딩하지 않고 그대로 분리한다.
+    """
+    if isinstance(frame, memoryview):
+        obj = frame.obj
+        if isinstance(obj, bytes) and frame.nbytes == len(obj):
+            return obj
+        return frame.tobytes()
+    if isinstance(frame, bytearray):
+        # bytearray 조각은 해시 불가 (코드/tr_id 캐시 키로 못 씀)
+        return bytes(frame)
+    return frame
+
+
+def _safe_int(raw: bytes) -> int:
+    try:
+        return int(raw)
+    except ValueError:
+        return 0
+
+
+def _safe_float(raw: bytes) -> float:
+    try:
+        return float(raw)
+    except ValueError:
+        return 0.0
+
+
+class KISFrameParser:
+    """KIS 실시간 프레임 파서"""
+
+    def __init__(self, schemas: Optional[Dict[str, FrameSchema]] = None):
+        self.schemas = dict(schemas or DEFAULT_SCHEMAS)
+        self.frame_count = 0
+        self.record_count = 0
+        self.error_count = 0
+        self.encrypted_count = 0
+        self._tr_ids: Dict = {tr_id.encode('ascii'): tr_id for tr_id in self.schemas}
+        self._tr_ids.update({tr_id: tr_id for tr_id in self.schemas})
+        self._codes: Dict = {}
+        self._times: Dict = {}
+        self._counts: Dict = {}
+        # 헤더 접두사(암호화|TR_ID|건수) -> (tr_id, 건수) - 프레임마다 헤더를 해석하지 않도록
+        self._routes: Dict = {}
+        # 단건 체결가 빠른 경로 (종목코드가 첫 필드인 체결가 스키마일 때만)
+        price_schema = self.schemas.get(TR_PRICE)
+        fast = price_schema is not None and price_schema.names[0] == 'code' and price_schema.positions[0] == 0
+        self._fast_tr_id = TR_PRICE if fast else None
+        self._price_getter = price_schema.getter if fast else None
+        self._first_split = price_schema.maxsplit if fast else 1
+
+    @staticmethod
+    def is_realtime_frame(message: Frame) -> bool:
+        """실시간 데이터 프레임 여부 (JSON 제어 메시지와 구분)"""
+        head = message[:2]
+        if isinstance(head, str):
+            return head in ('0|', '1|')
+        return bytes(head) in (b'0|', b'1|')
+
+    def split_frame(self, frame: Frame) -> Optional[Tuple[str, int, list]]:
+        """헤더를 해석하고 페이로드 필드 목록 반환
+
+        단건 프레임은 스키마의 마지막 필요 필드까지만 분리하므로
+        반환 목록이 레코드 폭보다 짧을 수 있다.
+        """
+        buf = _as_buffer(frame)
+        header_sep, field_sep = _STR_SEPS if type(buf) is str else _BYTES_SEPS
+
+        parts = buf.split(header_sep, 3)
+        if len(parts) != 4:
+            self.error_count += 1
+            return None
+
+        encrypted, raw_tr_id, raw_count, payload = parts
+        if encrypted not in ('0', b'0'):
+            # 암호화 프레임 (체결통보 등) - 복호화 미지원
+            self.encrypted_count += 1
+            return None
+
+        tr_id = self._tr_ids.get(raw_tr_id) or self._intern(self._tr_ids, raw_tr_id)
+        count = self._counts.get(raw_count) or self._parse_count(raw_count)
+        if count is None:
+            return None
+
+        schema = self.schemas.get(tr_id)
+        if count == 1 and schema is not None:
+            fields = payload.split(field_sep, schema.maxsplit)
+        else:
+            fields = payload.split(field_sep)
+        self.frame_count += 1
+        return tr_id, count, fields
+
+    def parse(self, frame: Frame) -> Tuple[Optional[str], List]:
+        """프레임을 틱 객체 리스트로 파싱
+
+        수신의 대부분인 단건 체결가 프레임은 프레임 전체를 체결가 스키마의 마지막 필요
+        필드까지 한 번만 분리하고 (헤더+종목코드가 첫 조각), 헤더 접두사는 캐시된
+        라우트로 해석한다. 페이로드 복사/헤더 재해석/중간 튜플이 없는 빠른 경로.
+        """
+        recv_ns = time.time_ns()
+        if type(frame) is not bytes:
+            frame = _as_buffer(frame)
+        header_sep, field_sep = _STR_SEPS if type(frame) is str else _BYTES_SEPS
+
+        fields = frame.split(field_sep, self._first_split)
+        prefix, _, code = fields[0].rpartition(header_sep)
+        route = self._routes.get(prefix) or self._route(prefix)
+        if route is None:
+            return None, []
+        tr_id, count = route
+        self.frame_count += 1
+
+        if count == 1 and tr_id == self._fast_tr_id:
+            try:
+                _, trade_time, price, change, rate, vol, total = self._price_getter(fields)
+            except (ValueError, IndexError):
+                # 필드 수 부족
+                self.error_count += 1
+                return tr_id, []
+            codes = self._codes
+            times = self._times
+            try:
+                tick = Tick(codes.get(code) or self._intern(codes, code),
+                            times.get(trade_time) or self._intern(times, trade_time),
+                            int(price), int(change), float(rate), int(vol), int(total), recv_ns)
+            except ValueError:
+                tick = self._build_tick((code, trade_time, price, change, rate, vol, total), recv_ns)
+            self.record_count += 1
+            return tr_id, [tick]
+
+        schema = self.schemas.get(tr_id)
+        if schema is None:
+            return tr_id, []
+
+        # 다건/호가 프레임: 페이로드 전체 분리
+        fields = frame.split(header_sep, 3)[3].split(field_sep)
+        width = schema.width
+        count = min(count, len(fields) // width) if count > 1 else 1
+        if len(fields) < schema.maxsplit:
+            self.error_count += 1
+            return tr_id, []
+
+        if tr_id == TR_ORDERBOOK:
+            records = [self._build_orderbook(schema, fields, i * width, recv_ns)
+                       for i in range(count)]
+            records = [r for r in records if r is not None]
+        else:
+            records = self._build_ticks(schema, fields, count, recv_ns)
+
+        self.record_count += len(records)
+        return tr_id, records
+
+    def _build_ticks(self, schema: FrameSchema, fields: list, count: int, recv_ns: int) -> List[Tick]:
+        """다건 체결가 - 필드별 stride 슬라이스로 열을 모아 레코드 슬라이스 복사 없이 변환"""
+        stop = (count - 1) * schema.width + 1
+        columns = [fields[pos:pos + stop:schema.width] for pos in schema.positions]
+        codes = self._codes
+        times = self._times
+        try:
+            return [Tick(codes.get(code) or self._intern(codes, code),
+                         times.get(trade_time) or self._intern(times, trade_time),
+                         int(price), int(change), float(rate), int(vol), int(total), recv_ns)
+                    for code, trade_time, price, change, rate, vol, total in zip(*columns)]
+        except ValueError:
+            # 비정상 값이 섞인 프레임만 레코드별 느린 경로
+            return [self._build_tick(values, recv_ns) for values in zip(*columns)]
+
+    def _route(self, prefix) -> Optional[Tuple[str, int]]:
+        """헤더 접두사 해석 (캐시 미스 시) - 정상 프레임만 캐시"""
+        header_sep = '|' if isinstance(prefix, str) else HEADER_SEP
+        parts = prefix.split(header_sep)
+        if len(parts) != 3:
+            self.error_count += 1
+            return None
+
+        encrypted, raw_tr_id, raw_count = parts
+        if encrypted not in ('0', b'0'):
+            # 암호화 프레임 (체결통보 등) - 복호화 미지원
+            self.encrypted_count += 1
+            return None
+
+        count = self._counts.get(raw_count) or self._parse_count(raw_count)
+        if count is None:
+            return None
+        tr_id = self._tr_ids.get(raw_tr_id) or self._intern(self._tr_ids, raw_tr_id)
+        route = (tr_id, count)
+        if len(self._routes) < MAX_ROUTES:
+            self._routes[prefix] = route
+        return route
+
+    def _parse_count(self, raw_count) -> Optional[int]:
+        """데이터건수 필드 변환 (캐시 미스 시)"""
+        try:
+            count = int(raw_count)
+        except ValueError:
+            count = 0
+        if count < 1:
+            self.error_count += 1
+            return None
+        self._counts[raw_count] = count
+        return count
+
+    @staticmethod
+    def _intern(cache: Dict, raw) -> str:
+        """bytes/str 필드를 문자열로 변환해 캐시 (틱마다 디코딩하지 않도록)"""
+        text = raw if isinstance(raw, str) else raw.decode('ascii', errors='ignore')
+        cache[raw] = text
+        return text
+
+    def _build_tick(self, values: tuple, recv_ns: int) -> Tick:
+        code, trade_time, price, change, rate, vol, total = values
+        code = self._codes.get(code) or self._intern(self._codes, code)
+        trade_time = self._times.get(trade_time) or self._intern(self._times, trade_time)
+        try:
+            return Tick(code, trade_time, int(price), int(change), float(rate),
+                        int(vol), int(total), recv_ns)
+        except ValueError:
+            # 빈 필드 등 비정상 값은 느린 경로로 0 처리
+            self.error_count += 1
+            return Tick(code, trade_time, _safe_int(price), _safe_int(change),
+                        _safe_float(rate), _safe_int(vol), _safe_int(total), recv_ns)
+
+    def _build_orderbook(self, schema: FrameSchema, fields: List[bytes],
+                         base: int, recv_ns: int) -> Optional[OrderbookTick]:
+        idx = schema.index
+        ask = base + idx['ask_start']
+        bid = base + idx['bid_start']
+        ask_vol = base + idx['ask_volume_start']
+        bid_vol = base + idx['bid_volume_start']
+        try:
+            return OrderbookTick(
+                self._codes.get(fields[base + idx['code']])
+                or self._intern(self._codes, fields[base + idx['code']]),
+                self._times.get(fields[base + idx['trade_time']])
+                or self._intern(self._times, fields[base + idx['trade_time']]),
+                tuple(map(int, fields[ask:ask + 10])),
+                tuple(map(int, fields[bid:bid + 10])),
+                tuple(map(int, fields[ask_vol:ask_vol + 10])),
+                tuple(map(int, fields[bid_vol:bid_vol + 10])),
+                int(fields[base + idx['total_ask_volume']]),
+                int(fields[base + idx['total_bid_volume']]),
+                recv_ns,
+            )
+        except (ValueError, IndexError):
+            self.error_count += 1
+            return None
+
+    def parse_records(self, frame: Frame) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """체결가 프레임을 NumPy 구조화 배열로 파싱
+
+        레코드를 튜플로 변환한 뒤 np.array 한 번으로 배열을 만든다 (열별 문자열 배열
+        변환 없음). 배열 생성 고정 비용이 있으므로 다건 프레임/녹화 재생용이며,
+        단건 실시간 수신은 parse() 가 더 빠르다.
+        """
+        recv_ns = time.time_ns()
+        header = self.split_frame(frame)
+        if header is None:
+            return None, None
+
+        tr_id, count, fields = header
+        schema = self.schemas.get(tr_id)
+        if schema is None or tr_id != TR_PRICE:
+            return tr_id, None
+
+        width = schema.width
+        count = 1 if count == 1 else min(count, len(fields) // width)
+        if len(fields) < schema.maxsplit:
+            self.error_count += 1
+            return tr_id, None
+
+        stop = (count - 1) * width + 1
+        columns = [fields[pos:pos + stop:width] for pos in schema.positions]
+        try:
+            rows = [(code, trade_time, int(price), int(change), float(rate), int(vol), int(total), recv_ns)
+                    for code, trade_time, price, change, rate, vol, total in zip(*columns)]
+            records = np.array(rows, dtype=TICK_DTYPE)
+        except (ValueError, UnicodeEncodeError):
+            self.error_count += 1
+            return tr_id, None
+
+        self.record_count += count
+        return tr_id, records
+
+    def get_stats(self) -> Dict[str, int]:
+        """파서 통계 반환"""
+        return {
+            'frames': self.frame_count,
+            'records': self.record_count,
+            'errors': self.error_count,
+            'encrypted': self.encrypted_count,
+        }
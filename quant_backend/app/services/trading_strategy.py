@@ -423,9 +423,7 @@ class TradingStrategy:
                 # 현재가는 마지막 틱 데이터에서 가져오기
                 current_price = 0
                 if stock_code in self.data_processor.tick_buffers:
-                    ticks = list(self.data_processor.tick_buffers[stock_code])
-                    if ticks:
-                        current_price = ticks[-1]['price']
+                    current_price = self.data_processor.tick_buffers[stock_code].latest('price')
                 
                 pnl = (current_price - position['avg_price']) * position['quantity']
                 total_pnl += pnl
@@ -477,6 +475,7 @@ class TradingStrategy:
             
             # WebSocket 연결 종료
             await self.kis_ws.disconnect()
+            await self.chart_manager.close()
             
             # 최종 성과 출력
             self.print_strategy_performance()
@@ -0,0 +1,424 @@
+# benchmark.py - 실시간 처리 경로 성능 측정 스크립트
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# app 디렉토리를 Python 경로에 추가
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir / "app"))
+
+SAMPLE_CODES = ["005930", "000660", "035420", "035720", "051910",
+                "006400", "005380", "000270", "068270", "105560"]
+
+
+def make_price_frame(codes, records_per_frame: int = 1) -> str:
+    """H0STCNT0 체결가 프레임 생성 (KIS 실시간 프레임 형식)"""
+    records = []
+    for _ in range(records_per_frame):
+        code = random.choice(codes)
+        price = random.randint(50000, 80000)
+        change = random.randint(-2000, 2000)
+        fields = [
+            code, datetime.now().strftime("%H%M%S"), str(price), "2", str(change),
+            f"{change / price * 100:.2f}", str(price), str(price - 500), str(price + 800),
+            str(price - 900), str(price + 100), str(price - 100),
+            str(random.randint(1, 500)), str(random.randint(100000, 9000000)),
+        ]
+        fields += ["0"] * (46 - len(fields))
+        records.append("^".join(fields))
+    return f"0|H0STCNT0|{records_per_frame:03d}|" + "^".join(records)
+
+
+def load_frames(path: str):
+    """녹화된 프레임 파일 로드 (한 줄에 한 프레임)"""
+    with open(path, "rb") as f:
+        return [line.rstrip(b"\r\n") for line in f if line.strip()]
+
+
+def legacy_parse_price(message):
+    """기존 방식: 전체 디코딩 + split + 필드별 isdigit/int + dict 생성"""
+    data_str = message.decode("utf-8", errors="ignore") if isinstance(message, bytes) else message
+    parts = data_str.split("|")
+    fields = parts[3].split("^")
+    results = []
+    for base in range(0, len(fields) - 45, 46):
+        f = fields[base:base + 46]
+        results.append({
+            'timestamp': datetime.now(),
+            'code': f[0],
+            'price': int(f[2]) if f[2].isdigit() else 0,
+            'volume': int(f[12]) if f[12].isdigit() else 0,
+            'total_volume': int(f[13]) if f[13].isdigit() else 0,
+            'change': int(f[4]) if f[4].lstrip('-').isdigit() else 0,
+            'change_rate': float(f[5]),
+        })
+    return results
+
+
+def _timeit(func, frames, repeat: int = 3) -> float:
+    """프레임 전체 처리 최소 소요 시간 (초)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            func(frame)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _timeit_interleaved(funcs, frames, repeat: int = 7):
+    """여러 함수를 번갈아 반복 측정한 최소 소요 시간 (부하 변동이 한쪽에만 몰리지 않도록)"""
+    best = [float("inf")] * len(funcs)
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            best[i] = min(best[i], _timeit(func, frames, repeat=1))
+    return best
+
+
+def bench_parser(frames):
+    """실시간 프레임 파서 벤치마크"""
+    from services.tick_parser import KISFrameParser
+
+    parser = KISFrameParser()
+    record_count = sum(len(parser.parse(f)[1]) for f in frames)
+
+    print("=" * 60)
+    print(f"프레임 파서 벤치마크 ({len(frames):,} 프레임 / {record_count:,} 레코드)")
+    print("=" * 60)
+
+    names = ["기존 split/isdigit", "KISFrameParser.parse", "KISFrameParser.parse_records"]
+    elapsed = _timeit_interleaved([legacy_parse_price, parser.parse, parser.parse_records], frames)
+    results = list(zip(names, elapsed))
+    baseline = results[0][1]
+    for name, elapsed in results:
+        per_record = elapsed / max(record_count, 1) * 1e6
+        print(f"{name:<32} {per_record:8.2f} µs/레코드  (x{baseline / elapsed:.2f})")
+
+
+async def bench_dispatcher(frames, slow_ms: float = 5.0):
+    """구독자 분배기 벤치마크 - 느린 구독자가 수신 루프를 막는지 비교"""
+    from services.tick_parser import KISFrameParser
+    from services.tick_dispatcher import TickDispatcher, OverflowPolicy
+
+    parser = KISFrameParser()
+    ticks = [tick for f in frames for tick in parser.parse(f)[1]]
+
+    async def slow_consumer(tick):
+        await asyncio.sleep(slow_ms / 1000)
+
+    async def fast_consumer(tick):
+        pass
+
+    print("=" * 60)
+    print(f"분배기 벤치마크 ({len(ticks):,} 틱, 느린 구독자 {slow_ms}ms/틱)")
+    print("=" * 60)
+
+    # 기존 방식: 수신 루프에서 콜백을 순차 await (일부만 측정)
+    sample = ticks[:200]
+    start = time.perf_counter()
+    for tick in sample:
+        await fast_consumer(tick)
+        await slow_consumer(tick)
+    sequential = (time.perf_counter() - start) / len(sample) * 1e6
+    print(f"{'순차 await':<24} 수신 루프 {sequential:10.2f} µs/틱")
+
+    for policy in (OverflowPolicy.DROP_OLDEST, OverflowPolicy.CONFLATE):
+        dispatcher = TickDispatcher(maxsize=1000, policy=policy)
+        for code in SAMPLE_CODES:
+            dispatcher.subscribe(code, slow_consumer)
+            dispatcher.subscribe(code, fast_consumer)
+
+        start = time.perf_counter()
+        for i, tick in enumerate(ticks):
+            dispatcher.publish(tick.code, tick)
+            if i % 100 == 0:
+                await asyncio.sleep(0)  # 소켓 수신 대기 지점
+        elapsed = (time.perf_counter() - start) / len(ticks) * 1e6
+        await asyncio.sleep(0.05)
+
+        stats = dispatcher.get_stats()
+        dropped = sum(s['dropped'] for s in stats)
+        conflated = sum(s['conflated'] for s in stats)
+        max_lag = max(s['max_lag'] for s in stats)
+        print(f"{'분배기 ' + policy.value:<24} 수신 루프 {elapsed:10.2f} µs/틱 | "
+              f"유실 {dropped:,} / 병합 {conflated:,} / 최대 적체 {max_lag}")
+        await dispatcher.stop()
+
+
+async def bench_redis_writer(frames, count: int = 5000):
+    """Redis 저장 벤치마크 - 틱당 개별 await vs 버퍼링 파이프라인 (fakeredis)"""
+    try:
+        from fakeredis import aioredis as fake_aioredis
+    except ImportError:
+        print("\nfakeredis가 없어 Redis 벤치마크를 건너뜁니다 (pip install fakeredis)")
+        return
+
+    import json
+    from services.tick_parser import KISFrameParser
+    from services.redis_writer import RedisTickWriter
+
+    parser = KISFrameParser()
+    ticks = [tick for f in frames[:count] for tick in parser.parse(f)[1]]
+    stats = {'tick_count_1min': 10, 'avg_price_1min': 70000.0, 'last_update': datetime.now()}
+
+    print("=" * 60)
+    print(f"Redis 저장 벤치마크 ({len(ticks):,} 틱, fakeredis)")
+    print("=" * 60)
+
+    # 기존 방식: 틱마다 5회 왕복
+    redis = fake_aioredis.FakeRedis()
+    start = time.perf_counter()
+    for tick in ticks:
+        tick_key = f"ticks:{tick.code}"
+        await redis.lpush(tick_key, json.dumps(dict(tick), default=str))
+        await redis.ltrim(tick_key, 0, 999)
+        await redis.expire(tick_key, 86400)
+        await redis.hset(f"stats:{tick.code}", mapping={k: str(v) for k, v in stats.items()})
+        await redis.expire(f"stats:{tick.code}", 3600)
+    legacy = (time.perf_counter() - start) / len(ticks) * 1e6
+    print(f"{'틱당 5회 await':<24} {legacy:8.2f} µs/틱")
+
+    redis = fake_aioredis.FakeRedis()
+    writer = RedisTickWriter(redis, flush_interval_ms=20, max_batch=500)
+    start = time.perf_counter()
+    for tick in ticks:
+        await writer.write(tick.code, tick, stats)
+    await writer.close()
+    buffered = (time.perf_counter() - start) / len(ticks) * 1e6
+    print(f"{'RedisTickWriter':<24} {buffered:8.2f} µs/틱  (x{legacy / buffered:.2f}) | "
+          f"flush {writer.flushes}회")
+
+    stored = sum([await redis.xlen(f"ticks:{code}") for code in SAMPLE_CODES])
+    latest = await writer.read_ticks(ticks[-1].code, count=1)
+    print(f"저장 확인: stream {stored:,}건, 최신 {ticks[-1].code} {latest[0]['price']:,}원")
+
+
+def bench_ring_buffer(frames, capacity: int = 1000, window_queries: int = 2000):
+    """틱 버퍼 벤치마크 - dict 틱 deque vs NumPy 링 버퍼 (메모리/구간 조회)"""
+    import tracemalloc
+    from collections import deque
+    import numpy as np
+    from services.tick_parser import KISFrameParser
+    from services.ring_buffer import TickRingBuffer, NS_PER_SEC
+
+    parser = KISFrameParser()
+    ticks = [tick for f in frames for tick in parser.parse(f)[1]]
+    codes = sorted({tick.code for tick in ticks})
+    base_ns = time.time_ns() - len(ticks) * 1_000_000
+    stamps = [base_ns + i * 1_000_000 for i in range(len(ticks))]  # 1ms 간격
+
+    print("=" * 60)
+    print(f"틱 버퍼 벤치마크 ({len(ticks):,} 틱, 종목 {len(codes)}개, 버퍼 {capacity:,}틱)")
+    print("=" * 60)
+
+    # 기존 방식: 종목별 deque에 dict + datetime
+    tracemalloc.start()
+    legacy = {code: deque(maxlen=capacity) for code in codes}
+    start = time.perf_counter()
+    for tick, ts in zip(ticks, stamps):
+        legacy[tick.code].append({
+            'code': tick.code, 'timestamp': datetime.fromtimestamp(ts / NS_PER_SEC),
+            'price': tick.price, 'volume': tick.volume, 'change': tick.change,
+            'change_rate': tick.change_rate, 'total_volume': tick.total_volume,
+        })
+    legacy_append = (time.perf_counter() - start) / len(ticks) * 1e6
+    legacy_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    rings = {code: TickRingBuffer(capacity) for code in codes}
+    start = time.perf_counter()
+    for tick, ts in zip(ticks, stamps):
+        rings[tick.code].append(ts, tick.price, tick.volume, tick.change, tick.change_rate)
+    ring_append = (time.perf_counter() - start) / len(ticks) * 1e6
+    ring_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # 최근 0.5초 구간 통계 (기존: 전체 순회 필터 / 링 버퍼: 이진 탐색 + 벡터 연산)
+    code = codes[0]
+    cutoff = datetime.fromtimestamp((stamps[-1] - NS_PER_SEC // 2) / NS_PER_SEC)
+    start = time.perf_counter()
+    for _ in range(window_queries):
+        prices = [t['price'] for t in legacy[code] if t['timestamp'] >= cutoff]
+        np.std(np.diff(prices)) if len(prices) > 2 else 0
+    legacy_query = (time.perf_counter() - start) / window_queries * 1e6
+
+    cutoff_ns = stamps[-1] - NS_PER_SEC // 2
+    start = time.perf_counter()
+    for _ in range(window_queries):
+        prices = rings[code].between(cutoff_ns)['price']
+        np.std(np.diff(prices)) if len(prices) > 2 else 0
+    ring_query = (time.perf_counter() - start) / window_queries * 1e6
+
+    print(f"{'deque[dict]':<20} 적재 {legacy_append:6.2f} µs/틱 | 구간 통계 {legacy_query:8.1f} µs | "
+          f"메모리 {legacy_mem / 1024:,.0f} KB")
+    print(f"{'TickRingBuffer':<20} 적재 {ring_append:6.2f} µs/틱 | 구간 통계 {ring_query:8.1f} µs | "
+          f"메모리 {ring_mem / 1024:,.0f} KB (x{legacy_mem / max(ring_mem, 1):.1f} 절감)")
+
+
+class FakeWebSocket:
+    """가짜 WebSocket 클라이언트 (전송 지연 시뮬레이션)"""
+
+    def __init__(self, delay_ms: float = 0.0):
+        self.delay = delay_ms / 1000
+        self.received = 0
+        self.bytes = 0
+        self.closed = False
+
+    async def send_text(self, message: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+        self.bytes += len(message)
+
+    async def send_bytes(self, message: bytes):
+        await self.send_text(message)
+
+    async def close(self):
+        self.closed = True
+
+
+async def bench_chart_broadcast(clients: int = 300, slow_clients: int = 5, updates: int = 2000,
+                                slow_ms: float = 50.0):
+    """차트 브로드캐스트 벤치마크 - 순차 send vs 허브 (병합/동시 전송/퇴출)"""
+    import json
+    from services.chart_broadcast import ChartBroadcastHub
+
+    code = SAMPLE_CODES[0]
+    indicators = {'sma5': 70000.0, 'sma20': 69800.0, 'rsi': 55.2, 'macd': 12.5}
+    stats = {'tick_count_1min': 120, 'avg_price_1min': 70010.0, 'last_update': datetime.now()}
+
+    def make_update(i):
+        return {'type': 'tick_update', 'code': code, 'timestamp': datetime.now().isoformat(),
+                'price': 70000 + i % 100, 'volume': i % 50, 'change': 100, 'change_rate': 0.14,
+                'indicators': indicators, 'stats': stats}
+
+    print("=" * 60)
+    print(f"차트 브로드캐스트 벤치마크 (클라이언트 {clients}개, 느린 클라이언트 {slow_clients}개 "
+          f"{slow_ms}ms/전송, 업데이트 {updates:,}건)")
+    print("=" * 60)
+
+    # 기존 방식: 업데이트마다 json.dumps + 클라이언트 순차 await (일부만 측정)
+    sockets = [FakeWebSocket(slow_ms if i < slow_clients else 0) for i in range(clients)]
+    sample = 20
+    start = time.perf_counter()
+    for i in range(sample):
+        message = json.dumps(make_update(i), default=str)
+        for ws in sockets:
+            await ws.send_text(message)
+    sequential = (time.perf_counter() - start) / sample * 1000
+    print(f"{'순차 send':<24} 업데이트당 {sequential:9.2f} ms (빠른 클라이언트도 동일하게 지연)")
+
+    for encoding in ("json", "msgpack"):
+        try:
+            hub = ChartBroadcastHub(frame_interval=0.01, client_queue_size=4,
+                                    send_timeout=0.2, max_full_frames=5, encoding=encoding)
+        except ValueError:
+            print(f"{'허브 ' + encoding:<24} 건너뜀 (msgpack 미설치)")
+            continue
+        sockets = [FakeWebSocket(slow_ms if i < slow_clients else 0) for i in range(clients)]
+        for ws in sockets:
+            hub.add_client(code, ws)
+
+        publish_time = 0.0
+        for i in range(updates):
+            start = time.perf_counter()
+            hub.publish(code, make_update(i))
+            publish_time += time.perf_counter() - start
+            if i % 10 == 0:
+                await asyncio.sleep(0.002)  # 틱 수신 간격
+        publish_cost = publish_time / updates * 1e6
+        await asyncio.sleep(0.3)
+
+        hub_stats = hub.get_stats()
+        fast = [ws.received for ws in sockets[slow_clients:]]
+        print(f"{'허브 ' + encoding:<24} publish {publish_cost:7.2f} µs | 프레임 {hub_stats['frames']:,} / "
+              f"직렬화 {hub_stats['serializations']:,} / 병합 {hub_stats['conflated']:,} | "
+              f"빠른 클라이언트 수신 {min(fast):,}~{max(fast):,}건 | 퇴출 {hub_stats['evicted']}")
+        await hub.stop()
+
+
+async def bench_chart_stream(history: int = 1000, updates: int = 500, width: int = 300):
+    """차트 스트림 벤치마크 - 전체 이력 재전송 vs 스냅샷 + 델타"""
+    import json
+    from services.data_processor import TickDataProcessor, RealTimeChartManager
+    from services.chart_broadcast import serialize
+    from services.chart_stream import ChartStream
+    from services.output_sinks import NullSink
+
+    code = SAMPLE_CODES[0]
+    processor = TickDataProcessor(output=NullSink())
+    manager = RealTimeChartManager(processor)
+
+    def make_tick():
+        price = random.randint(69000, 71000)
+        return {'code': code, 'timestamp': datetime.now(), 'price': price,
+                'volume': random.randint(1, 500), 'change': price - 70000,
+                'change_rate': (price - 70000) / 700}
+
+    for _ in range(history):
+        await processor.process_tick(make_tick())
+
+    print("=" * 60)
+    print(f"차트 스트림 벤치마크 (이력 {history:,}틱, 업데이트 {updates:,}건, 화면 폭 {width}px)")
+    print("=" * 60)
+
+    # 기존 방식: 업데이트마다 전체 틱/분봉 JSON 재생성
+    legacy_time = legacy_bytes = 0
+    for _ in range(updates // 10):
+        await processor.process_tick(make_tick())
+        start = time.perf_counter()
+        payload = json.dumps(await manager.generate_tick_chart_json(code), default=str)
+        legacy_time += time.perf_counter() - start
+        legacy_bytes += len(payload)
+    legacy_time /= updates // 10
+    legacy_bytes /= updates // 10
+
+    stream = ChartStream(code, processor)
+    snapshot = serialize(stream.snapshot(width))
+    delta_time = delta_bytes = 0
+    for _ in range(updates):
+        await processor.process_tick(make_tick())
+        start = time.perf_counter()
+        payload = serialize(stream.next_delta())
+        delta_time += time.perf_counter() - start
+        delta_bytes += len(payload)
+    delta_time /= updates
+    delta_bytes /= updates
+
+    print(f"{'전체 재전송':<20} {legacy_time * 1e6:9.1f} µs | {legacy_bytes:10,.0f} bytes/업데이트")
+    print(f"{'델타':<20} {delta_time * 1e6:9.1f} µs | {delta_bytes:10,.0f} bytes/업데이트 "
+          f"(x{legacy_bytes / delta_bytes:.0f} 절감) | 초기 스냅샷 {len(snapshot):,} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='실시간 처리 경로 벤치마크')
+    parser.add_argument('--frames', help='녹화된 실시간 프레임 파일 (한 줄에 한 프레임)')
+    parser.add_argument('--count', type=int, default=20000, help='생성할 프레임 수')
+    parser.add_argument('--batch', type=int, default=1, help='프레임당 레코드 수')
+    args = parser.parse_args()
+
+    random.seed(42)
+    if args.frames:
+        frames = load_frames(args.frames)
+    else:
+        frames = [make_price_frame(SAMPLE_CODES, args.batch).encode()
+                  for _ in range(args.count)]
+
+    bench_parser(frames)
+    asyncio.run(bench_dispatcher(frames))
+    asyncio.run(bench_redis_writer(frames))
+    bench_ring_buffer(frames)
+    asyncio.run(bench_chart_broadcast())
+    asyncio.run(bench_chart_stream())
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n벤치마크 중단됨")
@@ -0,0 +1,193 @@
+# tests/test_redis_writer.py - 버퍼링 Redis 틱 저장기 테스트 (fakeredis)
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# app 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+fake_aioredis = pytest.importorskip("fakeredis").aioredis
+
+from services.redis_writer import RedisTickWriter, encode_tick, decode_tick, TICK_FIELDS
+from services.tick_parser import Tick
+
+
+def make_tick(code: str = "005930", price: int = 70000, recv_ns: int = 1_700_000_000_000_000_000) -> Tick:
+    return Tick(code, "090000", price, -100, -0.14, 10, 1000, recv_ns)
+
+
+class StalledRedis:
+    """pipeline.execute() 가 release() 전까지 끝나지 않는 Redis (느린 Redis 흉내)"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.released = asyncio.Event()
+        self.executing = 0
+
+    def pipeline(self, transaction: bool = False):
+        pipe = self.redis.pipeline(transaction=transaction)
+        execute = pipe.execute
+
+        async def stalled_execute():
+            self.executing += 1
+            await self.released.wait()
+            return await execute()
+
+        pipe.execute = stalled_execute
+        return pipe
+
+    def __getattr__(self, name):
+        return getattr(self.redis, name)
+
+
+class FailingRedis:
+    """pipeline.execute() 가 항상 실패하는 Redis"""
+
+    def pipeline(self, transaction: bool = False):
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    async def execute(self):
+        raise ConnectionError("redis down")
+
+
+# ===== 필드 인코딩 =====
+
+def test_encode_tick_uses_fixed_csv_layout():
+    encoded = encode_tick(make_tick())
+    assert encoded == "1700000000000000000,70000,10,-100,-0.14,1000"
+    assert len(encoded.split(",")) == len(TICK_FIELDS)
+
+
+def test_encode_dict_tick_uses_timestamp_and_defaults():
+    timestamp = datetime(2024, 1, 2, 9, 0, 0)
+    encoded = encode_tick({'timestamp': timestamp, 'price': 50000, 'volume': 3})
+
+    decoded = decode_tick(encoded)
+    assert decoded['recv_ns'] == int(timestamp.timestamp() * 1e9)
+    assert (decoded['price'], decoded['volume']) == (50000, 3)
+    assert (decoded['change'], decoded['change_rate'], decoded['total_volume']) == (0, 0.0, 0)
+
+
+def test_decode_tick_roundtrip_from_bytes():
+    tick = make_tick(price=123456)
+    decoded = decode_tick(encode_tick(tick).encode("ascii"))
+    assert decoded == {
+        'recv_ns': tick.recv_ns, 'price': 123456, 'volume': 10,
+        'change': -100, 'change_rate': -0.14, 'total_volume': 1000,
+    }
+
+
+# ===== 배치 flush =====
+
+def test_batch_flush_writes_streams_stats_and_ttl():
+    async def run():
+        redis = fake_aioredis.FakeRedis()
+        writer = RedisTickWriter(redis, flush_interval_ms=60000, max_batch=4,
+                                 tick_ttl=100, stats_ttl=50)
+        stats = {'tick_count_1min': 3, 'avg_price_1min': 70000.5, 'last_update': datetime(2024, 1, 2)}
+        for i in range(6):
+            await writer.write("005930", make_tick("005930", 70000 + i, recv_ns=i + 1), stats)
+        for i in range(4):
+            await writer.write("000660", make_tick("000660", 150000 + i, recv_ns=i + 1))
+        assert writer.pending == 10  # flush 태스크가 돌기 전에는 버퍼에만 쌓임
+
+        await writer.close()
+
+        assert writer.pending == 0
+        assert writer.written == 10
+        assert writer.flushes == 3  # max_batch=4 -> 4 + 4 + 2
+        assert await redis.xlen("ticks:005930") == 6
+        assert await redis.xlen("ticks:000660") == 4
+
+        latest = await writer.read_ticks("005930", count=2)
+        assert [t['price'] for t in latest] == [70005, 70004]  # 최신순
+
+        saved = await redis.hgetall("stats:005930")
+        assert saved == {b'tick_count_1min': b'3', b'avg_price_1min': b'70000.5',
+                         b'last_update': b'2024-01-02 00:00:00'}
+        assert not await redis.exists("stats:000660")
+        assert 0 < await redis.ttl("ticks:005930") <= 100
+        assert 0 < await redis.ttl("stats:005930") <= 50
+
+    asyncio.run(run())
+
+
+def test_background_flush_after_interval():
+    async def run():
+        redis = fake_aioredis.FakeRedis()
+        writer = RedisTickWriter(redis, flush_interval_ms=10, max_batch=500)
+        await writer.write("005930", make_tick())
+        await asyncio.sleep(0.1)
+
+        assert writer.pending == 0
+        assert await redis.xlen("ticks:005930") == 1
+        await writer.close()
+
+    asyncio.run(run())
+
+
+# ===== backpressure / 유실 =====
+
+def test_backpressure_drops_oldest_ticks_when_redis_stalls():
+    async def run():
+        redis = StalledRedis(fake_aioredis.FakeRedis())
+        writer = RedisTickWriter(redis, flush_interval_ms=60000, max_batch=1,
+                                 max_pending=3, backpressure_timeout=0.01)
+        for i in range(10):
+            await writer.write("005930", make_tick(price=70000 + i, recv_ns=i + 1))
+
+        # 첫 틱은 flush 중(멈춤), 이후 버퍼가 가득 찰 때마다 가장 오래된 틱 폐기
+        assert redis.executing == 1
+        assert writer.backpressure_waits == 7
+        assert writer.dropped == 6
+        assert writer.pending == 3
+        assert [decode_tick(encoded)['price'] for _, encoded in writer._ticks] == [70007, 70008, 70009]
+
+        redis.released.set()
+        while writer.pending:
+            await asyncio.sleep(0.01)
+        await writer.close()
+
+        assert writer.written == 4
+        assert [t['price'] for t in await writer.read_ticks("005930")] == [70009, 70008, 70007, 70000]
+
+    asyncio.run(run())
+
+
+def test_backpressure_waits_for_flush_without_dropping():
+    async def run():
+        redis = fake_aioredis.FakeRedis()
+        writer = RedisTickWriter(redis, flush_interval_ms=60000, max_batch=100,
+                                 max_pending=5, backpressure_timeout=1.0)
+        for i in range(20):
+            await writer.write("005930", make_tick(price=70000 + i))
+        await writer.close()
+
+        assert writer.backpressure_waits > 0
+        assert writer.dropped == 0
+        assert writer.written == 20
+        assert await redis.xlen("ticks:005930") == 20
+
+    asyncio.run(run())
+
+
+def test_failed_pipeline_counts_error_and_dropped_batch():
+    async def run():
+        writer = RedisTickWriter(FailingRedis(), flush_interval_ms=60000, max_batch=3)
+        for i in range(5):
+            await writer.write("005930", make_tick(price=70000 + i))
+        await writer.close()
+
+        # 실패한 배치만 버리고 남은 틱은 다음 flush 로 남김
+        assert writer.errors == 1
+        assert writer.dropped == 3
+        assert writer.written == 0
+        assert writer.pending == 2
+
+    asyncio.run(run())
@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 class KiwoomClient:
     """키움 Open API 모의 클라이언트"""
     
-    def __init__(self):
+    def __init__(self, simulator=None, speed: float = 1.0, step_interval: float = 0.01):
         self.is_connected = False
         self.account_number = "8012345-01"
         self.server_type = "DEMO"  # DEMO or REAL
@@ -28,6 +28,84 @@ class KiwoomClient:
         
         # 가격 변동 시뮬레이션 태스크
         self.price_update_task = None
+        
+        # 실시간 이벤트 리스너 (시세/체결)
+        self.price_listeners = []
+        self.fill_listeners = []
+        
+        # 벡터화 시장 시뮬레이터 (market_simulator.MarketSimulator / ReplayFeed, 선택)
+        self.simulator = None
+        self.speed = speed  # 시뮬레이션 배속
+        self.step_interval = step_interval
+        self.sim_orders = {}  # 시뮬레이터 주문 ID -> 주문번호
+        if simulator is not None:
+            self.use_simulator(simulator)
+    
+    @classmethod
+    def from_settings(cls, settings=None) -> "KiwoomClient":
+        """설정(mock_market_feed)에 따라 시뮬레이터/녹화 재생을 붙인 모의 클라이언트 생성"""
+        if settings is None:
+            from utils.config import get_settings
+            settings = get_settings()
+        
+        client = cls(speed=settings.mock_simulator_speed, step_interval=settings.mock_simulator_step)
+        feed = settings.mock_market_feed
+        if not feed:
+            return client
+        
+        from data.market_simulator import MarketSimulator, ReplayFeed
+        seed = settings.mock_simulator_seed
+        if feed == "simulator":
+            if settings.mock_simulator_symbols > 0:
+                simulator = MarketSimulator.random_universe(settings.mock_simulator_symbols, seed=seed)
+            else:
+                codes = list(client.mock_prices)
+                prices = [client.mock_prices[code]['current_price'] for code in codes]
+                simulator = MarketSimulator(codes, prices, seed=seed)
+        else:
+            simulator = ReplayFeed(feed, seed=seed)
+        
+        client.use_simulator(simulator)
+        logger.info(f"모의 시세 생성기: {type(simulator).__name__} ({len(simulator.codes)}종목)")
+        return client
+    
+    def use_simulator(self, simulator):
+        """시뮬레이터 종목을 모의 시세에 등록하고 가격/체결을 시뮬레이터로 생성"""
+        self.simulator = simulator
+        now = datetime.now()
+        for code, price in zip(simulator.codes, simulator.last_price.tolist()):
+            self.mock_prices[code] = {
+                'current_price': int(price),
+                'prev_close': int(price),
+                'volume': 0,
+                'high': int(price),
+                'low': int(price),
+                'market_cap': 0,
+                'last_update': now
+            }
+    
+    def add_price_listener(self, callback):
+        """시세 변경 리스너 등록 - callback(stock_code, quote)"""
+        self.price_listeners.append(callback)
+    
+    def remove_price_listener(self, callback):
+        if callback in self.price_listeners:
+            self.price_listeners.remove(callback)
+    
+    def add_fill_listener(self, callback):
+        """체결 리스너 등록 - callback(order)"""
+        self.fill_listeners.append(callback)
+    
+    def remove_fill_listener(self, callback):
+        if callback in self.fill_listeners:
+            self.fill_listeners.remove(callback)
+    
+    def _notify(self, listeners, *args):
+        for callback in listeners:
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f"리스너 호출 오류: {e}")
     
     def initialize_mock_data(self):
         """모의 데이터 초기화"""
@@ -143,6 +221,10 @@ class KiwoomClient:
     
     async def simulate_price_updates(self):
         """실시간 가격 변동 시뮬레이션"""
+        if self.simulator is not None:
+            await self.run_simulator()
+            return
+        
         try:
             while self.is_connected:
                 await asyncio.sleep(1)  # 1초마다 업데이트
@@ -155,6 +237,73 @@ class KiwoomClient:
         except Exception as e:
             logger.error(f"가격 업데이트 시뮬레이션 오류: {e}")
     
+    async def run_simulator(self):
+        """시뮬레이터 구동 - step_interval마다 전 종목 한 스텝 (speed 배속)"""
+        loop = asyncio.get_running_loop()
+        next_step = loop.time()
+        try:
+            while self.is_connected:
+                batch, fills = self.simulator.step(self.step_interval)
+                self.apply_ticks(batch)
+                self.apply_fills(fills)
+                
+                next_step += self.step_interval / self.speed
+                await asyncio.sleep(max(next_step - loop.time(), 0))
+        except asyncio.CancelledError:
+            logger.info("시장 시뮬레이터 종료")
+        except Exception as e:
+            logger.error(f"시장 시뮬레이터 오류: {e}")
+    
+    def apply_ticks(self, batch):
+        """시뮬레이터 체결을 모의 시세에 반영하고 시세 리스너 호출"""
+        if not len(batch):
+            return
+        codes = self.simulator.codes
+        now = datetime.now()
+        for index, price, volume in zip(batch.index.tolist(), batch.price.tolist(), batch.volume.tolist()):
+            stock_code = codes[index]
+            price_data = self.mock_prices[stock_code]
+            price = int(price)
+            price_data['current_price'] = price
+            price_data['volume'] += volume
+            if price > price_data['high']:
+                price_data['high'] = price
+            if price < price_data['low']:
+                price_data['low'] = price
+            price_data['last_update'] = now
+            
+            if self.price_listeners:
+                self._notify(self.price_listeners, stock_code, {**price_data, 'tick_volume': volume})
+    
+    def apply_fills(self, fills):
+        """시뮬레이터 주문 체결(부분 체결 포함)을 주문 상태에 반영하고 체결 리스너 호출"""
+        for sim_order, _, fill_price, fill_quantity in fills:
+            order_id = self.sim_orders.get(sim_order.order_id)
+            order = self.mock_orders.get(order_id)
+            if order is None:
+                continue
+            
+            filled = order['quantity'] - sim_order.remaining
+            order.update({
+                'status': 'filled' if sim_order.remaining == 0 else 'partially_filled',
+                'fill_time': datetime.now(),
+                'fill_price': sim_order.filled_value / filled,  # 평균 체결가
+                'fill_quantity': filled,
+                'remaining_quantity': sim_order.remaining,
+                'commission': self.calculate_commission(sim_order.filled_value)
+            })
+            if sim_order.remaining == 0:
+                self.sim_orders.pop(sim_order.order_id, None)
+            
+            logger.info(f"주문 체결: {order_id} - {fill_quantity}주 @ {fill_price}")
+            # 리스너에는 이번 체결분만 전달
+            self._notify(self.fill_listeners, {
+                **order,
+                'fill_price': fill_price,
+                'fill_quantity': fill_quantity,
+                'commission': self.calculate_commission(fill_price * fill_quantity)
+            })
+    
     async def update_mock_price(self, stock_code: str):
         """개별 종목 가격 업데이트"""
         try:
@@ -176,12 +325,16 @@ class KiwoomClient:
             new_price = max(min_price, min(max_price, new_price))
             
             # 가격 데이터 업데이트
+            tick_volume = random.randint(1000, 10000)
             price_data['current_price'] = int(new_price)
-            price_data['volume'] += random.randint(1000, 10000)
+            price_data['volume'] += tick_volume
             price_data['high'] = max(price_data['high'], int(new_price))
             price_data['low'] = min(price_data['low'], int(new_price))
             price_data['last_update'] = datetime.now()
             
+            if self.price_listeners:
+                self._notify(self.price_listeners, stock_code, {**price_data, 'tick_volume': tick_volume})
+            
         except Exception as e:
             logger.error(f"가격 업데이트 오류 {stock_code}: {e}")
     
@@ -258,7 +411,12 @@ class KiwoomClient:
             self.mock_orders[order_id] = order_data
             
             # 주문 처리 시뮬레이션 시작
-            asyncio.create_task(self.simulate_order_fill(order_id))
+            if self.simulator is not None and stock_code in self.simulator.index:
+                sim_order_id = self.simulator.submit_order(stock_code, order_type, quantity, price)
+                self.sim_orders[sim_order_id] = order_id
+                order_data['sim_order_id'] = sim_order_id
+            else:
+                asyncio.create_task(self.simulate_order_fill(order_id))
             
             logger.info(f"주문 전송 완료: {stock_code} {order_type} {quantity}주 @ {price}")
             return order_id
@@ -302,6 +460,7 @@ class KiwoomClient:
                 })
                 
                 logger.info(f"주문 체결: {order_id} - {fill_quantity}주 @ {fill_price}")
+                self._notify(self.fill_listeners, order)
                 
             else:
                 # 주문 취소 또는 거부
@@ -338,7 +497,10 @@ class KiwoomClient:
             
             order = self.mock_orders[order_id]
             
-            if order['status'] == 'pending':
+            if order['status'] in ('pending', 'partially_filled'):
+                if 'sim_order_id' in order:
+                    self.simulator.cancel_order(order['sim_order_id'])
+                    self.sim_orders.pop(order['sim_order_id'], None)
                 order['status'] = 'cancelled'
                 order['cancel_time'] = datetime.now()
                 logger.info(f"주문 취소됨: {order_id}")
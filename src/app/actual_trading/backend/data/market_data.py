@@ -1 +1,263 @@
- 
+# file: backend/data/market_data.py
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from database import get_db_session, get_price_store, get_stock_ids
+
+logger = logging.getLogger(__name__)
+
+
+class SymbolHistory:
+    """종목 하나의 가격/거래량 이력 (시간순 NumPy 배열)"""
+
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)  # epoch 초
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.volumes = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+        self.loaded = False  # DB 이력 적재 여부 (실시간 틱만 있는 종목은 False)
+        self.covered_from = float('inf')  # 이 시각(epoch 초) 이후 이력은 빠짐없이 보유
+
+    def load(self, timestamps: np.ndarray, prices: np.ndarray, volumes: np.ndarray,
+             covered_from: float):
+        """일괄 적재 (기존 내용 교체, 최근 capacity개만 보관)
+
+        covered_from: 조회 구간 시작 시각 - capacity 로 잘렸으면 남은 첫 봉 시각으로 좁힘
+        """
+        n = min(len(prices), self.capacity)
+        self.timestamps[:n] = timestamps[-n:] if n else timestamps[:0]
+        self.prices[:n] = prices[-n:] if n else prices[:0]
+        self.volumes[:n] = volumes[-n:] if n else volumes[:0]
+        self.size = n
+        self.loaded = True
+        self.covered_from = float(self.timestamps[0]) if n and n >= self.capacity else covered_from
+
+    def append(self, timestamp: float, price: float, volume: int = 0):
+        """실시간 데이터 추가 - 가득 차면 오래된 절반을 밀어냄"""
+        if self.size == self.capacity:
+            keep = self.capacity // 2
+            for arr in (self.timestamps, self.prices, self.volumes):
+                arr[:keep] = arr[self.size - keep:self.size]
+            self.size = keep
+            self.covered_from = max(self.covered_from, float(self.timestamps[0]))
+        i = self.size
+        self.timestamps[i] = timestamp
+        self.prices[i] = price
+        self.volumes[i] = volume
+        self.size += 1
+
+    def covers(self, days: Optional[int] = None) -> bool:
+        """최근 days일 구간 전체를 보유하는지 (days=None 이면 적재 여부만)"""
+        if not self.loaded:
+            return False
+        if days is None:
+            return True
+        return (datetime.now() - timedelta(days=days)).timestamp() >= self.covered_from
+
+    def _start(self, days: Optional[int], limit: Optional[int]) -> int:
+        start = 0
+        if days is not None:
+            cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+            start = int(np.searchsorted(self.timestamps[:self.size], cutoff, side='left'))
+        if limit is not None:
+            start = max(start, self.size - limit)
+        return start
+
+    def prices_since(self, days: Optional[int] = None, limit: Optional[int] = None) -> np.ndarray:
+        return self.prices[self._start(days, limit):self.size]
+
+    def volumes_since(self, days: Optional[int] = None, limit: Optional[int] = None) -> np.ndarray:
+        return self.volumes[self._start(days, limit):self.size]
+
+    @property
+    def last_price(self) -> Optional[float]:
+        return float(self.prices[self.size - 1]) if self.size else None
+
+
+class MarketDataCache:
+    """감시 종목 시세/포지션 캐시
+
+    - 주기마다 감시 종목 전체의 최근 N개 봉 종가를 시세 저장소 롤업(resolution)에서 일괄 적재
+    - 실시간 체결은 on_price()로 배열에 바로 추가
+    - 전략은 읽기 API(get_prices/get_volumes/get_position)로 DB 없이 즉시 조회
+    - 캐시 구간(lookback_days / max_bars)을 넘는 요청은 covers()가 False -> 호출자가 DB 조회
+    - DB 작업은 asyncio.to_thread로 이벤트 루프 밖에서 실행
+    """
+
+    def __init__(self, max_bars: int = 500, lookback_days: int = 60, resolution: str = '1m'):
+        self.max_bars = max_bars
+        self.lookback_days = lookback_days
+        self.resolution = resolution  # 실시간 봉 주기와 맞춤 (price_store.RESOLUTIONS)
+        self.histories: Dict[str, SymbolHistory] = {}
+        self.positions: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        self.loaded_at: Optional[datetime] = None
+        self.positions_loaded_at: Optional[datetime] = None
+        self._refresh_lock = asyncio.Lock()
+
+        # 통계
+        self.refresh_count = 0
+        self.last_refresh_ms = 0.0
+        self.live_updates = 0
+
+    # ------------------------------------------------------------------
+    # 적재 (DB -> 메모리)
+    # ------------------------------------------------------------------
+    def _query_history(self, stock_codes: List[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """감시 종목 전체의 최근 max_bars개 봉 종가를 시세 저장소 롤업에서 조회 (동기)"""
+        stock_ids = get_stock_ids(stock_codes)
+        codes_by_id = {stock_id: code for code, stock_id in stock_ids.items()}
+        start_ts = (datetime.now() - timedelta(days=self.lookback_days)).timestamp()
+
+        result = {}
+        bars = get_price_store().latest_closes(list(codes_by_id), self.resolution, self.max_bars)
+        for stock_id, (ts, prices, volumes) in bars.items():
+            keep = ts >= start_ts
+            result[codes_by_id[stock_id]] = (ts[keep], prices[keep], volumes[keep])
+        return result
+
+    def _query_positions(self) -> Dict[Tuple[int, str], Dict[str, Any]]:
+        """보유 포지션 전체를 한 번에 조회 (동기)"""
+        with get_db_session() as conn:
+            rows = conn.execute("""
+                SELECT p.strategy_id, s.code, p.quantity, p.avg_price, p.current_price, p.unrealized_pnl
+                FROM positions p
+                JOIN stocks s ON s.id = p.stock_id
+                WHERE p.quantity > 0
+            """).fetchall()
+
+        return {
+            (strategy_id, code): {
+                'quantity': quantity,
+                'avg_price': avg_price,
+                'current_price': current_price,
+                'unrealized_pnl': unrealized_pnl
+            }
+            for strategy_id, code, quantity, avg_price, current_price, unrealized_pnl in rows
+        }
+
+    async def refresh(self, stock_codes: Iterable[str], include_positions: bool = True):
+        """감시 종목 가격 이력과 포지션 일괄 갱신"""
+        codes = sorted(set(stock_codes))
+        if not codes:
+            return
+
+        async with self._refresh_lock:
+            start = time.perf_counter()
+            try:
+                covered_from = (datetime.now() - timedelta(days=self.lookback_days)).timestamp()
+                history = await asyncio.to_thread(self._query_history, codes)
+                empty = (np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64),
+                         np.empty(0, dtype=np.int64))
+                for code in codes:
+                    symbol = self.histories.get(code)
+                    if symbol is None:
+                        symbol = self.histories[code] = SymbolHistory(self.max_bars)
+                    # 구간 내 이력이 없는 종목도 "DB 확인 완료"로 적재
+                    symbol.load(*history.get(code, empty), covered_from=covered_from)
+                self.loaded_at = datetime.now()
+
+                if include_positions:
+                    self.positions = await asyncio.to_thread(self._query_positions)
+                    self.positions_loaded_at = datetime.now()
+
+                self.refresh_count += 1
+            except Exception as e:
+                logger.error(f"시세 캐시 갱신 실패: {e}")
+            finally:
+                self.last_refresh_ms = (time.perf_counter() - start) * 1000
+
+    def on_price(self, stock_code: str, price: float, volume: int = 0,
+                 timestamp: Optional[datetime] = None):
+        """실시간 체결 반영 (DB 왕복 없음)"""
+        symbol = self.histories.get(stock_code)
+        if symbol is None:
+            symbol = self.histories[stock_code] = SymbolHistory(self.max_bars)
+        ts = (timestamp or datetime.now()).timestamp()
+        symbol.append(ts, price, volume)
+        self.live_updates += 1
+
+    def set_position(self, strategy_id: int, stock_code: str, position: Optional[Dict[str, Any]]):
+        """체결 후 포지션 캐시 갱신 (None이면 제거)"""
+        if position and position.get('quantity', 0) > 0:
+            self.positions[(strategy_id, stock_code)] = position
+        else:
+            self.positions.pop((strategy_id, stock_code), None)
+
+    def apply_fill(self, strategy_id: int, stock_code: str, side: str, quantity: int, price: float):
+        """체결을 전략 포지션에 바로 반영 (다음 refresh 전까지 이미 보유한 종목에 매수 신호를 반복하지 않도록)"""
+        current = self.positions.get((strategy_id, stock_code))
+        position = dict(current) if current else {'quantity': 0, 'avg_price': 0.0}
+        held = position['quantity']
+        if side == "buy":
+            total = held + quantity
+            position['avg_price'] = (position['avg_price'] * held + price * quantity) / total
+            position['quantity'] = total
+        else:
+            position['quantity'] = max(held - quantity, 0)
+        position['current_price'] = price
+        position['unrealized_pnl'] = (price - position['avg_price']) * position['quantity']
+        self.set_position(strategy_id, stock_code, position)
+
+    def invalidate_positions(self):
+        """전략을 알 수 없는 체결 - 다음 refresh 까지 포지션은 DB에서 조회"""
+        self.positions_loaded_at = None
+
+    # ------------------------------------------------------------------
+    # 읽기 API (논블로킹)
+    # ------------------------------------------------------------------
+    def has_symbol(self, stock_code: str) -> bool:
+        """DB 이력이 적재된 종목인지 (실시간 틱만 받은 종목은 False)"""
+        symbol = self.histories.get(stock_code)
+        return symbol is not None and symbol.loaded
+
+    def covers(self, stock_code: str, days: Optional[int] = None) -> bool:
+        """최근 days일 이력을 캐시만으로 빠짐없이 제공할 수 있는지"""
+        symbol = self.histories.get(stock_code)
+        return symbol is not None and symbol.covers(days)
+
+    def get_prices(self, stock_code: str, days: Optional[int] = None,
+                   limit: Optional[int] = None) -> np.ndarray:
+        """가격 배열 (읽기 전용 뷰)"""
+        symbol = self.histories.get(stock_code)
+        if symbol is None:
+            return np.empty(0, dtype=np.float64)
+        return symbol.prices_since(days, limit)
+
+    def get_volumes(self, stock_code: str, days: Optional[int] = None,
+                    limit: Optional[int] = None) -> np.ndarray:
+        """거래량 배열 (0 제외)"""
+        symbol = self.histories.get(stock_code)
+        if symbol is None:
+            return np.empty(0, dtype=np.int64)
+        volumes = symbol.volumes_since(days, limit)
+        return volumes[volumes > 0]
+
+    def get_last_price(self, stock_code: str) -> Optional[float]:
+        symbol = self.histories.get(stock_code)
+        return symbol.last_price if symbol else None
+
+    @property
+    def has_positions(self) -> bool:
+        return self.positions_loaded_at is not None
+
+    def get_position(self, strategy_id: int, stock_code: str) -> Optional[Dict[str, Any]]:
+        return self.positions.get((strategy_id, stock_code))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'symbols': len(self.histories),
+            'loaded_symbols': sum(1 for h in self.histories.values() if h.loaded),
+            'bars': sum(h.size for h in self.histories.values()),
+            'positions': len(self.positions),
+            'refresh_count': self.refresh_count,
+            'last_refresh_ms': round(self.last_refresh_ms, 2),
+            'live_updates': self.live_updates,
+            'loaded_at': self.loaded_at.isoformat() if self.loaded_at else None,
+        }
@@ -0,0 +1,363 @@
+#file: backend/data/market_simulator.py
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TRADING_SECONDS_PER_YEAR = 252 * 6.5 * 3600  # 연간 정규장 초
+
+# 한국거래소 호가단위 (가격 구간 상한, 호가단위)
+_TICK_BANDS = np.array([2000, 5000, 20000, 50000, 200000, 500000])
+_TICK_SIZES = np.array([1, 5, 10, 50, 100, 500, 1000])
+
+
+def tick_size(prices: np.ndarray) -> np.ndarray:
+    """가격대별 호가단위 (벡터)"""
+    return _TICK_SIZES[np.searchsorted(_TICK_BANDS, prices, side='right')]
+
+
+def round_to_tick(prices: np.ndarray) -> np.ndarray:
+    ticks = tick_size(prices)
+    return np.round(prices / ticks) * ticks
+
+
+class TickBatch(NamedTuple):
+    """한 스텝에서 발생한 체결 (시간순, 열 지향)"""
+    ts: np.ndarray      # 시뮬레이션 시각 (초)
+    index: np.ndarray   # 종목 인덱스
+    price: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self):
+        return len(self.ts)
+
+
+@dataclass
+class SimOrder:
+    """시뮬레이터 주문 (가격-시간 우선, 앞선 대기물량 추적)"""
+    order_id: int
+    index: int
+    side: int             # +1 매수, -1 매도
+    price: float
+    quantity: int
+    active_at: float      # 거래소 도착 시각 (제출 시각 + 지연)
+    remaining: int = 0
+    queue_ahead: float = -1.0  # 도착 전 -1
+    filled_value: float = 0.0
+    status: str = 'pending'
+    fills: List[Tuple[float, float, int]] = field(default_factory=list)  # (시각, 가격, 수량)
+
+
+class OrderMatcher:
+    """체결 모델
+
+    - 주문은 지연(latency + 지터) 후 거래소에 도착
+    - 도착 시 최근 체결가를 넘어서는 주문은 즉시 체결 (시장성 주문)
+    - 나머지는 해당 호가에 대기하며 앞선 대기물량(queue_ahead)을 가진다
+    - 이후 같은 가격 체결량은 앞선 물량부터 소진, 더 불리한 가격 체결이 나오면 잔량 전부 체결
+    """
+
+    def __init__(self, rng: np.random.Generator, latency: float = 0.005,
+                 latency_jitter: float = 0.002, depth: float = 5000.0):
+        self.rng = rng
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.depth = depth  # 호가당 평균 대기물량 (주)
+        self.orders: Dict[int, SimOrder] = {}
+        self.by_symbol: Dict[int, List[SimOrder]] = {}
+        self._next_id = 1
+
+    def submit(self, index: int, side: int, quantity: int, price: float, now: float) -> int:
+        delay = self.latency + self.rng.exponential(self.latency_jitter) if self.latency_jitter else self.latency
+        order = SimOrder(self._next_id, index, side, float(price), int(quantity), now + delay, remaining=int(quantity))
+        self._next_id += 1
+        self.orders[order.order_id] = order
+        self.by_symbol.setdefault(index, []).append(order)
+        return order.order_id
+
+    def cancel(self, order_id: int) -> bool:
+        order = self.orders.get(order_id)
+        if order is None or order.status not in ('pending', 'partial'):
+            return False
+        order.status = 'cancelled'
+        self._detach(order)
+        return True
+
+    def _detach(self, order: SimOrder):
+        orders = self.by_symbol.get(order.index, [])
+        if order in orders:
+            orders.remove(order)
+        if not orders:
+            self.by_symbol.pop(order.index, None)
+
+    def _fill(self, order: SimOrder, ts: float, price: float, quantity: int, fills: list):
+        order.remaining -= quantity
+        order.filled_value += price * quantity
+        order.fills.append((ts, price, quantity))
+        order.status = 'filled' if order.remaining == 0 else 'partial'
+        fills.append((order, ts, price, quantity))
+
+    def match(self, batch: TickBatch, last_price: np.ndarray, now: float) -> List[Tuple[SimOrder, float, float, int]]:
+        """스텝 체결과 대기 주문 매칭 -> [(주문, 시각, 체결가, 수량)]"""
+        fills: List[Tuple[SimOrder, float, float, int]] = []
+        if not self.by_symbol:
+            return fills
+
+        has_ticks = np.isin(np.fromiter(self.by_symbol, dtype=np.int64), batch.index) if len(batch) else None
+        for k, (index, orders) in enumerate(list(self.by_symbol.items())):
+            ticks = None
+            if has_ticks is not None and has_ticks[k]:
+                mask = batch.index == index
+                ticks = (batch.ts[mask], batch.price[mask], batch.volume[mask])
+
+            for order in list(orders):
+                if order.active_at > now:
+                    continue
+                if order.queue_ahead < 0:
+                    # 거래소 도착: 시장성 여부 판단
+                    reference = last_price[index]
+                    if (order.price - reference) * order.side >= 0:
+                        self._fill(order, order.active_at, float(reference), order.remaining, fills)
+                    else:
+                        order.queue_ahead = self.rng.exponential(self.depth)
+                if order.remaining and ticks is not None:
+                    self._match_ticks(order, ticks, fills)
+                if order.remaining == 0:
+                    self._detach(order)
+        return fills
+
+    def _match_ticks(self, order: SimOrder, ticks, fills: list):
+        ts, prices, volumes = ticks
+        live = ts >= order.active_at
+        if not live.any():
+            return
+        ts, prices, volumes = ts[live], prices[live], volumes[live]
+
+        # 주문 가격보다 불리한 쪽 체결 -> 해당 호가 소진으로 간주, 잔량 전부 체결
+        through = np.flatnonzero((order.price - prices) * order.side > 0)
+        at_price = (prices == order.price)
+        stop = through[0] if len(through) else len(ts)
+
+        # 같은 가격 체결량으로 앞선 대기물량부터 소진
+        traded = np.cumsum(volumes[:stop] * at_price[:stop])
+        if len(traded) and traded[-1] > order.queue_ahead:
+            available = traded - order.queue_ahead
+            first = int(np.argmax(available > 0))
+            quantity = int(min(order.remaining, available[-1]))
+            if quantity:
+                self._fill(order, float(ts[first]), order.price, quantity, fills)
+            order.queue_ahead = 0.0
+        elif len(traded):
+            order.queue_ahead -= float(traded[-1])
+
+        if order.remaining and len(through):
+            self._fill(order, float(ts[stop]), order.price, order.remaining, fills)
+
+
+class _FeedBase:
+    """시뮬레이터/재생 피드 공통 (종목 인덱스, 최근 체결가, 주문 매칭, 녹화)"""
+
+    def __init__(self, codes: Sequence[str], prices: np.ndarray, seed: Optional[int],
+                 latency: float, latency_jitter: float, depth: float):
+        self.codes = list(codes)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.rng = np.random.default_rng(seed)
+        self.last_price = np.asarray(prices, dtype=np.float64).copy()
+        self.prev_close = self.last_price.copy()
+        self.matcher = OrderMatcher(self.rng, latency, latency_jitter, depth)
+        self.now = 0.0
+
+        self._recording: Optional[List[TickBatch]] = None
+
+        # 통계
+        self.ticks = 0
+        self.steps = 0
+        self.fill_count = 0
+
+    def _generate(self, dt: float) -> TickBatch:
+        raise NotImplementedError
+
+    def step(self, dt: float) -> Tuple[TickBatch, List[Tuple[SimOrder, float, float, int]]]:
+        """dt초 진행 -> (체결 묶음, 주문 체결 목록)"""
+        batch = self._generate(dt)
+        self.now += dt
+        if len(batch):
+            self.last_price[batch.index] = batch.price  # 시간순이므로 마지막 값이 남음
+        fills = self.matcher.match(batch, self.last_price, self.now)
+        if self._recording is not None and len(batch):
+            self._recording.append(batch)
+        self.ticks += len(batch)
+        self.steps += 1
+        self.fill_count += len(fills)
+        return batch, fills
+
+    def run(self, duration: float, dt: float = 0.01):
+        """오프라인 실행 (대기 없이 duration초 분량의 스텝 생성)"""
+        for _ in range(int(round(duration / dt))):
+            yield self.step(dt)
+
+    def submit_order(self, stock_code: str, side: str, quantity: int, price: float) -> int:
+        return self.matcher.submit(self.index[stock_code], 1 if side.lower() == 'buy' else -1,
+                                   quantity, price, self.now)
+
+    def cancel_order(self, order_id: int) -> bool:
+        return self.matcher.cancel(order_id)
+
+    # 녹화
+    def start_recording(self):
+        self._recording = []
+
+    def save_recording(self, path: str):
+        """녹화한 체결을 .npz로 저장 (ReplayFeed 입력 형식)"""
+        batches = self._recording or []
+        arrays = {name: np.concatenate([getattr(b, name) for b in batches]) if batches else np.empty(0)
+                  for name in TickBatch._fields}
+        np.savez_compressed(path, codes=np.array(self.codes), prev_close=self.prev_close, **arrays)
+        logger.info(f"체결 녹화 저장: {path} ({len(arrays['ts'])}건)")
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'symbols': len(self.codes),
+            'sim_time': round(self.now, 3),
+            'steps': self.steps,
+            'ticks': self.ticks,
+            'fills': self.fill_count,
+            'open_orders': sum(len(orders) for orders in self.matcher.by_symbol.values()),
+        }
+
+
+class MarketSimulator(_FeedBase):
+    """벡터화 시장 시뮬레이터
+
+    - 전 종목 로그가격을 스텝마다 한 번에 갱신 (시장 + 업종 팩터 모델 또는 상관행렬 Cholesky)
+    - 초당 tick_rate건 체결을 종목별 활동도 가중으로 배분 (포아송)
+    - 체결가는 호가단위로 반올림, 전일 종가 ±30% 가격제한
+    - seed가 같으면 가격 경로/체결/주문 체결이 모두 재현됨
+    """
+
+    def __init__(self, codes: Sequence[str], prices: Sequence[float],
+                 volatility=0.3, market_correlation: float = 0.3,
+                 sectors: Optional[Sequence[int]] = None, sector_correlation: float = 0.2,
+                 correlation: Optional[np.ndarray] = None, tick_rate: float = 1000.0,
+                 mean_volume: float = 300.0, seed: Optional[int] = None,
+                 latency: float = 0.005, latency_jitter: float = 0.002, depth: float = 5000.0):
+        super().__init__(codes, np.asarray(prices, dtype=np.float64), seed, latency, latency_jitter, depth)
+        n = len(self.codes)
+        self.log_price = np.log(self.last_price)
+        self.tick_rate = tick_rate
+        self.mean_volume = mean_volume
+
+        # 초당 분산 (연 변동성 -> 초 단위)
+        sigma = np.broadcast_to(np.asarray(volatility, dtype=np.float64), (n,))
+        self.var_per_sec = sigma ** 2 / TRADING_SECONDS_PER_YEAR
+
+        # 상관 구조: 명시 행렬이면 Cholesky, 아니면 팩터 적재량 (O(N·K))
+        self.cholesky = np.linalg.cholesky(correlation) if correlation is not None else None
+        self.sectors = np.asarray(sectors if sectors is not None else np.zeros(n), dtype=np.intp)
+        self.n_sectors = int(self.sectors.max()) + 1 if n else 0
+        self.market_loading = np.sqrt(market_correlation)
+        self.sector_loading = np.sqrt(sector_correlation) if sectors is not None else 0.0
+        self.idio_loading = np.sqrt(max(1.0 - market_correlation - self.sector_loading ** 2, 0.0))
+
+        # 종목별 체결 빈도 (로그정규 활동도)
+        activity = self.rng.lognormal(0.0, 1.0, n)
+        self.activity = activity / activity.sum()
+
+    @classmethod
+    def random_universe(cls, n_symbols: int, seed: Optional[int] = None, n_sectors: int = 10, **kwargs):
+        """부하 테스트용 가상 종목 n개 (코드 9xxxxx)"""
+        rng = np.random.default_rng(seed)
+        codes = [f"9{i:05d}" for i in range(n_symbols)]
+        prices = round_to_tick(np.exp(rng.uniform(np.log(2000), np.log(500000), n_symbols)))
+        sectors = rng.integers(0, n_sectors, n_symbols)
+        volatility = rng.uniform(0.15, 0.6, n_symbols)
+        return cls(codes, prices, volatility=volatility, sectors=sectors, seed=seed, **kwargs)
+
+    def _shocks(self) -> np.ndarray:
+        """전 종목 상관 표준정규 충격 한 번에 생성"""
+        n = len(self.codes)
+        if self.cholesky is not None:
+            return self.cholesky @ self.rng.standard_normal(n)
+        z = self.idio_loading * self.rng.standard_normal(n)
+        z += self.market_loading * self.rng.standard_normal()
+        if self.sector_loading:
+            z += self.sector_loading * self.rng.standard_normal(self.n_sectors)[self.sectors]
+        return z
+
+    def _generate(self, dt: float) -> TickBatch:
+        # 1. 잠재 가격 경로 (기하 브라운 운동)
+        var = self.var_per_sec * dt
+        self.log_price += np.sqrt(var) * self._shocks() - 0.5 * var
+        np.clip(self.log_price, np.log(self.prev_close * 0.7), np.log(self.prev_close * 1.3), out=self.log_price)
+
+        # 2. 이번 스텝 체결 수와 체결 종목
+        count = self.rng.poisson(self.tick_rate * dt)
+        if count == 0:
+            return TickBatch(np.empty(0), np.empty(0, dtype=np.intp), np.empty(0), np.empty(0, dtype=np.int64))
+        index = self.rng.choice(len(self.codes), size=count, p=self.activity)
+        ts = self.now + np.sort(self.rng.uniform(0.0, dt, count))
+        price = round_to_tick(np.exp(self.log_price[index]))
+        volume = np.maximum(self.rng.geometric(1.0 / self.mean_volume, count), 1)
+        return TickBatch(ts, index, price, volume.astype(np.int64))
+
+
+class ReplayFeed(_FeedBase):
+    """녹화 파일 재생 피드 (.npz: save_recording 형식 / .csv: time, code, price, volume)"""
+
+    def __init__(self, path: str, seed: Optional[int] = None, latency: float = 0.005,
+                 latency_jitter: float = 0.002, depth: float = 5000.0):
+        path = Path(path)
+        if path.suffix == '.npz':
+            data = np.load(path)
+            codes = [str(code) for code in data['codes']]
+            ts, index = data['ts'], data['index'].astype(np.intp)
+            price, volume = data['price'], data['volume'].astype(np.int64)
+            prev_close = data['prev_close']
+        else:
+            import pandas as pd
+            frame = pd.read_csv(path, dtype={'code': str}).sort_values('time', kind='stable')
+            codes_index, uniques = pd.factorize(frame['code'])
+            codes = list(uniques)
+            ts = frame['time'].to_numpy(np.float64)
+            ts = ts - ts[0] if len(ts) else ts
+            index = codes_index.astype(np.intp)
+            price = frame['price'].to_numpy(np.float64)
+            volume = frame['volume'].to_numpy(np.int64)
+            # 종목별 첫 체결가를 기준가로 사용
+            first = np.unique(index, return_index=True)[1]
+            prev_close = price[first]
+
+        super().__init__(codes, prev_close, seed, latency, latency_jitter, depth)
+        self.data = TickBatch(ts, index, price, volume)
+        self._cursor = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._cursor >= len(self.data)
+
+    def _generate(self, dt: float) -> TickBatch:
+        end = int(np.searchsorted(self.data.ts, self.now + dt, side='left'))
+        start, self._cursor = self._cursor, end
+        return TickBatch(*(column[start:end] for column in self.data))
+
+
+def benchmark(n_symbols: int = 3000, tick_rate: float = 5000.0, duration: float = 60.0,
+              dt: float = 0.01, seed: int = 42) -> Dict[str, float]:
+    """오프라인 처리량 측정 (시뮬레이션 duration초를 대기 없이 생성)"""
+    simulator = MarketSimulator.random_universe(n_symbols, seed=seed, tick_rate=tick_rate)
+    start = time.perf_counter()
+    for _ in simulator.run(duration, dt):
+        pass
+    elapsed = time.perf_counter() - start
+    return {**simulator.get_stats(), 'wall_sec': round(elapsed, 3),
+            'ticks_per_sec': round(simulator.ticks / elapsed, 1)}
+
+
+if __name__ == "__main__":
+    print(benchmark())
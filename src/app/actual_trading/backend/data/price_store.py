@@ -0,0 +1,353 @@
+# file: backend/data/price_store.py
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+US_PER_SEC = 1_000_000
+EPOCH = datetime(1970, 1, 1)
+
+# 롤업 해상도 -> 버킷 크기 (마이크로초)
+RESOLUTIONS = {
+    '1m': 60 * US_PER_SEC,
+    '5m': 300 * US_PER_SEC,
+    '1d': 86400 * US_PER_SEC,
+}
+PARTITIONED = ('ticks', '1m', '5m')  # 월 파티션 대상 (일봉은 단일 테이블)
+
+_PARTITION_RE = re.compile(r'^price_(ticks|1m|5m)_(\d{6})$')
+
+
+def to_us(timestamp: datetime) -> int:
+    """naive 로컬 시각 -> 마이크로초 정수 (시간대 변환 없이 벽시계 기준)"""
+    delta = timestamp - EPOCH
+    return (delta.days * 86400 + delta.seconds) * US_PER_SEC + delta.microseconds
+
+
+def from_us(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+def month_key(timestamp: datetime) -> str:
+    return f"{timestamp.year:04d}{timestamp.month:02d}"
+
+
+def _months_between(start: datetime, end: datetime) -> List[str]:
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year:04d}{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+_TICK_DDL = '''
+CREATE TABLE IF NOT EXISTS {table} (
+    stock_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    price REAL NOT NULL,
+    volume INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (stock_id, ts)
+) WITHOUT ROWID
+'''
+
+_BAR_DDL = '''
+CREATE TABLE IF NOT EXISTS {table} (
+    stock_id INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    open REAL, high REAL, low REAL, close REAL,
+    volume INTEGER NOT NULL DEFAULT 0,
+    tick_count INTEGER NOT NULL DEFAULT 0,
+    first_ts INTEGER, last_ts INTEGER,
+    PRIMARY KEY (stock_id, bucket)
+) WITHOUT ROWID
+'''
+
+# 같은 (종목, 마이크로초) 틱은 하나로 합침
+_TICK_UPSERT = '''
+INSERT INTO {table} (stock_id, ts, price, volume) VALUES (?, ?, ?, ?)
+ON CONFLICT(stock_id, ts) DO UPDATE SET
+    price = excluded.price,
+    volume = volume + excluded.volume
+'''
+
+# 봉 병합: 시가는 더 이른 틱, 종가는 더 늦은 틱 기준
+_BAR_UPSERT = '''
+INSERT INTO {table} (stock_id, bucket, open, high, low, close, volume, tick_count, first_ts, last_ts)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(stock_id, bucket) DO UPDATE SET
+    open = CASE WHEN excluded.first_ts < first_ts THEN excluded.open ELSE open END,
+    high = max(high, excluded.high),
+    low = min(low, excluded.low),
+    close = CASE WHEN excluded.last_ts >= last_ts THEN excluded.close ELSE close END,
+    volume = volume + excluded.volume,
+    tick_count = tick_count + excluded.tick_count,
+    first_ts = min(first_ts, excluded.first_ts),
+    last_ts = max(last_ts, excluded.last_ts)
+'''
+
+
+class PriceStore:
+    """시세 이력 저장소 (월 파티션 + 롤업)
+
+    - 틱은 price_ticks_YYYYMM 테이블에 (stock_id, ts) 클러스터드 키(WITHOUT ROWID)로 저장
+    - 1분/5분봉은 price_1m_YYYYMM / price_5m_YYYYMM, 일봉은 price_1d 에
+      삽입 시점에 upsert로 바로 반영 (조회 시 집계 없음)
+    - 조회는 기간에 걸친 월 파티션만 골라 UNION ALL
+    - 보존 기간 정리는 DELETE 스캔 대신 월 파티션 DROP
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or Path("data") / "price_history.db")
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        for pragma in ("PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL",
+                       "PRAGMA temp_store=MEMORY", "PRAGMA cache_size=-16000"):
+            self._conn.execute(pragma)
+        self._conn.execute(_BAR_DDL.format(table='price_1d'))
+        self._partitions = self._load_partitions()
+
+        # 통계
+        self.ticks_written = 0
+        self.bars_written = 0
+        self.last_insert_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # 파티션 라우팅
+    # ------------------------------------------------------------------
+    def _load_partitions(self) -> Dict[str, set]:
+        partitions = {kind: set() for kind in PARTITIONED}
+        rows = self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        for (name,) in rows:
+            match = _PARTITION_RE.match(name)
+            if match:
+                partitions[match.group(1)].add(match.group(2))
+        return partitions
+
+    @staticmethod
+    def table_name(kind: str, month: Optional[str] = None) -> str:
+        return 'price_1d' if kind == '1d' else f"price_{kind}_{month}"
+
+    def _ensure_partition(self, kind: str, month: str) -> str:
+        table = self.table_name(kind, month)
+        if month not in self._partitions[kind]:
+            ddl = _TICK_DDL if kind == 'ticks' else _BAR_DDL
+            self._conn.execute(ddl.format(table=table))
+            self._partitions[kind].add(month)
+        return table
+
+    def partitions(self, kind: str = 'ticks') -> List[str]:
+        return sorted(self._partitions[kind])
+
+    def _tables_for(self, kind: str, start: datetime, end: datetime) -> List[str]:
+        if kind == '1d':
+            return ['price_1d']
+        existing = self._partitions[kind]
+        return [self.table_name(kind, m) for m in _months_between(start, end) if m in existing]
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def insert_ticks(self, rows: Iterable[Tuple[int, datetime, float, int]]) -> int:
+        """틱 일괄 저장 + 1분/5분/일봉 롤업 갱신 (트랜잭션 하나)
+
+        rows: [(stock_id, timestamp, price, volume)]
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        start = time.perf_counter()
+
+        stock_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        ts = np.fromiter((to_us(r[1]) for r in rows), dtype=np.int64, count=len(rows))
+        prices = np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+        volumes = np.fromiter((r[3] or 0 for r in rows), dtype=np.int64, count=len(rows))
+        months = [month_key(r[1]) for r in rows]
+
+        with self._lock, self._conn:
+            # 1. 월 파티션별 틱
+            by_month: Dict[str, List[int]] = {}
+            for i, month in enumerate(months):
+                by_month.setdefault(month, []).append(i)
+            for month, idx in by_month.items():
+                table = self._ensure_partition('ticks', month)
+                self._conn.executemany(_TICK_UPSERT.format(table=table), zip(
+                    stock_ids[idx].tolist(), ts[idx].tolist(), prices[idx].tolist(), volumes[idx].tolist()))
+
+            # 2. 롤업: 배치 안에서 (종목, 버킷)별로 먼저 집계한 뒤 upsert
+            bars = 0
+            for resolution, size in RESOLUTIONS.items():
+                for table, params in self._rollup(resolution, size, stock_ids, ts, prices, volumes):
+                    self._conn.executemany(_BAR_UPSERT.format(table=table), params)
+                    bars += len(params)
+
+        self.ticks_written += len(rows)
+        self.bars_written += bars
+        self.last_insert_ms = (time.perf_counter() - start) * 1000
+        return len(rows)
+
+    def _rollup(self, resolution: str, size: int, stock_ids: np.ndarray, ts: np.ndarray,
+                prices: np.ndarray, volumes: np.ndarray):
+        """배치를 (종목, 버킷)별 OHLCV로 집계 -> [(테이블, 파라미터 목록)]"""
+        buckets = ts // size * size
+        order = np.lexsort((ts, buckets, stock_ids))
+        sid, bkt = stock_ids[order], buckets[order]
+        starts = np.flatnonzero(np.r_[True, (sid[1:] != sid[:-1]) | (bkt[1:] != bkt[:-1])])
+        ends = np.r_[starts[1:], len(order)] - 1
+        p, t = prices[order], ts[order]
+
+        columns = (
+            sid[starts], bkt[starts],
+            p[starts], np.maximum.reduceat(p, starts), np.minimum.reduceat(p, starts), p[ends],
+            np.add.reduceat(volumes[order], starts), np.diff(np.r_[starts, len(order)]),
+            t[starts], t[ends],
+        )
+        params = list(zip(*(column.tolist() for column in columns)))
+        if resolution == '1d':
+            return [('price_1d', params)]
+
+        grouped: Dict[str, list] = {}
+        for row in params:
+            month = month_key(from_us(row[1]))
+            grouped.setdefault(month, []).append(row)
+        return [(self._ensure_partition(resolution, month), rows) for month, rows in grouped.items()]
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get_ticks(self, stock_id: int, start: datetime, end: Optional[datetime] = None) -> List[Tuple[datetime, float, int]]:
+        """기간 틱 [(시각, 가격, 거래량)] - 해당 월 파티션만 조회"""
+        end = end or datetime.now()
+        tables = self._tables_for('ticks', start, end)
+        if not tables:
+            return []
+        sql = " UNION ALL ".join(
+            f"SELECT ts, price, volume FROM {table} WHERE stock_id = ? AND ts BETWEEN ? AND ?" for table in tables
+        ) + " ORDER BY ts"
+        params = [stock_id, to_us(start), to_us(end)] * len(tables)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [(from_us(ts), price, volume) for ts, price, volume in rows]
+
+    def get_bars(self, stock_id: int, resolution: str = '1m', start: Optional[datetime] = None,
+                 end: Optional[datetime] = None, limit: Optional[int] = None) -> List[Dict]:
+        """롤업 봉 조회 (시간순). limit만 주면 최근 limit개"""
+        end = end or datetime.now()
+        if start is None:
+            # 최근 limit개: 최신 파티션부터 필요한 만큼만 거슬러 올라감
+            return self._latest_bars(stock_id, resolution, end, limit or 100)
+
+        tables = self._tables_for(resolution, start, end)
+        if not tables:
+            return []
+        sql = " UNION ALL ".join(
+            f"SELECT bucket, open, high, low, close, volume, tick_count FROM {table} "
+            f"WHERE stock_id = ? AND bucket BETWEEN ? AND ?" for table in tables
+        ) + " ORDER BY bucket"
+        params = [stock_id, to_us(start), to_us(end)] * len(tables)
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._bar_dict(row) for row in rows]
+
+    def _latest_bars(self, stock_id: int, resolution: str, end: datetime, limit: int) -> List[Dict]:
+        if resolution == '1d':
+            tables = ['price_1d']
+        else:
+            tables = [self.table_name(resolution, m) for m in sorted(self._partitions[resolution], reverse=True)
+                      if m <= month_key(end)]
+        rows: List[tuple] = []
+        with self._lock:
+            for table in tables:
+                rows.extend(self._conn.execute(
+                    f"SELECT bucket, open, high, low, close, volume, tick_count FROM {table} "
+                    f"WHERE stock_id = ? AND bucket <= ? ORDER BY bucket DESC LIMIT ?",
+                    (stock_id, to_us(end), limit - len(rows))).fetchall())
+                if len(rows) >= limit:
+                    break
+        return [self._bar_dict(row) for row in reversed(rows)]
+
+    @staticmethod
+    def _bar_dict(row: tuple) -> Dict:
+        bucket, open_, high, low, close, volume, tick_count = row
+        return {'timestamp': from_us(bucket), 'open': open_, 'high': high, 'low': low,
+                'close': close, 'volume': volume, 'tick_count': tick_count}
+
+    def latest_closes(self, stock_ids: Sequence[int], resolution: str = '1m',
+                      limit: int = 500) -> Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """종목별 최근 limit개 봉 (epoch 초 timestamps, 종가, 거래량) - 시세 캐시 적재용"""
+        result = {}
+        for stock_id in stock_ids:
+            bars = self._latest_bars(stock_id, resolution, datetime.now(), limit)
+            if bars:
+                result[stock_id] = (
+                    np.array([bar['timestamp'].timestamp() for bar in bars], dtype=np.float64),
+                    np.array([bar['close'] for bar in bars], dtype=np.float64),
+                    np.array([bar['volume'] for bar in bars], dtype=np.int64),
+                )
+        return result
+
+    # ------------------------------------------------------------------
+    # 보존 기간 / 이관
+    # ------------------------------------------------------------------
+    def drop_before(self, cutoff: datetime, kinds: Sequence[str] = PARTITIONED) -> List[str]:
+        """cutoff 이전 달의 파티션 통째로 삭제 (DELETE 스캔 없음) -> 삭제한 테이블 목록"""
+        cutoff_month = month_key(cutoff)
+        dropped = []
+        with self._lock, self._conn:
+            for kind in kinds:
+                for month in sorted(self._partitions[kind]):
+                    if month >= cutoff_month:
+                        break
+                    table = self.table_name(kind, month)
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    self._partitions[kind].discard(month)
+                    dropped.append(table)
+        if dropped:
+            logger.info(f"시세 파티션 삭제: {', '.join(dropped)}")
+        return dropped
+
+    def migrate_from(self, legacy_db_path: str, batch_size: int = 50000) -> int:
+        """기존 단일 price_history 테이블을 파티션/롤업으로 이관"""
+        legacy = sqlite3.connect(legacy_db_path)
+        total = 0
+        try:
+            cursor = legacy.execute(
+                "SELECT stock_id, timestamp, price, volume FROM price_history ORDER BY id"
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                total += self.insert_ticks(
+                    (stock_id, datetime.fromisoformat(str(timestamp)), price or 0.0, volume or 0)
+                    for stock_id, timestamp, price, volume in rows
+                )
+        finally:
+            legacy.close()
+        logger.info(f"price_history 이관 완료: {total}건")
+        return total
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict:
+        return {
+            'db_path': self.db_path,
+            'partitions': {kind: self.partitions(kind) for kind in PARTITIONED},
+            'ticks_written': self.ticks_written,
+            'bars_written': self.bars_written,
+            'last_insert_ms': round(self.last_insert_ms, 2),
+        }
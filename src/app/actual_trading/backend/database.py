@@ -12,6 +12,30 @@ logger = logging.getLogger(__name__)
 DATABASE_DIR = Path("data")
 DATABASE_DIR.mkdir(exist_ok=True)
 DATABASE_FILE = DATABASE_DIR / "quantrade.db"
+PRICE_STORE_FILE = DATABASE_DIR / "price_history.db"  # 시세 이력 (월 파티션)
+
+_price_store = None
+
+def get_price_store():
+    """시세 이력 저장소 (프로세스당 하나)"""
+    global _price_store
+    if _price_store is None:
+        from data.price_store import PriceStore
+        _price_store = PriceStore(PRICE_STORE_FILE)
+    return _price_store
+
+def get_stock_ids(stock_codes=None):
+    """종목코드 -> stocks.id (시세 저장소 키), stock_codes가 없으면 전체"""
+    with get_db_session() as conn:
+        if stock_codes is None:
+            rows = conn.execute("SELECT code, id FROM stocks").fetchall()
+        else:
+            codes = list(stock_codes)
+            if not codes:
+                return {}
+            placeholders = ",".join("?" * len(codes))
+            rows = conn.execute(f"SELECT code, id FROM stocks WHERE code IN ({placeholders})", codes).fetchall()
+    return {code: stock_id for code, stock_id in rows}
 
 def init_db():
     """데이터베이스 초기화 - 테이블 생성"""
@@ -63,6 +87,23 @@ def init_db():
                 )
             ''')
             
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS positions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    strategy_id INTEGER,
+                    stock_id INTEGER,
+                    quantity INTEGER,
+                    avg_price REAL,
+                    current_price REAL,
+                    unrealized_pnl REAL DEFAULT 0,
+                    realized_pnl REAL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (strategy_id) REFERENCES strategies (id),
+                    FOREIGN KEY (stock_id) REFERENCES stocks (id)
+                )
+            ''')
+            
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS portfolio (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -182,8 +223,21 @@ class DatabaseManager:
                 cursor.execute('''
                     DELETE FROM portfolio WHERE timestamp < datetime('now', '-{} days')
                 '''.format(days))
+                
+                # 레거시 단일 틱 테이블 (이관 전 데이터)도 보존 기간으로 제한
+                legacy = cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'price_history'"
+                ).fetchone()
+                if legacy:
+                    cursor.execute('''
+                        DELETE FROM price_history WHERE timestamp < datetime('now', '-{} days')
+                    '''.format(days))
                 conn.commit()
-                logger.info(f"{days}일 이전 데이터 정리 완료")
+
+            # 시세 이력은 DELETE 없이 보존 기간이 지난 월 파티션 삭제
+            from datetime import datetime, timedelta
+            get_price_store().drop_before(datetime.now() - timedelta(days=days))
+            logger.info(f"{days}일 이전 데이터 정리 완료")
         except Exception as e:
             logger.error(f"데이터 정리 실패: {e}")
 
@@ -82,7 +82,7 @@ async def lifespan(app: FastAPI):
         if initial_mode == "DEMO" or kiwoom_client is None:
             try:
                 from data.kiwoom_mock import KiwoomClient
-                kiwoom_client = KiwoomClient()
+                kiwoom_client = KiwoomClient.from_settings()
                 await kiwoom_client.connect()
             except Exception as e:
                 logger.error(f"Mock 클라이언트 초기화 실패: {e}")
@@ -229,7 +229,8 @@ async def get_trading_status():
         "active_strategies": len(trading_engine.get_active_strategies()),
         "current_positions": len(trading_engine.get_current_positions()),
         "total_orders_today": trading_engine.get_daily_order_count(),
-        "last_update": trading_engine.last_update.isoformat() if trading_engine.last_update else None
+        "last_update": trading_engine.last_update.isoformat() if trading_engine.last_update else None,
+        "engine": trading_engine.get_engine_stats()
     }
 
 # 개발용 편의 엔드포인트
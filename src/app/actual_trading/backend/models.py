@@ -1,6 +1,6 @@
 # file: backend/models.py
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -116,7 +116,12 @@ class Portfolio(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
 
 class PriceHistory(Base):
+    """레거시 단일 틱 테이블 - 신규 시세 이력은 data.price_store.PriceStore (월 파티션 + 롤업)"""
     __tablename__ = "price_history"
+    __table_args__ = (
+        # 종목별 최근 구간 조회용 복합 인덱스
+        Index("ix_price_history_stock_timestamp", "stock_id", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     stock_id = Column(Integer, ForeignKey("stocks.id"))
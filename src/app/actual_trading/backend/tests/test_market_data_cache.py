@@ -0,0 +1,62 @@
+# tests/test_market_data_cache.py - 시세/포지션 캐시 갱신 테스트 (임시 sqlite DB)
+import asyncio
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture
+def cache_env(tmp_path, monkeypatch):
+    """임시 디렉토리의 DB/시세 저장소로 database 모듈을 돌림"""
+    monkeypatch.chdir(tmp_path)  # database 모듈이 import 시 ./data 를 만듦
+    import database
+    from data.market_data import MarketDataCache
+
+    monkeypatch.setattr(database, "DATABASE_FILE", tmp_path / "quantrade.db")
+    monkeypatch.setattr(database, "PRICE_STORE_FILE", tmp_path / "price_history.db")
+    monkeypatch.setattr(database, "_price_store", None)
+    database.init_db()
+    return database, MarketDataCache
+
+
+def add_position(db_file, strategy_id: int, code: str, quantity: int, avg_price: float):
+    with sqlite3.connect(db_file) as conn:
+        stock_id = conn.execute("SELECT id FROM stocks WHERE code = ?", (code,)).fetchone()[0]
+        conn.execute(
+            "INSERT INTO positions (strategy_id, stock_id, quantity, avg_price, current_price, unrealized_pnl) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (strategy_id, stock_id, quantity, avg_price, avg_price * 1.1, avg_price * 0.1 * quantity)
+        )
+
+
+def test_refresh_loads_histories_and_positions(cache_env):
+    database, MarketDataCache = cache_env
+    add_position(database.DATABASE_FILE, 1, "005930", 10, 70000.0)
+    add_position(database.DATABASE_FILE, 2, "000660", 5, 120000.0)
+    add_position(database.DATABASE_FILE, 2, "035420", 0, 190000.0)  # 청산된 포지션
+
+    stock_id = database.get_stock_ids(["005930"])["005930"]
+    now = datetime.now().replace(second=0, microsecond=0)
+    database.get_price_store().insert_ticks(
+        [(stock_id, now - timedelta(minutes=i), 71000.0 + i, 10) for i in range(3)]
+    )
+
+    cache = MarketDataCache()
+    asyncio.run(cache.refresh(["005930", "000660"]))
+
+    assert cache.refresh_count == 1
+    assert cache.positions_loaded_at is not None
+    assert cache.positions == {
+        (1, "005930"): {'quantity': 10, 'avg_price': 70000.0,
+                        'current_price': pytest.approx(77000.0), 'unrealized_pnl': pytest.approx(70000.0)},
+        (2, "000660"): {'quantity': 5, 'avg_price': 120000.0,
+                        'current_price': pytest.approx(132000.0), 'unrealized_pnl': pytest.approx(60000.0)},
+    }
+    assert list(cache.histories["005930"].prices_since()) == [71002.0, 71001.0, 71000.0]
+    assert cache.histories["000660"].covers()
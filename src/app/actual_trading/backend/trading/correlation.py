@@ -0,0 +1,179 @@
+# file: backend/trading/correlation.py
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def align_returns(series: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Tuple[List[str], np.ndarray]:
+    """종목별 (timestamps, prices)를 공통 시각축에 맞춘 로그 수익률 행렬로 변환
+
+    시각축은 전체 종목 시각의 합집합이며, 빈 시각은 직전 가격으로 채운다.
+    첫 체결 이전 구간과 가격이 없는 구간의 수익률은 0으로 둔다.
+
+    Returns:
+        (종목코드 목록, T x N 수익률 행렬)
+    """
+    codes = [code for code, (ts, prices) in series.items() if len(ts) >= 2]
+    if not codes:
+        return [], np.empty((0, 0))
+
+    timeline = np.unique(np.concatenate([series[code][0] for code in codes]))
+    T, N = len(timeline), len(codes)
+    prices = np.full((T, N), np.nan)
+    for j, code in enumerate(codes):
+        ts, px = series[code]
+        prices[np.searchsorted(timeline, ts), j] = px
+
+    # 직전 가격으로 채우기 (열별 마지막 유효 인덱스 누적 최대값)
+    valid = ~np.isnan(prices) & (prices > 0)
+    idx = np.where(valid, np.arange(T)[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    filled = prices[idx, np.arange(N)]
+    filled[~np.maximum.accumulate(valid, axis=0)] = np.nan
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = np.diff(np.log(filled), axis=0)
+    returns[~np.isfinite(returns)] = 0.0
+    return codes, returns
+
+
+class CorrelationEngine:
+    """종목 수익률 상관행렬 엔진
+
+    - 전체 상관행렬을 행렬곱 한 번(BLAS)으로 계산
+    - ewma_lambda를 주면 지수가중 공분산, 새 수익률 행마다 rank-1 갱신
+    - 종목코드 -> 정수 인덱스로 조회 (문자열 키 생성 없음)
+    """
+
+    def __init__(self, ewma_lambda: Optional[float] = None):
+        self.ewma_lambda = ewma_lambda
+        self.codes: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.mean = np.empty(0)
+        self.cov = np.empty((0, 0))
+        self.count = 0  # 반영된 수익률 행 수
+        self._corr: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def fit(self, codes: Sequence[str], returns: np.ndarray):
+        """수익률 행렬(T x N) 전체로 평균/공분산 재계산"""
+        self.codes = list(codes)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.count = returns.shape[0]
+        if self.count == 0:
+            self.mean = np.zeros(len(self.codes))
+            self.cov = np.zeros((len(self.codes), len(self.codes)))
+            self._corr = None
+            return
+
+        if self.ewma_lambda:
+            weights = self.ewma_lambda ** np.arange(self.count - 1, -1, -1, dtype=np.float64)
+            weights /= weights.sum()
+            self.mean = weights @ returns
+            centered = (returns - self.mean) * np.sqrt(weights)[:, None]
+            self.cov = centered.T @ centered
+        else:
+            self.mean = returns.mean(axis=0)
+            centered = returns - self.mean
+            self.cov = centered.T @ centered / max(self.count - 1, 1)
+        self._corr = None
+
+    def fit_prices(self, series: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        """종목별 (timestamps, prices)로 바로 계산"""
+        codes, returns = align_returns(series)
+        self.fit(codes, returns)
+
+    def update(self, returns_row: np.ndarray):
+        """새 수익률 한 행(종목 순서는 self.codes) rank-1 갱신"""
+        r = np.asarray(returns_row, dtype=np.float64)
+        if self.ewma_lambda:
+            lam = self.ewma_lambda
+            d = r - self.mean
+            self.mean += (1 - lam) * d
+            self.cov *= lam
+            self.cov += lam * (1 - lam) * np.outer(d, d)
+        else:
+            n = self.count + 1
+            d = r - self.mean
+            self.mean += d / n
+            if n > 1:
+                # 표본공분산 점화식: C_n = ((n-2) C_{n-1} + d (r - mean_n)^T) / (n-1)
+                self.cov *= (n - 2) / (n - 1)
+                self.cov += np.outer(d, r - self.mean) / (n - 1)
+        self.count += 1
+        self._corr = None
+
+    @property
+    def corr(self) -> np.ndarray:
+        """상관행렬 (공분산에서 지연 계산)"""
+        if self._corr is None:
+            std = np.sqrt(np.clip(np.diag(self.cov), 0, None))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                corr = self.cov / np.outer(std, std)
+            corr[~np.isfinite(corr)] = 0.0
+            np.fill_diagonal(corr, 1.0)
+            self._corr = corr
+        return self._corr
+
+    def indices(self, codes: Sequence[str]) -> np.ndarray:
+        """종목코드 목록 -> 인덱스 배열 (모르는 종목은 제외)"""
+        return np.fromiter((self.index[c] for c in codes if c in self.index), dtype=np.intp)
+
+    def get(self, code1: str, code2: str) -> float:
+        i, j = self.index.get(code1), self.index.get(code2)
+        if i is None or j is None:
+            return 0.0
+        return float(self.corr[i, j])
+
+    def max_correlation_with(self, code: str, held: Sequence[str]) -> Tuple[Optional[str], float]:
+        """보유 종목 중 code와 상관계수 절댓값이 가장 큰 종목"""
+        i = self.index.get(code)
+        held_idx = self.indices([c for c in held if c != code])
+        if i is None or len(held_idx) == 0:
+            return None, 0.0
+        row = self.corr[i, held_idx]
+        k = int(np.argmax(np.abs(row)))
+        return self.codes[held_idx[k]], float(row[k])
+
+    def high_correlation_pairs(self, codes: Sequence[str], threshold: float) -> List[Tuple[str, str, float]]:
+        """상관계수 절댓값이 threshold를 넘는 종목 쌍 (상삼각만)"""
+        idx = self.indices(codes)
+        sub = self.corr[np.ix_(idx, idx)]
+        rows, cols = np.nonzero(np.triu(np.abs(sub) > threshold, k=1))
+        return [(self.codes[idx[r]], self.codes[idx[c]], float(sub[r, c])) for r, c in zip(rows, cols)]
+
+    def portfolio_concentration(self, weights: Dict[str, float]) -> Dict[str, float]:
+        """비중 벡터 기반 포트폴리오 집중도 지표
+
+        - volatility: 포트폴리오 수익률 표준편차 sqrt(w' C w)
+        - diversification_ratio: 개별 변동성 가중합 / 포트폴리오 변동성 (1에 가까울수록 분산 효과 없음)
+        - avg_correlation: 비중 가중 평균 상관계수 (대각 제외)
+        - effective_n: 1 / sum(w^2)
+        """
+        codes = [c for c in weights if c in self.index]
+        if not codes:
+            return {'volatility': 0.0, 'diversification_ratio': 1.0,
+                    'avg_correlation': 0.0, 'effective_n': 0.0}
+
+        idx = self.indices(codes)
+        w = np.array([weights[c] for c in codes], dtype=np.float64)
+        cov = self.cov[np.ix_(idx, idx)]
+        corr = self.corr[np.ix_(idx, idx)]
+        std = np.sqrt(np.clip(np.diag(cov), 0, None))
+
+        port_vol = float(np.sqrt(max(w @ cov @ w, 0.0)))
+        ww = np.outer(w, w)
+        np.fill_diagonal(ww, 0.0)
+        off_diag = ww.sum()
+        return {
+            'volatility': port_vol,
+            'diversification_ratio': float((np.abs(w) @ std) / port_vol) if port_vol > 0 else 1.0,
+            'avg_correlation': float((ww * corr).sum() / off_diag) if off_diag > 0 else 0.0,
+            'effective_n': float(1.0 / (w @ w)) if w.any() else 0.0,
+        }
@@ -0,0 +1,258 @@
+# file: backend/trading/event_engine.py
+
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from models import TradingSignal
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """지연시간 히스토그램 (2의 거듭제곱 마이크로초 버킷, 기록 O(1))"""
+
+    def __init__(self, buckets: int = 32):
+        self.counts = [0] * buckets  # i번 버킷: [2^(i-1), 2^i) us
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        us = seconds * 1e6
+        index = math.frexp(us)[1] if us >= 1 else 0
+        self.counts[min(max(index, 0), len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += us
+        if us > self.max:
+            self.max = us
+
+    def percentile(self, q: float) -> float:
+        """q 분위수 (버킷 상한값, 마이크로초)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(float(2 ** index), self.max)
+        return self.max
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_us': round(self.total / self.count, 1) if self.count else 0.0,
+            'p50_us': round(self.percentile(0.5), 1),
+            'p99_us': round(self.percentile(0.99), 1),
+            'max_us': round(self.max, 1),
+        }
+
+
+class BarBuilder:
+    """틱을 받아 종목별 현재 봉(OHLCV) 유지"""
+
+    __slots__ = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, price: float, volume: int):
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+
+    def update(self, price: float, volume: int):
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+
+
+class EventScheduler:
+    """이벤트 기반 전략 실행기
+
+    - 가격 이벤트: 해당 종목을 구독한 전략만 실행
+    - 큐에 쌓인 이벤트는 한 번에 꺼내 종목별 최신 시세로 병합하고,
+      실행할 전략을 모아 동시에 평가 (배치)
+    - 타이머 이벤트: bar_interval 경계마다 봉 마감 -> 시세 캐시/봉 핸들러 반영,
+      refresh_interval마다 시세/포지션 캐시 일괄 갱신
+    - 단계별 지연시간 히스토그램: 수신 -> 꺼냄(queue), 꺼냄 -> 신호(signal),
+      신호 -> 주문(order), 수신 -> 주문(total)
+    """
+
+    def __init__(self, strategy_manager, on_signals: Optional[Callable[[List[TradingSignal]], Awaitable[int]]] = None,
+                 bar_interval: float = 60.0, refresh_interval: float = 300.0, max_batch: int = 1000):
+        self.strategy_manager = strategy_manager
+        self.on_signals = on_signals  # 신호 목록 -> 전송한 주문 수
+        self.bar_interval = bar_interval
+        self.refresh_interval = refresh_interval
+        self.max_batch = max_batch
+
+        self.subscriptions: Dict[str, Set[int]] = {}  # 종목코드 -> 전략 ID
+        self.quotes: Dict[str, Dict[str, Any]] = {}   # 종목별 최신 시세
+        self.bars: Dict[str, BarBuilder] = {}
+        self.bar_handlers: List[Callable[[str, Dict[str, Any]], None]] = []
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self.running = False
+
+        self.latency = {stage: LatencyHistogram() for stage in ('queue', 'signal', 'order', 'total')}
+
+        # 통계
+        self.events = 0
+        self.batches = 0
+        self.evaluations = 0
+        self.signals = 0
+        self.orders = 0
+        self.bar_closes = 0
+        self.last_event: Optional[datetime] = None
+
+    def rebuild_subscriptions(self):
+        """전략별 대상 종목으로 구독표 재구성 (전략 추가/제거 후 호출)"""
+        subscriptions: Dict[str, Set[int]] = {}
+        for strategy_id, strategy in self.strategy_manager.strategies.items():
+            for stock_code in strategy.target_stocks:
+                subscriptions.setdefault(stock_code, set()).add(strategy_id)
+        self.subscriptions = subscriptions
+        logger.info(f"구독 갱신: 종목 {len(subscriptions)}개, 전략 {len(self.strategy_manager.strategies)}개")
+
+    def add_bar_handler(self, handler: Callable[[str, Dict[str, Any]], None]):
+        """봉 마감 핸들러 등록 - handler(stock_code, bar)"""
+        self.bar_handlers.append(handler)
+
+    # ------------------------------------------------------------------
+    # 이벤트 입력 (시세 피드 콜백, 이벤트 루프 스레드에서 호출)
+    # ------------------------------------------------------------------
+    def on_price(self, stock_code: str, quote: Dict[str, Any]):
+        """가격 이벤트 수신 - 큐에 넣기만 함 (대기 없음)"""
+        self._queue.put_nowait((time.perf_counter(), stock_code, quote))
+
+    # ------------------------------------------------------------------
+    # 실행 루프
+    # ------------------------------------------------------------------
+    async def run(self):
+        """가격 이벤트 루프와 타이머 루프 실행 (stop() 까지)"""
+        self.running = True
+        self.rebuild_subscriptions()
+        self._tasks = [
+            asyncio.create_task(self._bar_timer()),
+            asyncio.create_task(self._refresh_timer()),
+        ]
+        try:
+            while self.running:
+                batch = [await self._queue.get()]
+                while len(batch) < self.max_batch and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                await self.process_batch(batch)
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            self.running = False
+
+    def stop(self):
+        self.running = False
+        self._queue.put_nowait(None)  # 대기 중인 get() 깨우기
+
+    async def process_batch(self, batch: List[Optional[Tuple[float, str, Dict[str, Any]]]]):
+        """이벤트 묶음 처리 - 종목별 최신 시세로 병합 후 구독 전략만 평가"""
+        dequeued = time.perf_counter()
+        changed: Dict[str, Dict[str, Any]] = {}
+        oldest = dequeued
+        for event in batch:
+            if event is None:
+                continue
+            received, stock_code, quote = event
+            self.latency['queue'].record(dequeued - received)
+            oldest = min(oldest, received)
+            changed[stock_code] = quote
+
+            price = quote['current_price']
+            volume = quote.get('tick_volume', 0)
+            bar = self.bars.get(stock_code)
+            if bar is None:
+                self.bars[stock_code] = BarBuilder(price, volume)
+            else:
+                bar.update(price, volume)
+
+        if not changed:
+            return
+        self.events += len(batch)
+        self.batches += 1
+        self.quotes.update(changed)
+        self.last_event = datetime.now()
+
+        strategy_ids: Set[int] = set()
+        for stock_code in changed:
+            strategy_ids.update(self.subscriptions.get(stock_code, ()))
+        if not strategy_ids:
+            return
+
+        # 바뀐 종목만 넘기면 전략은 자기 대상 종목 중 해당 종목만 평가
+        results = await asyncio.gather(*(
+            self.strategy_manager.generate_signals(strategy_id, changed)
+            for strategy_id in strategy_ids
+        ))
+        signaled = time.perf_counter()
+        self.evaluations += len(strategy_ids)
+        self.latency['signal'].record(signaled - dequeued)
+
+        signals = [signal for result in results for signal in result]
+        if not signals or self.on_signals is None:
+            return
+        self.signals += len(signals)
+
+        orders = await self.on_signals(signals)
+        if orders:
+            ordered = time.perf_counter()
+            self.orders += orders
+            self.latency['order'].record(ordered - signaled)
+            self.latency['total'].record(ordered - oldest)
+
+    async def _bar_timer(self):
+        """bar_interval 경계마다 봉 마감"""
+        while True:
+            now = time.time()
+            await asyncio.sleep(self.bar_interval - now % self.bar_interval)
+            self.close_bars()
+
+    def close_bars(self, timestamp: Optional[datetime] = None):
+        """현재 봉 전체 마감 - 시세 캐시에 종가 추가 후 봉 핸들러 호출"""
+        bars, self.bars = self.bars, {}
+        timestamp = timestamp or datetime.now()
+        for stock_code, bar in bars.items():
+            self.strategy_manager.on_price_update(stock_code, bar.close, bar.volume, timestamp)
+            payload = {'open': bar.open, 'high': bar.high, 'low': bar.low,
+                       'close': bar.close, 'volume': bar.volume, 'timestamp': timestamp}
+            for handler in self.bar_handlers:
+                try:
+                    handler(stock_code, payload)
+                except Exception as e:
+                    logger.error(f"봉 마감 처리 오류 {stock_code}: {e}")
+        self.bar_closes += 1
+
+    async def _refresh_timer(self):
+        """refresh_interval마다 시세/포지션 캐시 일괄 갱신 (DB는 스레드에서)"""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.strategy_manager.refresh_market_data()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': self.running,
+            'subscribed_symbols': len(self.subscriptions),
+            'events': self.events,
+            'batches': self.batches,
+            'avg_batch': round(self.events / self.batches, 2) if self.batches else 0.0,
+            'evaluations': self.evaluations,
+            'signals': self.signals,
+            'orders': self.orders,
+            'bar_closes': self.bar_closes,
+            'queue_size': self._queue.qsize(),
+            'latency': {stage: histogram.get_stats() for stage, histogram in self.latency.items()},
+            'last_event': self.last_event.isoformat() if self.last_event else None,
+        }
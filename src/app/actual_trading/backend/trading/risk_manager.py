@@ -1,21 +1,38 @@
 # file: backend/trading/risk_manager.py
 
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, date, time
 import json
+import math
+import numpy as np
 
 from models import TradingSignal, RiskMetrics
-from database import get_db_session
+from database import get_db_session, get_price_store, get_stock_ids
 from utils.config import get_settings
+from trading.correlation import CorrelationEngine
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# 간단한 섹터 매핑 (실제로는 데이터베이스나 API에서 조회)
+SECTOR_MAP = {
+    '005930': 'Technology',  # 삼성전자
+    '000660': 'Technology',  # SK하이닉스
+    '035420': 'Technology',  # NAVER
+    '035720': 'Technology',  # 카카오
+    '051910': 'Chemical',    # LG화학
+    '006400': 'Technology',  # 삼성SDI
+    '207940': 'Biotech',     # 삼성바이오로직스
+    '373220': 'Battery',     # LG에너지솔루션
+}
+
 class RiskManager:
     """리스크 관리 클래스"""
     
-    def __init__(self):
+    def __init__(self, risk_state: Optional["RiskState"] = None):
+        self.risk_state = risk_state  # 있으면 주문 경로 체크를 메모리 상태로 처리
+        
         # 기본 리스크 한도 설정
         self.daily_loss_limit = -0.02  # -2%
         self.position_size_limit = 0.05  # 5%
@@ -35,6 +52,16 @@ class RiskManager:
     async def validate_signal(self, signal: TradingSignal, current_positions: Dict[str, Any]) -> bool:
         """트레이딩 신호의 리스크 검증"""
         try:
+            if self.risk_state is not None and self.risk_state.loaded:
+                allowed, reason = self.pre_trade_check(
+                    signal.stock_code, signal.signal_type, signal.quantity, signal.price, signal.confidence
+                )
+                if allowed:
+                    logger.info(f"리스크 검증 통과: {signal.stock_code} {signal.signal_type}")
+                else:
+                    logger.warning(f"{reason} - 신호 거부")
+                return allowed
+            
             # 1. 기본 리스크 체크
             if not self.trading_allowed:
                 logger.warning("트레이딩이 비활성화됨 - 신호 거부")
@@ -77,6 +104,58 @@ class RiskManager:
             logger.error(f"리스크 검증 오류: {e}")
             return False
     
+    def pre_trade_check(self, stock_code: str, side: str, quantity: int, price: float,
+                        confidence: float = 1.0) -> Tuple[bool, str]:
+        """주문 직전 리스크 체크 (RiskState 메모리 값만 사용, DB 접근 없음)
+        
+        Returns:
+            (허용 여부, 거부 사유)
+        """
+        state = self.risk_state
+        if not self.trading_allowed:
+            return False, "트레이딩이 비활성화됨"
+        state.roll_day()
+        
+        equity = state.equity
+        if state.daily_pnl_ratio <= self.daily_loss_limit:
+            self.risk_level = "CRITICAL"
+            return False, f"일일 손실 한도 초과: {state.daily_pnl_ratio:.2%}"
+        
+        if not state.drawdown.is_drawdown_acceptable():
+            return False, f"낙폭 한도 초과: {state.drawdown.current_drawdown:.2%}"
+        
+        if side != "buy":
+            return True, ""  # 매도는 리스크 감소
+        
+        symbol = state.symbols.get(stock_code)
+        held = symbol is not None and symbol.quantity > 0
+        if not held and state.positions_count >= self.max_positions:
+            return False, "최대 포지션 수 초과"
+        
+        if equity <= 0:
+            return False, "평가금액 없음"
+        order_value = quantity * price
+        if order_value / equity > self.position_size_limit:
+            return False, "포지션 크기 한도 초과"
+        
+        stock_weight = (state.exposure(stock_code) + order_value) / equity
+        if stock_weight > self.max_single_stock_weight:
+            return False, f"종목 집중도 초과: {stock_code} {stock_weight:.1%}"
+        
+        sector = symbol.sector if symbol is not None else SECTOR_MAP.get(stock_code)
+        if sector:
+            sector_weight = (state.sector_exposure.get(sector, 0.0) + order_value) / equity
+            if sector_weight > self.max_sector_weight:
+                return False, f"섹터 집중도 초과: {sector} {sector_weight:.1%}"
+        
+        if not self.check_market_hours():
+            return False, "시장 시간 외"
+        
+        if state.volatility(stock_code) > 0.4 and confidence <= 0.8:
+            return False, "변동성 리스크 높음"
+        
+        return True, ""
+    
     async def check_daily_loss_limit(self) -> bool:
         """일일 손실 한도 체크"""
         try:
@@ -298,6 +377,9 @@ class RiskManager:
     # 헬퍼 메서드들
     async def get_today_pnl(self) -> float:
         """오늘의 실현 손익 조회"""
+        if self.risk_state is not None and self.risk_state.loaded:
+            return self.risk_state.realized_pnl_today
+        
         try:
             from models import Order, OrderStatus
             
@@ -322,6 +404,9 @@ class RiskManager:
     
     async def get_total_portfolio_value(self) -> float:
         """총 포트폴리오 가치 조회"""
+        if self.risk_state is not None and self.risk_state.loaded:
+            return self.risk_state.equity
+        
         try:
             from models import Portfolio
             
@@ -339,19 +424,7 @@ class RiskManager:
     async def get_stock_sector(self, stock_code: str) -> Optional[str]:
         """종목의 섹터 정보 조회"""
         try:
-            # 간단한 섹터 매핑 (실제로는 데이터베이스나 API에서 조회)
-            sector_map = {
-                '005930': 'Technology',  # 삼성전자
-                '000660': 'Technology',  # SK하이닉스
-                '035420': 'Technology',  # NAVER
-                '035720': 'Technology',  # 카카오
-                '051910': 'Chemical',    # LG화학
-                '006400': 'Technology',  # 삼성SDI
-                '207940': 'Biotech',     # 삼성바이오로직스
-                '373220': 'Battery',     # LG에너지솔루션
-            }
-            
-            return sector_map.get(stock_code)
+            return SECTOR_MAP.get(stock_code)
             
         except Exception as e:
             logger.error(f"섹터 정보 조회 오류: {e}")
@@ -383,28 +456,26 @@ class RiskManager:
             return 0.0
     
     async def get_stock_volatility(self, stock_code: str, days: int = 30) -> float:
-        """종목 변동성 계산"""
+        """종목 변동성 계산 (RiskState에 충분한 봉이 있으면 DB 조회 생략)"""
+        if self.risk_state is not None:
+            symbol = self.risk_state.symbols.get(stock_code)
+            if symbol is not None and symbol.bars >= 10:
+                return self.risk_state.volatility(stock_code)
+        
         try:
-            from models import Stock, PriceHistory
             from trading.indicators import TechnicalIndicators
             
-            with get_db_session() as db:
-                stock = db.query(Stock).filter(Stock.code == stock_code).first()
-                if not stock:
-                    return 0.0
-                
-                # 최근 30일 가격 데이터 조회
-                price_records = db.query(PriceHistory)\
-                    .filter(PriceHistory.stock_id == stock.id)\
-                    .order_by(PriceHistory.timestamp.desc())\
-                    .limit(days)\
-                    .all()
-                
-                if len(price_records) < 10:
-                    return 0.0
-                
-                prices = [record.price for record in reversed(price_records)]
-                return TechnicalIndicators.calculate_volatility(prices, min(20, len(prices)))
+            stock_id = get_stock_ids([stock_code]).get(stock_code)
+            if stock_id is None:
+                return 0.0
+            
+            # 최근 days개 일봉 종가 (시세 저장소 일봉 롤업)
+            bars = get_price_store().get_bars(stock_id, '1d', limit=days)
+            if len(bars) < 10:
+                return 0.0
+            
+            prices = [bar['close'] for bar in bars]
+            return TechnicalIndicators.calculate_volatility(prices, min(20, len(prices) - 1))
                 
         except Exception as e:
             logger.error(f"변동성 계산 오류: {e}")
@@ -467,10 +538,20 @@ class PositionSizer:
     def __init__(self, risk_manager: RiskManager):
         self.risk_manager = risk_manager
     
-    def calculate_position_size(self, signal: TradingSignal, portfolio_value: float, 
-                              volatility: float = 0.2) -> int:
-        """포지션 크기 계산 (Kelly Criterion 기반)"""
+    def calculate_position_size(self, signal: TradingSignal, portfolio_value: Optional[float] = None, 
+                              volatility: Optional[float] = None) -> int:
+        """포지션 크기 계산 (Kelly Criterion 기반)
+        
+        portfolio_value/volatility를 생략하면 RiskState 값 사용 (없으면 변동성 0.2)
+        """
         try:
+            state = self.risk_manager.risk_state
+            if portfolio_value is None:
+                portfolio_value = state.equity if state is not None else 50000000.0
+            if volatility is None:
+                volatility = state.volatility(signal.stock_code) if state is not None else 0.0
+                volatility = volatility or 0.2
+            
             # 기본 포지션 크기 (포트폴리오의 5%)
             base_position_value = portfolio_value * self.risk_manager.position_size_limit
             
@@ -509,6 +590,17 @@ class PositionSizer:
             return entry_price + (risk_amount * risk_reward_ratio)
         except:
             return entry_price * 1.1  # 기본 10% 익절
+    
+    def calculate_exit_prices(self, stock_code: str, entry_price: float) -> Dict[str, float]:
+        """RiskState ATR 기반 손절/익절가 (ATR이 없으면 기본 비율)"""
+        state = self.risk_manager.risk_state
+        atr = state.get_atr(stock_code) if state is not None else 0.0
+        if atr <= 0:
+            return {'stop_loss': entry_price * 0.95, 'take_profit': entry_price * 1.1}
+        return {
+            'stop_loss': self.calculate_stop_loss_price(entry_price, atr),
+            'take_profit': self.calculate_take_profit_price(entry_price, atr)
+        }
 
 class DrawdownManager:
     """낙폭 관리 클래스"""
@@ -550,80 +642,401 @@ class DrawdownManager:
             'is_acceptable': self.is_drawdown_acceptable()
         }
 
+TRADING_DAYS_PER_YEAR = 252
+TRADING_SECONDS_PER_DAY = 6.5 * 3600  # 정규장 09:00 ~ 15:30
+
+def bar_periods_per_year(bar_interval: float) -> float:
+    """봉 주기(초) -> 연간 봉 개수 (정규장 기준, 일봉 이상은 252)"""
+    return TRADING_DAYS_PER_YEAR * max(TRADING_SECONDS_PER_DAY / bar_interval, 1.0)
+
+def resample_closes(timestamps: np.ndarray, prices: np.ndarray, bar_interval: float) -> np.ndarray:
+    """시세 이력 -> bar_interval 경계(epoch 기준, EventScheduler와 동일) 봉 종가"""
+    if len(prices) == 0:
+        return np.asarray(prices, dtype=np.float64)
+    buckets = np.floor(np.asarray(timestamps, dtype=np.float64) / bar_interval)
+    last = np.append(np.flatnonzero(np.diff(buckets) != 0), len(buckets) - 1)
+    return np.asarray(prices, dtype=np.float64)[last]
+
+class SymbolRiskState:
+    """종목 하나의 리스크 상태"""
+    
+    __slots__ = ('code', 'sector', 'last_price', 'prev_close', 'ewma_var', 'atr', 'bars',
+                 'quantity', 'avg_price', 'exposure', 'vol_exposure')
+    
+    def __init__(self, stock_code: str, sector: Optional[str] = None):
+        self.code = stock_code
+        self.sector = sector
+        self.last_price = 0.0
+        self.prev_close = 0.0
+        self.ewma_var = 0.0      # 봉 로그수익률 EWMA 분산
+        self.atr = 0.0           # Wilder ATR
+        self.bars = 0            # 반영된 봉 수
+        self.quantity = 0
+        self.avg_price = 0.0
+        self.exposure = 0.0      # quantity * last_price
+        self.vol_exposure = 0.0  # exposure * 연율화 변동성
+
+class RiskState:
+    """사전 리스크 체크용 증분 상태 캐시
+    
+    - 종목별 변동성(EWMA)/ATR(Wilder)은 봉마다, 노출은 시세/체결마다 O(1) 갱신
+    - 포트폴리오 총노출/섹터 노출/평가금액/낙폭은 변화분만 반영해 O(1) 유지
+    - 주문 경로는 메모리 값만 읽음 (DB 접근 없음), DB 적재는 load_from_cache()로 주문 경로 밖에서
+    - bar_interval(초)을 주면 연율화 계수를 봉 주기에서 계산하고, 웜업 이력도 같은 주기 봉으로 리샘플
+    - 날짜가 바뀌면 주문 체크/체결 시점에 일일 기준값을 새로 잡음
+    """
+    
+    def __init__(self, vol_lambda: float = 0.94, atr_period: int = 14,
+                 periods_per_year: Optional[float] = None, bar_interval: Optional[float] = None,
+                 drawdown: Optional[DrawdownManager] = None):
+        self.vol_lambda = vol_lambda
+        self.atr_period = atr_period
+        self.bar_interval = bar_interval
+        if periods_per_year is None:
+            periods_per_year = bar_periods_per_year(bar_interval) if bar_interval else TRADING_DAYS_PER_YEAR
+        self.periods_per_year = periods_per_year
+        self.drawdown = drawdown or DrawdownManager()
+        
+        self.symbols: Dict[str, SymbolRiskState] = {}
+        self.sector_exposure: Dict[str, float] = {}
+        self.cash = 0.0
+        self.total_exposure = 0.0
+        self.vol_exposure = 0.0
+        self.positions_count = 0
+        self.realized_pnl_today = 0.0
+        self.day_start_equity = 0.0
+        self.trading_day = date.today()
+        self.loaded = False
+        
+        # 통계
+        self.bar_updates = 0
+        self.price_updates = 0
+        self.fill_updates = 0
+    
+    @property
+    def equity(self) -> float:
+        """평가금액 (현금 + 보유 종목 평가액)"""
+        return self.cash + self.total_exposure
+    
+    @property
+    def daily_pnl(self) -> float:
+        return self.equity - self.day_start_equity
+    
+    @property
+    def daily_pnl_ratio(self) -> float:
+        return self.daily_pnl / self.day_start_equity if self.day_start_equity > 0 else 0.0
+    
+    @property
+    def portfolio_volatility(self) -> float:
+        """노출 가중 변동성 (상관 무시 상한값)"""
+        equity = self.equity
+        return self.vol_exposure / equity if equity > 0 else 0.0
+    
+    def symbol(self, stock_code: str) -> SymbolRiskState:
+        state = self.symbols.get(stock_code)
+        if state is None:
+            state = self.symbols[stock_code] = SymbolRiskState(stock_code, SECTOR_MAP.get(stock_code))
+        return state
+    
+    def volatility(self, stock_code: str) -> float:
+        """연율화 변동성 (봉 2개 미만이면 0)"""
+        state = self.symbols.get(stock_code)
+        if state is None or state.bars < 2:
+            return 0.0
+        return (state.ewma_var * self.periods_per_year) ** 0.5
+    
+    def get_atr(self, stock_code: str) -> float:
+        state = self.symbols.get(stock_code)
+        return state.atr if state else 0.0
+    
+    def exposure(self, stock_code: str) -> float:
+        state = self.symbols.get(stock_code)
+        return state.exposure if state else 0.0
+    
+    # ------------------------------------------------------------------
+    # 증분 갱신
+    # ------------------------------------------------------------------
+    def _revalue(self, state: SymbolRiskState):
+        """종목 노출 재평가 - 포트폴리오 합계에는 변화분만 반영"""
+        exposure = state.quantity * state.last_price
+        vol_exposure = exposure * self.volatility(state.code)
+        delta = exposure - state.exposure
+        if delta:
+            self.total_exposure += delta
+            if state.sector:
+                self.sector_exposure[state.sector] = self.sector_exposure.get(state.sector, 0.0) + delta
+        self.vol_exposure += vol_exposure - state.vol_exposure
+        state.exposure = exposure
+        state.vol_exposure = vol_exposure
+    
+    def on_price(self, stock_code: str, price: float):
+        """시세 반영 (보유 종목이면 평가액/낙폭 갱신)"""
+        state = self.symbol(stock_code)
+        state.last_price = price
+        self.price_updates += 1
+        if state.quantity:
+            self._revalue(state)
+            self.drawdown.update_drawdown(self.equity)
+    
+    def on_bar(self, stock_code: str, close: float, high: Optional[float] = None,
+               low: Optional[float] = None):
+        """봉 마감 반영 - 변동성/ATR 갱신 후 종가로 재평가
+        
+        high/low가 없으면 종가 변화폭을 True Range로 사용
+        """
+        state = self.symbol(stock_code)
+        prev = state.prev_close
+        if prev > 0 and close > 0:
+            ret = math.log(close / prev)
+            if state.bars == 1:
+                state.ewma_var = ret * ret
+            else:
+                lam = self.vol_lambda
+                state.ewma_var = lam * state.ewma_var + (1 - lam) * ret * ret
+            
+            if high is None or low is None:
+                true_range = abs(close - prev)
+            else:
+                true_range = max(high - low, abs(high - prev), abs(low - prev))
+            # 처음 atr_period개는 단순평균, 이후 Wilder 평활
+            n = min(state.bars, self.atr_period)
+            state.atr += (true_range - state.atr) / n
+        
+        state.prev_close = close
+        state.bars += 1
+        self.bar_updates += 1
+        self.on_price(stock_code, close)
+    
+    def on_fill(self, stock_code: str, side: str, quantity: int, price: float,
+                commission: float = 0.0):
+        """체결 반영 - 수량/평단/현금/실현손익 갱신"""
+        self.roll_day()
+        state = self.symbol(stock_code)
+        was_held = state.quantity > 0
+        
+        if side == "buy":
+            total = state.quantity + quantity
+            state.avg_price = (state.avg_price * state.quantity + price * quantity) / total
+            state.quantity = total
+            self.cash -= price * quantity + commission
+        else:
+            quantity = min(quantity, state.quantity)
+            self.realized_pnl_today += (price - state.avg_price) * quantity - commission
+            state.quantity -= quantity
+            self.cash += price * quantity - commission
+            if state.quantity == 0:
+                state.avg_price = 0.0
+        
+        self.positions_count += (state.quantity > 0) - was_held
+        state.last_price = price
+        self.fill_updates += 1
+        self._revalue(state)
+        self.drawdown.update_drawdown(self.equity)
+    
+    def start_day(self):
+        """장 시작 시 일일 기준값 초기화"""
+        self.trading_day = date.today()
+        self.day_start_equity = self.equity
+        self.realized_pnl_today = 0.0
+    
+    def roll_day(self) -> bool:
+        """날짜가 바뀌었으면 일일 기준값 재설정 (장기 실행 프로세스용), 바뀌었으면 True"""
+        if date.today() == self.trading_day:
+            return False
+        logger.info(f"거래일 변경 {self.trading_day} -> {date.today()}: 일일 손익 초기화")
+        self.start_day()
+        return True
+    
+    # ------------------------------------------------------------------
+    # 적재 (주문 경로 밖)
+    # ------------------------------------------------------------------
+    def warm_up(self, stock_code: str, closes: np.ndarray):
+        """종가 이력으로 변동성/ATR 초기화 (on_bar를 반복한 것과 같은 결과)"""
+        closes = np.asarray(closes, dtype=np.float64)
+        closes = closes[closes > 0]
+        state = self.symbol(stock_code)
+        if len(closes) == 0:
+            return
+        
+        state.bars = len(closes)
+        state.prev_close = float(closes[-1])
+        if len(closes) >= 2:
+            lam = self.vol_lambda
+            squared = np.diff(np.log(closes)) ** 2
+            weights = (1 - lam) * lam ** np.arange(len(squared) - 1, -1, -1, dtype=np.float64)
+            weights[0] = lam ** (len(squared) - 1)  # 첫 수익률이 초기값
+            state.ewma_var = float(weights @ squared)
+            
+            true_range = np.abs(np.diff(closes))
+            period = self.atr_period
+            atr = true_range[:period].mean()
+            rest = true_range[period:]
+            if len(rest):
+                decay = 1 - 1 / period
+                atr = decay ** len(rest) * atr + (decay ** np.arange(len(rest) - 1, -1, -1) @ rest) / period
+            state.atr = float(atr)
+        
+        state.last_price = state.prev_close
+        self._revalue(state)
+    
+    def load(self, positions: Dict[str, Dict[str, Any]], cash: float,
+             histories: Optional[Dict[str, np.ndarray]] = None):
+        """보유 포지션/현금/가격 이력으로 전체 상태 재구성"""
+        self.symbols.clear()
+        self.sector_exposure.clear()
+        self.total_exposure = 0.0
+        self.vol_exposure = 0.0
+        self.cash = cash
+        
+        for stock_code, closes in (histories or {}).items():
+            self.warm_up(stock_code, closes)
+        
+        for stock_code, position in positions.items():
+            state = self.symbol(stock_code)
+            state.quantity = int(position.get('quantity') or 0)
+            state.avg_price = position.get('avg_price') or 0.0
+            state.last_price = position.get('current_price') or state.last_price or state.avg_price
+            self._revalue(state)
+        
+        self.positions_count = sum(1 for state in self.symbols.values() if state.quantity > 0)
+        self.start_day()
+        self.drawdown.update_drawdown(self.equity)
+        self.loaded = True
+    
+    def load_from_cache(self, market_cache, cash: float):
+        """MarketDataCache의 포지션/가격 이력으로 적재 (전략별 포지션은 종목별로 합산)"""
+        positions: Dict[str, Dict[str, Any]] = {}
+        for (_, stock_code), position in market_cache.positions.items():
+            merged = positions.setdefault(stock_code, {'quantity': 0, 'avg_price': 0.0, 'current_price': None})
+            quantity = merged['quantity'] + position['quantity']
+            merged['avg_price'] = (merged['avg_price'] * merged['quantity']
+                                   + position['avg_price'] * position['quantity']) / quantity
+            merged['quantity'] = quantity
+            merged['current_price'] = position.get('current_price') or merged['current_price']
+        
+        histories = {}
+        for code, history in market_cache.histories.items():
+            prices = history.prices[:history.size]
+            if self.bar_interval:
+                # 실시간 봉과 같은 주기로 맞춤 (틱/짧은 주기 이력이면 변동성이 과소평가됨)
+                prices = resample_closes(history.timestamps[:history.size], prices, self.bar_interval)
+            histories[code] = prices
+        self.load(positions, cash, histories)
+    
+    def get_portfolio_data(self) -> Dict[str, Any]:
+        """RiskAlert 입력 형식의 포트폴리오 요약"""
+        return {
+            'total_value': self.equity,
+            'cash': self.cash,
+            'total_exposure': self.total_exposure,
+            'daily_pnl': self.daily_pnl,
+            'realized_pnl': self.realized_pnl_today,
+            'current_drawdown': self.drawdown.current_drawdown,
+            'volatility': self.portfolio_volatility,
+            'positions_count': self.positions_count
+        }
+
 class CorrelationManager:
-    """상관관계 관리 클래스"""
+    """상관관계 관리 클래스 (CorrelationEngine 기반 전체 행렬 계산)"""
     
-    def __init__(self):
-        self.correlation_matrix = {}
+    def __init__(self, market_cache=None, ewma_lambda: Optional[float] = None):
+        self.engine = CorrelationEngine(ewma_lambda)
+        self.market_cache = market_cache
         self.max_correlation = 0.7  # 최대 허용 상관계수
     
+    @property
+    def correlation_matrix(self):
+        """상관계수 행렬 (종목 순서는 self.engine.codes)"""
+        return self.engine.corr
+    
     async def update_correlations(self, stock_codes: List[str], days: int = 60):
-        """종목간 상관관계 업데이트"""
+        """종목간 상관관계 업데이트 (시세 캐시 또는 일괄 조회 한 번)"""
         try:
-            from models import Stock, PriceHistory
-            from trading.indicators import TechnicalIndicators
-            
-            price_data = {}
-            
-            # 각 종목의 가격 데이터 수집
-            with get_db_session() as db:
-                for stock_code in stock_codes:
-                    stock = db.query(Stock).filter(Stock.code == stock_code).first()
-                    if stock:
-                        price_records = db.query(PriceHistory)\
-                            .filter(PriceHistory.stock_id == stock.id)\
-                            .order_by(PriceHistory.timestamp)\
-                            .limit(days)\
-                            .all()
-                        
-                        prices = [record.price for record in price_records]
-                        if len(prices) >= days // 2:
-                            price_data[stock_code] = prices
-            
-            # 상관계수 행렬 계산
-            for code1 in price_data:
-                for code2 in price_data:
-                    if code1 != code2:
-                        correlation = TechnicalIndicators.calculate_correlation(
-                            price_data[code1], price_data[code2]
-                        )
-                        self.correlation_matrix[f"{code1}_{code2}"] = correlation
+            from data.market_data import MarketDataCache
+            
+            cache = self.market_cache
+            if cache is None or not all(cache.has_symbol(code) for code in stock_codes):
+                cache = MarketDataCache(max_bars=days, lookback_days=max(days * 2, 30))
+                await cache.refresh(stock_codes, include_positions=False)
+            
+            # 각 종목의 최근 가격 (데이터가 절반 미만인 종목 제외)
+            series = {}
+            for stock_code in stock_codes:
+                history = cache.histories.get(stock_code)
+                if history is None:
+                    continue
+                start = max(history.size - days, 0)
+                if history.size - start >= days // 2:
+                    series[stock_code] = (history.timestamps[start:history.size],
+                                          history.prices[start:history.size])
+            
+            # 상관계수 행렬 계산 (행렬곱 한 번)
+            self.engine.fit_prices(series)
             
         except Exception as e:
             logger.error(f"상관관계 업데이트 오류: {e}")
     
+    def on_bar(self, returns: Dict[str, float]):
+        """새 봉 수익률 반영 (rank-1 갱신, 모르는 종목은 0)"""
+        if not len(self.engine):
+            return
+        row = np.zeros(len(self.engine))
+        for code, value in returns.items():
+            i = self.engine.index.get(code)
+            if i is not None:
+                row[i] = value
+        self.engine.update(row)
+    
+    def get_correlation(self, code1: str, code2: str) -> float:
+        """두 종목 상관계수"""
+        return self.engine.get(code1, code2)
+    
     def check_correlation_risk(self, new_stock: str, existing_stocks: List[str]) -> bool:
         """새로운 종목 추가시 상관관계 리스크 체크"""
         try:
-            for existing_stock in existing_stocks:
-                key = f"{new_stock}_{existing_stock}"
-                reverse_key = f"{existing_stock}_{new_stock}"
-                
-                correlation = self.correlation_matrix.get(key) or self.correlation_matrix.get(reverse_key, 0)
-                
-                if abs(correlation) > self.max_correlation:
-                    logger.warning(f"높은 상관관계 감지: {new_stock} - {existing_stock} ({correlation:.2f})")
-                    return False
+            existing_stock, correlation = self.engine.max_correlation_with(new_stock, existing_stocks)
+            
+            if existing_stock is not None and abs(correlation) > self.max_correlation:
+                logger.warning(f"높은 상관관계 감지: {new_stock} - {existing_stock} ({correlation:.2f})")
+                return False
             
             return True
             
         except Exception as e:
             logger.error(f"상관관계 체크 오류: {e}")
             return True
+    
+    def check_portfolio_correlation(self, weights: Dict[str, float]) -> Dict[str, Any]:
+        """보유 비중 기준 포트폴리오 상관 집중도 체크"""
+        try:
+            metrics = self.engine.portfolio_concentration(weights)
+            pairs = self.engine.high_correlation_pairs(list(weights), self.max_correlation)
+            return {
+                **metrics,
+                'high_correlation_pairs': pairs,
+                'is_concentrated': bool(pairs)
+            }
+        except Exception as e:
+            logger.error(f"포트폴리오 상관관계 체크 오류: {e}")
+            return {}
 
 class RiskAlert:
     """리스크 알림 클래스"""
     
-    def __init__(self):
+    def __init__(self, risk_state: Optional[RiskState] = None):
+        self.risk_state = risk_state
         self.alert_thresholds = {
             'daily_loss': -0.015,  # -1.5%
             'drawdown': 0.10,      # 10%
             'volatility': 0.35     # 35%
         }
     
-    async def check_and_send_alerts(self, portfolio_data: Dict[str, Any]):
-        """리스크 알림 체크 및 발송"""
+    async def check_and_send_alerts(self, portfolio_data: Optional[Dict[str, Any]] = None):
+        """리스크 알림 체크 및 발송 (portfolio_data 생략 시 RiskState 요약 사용)"""
         try:
+            if portfolio_data is None:
+                portfolio_data = self.risk_state.get_portfolio_data() if self.risk_state else {}
+            
             alerts = []
             
             # 일일 손실 알림
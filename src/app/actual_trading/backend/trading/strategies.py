@@ -1,5 +1,6 @@
 # file: backend/trading/strategies.py
 
+import asyncio
 import json
 import logging
 from abc import ABC, abstractmethod
@@ -10,15 +11,17 @@ import pandas as pd
 
 from models import TradingSignal, OrderType, Strategy
 from trading.indicators import TechnicalIndicators
-from database import get_db_session
+from database import get_db_session, get_price_store, get_stock_ids
+from data.market_data import MarketDataCache
 
 logger = logging.getLogger(__name__)
 
 class BaseStrategy(ABC):
     """전략 베이스 클래스"""
     
-    def __init__(self, strategy_config: Strategy):
+    def __init__(self, strategy_config: Strategy, market_cache: Optional[MarketDataCache] = None):
         self.config = strategy_config
+        self.market_cache = market_cache
         self.name = strategy_config.name
         self.strategy_type = strategy_config.strategy_type
         self.target_stocks = json.loads(strategy_config.target_stocks)
@@ -41,53 +44,50 @@ class BaseStrategy(ABC):
             return 100
     
     async def get_price_history(self, stock_code: str, days: int = 30) -> List[float]:
-        """종목의 과거 가격 데이터 조회"""
+        """종목의 과거 가격 데이터 조회 (캐시가 구간 전체를 가지면 캐시, 아니면 스레드에서 DB 조회)"""
+        if self.market_cache and self.market_cache.covers(stock_code, days):
+            return self.market_cache.get_prices(stock_code, days).tolist()
+        return await asyncio.to_thread(self._query_price_history, stock_code, days)
+    
+    async def get_volume_history(self, stock_code: str, days: int = 5) -> List[int]:
+        """종목의 과거 거래량 데이터 조회 (캐시가 구간 전체를 가지면 캐시, 아니면 스레드에서 DB 조회)"""
+        if self.market_cache and self.market_cache.covers(stock_code, days):
+            return self.market_cache.get_volumes(stock_code, days).tolist()
+        return await asyncio.to_thread(self._query_volume_history, stock_code, days)
+    
+    async def get_current_position(self, stock_code: str) -> Optional[Dict[str, Any]]:
+        """현재 보유 포지션 조회 (캐시 우선, 없으면 스레드에서 DB 조회)"""
+        if self.market_cache and self.market_cache.has_positions:
+            return self.market_cache.get_position(self.config.id, stock_code)
+        return await asyncio.to_thread(self._query_current_position, stock_code)
+    
+    def _query_bars(self, stock_code: str, days: int) -> List[Dict[str, Any]]:
+        """시세 저장소에서 기간 봉 조회 (동기) - 캐시와 같은 해상도"""
+        stock_id = get_stock_ids([stock_code]).get(stock_code)
+        if stock_id is None:
+            return []
+        resolution = self.market_cache.resolution if self.market_cache else '1m'
+        start_date = datetime.now() - timedelta(days=days)
+        return get_price_store().get_bars(stock_id, resolution, start=start_date)
+    
+    def _query_price_history(self, stock_code: str, days: int) -> List[float]:
+        """가격 히스토리 DB 조회 (동기)"""
         try:
-            from models import Stock, PriceHistory
-            
-            with get_db_session() as db:
-                stock = db.query(Stock).filter(Stock.code == stock_code).first()
-                if not stock:
-                    return []
-                
-                start_date = datetime.now() - timedelta(days=days)
-                price_records = db.query(PriceHistory)\
-                    .filter(PriceHistory.stock_id == stock.id)\
-                    .filter(PriceHistory.timestamp >= start_date)\
-                    .order_by(PriceHistory.timestamp)\
-                    .all()
-                
-                return [record.price for record in price_records]
-                
+            return [bar['close'] for bar in self._query_bars(stock_code, days)]
         except Exception as e:
             logger.error(f"가격 히스토리 조회 실패 {stock_code}: {e}")
             return []
     
-    async def get_volume_history(self, stock_code: str, days: int = 5) -> List[int]:
-        """종목의 과거 거래량 데이터 조회"""
+    def _query_volume_history(self, stock_code: str, days: int) -> List[int]:
+        """거래량 히스토리 DB 조회 (동기)"""
         try:
-            from models import Stock, PriceHistory
-            
-            with get_db_session() as db:
-                stock = db.query(Stock).filter(Stock.code == stock_code).first()
-                if not stock:
-                    return []
-                
-                start_date = datetime.now() - timedelta(days=days)
-                volume_records = db.query(PriceHistory)\
-                    .filter(PriceHistory.stock_id == stock.id)\
-                    .filter(PriceHistory.timestamp >= start_date)\
-                    .order_by(PriceHistory.timestamp)\
-                    .all()
-                
-                return [record.volume for record in volume_records if record.volume]
-                
+            return [bar['volume'] for bar in self._query_bars(stock_code, days) if bar['volume']]
         except Exception as e:
             logger.error(f"거래량 히스토리 조회 실패 {stock_code}: {e}")
             return []
     
-    async def get_current_position(self, stock_code: str) -> Optional[Dict[str, Any]]:
-        """현재 보유 포지션 조회"""
+    def _query_current_position(self, stock_code: str) -> Optional[Dict[str, Any]]:
+        """보유 포지션 DB 조회 (동기)"""
         try:
             from models import Position, Stock
             
@@ -564,8 +564,9 @@ class MovingAverageStrategy(BaseStrategy):
 class StrategyManager:
     """전략 관리자"""
     
-    def __init__(self):
+    def __init__(self, market_cache: Optional[MarketDataCache] = None):
         self.strategies = {}
+        self.market_cache = market_cache or MarketDataCache()
         
     async def initialize(self):
         """전략 매니저 초기화"""
@@ -596,7 +597,7 @@ class StrategyManager:
             
             strategy_class = strategy_map.get(strategy_config.strategy_type)
             if strategy_class:
-                return strategy_class(strategy_config)
+                return strategy_class(strategy_config, self.market_cache)
             else:
                 logger.warning(f"알 수 없는 전략 타입: {strategy_config.strategy_type}")
                 return None
@@ -605,6 +606,33 @@ class StrategyManager:
             logger.error(f"전략 생성 실패 {strategy_config.name}: {e}")
             return None
     
+    def get_watched_stocks(self) -> List[str]:
+        """활성 전략 전체의 감시 종목"""
+        codes = set()
+        for strategy in self.strategies.values():
+            codes.update(strategy.target_stocks)
+        return sorted(codes)
+    
+    async def refresh_market_data(self):
+        """감시 종목 시세/포지션을 주기당 한 번 일괄 적재"""
+        await self.market_cache.refresh(self.get_watched_stocks())
+    
+    def on_price_update(self, stock_code: str, price: float, volume: int = 0,
+                        timestamp: Optional[datetime] = None):
+        """실시간 체결을 시세 캐시에 반영"""
+        self.market_cache.on_price(stock_code, price, volume, timestamp)
+    
+    async def generate_all_signals(self, market_data: Dict[str, Any],
+                                   refresh: bool = True) -> Dict[int, List[TradingSignal]]:
+        """전체 전략 신호 생성 (캐시를 한 번 갱신한 뒤 모든 전략이 공유)"""
+        if refresh:
+            await self.refresh_market_data()
+        
+        results = {}
+        for strategy_id in list(self.strategies):
+            results[strategy_id] = await self.generate_signals(strategy_id, market_data)
+        return results
+    
     async def generate_signals(self, strategy_id: int, market_data: Dict[str, Any]) -> List[TradingSignal]:
         """특정 전략의 신호 생성"""
         try:
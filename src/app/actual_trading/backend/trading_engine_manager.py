@@ -1,7 +1,8 @@
 # file: backend/trading_engine_manager.py
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -16,11 +17,50 @@ class TradingEngine:
         self.active_strategies = {}
         self.current_positions = {}
         self.last_update = None
+        self.daily_order_count = 0
+        
+        # 이벤트 기반 실행 구성요소 (initialize에서 생성)
+        self.strategy_manager = None
+        self.risk_manager = None
+        self.scheduler = None
+        self.order_strategies: Dict[str, int] = {}  # 주문번호 -> 전략 ID (체결을 전략 포지션에 귀속)
+        
+        # 실시간 틱 -> 시세 저장소 (price_store) 일괄 기록
+        self.stock_ids: Dict[str, int] = {}
+        self.pending_ticks: List[tuple] = []
+        self.tick_flush_interval = 1.0
         
     async def initialize(self):
         """트레이딩 엔진 초기화"""
         try:
             logger.info("트레이딩 엔진 초기화 중...")
+            from trading.strategies import StrategyManager
+            from trading.risk_manager import RiskManager, RiskState
+            from trading.event_engine import EventScheduler
+            from utils.config import get_settings
+            from database import get_stock_ids
+            
+            bar_interval = get_settings().bar_interval_sec
+            try:
+                self.stock_ids = await asyncio.to_thread(get_stock_ids)
+            except Exception as e:
+                logger.warning(f"종목 ID 조회 실패 - 틱 기록 생략: {e}")
+            self.strategy_manager = StrategyManager()
+            try:
+                await self.strategy_manager.initialize()
+                await self.strategy_manager.refresh_market_data()
+            except Exception as e:
+                logger.warning(f"전략 로드 실패 - 빈 전략으로 시작: {e}")
+            self.active_strategies = self.strategy_manager.strategies
+            
+            # 변동성은 스케줄러 봉 주기로 연율화, 웜업도 같은 주기로 리샘플
+            self.risk_manager = RiskManager(RiskState(bar_interval=bar_interval))
+            await self.load_risk_state()
+            
+            self.scheduler = EventScheduler(self.strategy_manager, on_signals=self.handle_signals,
+                                            bar_interval=bar_interval)
+            self.scheduler.add_bar_handler(self._on_bar_close)
+            
             # 기본 설정 로드
             self.last_update = datetime.now()
             logger.info("트레이딩 엔진 초기화 완료")
@@ -28,21 +68,122 @@ class TradingEngine:
             logger.error(f"트레이딩 엔진 초기화 실패: {e}")
             raise
     
+    async def load_risk_state(self):
+        """시세 캐시/계좌 정보로 리스크 상태 적재 (주문 경로 밖에서 한 번)"""
+        try:
+            cash = 0.0
+            if self.kiwoom_client and hasattr(self.kiwoom_client, 'get_account_info'):
+                account = await self.kiwoom_client.get_account_info()
+                cash = account.get('available_cash', 0.0)
+            self.risk_manager.risk_state.load_from_cache(self.strategy_manager.market_cache, cash)
+        except Exception as e:
+            logger.warning(f"리스크 상태 적재 실패 - DB 기반 리스크 체크 사용: {e}")
+    
     async def run(self):
-        """메인 트레이딩 루프"""
+        """메인 트레이딩 루프 (시세 이벤트 기반)"""
         self.is_running = True
         logger.info("트레이딩 루프 시작")
         
+        if self.scheduler is None:
+            await self.initialize()
+        
+        client = self.kiwoom_client
+        if client and hasattr(client, 'add_price_listener'):
+            client.add_price_listener(self._on_price)
+            client.add_fill_listener(self._on_fill)
+        else:
+            logger.warning("실시간 시세 리스너를 지원하지 않는 클라이언트 - 가격 이벤트 없음")
+        
+        tick_writer = asyncio.create_task(self._tick_writer())
         try:
-            while self.is_running:
-                # 간단한 루프 - 실제로는 더 복잡한 로직 필요
-                await asyncio.sleep(1)
+            await self.scheduler.run()
         except Exception as e:
             logger.error(f"트레이딩 루프 오류: {e}")
         finally:
+            tick_writer.cancel()
+            await asyncio.gather(tick_writer, return_exceptions=True)
+            await self.flush_ticks()
+            if client and hasattr(client, 'remove_price_listener'):
+                client.remove_price_listener(self._on_price)
+                client.remove_fill_listener(self._on_fill)
             self.is_running = False
             logger.info("트레이딩 루프 종료")
     
+    def _on_price(self, stock_code: str, quote: Dict[str, Any]):
+        """시세 피드 콜백 - 리스크 상태 재평가 후 스케줄러 큐에 적재"""
+        self.risk_manager.risk_state.on_price(stock_code, quote['current_price'])
+        stock_id = self.stock_ids.get(stock_code)
+        if stock_id is not None:
+            timestamp = quote.get('last_update')
+            if not isinstance(timestamp, datetime):
+                timestamp = datetime.now()
+            self.pending_ticks.append((stock_id, timestamp, quote['current_price'], quote.get('tick_volume', 0)))
+        self.scheduler.on_price(stock_code, quote)
+    
+    async def _tick_writer(self):
+        """tick_flush_interval마다 쌓인 틱을 시세 저장소에 기록"""
+        while True:
+            await asyncio.sleep(self.tick_flush_interval)
+            await self.flush_ticks()
+    
+    async def flush_ticks(self) -> int:
+        """쌓인 틱 일괄 저장 (틱/1분/5분/일봉 롤업, DB는 스레드에서)"""
+        if not self.pending_ticks:
+            return 0
+        rows, self.pending_ticks = self.pending_ticks, []
+        try:
+            from database import get_price_store
+            return await asyncio.to_thread(get_price_store().insert_ticks, rows)
+        except Exception as e:
+            logger.error(f"틱 저장 실패 ({len(rows)}건): {e}")
+            return 0
+    
+    def _on_fill(self, order: Dict[str, Any]):
+        """체결 콜백 - 리스크 상태/전략 포지션 캐시 반영"""
+        side = order['order_type'].lower()
+        stock_code = order['stock_code']
+        self.risk_manager.risk_state.on_fill(
+            stock_code, side, order['fill_quantity'], order['fill_price'],
+            order.get('commission', 0.0)
+        )
+        
+        market_cache = self.strategy_manager.market_cache
+        strategy_id = self.order_strategies.get(order.get('order_id'))
+        if strategy_id is None:
+            market_cache.invalidate_positions()
+        else:
+            market_cache.apply_fill(strategy_id, stock_code, side, order['fill_quantity'], order['fill_price'])
+        if order.get('status') == 'filled':
+            self.order_strategies.pop(order.get('order_id'), None)
+    
+    def _on_bar_close(self, stock_code: str, bar: Dict[str, Any]):
+        self.risk_manager.risk_state.on_bar(stock_code, bar['close'], bar['high'], bar['low'])
+    
+    async def handle_signals(self, signals: List[Any]) -> int:
+        """신호 -> 리스크 체크 -> 주문 전송, 전송한 주문 수 반환"""
+        if not self.is_trading_enabled or not self.kiwoom_client:
+            return 0
+        
+        strategy_ids = {strategy.name: strategy_id
+                        for strategy_id, strategy in self.strategy_manager.strategies.items()}
+        sent = 0
+        for signal in signals:
+            if not await self.risk_manager.validate_signal(signal, self.current_positions):
+                continue
+            try:
+                order_id = await self.kiwoom_client.send_order(
+                    signal.stock_code, signal.signal_type.value, signal.quantity, signal.price
+                )
+                if signal.strategy_name in strategy_ids:
+                    self.order_strategies[order_id] = strategy_ids[signal.strategy_name]
+                sent += 1
+            except Exception as e:
+                logger.error(f"주문 전송 실패 {signal.stock_code}: {e}")
+        
+        self.daily_order_count += sent
+        self.last_update = datetime.now()
+        return sent
+    
     async def start_trading(self):
         """자동매매 시작"""
         self.is_trading_enabled = True
@@ -57,11 +198,15 @@ class TradingEngine:
         """긴급 중단"""
         self.is_trading_enabled = False
         self.is_running = False
+        if self.scheduler:
+            self.scheduler.stop()
         logger.critical("긴급중단 실행됨")
     
     async def shutdown(self):
         """엔진 종료"""
         self.is_running = False
+        if self.scheduler:
+            self.scheduler.stop()
         if self.kiwoom_client:
             await self.kiwoom_client.disconnect()
         logger.info("트레이딩 엔진 종료 완료")
@@ -76,7 +221,11 @@ class TradingEngine:
     
     def get_daily_order_count(self):
         """오늘 주문 수 반환"""
-        return 0  # 임시 구현
+        return self.daily_order_count
+    
+    def get_engine_stats(self) -> Dict[str, Any]:
+        """이벤트 처리/단계별 지연시간 통계"""
+        return self.scheduler.get_stats() if self.scheduler else {}
     
     async def activate_strategy(self, strategy_id: int):
         """전략 활성화"""
@@ -189,7 +189,7 @@ async def change_trading_mode(request: TradingModeRequest):
         else:  # DEMO 모드
             # Mock 클라이언트 초기화
             from data.kiwoom_mock import KiwoomClient
-            KIWOOM_CLIENT_INSTANCE = KiwoomClient()
+            KIWOOM_CLIENT_INSTANCE = KiwoomClient.from_settings()
             await KIWOOM_CLIENT_INSTANCE.connect()
             
             logger.info("모의투자 모드로 전환됨")
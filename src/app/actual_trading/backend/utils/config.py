@@ -34,12 +34,20 @@ class Settings(BaseSettings):
     kiwoom_password: str = ""
     kiwoom_cert_password: str = ""
     
+    # 모의투자 시세 생성 ("" 랜덤워크, "simulator" 벡터화 시장 시뮬레이터, 그 외 값은 ReplayFeed 녹화 파일 경로)
+    mock_market_feed: str = ""
+    mock_simulator_symbols: int = 0  # 0이면 기본 모의 종목, n이면 가상 종목 n개
+    mock_simulator_seed: Optional[int] = None
+    mock_simulator_speed: float = 1.0  # 시뮬레이션 배속
+    mock_simulator_step: float = 0.01  # 시뮬레이션 스텝 (초)
+    
     # 트레이딩 설정
     initial_capital: float = 50000000.0  # 5천만원
     max_daily_loss: float = -0.02  # -2%
     max_position_size: float = 0.05  # 5%
     max_positions: int = 10
     emergency_sell_all: bool = False
+    bar_interval_sec: float = 60.0  # 실시간 봉 주기 (리스크 변동성 연율화 기준)
     
     # 리스크 관리 설정
     risk_daily_loss_limit: float = -0.02